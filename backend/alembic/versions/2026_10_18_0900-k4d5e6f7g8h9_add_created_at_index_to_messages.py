@@ -0,0 +1,29 @@
+"""add created_at index to messages
+
+Revision ID: k4d5e6f7g8h9
+Revises: j3c4d5e6f7g8
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "k4d5e6f7g8h9"
+down_revision: Union[str, None] = "j3c4d5e6f7g8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Delivery statistics bucket and filter messages by created_at
+    op.create_index(
+        "ix_messages_created_at", "messages", ["created_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_messages_created_at", table_name="messages")
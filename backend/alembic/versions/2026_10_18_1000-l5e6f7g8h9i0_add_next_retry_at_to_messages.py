@@ -0,0 +1,72 @@
+"""add next_retry_at retry queue column to messages
+
+Revision ID: l5e6f7g8h9i0
+Revises: k4d5e6f7g8h9
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from config import settings
+from models.message import PERMANENT_ERROR_CODES
+
+
+# revision identifiers, used by Alembic.
+revision: str = "l5e6f7g8h9i0"
+down_revision: Union[str, None] = "k4d5e6f7g8h9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 1. Add next_retry_at column
+    op.add_column(
+        "messages",
+        sa.Column(
+            "next_retry_at", sa.DateTime(timezone=True), nullable=True
+        ),
+    )
+
+    # 2. Partial index covering only queued messages
+    op.create_index(
+        "ix_messages_next_retry_at",
+        "messages",
+        ["next_retry_at"],
+        unique=False,
+        postgresql_where=sa.text("next_retry_at IS NOT NULL"),
+    )
+
+    # 3. Backfill the queue for messages that are currently retryable
+    backoff = settings.retry_backoff_minutes or [5]
+    backoff_case = " ".join(
+        f"WHEN retry_count = {i} THEN {minutes}"
+        for i, minutes in enumerate(backoff)
+    )
+    permanent_codes = ", ".join(
+        f"'{code}'" for code in sorted(PERMANENT_ERROR_CODES)
+    )
+    op.execute(
+        f"""
+        UPDATE messages
+        SET next_retry_at = COALESCE(last_retry_at, created_at, now())
+            + make_interval(
+                mins => CASE {backoff_case} ELSE {backoff[-1]} END
+            )
+        WHERE delivery_status IN ('FAILED', 'UNDELIVERED')
+          AND from_source IN (2, 3)
+          AND retry_count < {settings.retry_max_attempts}
+          AND (
+            twilio_error_code IS NULL
+            OR twilio_error_code NOT IN ({permanent_codes})
+          )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_messages_next_retry_at", table_name="messages")
+    op.drop_column("messages", "next_retry_at")
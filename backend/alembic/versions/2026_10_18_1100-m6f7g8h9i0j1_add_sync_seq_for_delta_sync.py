@@ -0,0 +1,57 @@
+"""add sync_seq change tracking for mobile delta sync
+
+Revision ID: m6f7g8h9i0j1
+Revises: l5e6f7g8h9i0
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "m6f7g8h9i0j1"
+down_revision: Union[str, None] = "l5e6f7g8h9i0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYNCED_TABLES = ("customers", "tickets", "messages")
+
+
+def upgrade() -> None:
+    # 1. Shared change sequence
+    op.execute("CREATE SEQUENCE IF NOT EXISTS sync_change_seq")
+
+    # 2. messages.updated_at, backfilled from created_at
+    op.add_column(
+        "messages",
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute("UPDATE messages SET updated_at = created_at")
+    op.alter_column("messages", "updated_at", server_default=sa.func.now())
+
+    # 3. sync_seq on every synced table (existing rows get a value)
+    for table in SYNCED_TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "sync_seq",
+                sa.BigInteger(),
+                server_default=sa.text("nextval('sync_change_seq')"),
+                nullable=False,
+            ),
+        )
+        op.create_index(
+            f"ix_{table}_sync_seq", table, ["sync_seq"], unique=False
+        )
+
+
+def downgrade() -> None:
+    for table in SYNCED_TABLES:
+        op.drop_index(f"ix_{table}_sync_seq", table_name=table)
+        op.drop_column(table, "sync_seq")
+    op.drop_column("messages", "updated_at")
+    op.execute("DROP SEQUENCE IF EXISTS sync_change_seq")
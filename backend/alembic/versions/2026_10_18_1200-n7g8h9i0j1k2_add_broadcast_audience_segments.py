@@ -0,0 +1,72 @@
+"""add broadcast audience segments and segment filter indexes
+
+Revision ID: n7g8h9i0j1k2
+Revises: m6f7g8h9i0j1
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "n7g8h9i0j1k2"
+down_revision: Union[str, None] = "m6f7g8h9i0j1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PROFILE_FIELD_INDEXES = {
+    "ix_customers_profile_crop_type": "crop_type",
+    "ix_customers_profile_gender": "gender",
+    "ix_customers_profile_weather_subscribed": "weather_subscribed",
+}
+
+
+def upgrade() -> None:
+    # 1. Dynamic group members
+    op.add_column(
+        "broadcast_groups",
+        sa.Column("segment", sa.JSON(), nullable=True),
+    )
+
+    # 2. Indexes backing segment filters and count previews
+    for name, field in PROFILE_FIELD_INDEXES.items():
+        op.create_index(
+            name,
+            "customers",
+            [sa.text(f"(profile_data ->> '{field}')")],
+        )
+    op.create_index("ix_customers_language", "customers", ["language"])
+    op.create_index(
+        "ix_customers_last_message_at", "customers", ["last_message_at"]
+    )
+    op.create_index(
+        "ix_customer_administrative_customer_id",
+        "customer_administrative",
+        ["customer_id"],
+    )
+    op.create_index(
+        "ix_customer_administrative_administrative_id",
+        "customer_administrative",
+        ["administrative_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_customer_administrative_administrative_id",
+        table_name="customer_administrative",
+    )
+    op.drop_index(
+        "ix_customer_administrative_customer_id",
+        table_name="customer_administrative",
+    )
+    op.drop_index("ix_customers_last_message_at", table_name="customers")
+    op.drop_index("ix_customers_language", table_name="customers")
+    for name in PROFILE_FIELD_INDEXES:
+        op.drop_index(name, table_name="customers")
+
+    op.drop_column("broadcast_groups", "segment")
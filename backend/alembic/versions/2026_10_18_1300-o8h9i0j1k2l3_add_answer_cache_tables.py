@@ -0,0 +1,77 @@
+"""add semantic answer cache tables
+
+Revision ID: o8h9i0j1k2l3
+Revises: n7g8h9i0j1k2
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "o8h9i0j1k2l3"
+down_revision: Union[str, None] = "n7g8h9i0j1k2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "answer_cache_entries",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("language", sa.String(length=10), nullable=False),
+        sa.Column("crop_type", sa.String(length=100), nullable=False),
+        sa.Column("kb_version", sa.String(length=64), nullable=False),
+        sa.Column("question", sa.Text(), nullable=False),
+        sa.Column("answer", sa.Text(), nullable=False),
+        sa.Column("embedding", sa.LargeBinary(), nullable=False),
+        sa.Column("source", sa.String(length=10), nullable=False),
+        sa.Column("has_citations", sa.Boolean(), nullable=False),
+        sa.Column("source_message_id", sa.Integer(), nullable=True),
+        sa.Column("answer_latency_ms", sa.Integer(), nullable=True),
+        sa.Column("hit_count", sa.Integer(), nullable=False),
+        sa.Column("last_hit_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["source_message_id"], ["messages.id"], ondelete="SET NULL"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_answer_cache_entries_id", "answer_cache_entries", ["id"]
+    )
+    op.create_index(
+        "ix_answer_cache_entries_partition",
+        "answer_cache_entries",
+        ["language", "crop_type", "kb_version"],
+    )
+
+    op.create_table(
+        "answer_cache_daily_stats",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("lookups", sa.Integer(), nullable=False),
+        sa.Column("hits", sa.Integer(), nullable=False),
+        sa.Column("time_saved_ms", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("day"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("answer_cache_daily_stats")
+    op.drop_index(
+        "ix_answer_cache_entries_partition",
+        table_name="answer_cache_entries",
+    )
+    op.drop_index(
+        "ix_answer_cache_entries_id", table_name="answer_cache_entries"
+    )
+    op.drop_table("answer_cache_entries")
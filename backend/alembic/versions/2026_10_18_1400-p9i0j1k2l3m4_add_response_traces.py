@@ -0,0 +1,64 @@
+"""add response latency traces
+
+Revision ID: p9i0j1k2l3m4
+Revises: o8h9i0j1k2l3
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "p9i0j1k2l3m4"
+down_revision: Union[str, None] = "o8h9i0j1k2l3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "response_traces",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("message_id", sa.Integer(), nullable=False),
+        sa.Column("trace_id", sa.String(), nullable=True),
+        sa.Column("path", sa.String(length=16), nullable=False),
+        sa.Column("received_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "transcribed_at", sa.DateTime(timezone=True), nullable=True
+        ),
+        sa.Column("onboarded_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "ai_job_created_at", sa.DateTime(timezone=True), nullable=True
+        ),
+        sa.Column(
+            "ai_callback_at", sa.DateTime(timezone=True), nullable=True
+        ),
+        sa.Column(
+            "reply_sent_at", sa.DateTime(timezone=True), nullable=True
+        ),
+        sa.Column("reply_message_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["message_id"], ["messages.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["reply_message_id"], ["messages.id"], ondelete="SET NULL"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("message_id"),
+    )
+    op.create_index("ix_response_traces_id", "response_traces", ["id"])
+    op.create_index(
+        "ix_response_traces_received_at", "response_traces", ["received_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_response_traces_received_at", table_name="response_traces"
+    )
+    op.drop_index("ix_response_traces_id", table_name="response_traces")
+    op.drop_table("response_traces")
@@ -0,0 +1,104 @@
+"""add per-customer conversation states
+
+Revision ID: q0j1k2l3m4n5
+Revises: p9i0j1k2l3m4
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "q0j1k2l3m4n5"
+down_revision: Union[str, None] = "p9i0j1k2l3m4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "conversation_states",
+        sa.Column("customer_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "has_messages",
+            sa.Boolean(),
+            server_default="false",
+            nullable=False,
+        ),
+        sa.Column("open_ticket_id", sa.Integer(), nullable=True),
+        sa.Column(
+            "pending_undelivered",
+            sa.Integer(),
+            server_default="0",
+            nullable=False,
+        ),
+        sa.Column(
+            "last_follow_up_at", sa.DateTime(timezone=True), nullable=True
+        ),
+        sa.Column(
+            "last_resolved_at", sa.DateTime(timezone=True), nullable=True
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["customer_id"], ["customers.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["open_ticket_id"], ["tickets.id"], ondelete="SET NULL"
+        ),
+        sa.PrimaryKeyConstraint("customer_id"),
+    )
+
+    # Backfill every customer with messages or tickets in one pass
+    op.execute(
+        """
+        INSERT INTO conversation_states (
+            customer_id, has_messages, open_ticket_id,
+            pending_undelivered, last_follow_up_at, last_resolved_at
+        )
+        SELECT
+            c.id,
+            COALESCE(m.total, 0) > 0,
+            t.open_ticket_id,
+            COALESCE(m.pending, 0),
+            m.last_follow_up_at,
+            t.last_resolved_at
+        FROM customers c
+        LEFT JOIN (
+            SELECT
+                customer_id,
+                COUNT(*) AS total,
+                COUNT(*) FILTER (
+                    WHERE from_source = 2
+                    AND delivery_status = 'UNDELIVERED'
+                ) AS pending,
+                MAX(created_at) FILTER (
+                    WHERE message_type = 'FOLLOW_UP'
+                ) AS last_follow_up_at
+            FROM messages
+            GROUP BY customer_id
+        ) m ON m.customer_id = c.id
+        LEFT JOIN (
+            SELECT
+                customer_id,
+                MIN(id) FILTER (WHERE resolved_at IS NULL)
+                    AS open_ticket_id,
+                MAX(resolved_at) AS last_resolved_at
+            FROM tickets
+            GROUP BY customer_id
+        ) t ON t.customer_id = c.id
+        WHERE m.customer_id IS NOT NULL OR t.customer_id IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("conversation_states")
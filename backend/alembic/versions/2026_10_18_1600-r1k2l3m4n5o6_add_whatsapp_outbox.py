@@ -0,0 +1,86 @@
+"""add whatsapp outbox
+
+Revision ID: r1k2l3m4n5o6
+Revises: q0j1k2l3m4n5
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "r1k2l3m4n5o6"
+down_revision: Union[str, None] = "q0j1k2l3m4n5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "whatsapp_outbox",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("to_number", sa.String(), nullable=False),
+        sa.Column(
+            "kind",
+            sa.Enum("TEXT", "TEMPLATE", name="outboxkind"),
+            nullable=False,
+        ),
+        sa.Column("body", sa.Text(), nullable=True),
+        sa.Column("content_sid", sa.String(), nullable=True),
+        sa.Column("content_variables", sa.JSON(), nullable=True),
+        sa.Column("message_id", sa.Integer(), nullable=True),
+        sa.Column("trace_message_id", sa.Integer(), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "PENDING", "SENDING", "SENT", "FAILED", name="outboxstatus"
+            ),
+            nullable=False,
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("twilio_sid", sa.String(), nullable=True),
+        sa.Column("error_code", sa.String(length=10), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["message_id"], ["messages.id"], ondelete="SET NULL"
+        ),
+        sa.ForeignKeyConstraint(
+            ["trace_message_id"], ["messages.id"], ondelete="SET NULL"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_whatsapp_outbox_id"), "whatsapp_outbox", ["id"]
+    )
+    op.create_index(
+        "ix_whatsapp_outbox_unsent",
+        "whatsapp_outbox",
+        ["to_number", "id"],
+        postgresql_where=sa.text("status IN ('PENDING', 'SENDING')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_whatsapp_outbox_unsent", table_name="whatsapp_outbox")
+    op.drop_index(op.f("ix_whatsapp_outbox_id"), table_name="whatsapp_outbox")
+    op.drop_table("whatsapp_outbox")
+    sa.Enum(name="outboxstatus").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="outboxkind").drop(op.get_bind(), checkfirst=True)
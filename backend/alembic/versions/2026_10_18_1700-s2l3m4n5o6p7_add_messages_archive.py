@@ -0,0 +1,92 @@
+"""add messages archive
+
+Revision ID: s2l3m4n5o6p7
+Revises: r1k2l3m4n5o6
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "s2l3m4n5o6p7"
+down_revision: Union[str, None] = "r1k2l3m4n5o6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Monthly partitions are created by the archive job as needed
+    op.create_table(
+        "messages_archive",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("message_sid", sa.String(), nullable=False),
+        sa.Column("customer_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("from_source", sa.Integer(), nullable=False),
+        sa.Column(
+            "message_type",
+            postgresql.ENUM(name="messagetype", create_type=False),
+            nullable=True,
+        ),
+        sa.Column("status", sa.Integer(), nullable=False),
+        sa.Column(
+            "delivery_status",
+            postgresql.ENUM(name="deliverystatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("twilio_error_code", sa.String(length=10), nullable=True),
+        sa.Column("twilio_error_message", sa.Text(), nullable=True),
+        sa.Column("retry_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "last_retry_at", sa.DateTime(timezone=True), nullable=True
+        ),
+        sa.Column(
+            "next_retry_at", sa.DateTime(timezone=True), nullable=True
+        ),
+        sa.Column("delivered_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("media_url", sa.String(), nullable=True),
+        sa.Column(
+            "media_type",
+            postgresql.ENUM(name="mediatype", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("sync_seq", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_index(
+        "ix_messages_archive_customer_created",
+        "messages_archive",
+        ["customer_id", "created_at"],
+    )
+
+
+COLUMNS = (
+    "id, message_sid, customer_id, user_id, body, from_source, "
+    "message_type, status, delivery_status, twilio_error_code, "
+    "twilio_error_message, retry_count, last_retry_at, next_retry_at, "
+    "delivered_at, media_url, media_type, created_at, updated_at, sync_seq"
+)
+
+
+def downgrade() -> None:
+    # Move archived messages back before dropping the archive (and with
+    # it all of its partitions)
+    op.execute(
+        f"INSERT INTO messages ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM messages_archive"
+    )
+    op.drop_index(
+        "ix_messages_archive_customer_created",
+        table_name="messages_archive",
+    )
+    op.drop_table("messages_archive")
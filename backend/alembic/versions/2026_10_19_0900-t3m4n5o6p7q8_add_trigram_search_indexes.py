@@ -0,0 +1,44 @@
+"""add trigram search indexes
+
+Revision ID: t3m4n5o6p7q8
+Revises: s2l3m4n5o6p7
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "t3m4n5o6p7q8"
+down_revision: Union[str, None] = "s2l3m4n5o6p7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("customers", "full_name"),
+    ("customers", "phone_number"),
+    ("users", "full_name"),
+    ("users", "email"),
+    ("users", "phone_number"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, column in INDEXES:
+        op.create_index(
+            f"ix_{table}_{column}_trgm",
+            table,
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    # pg_trgm stays installed; other objects may depend on it
+    for table, column in reversed(INDEXES):
+        op.drop_index(f"ix_{table}_{column}_trgm", table_name=table)
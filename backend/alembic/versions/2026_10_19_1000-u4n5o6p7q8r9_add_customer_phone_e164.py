@@ -0,0 +1,78 @@
+"""add customer phone_e164
+
+Revision ID: u4n5o6p7q8r9
+Revises: t3m4n5o6p7q8
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import phonenumbers
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "u4n5o6p7q8r9"
+down_revision: Union[str, None] = "t3m4n5o6p7q8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+
+def _e164(phone):
+    """Same normalization as utils.phone.e164_or_none"""
+    if not phone:
+        return None
+    phone = phone.replace("whatsapp:", "").strip()
+    if not phone.startswith("+"):
+        phone = "+" + phone
+    try:
+        parsed = phonenumbers.parse(phone, None)
+    except phonenumbers.NumberParseException:
+        return None
+    if not phonenumbers.is_valid_number(parsed):
+        return None
+    return phonenumbers.format_number(
+        parsed, phonenumbers.PhoneNumberFormat.E164
+    )
+
+
+def upgrade() -> None:
+    op.add_column(
+        "customers", sa.Column("phone_e164", sa.String(), nullable=True)
+    )
+
+    # Backfill in id order, one UPDATE per batch
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.text(
+                "SELECT id, phone_number FROM customers "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        values = [
+            {"id": row.id, "phone_e164": _e164(row.phone_number)}
+            for row in rows
+        ]
+        values = [value for value in values if value["phone_e164"]]
+        if values:
+            connection.execute(
+                sa.text(
+                    "UPDATE customers SET phone_e164 = :phone_e164 "
+                    "WHERE id = :id"
+                ),
+                values,
+            )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_column("customers", "phone_e164")
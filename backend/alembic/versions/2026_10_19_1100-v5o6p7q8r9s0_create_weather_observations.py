@@ -0,0 +1,95 @@
+"""create weather_observations
+
+Revision ID: v5o6p7q8r9s0
+Revises: u4n5o6p7q8r9
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "v5o6p7q8r9s0"
+down_revision: Union[str, None] = "u4n5o6p7q8r9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "weather_observations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("administrative_id", sa.Integer(), nullable=False),
+        sa.Column("observed_on", sa.Date(), nullable=False),
+        sa.Column("fetched_at", sa.DateTime(), nullable=False),
+        sa.Column("temperature_c", sa.Float(), nullable=True),
+        sa.Column("temperature_max_c", sa.Float(), nullable=True),
+        sa.Column("temperature_min_c", sa.Float(), nullable=True),
+        sa.Column("soil_temp_estimate_c", sa.Float(), nullable=True),
+        sa.Column("forecast_max_temp_c", sa.Float(), nullable=True),
+        sa.Column("temperature_rising", sa.Boolean(), nullable=True),
+        sa.Column("relative_humidity_pct", sa.Float(), nullable=True),
+        sa.Column("thi_value", sa.Float(), nullable=True),
+        sa.Column("wind_speed_kmh", sa.Float(), nullable=True),
+        sa.Column("wind_gust_kmh", sa.Float(), nullable=True),
+        sa.Column("cloud_cover_pct", sa.Float(), nullable=True),
+        sa.Column("qpf_today_mm", sa.Float(), nullable=True),
+        sa.Column("rain_probability_today_pct", sa.Float(), nullable=True),
+        sa.Column(
+            "rain_probability_next_6h_pct", sa.Float(), nullable=True
+        ),
+        sa.Column("cumulative_rain_24h_mm", sa.Float(), nullable=True),
+        sa.Column("cumulative_rain_48h_mm", sa.Float(), nullable=True),
+        sa.Column("cumulative_rain_72h_mm", sa.Float(), nullable=True),
+        sa.Column("cumulative_rain_7d_mm", sa.Float(), nullable=True),
+        sa.Column("forecast_total_rainfall_mm", sa.Float(), nullable=True),
+        sa.Column("forecast_days_count", sa.Integer(), nullable=True),
+        sa.Column("consecutive_dry_days", sa.Integer(), nullable=True),
+        sa.Column("consecutive_wet_days", sa.Integer(), nullable=True),
+        sa.Column(
+            "consecutive_days_above_10c", sa.Integer(), nullable=True
+        ),
+        sa.Column("hours_since_last_rain", sa.Integer(), nullable=True),
+        sa.Column("month", sa.Integer(), nullable=True),
+        sa.Column("hour", sa.Integer(), nullable=True),
+        sa.Column("is_daytime", sa.Boolean(), nullable=True),
+        sa.Column(
+            "is_early_morning_or_late_evening", sa.Boolean(), nullable=True
+        ),
+        sa.ForeignKeyConstraint(
+            ["administrative_id"], ["administrative.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "administrative_id",
+            "observed_on",
+            name="uq_weather_observations_area_day",
+        ),
+    )
+    op.create_index(
+        op.f("ix_weather_observations_id"),
+        "weather_observations",
+        ["id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_weather_observations_observed_on"),
+        "weather_observations",
+        ["observed_on"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_weather_observations_observed_on"),
+        table_name="weather_observations",
+    )
+    op.drop_index(
+        op.f("ix_weather_observations_id"), table_name="weather_observations"
+    )
+    op.drop_table("weather_observations")
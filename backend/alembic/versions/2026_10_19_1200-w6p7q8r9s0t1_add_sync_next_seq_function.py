@@ -0,0 +1,55 @@
+"""add sync_next_seq() for the delta-sync cursor bound
+
+Revision ID: w6p7q8r9s0t1
+Revises: v5o6p7q8r9s0
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "w6p7q8r9s0t1"
+down_revision: Union[str, None] = "v5o6p7q8r9s0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYNCED_TABLES = ("customers", "tickets", "messages")
+
+# Same as models.sync.SYNC_NEXT_SEQ_FUNCTION (lock keys 0x5359 << 48)
+SYNC_NEXT_SEQ_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_next_seq() RETURNS bigint AS $$
+BEGIN
+    IF current_setting('agriconnect.sync_seq_locked', true)
+        IS DISTINCT FROM 'on' THEN
+        PERFORM pg_advisory_xact_lock_shared(
+            6005831578075267072 + (SELECT last_value FROM sync_change_seq)
+        );
+        PERFORM set_config('agriconnect.sync_seq_locked', 'on', true);
+    END IF;
+    RETURN nextval('sync_change_seq');
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.execute(SYNC_NEXT_SEQ_FUNCTION)
+    for table in SYNCED_TABLES:
+        op.alter_column(
+            table, "sync_seq", server_default=sa.text("sync_next_seq()")
+        )
+
+
+def downgrade() -> None:
+    for table in SYNCED_TABLES:
+        op.alter_column(
+            table,
+            "sync_seq",
+            server_default=sa.text("nextval('sync_change_seq')"),
+        )
+    op.execute("DROP FUNCTION IF EXISTS sync_next_seq()")
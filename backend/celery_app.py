@@ -5,6 +5,7 @@ Following Akvo RAG pattern with auto-constructed broker URLs.
 from celery import Celery
 from celery.schedules import crontab
 from config import settings
+from utils.metrics import connect_celery_metrics
 
 # Create Celery app (auto-construct URLs like Akvo RAG)
 celery_app = Celery(
@@ -40,12 +41,35 @@ celery_app.conf.beat_schedule = {
         "task": "tasks.weather_tasks.send_weather_broadcasts",
         "schedule": crontab(hour=6, minute=0, day_of_month="*/3"),
     },
+    # Drain the failed WhatsApp message retry queue every minute
+    "retry-failed-messages": {
+        "task": "tasks.retry_tasks.retry_failed_messages",
+        "schedule": crontab(minute="*"),
+    },
+    # Drain the WhatsApp outbox; commits also start a drain right away
+    "drain-whatsapp-outbox": {
+        "task": "tasks.outbox_tasks.drain_outbox",
+        "schedule": 10.0,
+    },
     # Retry failed weather broadcasts every 5 minutes
     "retry-failed-weather-broadcasts": {
         "task": "tasks.weather_tasks.retry_failed_weather_broadcasts",
         "schedule": crontab(minute="*/5"),
     },
+    # Move old messages to the archive on the 1st of each month
+    "archive-messages": {
+        "task": "tasks.archive_tasks.archive_messages",
+        "schedule": crontab(hour=2, minute=30, day_of_month=1),
+    },
+    # Tag resolved tickets whose on-resolve tagging run was missed
+    "tag-resolved-tickets": {
+        "task": "tasks.tagging_tasks.tag_resolved_tickets",
+        "schedule": crontab(minute="*/5"),
+    },
 }
 
+# Task runtime metrics and the worker's Prometheus exporter
+connect_celery_metrics()
+
 # Auto-discover tasks - Celery will import them when needed
 celery_app.autodiscover_tasks(lambda: ["tasks"])
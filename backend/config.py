@@ -1,8 +1,10 @@
 import json
 import os
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Tuple
 
+from pydantic import PrivateAttr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -38,6 +40,72 @@ def load_config() -> Dict[str, Any]:
 _config = load_config()
 
 
+def compile_language_codes(languages: list) -> Tuple[str, ...]:
+    """Supported language codes from the languages setting"""
+    if not languages:
+        return ("en",)
+    return tuple(lang["code"] for lang in languages if "code" in lang)
+
+
+@dataclass(frozen=True)
+class AdminLevels:
+    """Values derived from the administrative_hierarchy setting"""
+
+    # Level names below the root country level, by level_index
+    order: Tuple[str, ...]
+    country_level_name: str
+    leaf_level_name: str
+    leaf_level_index: int
+    delimiter: str
+    # " ward", " kata", ... level names and display labels, longest first
+    suffixes: Tuple[str, ...]
+
+    @classmethod
+    def from_hierarchy(cls, hierarchy: dict) -> "AdminLevels":
+        if not isinstance(hierarchy, dict):
+            hierarchy = {}
+        levels = hierarchy.get("levels", [])
+
+        filtered = [lvl for lvl in levels if lvl.get("level_index", 0) > 0]
+        filtered.sort(key=lambda lvl: lvl.get("level_index", 99))
+
+        root = next(
+            (lvl for lvl in levels if lvl.get("level_index") == 0),
+            None,
+        )
+        leaf = (
+            max(levels, key=lambda lvl: lvl.get("level_index", 0))
+            if levels
+            else {}
+        )
+
+        tokens = set()
+        for level in levels:
+            name = level.get("name")
+            if name:
+                tokens.add(name.lower().strip())
+            display = level.get("display")
+            if isinstance(display, dict):
+                for label in display.values():
+                    if label:
+                        tokens.add(label.lower().strip())
+            elif isinstance(display, str) and display:
+                tokens.add(display.lower().strip())
+
+        return cls(
+            order=tuple(lvl["name"] for lvl in filtered),
+            country_level_name=(
+                root["name"] if root and "name" in root else "country"
+            ),
+            leaf_level_name=leaf.get("name", "ward"),
+            leaf_level_index=leaf.get("level_index", 3),
+            delimiter=hierarchy.get("delimiter", " > "),
+            suffixes=tuple(
+                f" {token}" for token in sorted(tokens, key=len, reverse=True)
+            ),
+        )
+
+
 class Settings(BaseSettings):
     """Application settings loaded from config.json"""
 
@@ -49,6 +117,25 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
+    # Values compiled from list/dict settings, see _compiled_value()
+    _compiled: dict = PrivateAttr(default_factory=dict)
+
+    def _compiled_value(self, name: str, build: Callable[[Any], Any]):
+        """
+        build(<setting>), computed once per value of the setting.
+
+        The cache is keyed on the identity of the setting's value, so
+        assigning a new value (including monkeypatch in tests) is picked
+        up on the next access. Replace values instead of editing them in
+        place.
+        """
+        source = getattr(self, name)
+        cached = self._compiled.get(name)
+        if cached is None or cached[0] is not source:
+            cached = (source, build(source))
+            self._compiled[name] = cached
+        return cached[1]
+
     # Message limit
     message_limit: int = _config.get("message_limit")
 
@@ -65,6 +152,11 @@ class Settings(BaseSettings):
         .get("confirmation", {})
         .get("sid_sw", "")
     )
+    # Raw templates config; "sid_<language>" keys add languages beyond
+    # en/sw (WhatsAppService.get_template_sid)
+    whatsapp_templates: dict = _config.get("whatsapp", {}).get(
+        "templates", {}
+    )
     whatsapp_escalate_button_payload: str = (
         _config.get("whatsapp", {})
         .get("button_payloads", {})
@@ -127,6 +219,9 @@ class Settings(BaseSettings):
         .get("retry", {})
         .get("backoff_minutes", [5, 15, 60])
     )
+    retry_batch_size: int = (
+        _config.get("whatsapp", {}).get("retry", {}).get("batch_size", 100)
+    )
 
     # OpenAI Configuration
     # API credentials (from .env)
@@ -236,6 +331,163 @@ class Settings(BaseSettings):
     redis_port: int = int(os.getenv("REDIS_PORT", "6379"))
     redis_db: int = int(os.getenv("REDIS_DB", "0"))
 
+    # Route Socket.IO emits through Redis so Celery workers can emit too
+    socketio_redis_enabled: bool = os.getenv(
+        "SOCKETIO_REDIS_ENABLED", "false" if os.getenv("TESTING") else "true"
+    ).lower() in ("1", "true", "yes")
+    socketio_redis_channel: str = os.getenv(
+        "SOCKETIO_REDIS_CHANNEL", "socketio"
+    )
+
+    # Coalesce identical in-flight OpenAI/weather requests across
+    # processes (utils/single_flight.py); in-process coalescing is
+    # always on
+    single_flight_redis_enabled: bool = os.getenv(
+        "SINGLE_FLIGHT_REDIS_ENABLED",
+        "false" if os.getenv("TESTING") else "true",
+    ).lower() in ("1", "true", "yes")
+    # Lock expiry if the leader dies mid-request
+    single_flight_lock_ttl_ms: int = int(
+        os.getenv("SINGLE_FLIGHT_LOCK_TTL_MS", "60000")
+    )
+    # How long followers wait before making the request themselves
+    single_flight_wait_timeout_ms: int = int(
+        os.getenv("SINGLE_FLIGHT_WAIT_TIMEOUT_MS", "45000")
+    )
+    # How long a finished result stays readable for late followers
+    single_flight_result_ttl_ms: int = int(
+        os.getenv("SINGLE_FLIGHT_RESULT_TTL_MS", "10000")
+    )
+
+    # Redis copy of the per-customer conversation state read by the
+    # webhook (services/conversation_state_service.py); the database
+    # row is used when disabled or when Redis is unavailable
+    conversation_state_cache_enabled: bool = os.getenv(
+        "CONVERSATION_STATE_CACHE_ENABLED",
+        "false" if os.getenv("TESTING") else "true",
+    ).lower() in ("1", "true", "yes")
+    conversation_state_cache_ttl_seconds: int = int(
+        os.getenv("CONVERSATION_STATE_CACHE_TTL_SECONDS", "3600")
+    )
+
+    # Redis SET NX gate on inbound webhook MessageSids, taken before
+    # media download and transcription (utils/webhook_dedupe.py); the
+    # unique index on messages.message_sid is checked either way
+    webhook_dedupe_enabled: bool = os.getenv(
+        "WEBHOOK_DEDUPE_ENABLED",
+        "false" if os.getenv("TESTING") else "true",
+    ).lower() in ("1", "true", "yes")
+    webhook_dedupe_ttl_seconds: int = int(
+        os.getenv("WEBHOOK_DEDUPE_TTL_SECONDS", "86400")
+    )
+
+    # Transactional outbox for outbound WhatsApp messages
+    # (services/outbox_service.py); when disabled, messages are sent to
+    # Twilio inline by the request handler
+    whatsapp_outbox_enabled: bool = os.getenv(
+        "WHATSAPP_OUTBOX_ENABLED",
+        "false" if os.getenv("TESTING") else "true",
+    ).lower() in ("1", "true", "yes")
+    # Messages claimed per batch (at most one per recipient)
+    outbox_batch_size: int = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+    # Concurrent Twilio requests per drain task
+    outbox_concurrency: int = int(os.getenv("OUTBOX_CONCURRENCY", "8"))
+    # Twilio requests per second per drain task
+    outbox_rate_per_second: float = float(
+        os.getenv("OUTBOX_RATE_PER_SECOND", "20")
+    )
+    outbox_max_attempts: int = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+    # Retry delay after a retryable error, doubled per attempt
+    outbox_retry_backoff_seconds: int = int(
+        os.getenv("OUTBOX_RETRY_BACKOFF_SECONDS", "10")
+    )
+    # A claimed message not sent within this time is claimed again
+    outbox_claim_lease_seconds: int = int(
+        os.getenv("OUTBOX_CLAIM_LEASE_SECONDS", "300")
+    )
+
+    # Monthly archival of old messages into the partitioned
+    # messages_archive table (services/message_archive_service.py)
+    message_archive_enabled: bool = os.getenv(
+        "MESSAGE_ARCHIVE_ENABLED", "false"
+    ).lower() in ("1", "true", "yes")
+    # Months kept in the messages table, besides the current month
+    message_archive_hot_months: int = int(
+        os.getenv("MESSAGE_ARCHIVE_HOT_MONTHS", "6")
+    )
+    # Archived months older than this are exported to Parquet and
+    # dropped from the database (0: keep them in the database)
+    message_archive_export_months: int = int(
+        os.getenv("MESSAGE_ARCHIVE_EXPORT_MONTHS", "24")
+    )
+    # Messages moved per statement
+    message_archive_batch_size: int = int(
+        os.getenv("MESSAGE_ARCHIVE_BATCH_SIZE", "5000")
+    )
+    # Parquet exports; not under storage/, which is served publicly
+    message_archive_dir: str = os.getenv(
+        "MESSAGE_ARCHIVE_DIR", "./private/message_archive"
+    )
+
+    # Dashboard list totals are counted exactly up to this many rows
+    # and estimated by the query planner beyond (utils/search.py)
+    search_exact_count_limit: int = int(
+        os.getenv("SEARCH_EXACT_COUNT_LIMIT", "1000")
+    )
+
+    # Background ticket auto-tagging (tasks/tagging_tasks.py)
+    # Tickets classified per OpenAI call
+    ticket_tagging_batch_size: int = int(
+        os.getenv("TICKET_TAGGING_BATCH_SIZE", "10")
+    )
+    # Wait after a resolve so nearby resolves share one call
+    ticket_tagging_delay_seconds: int = int(
+        os.getenv("TICKET_TAGGING_DELAY_SECONDS", "30")
+    )
+    # Periodic sweep only retries tickets resolved this recently;
+    # older untagged tickets are handled by the backfill script
+    ticket_tagging_sweep_hours: int = int(
+        os.getenv("TICKET_TAGGING_SWEEP_HOURS", "24")
+    )
+
+    # Semantic answer cache (services/answer_cache_service.py), opt-in
+    answer_cache_enabled: bool = os.getenv(
+        "ANSWER_CACHE_ENABLED", "false"
+    ).lower() in ("1", "true", "yes")
+    # Minimum cosine similarity for a cached answer to be reused
+    answer_cache_similarity_threshold: float = float(
+        os.getenv("ANSWER_CACHE_SIMILARITY_THRESHOLD", "0.93")
+    )
+    # Shorter messages ("ok", "thanks") are never looked up or stored
+    answer_cache_min_question_chars: int = int(
+        os.getenv("ANSWER_CACHE_MIN_QUESTION_CHARS", "15")
+    )
+    # Newest entries searched per language/crop/KB partition
+    answer_cache_max_entries: int = int(
+        os.getenv("ANSWER_CACHE_MAX_ENTRIES", "5000")
+    )
+    # Older answers are not served (seasonal advice goes stale)
+    answer_cache_max_age_days: int = int(
+        os.getenv("ANSWER_CACHE_MAX_AGE_DAYS", "120")
+    )
+
+    # Per-stage farmer response latency traces
+    # (services/response_trace_service.py)
+    response_tracing_enabled: bool = os.getenv(
+        "RESPONSE_TRACING_ENABLED", "true"
+    ).lower() in ("1", "true", "yes")
+
+    # Prometheus metrics (utils/metrics.py). When set, GET /metrics
+    # requires "Authorization: Bearer <token>"
+    metrics_token: str = os.getenv("METRICS_TOKEN", "")
+    # Port of the Celery worker metrics exporter (0 disables it)
+    celery_metrics_port: int = int(os.getenv("CELERY_METRICS_PORT", "9808"))
+
+    # Seconds an authenticated user's principal stays cached (0 disables)
+    auth_principal_cache_ttl_seconds: int = int(
+        os.getenv("AUTH_PRINCIPAL_CACHE_TTL_SECONDS", "60")
+    )
+
     # Broadcast settings
     whatsapp_broadcast_template_sid: str = (
         _config.get("whatsapp", {})
@@ -262,6 +514,16 @@ class Settings(BaseSettings):
         "BROADCAST_RETRY_INTERVALS",
         [5, 15, 60],
     )
+    # Concurrent Twilio requests per bulk send batch
+    broadcast_send_concurrency: int = os.getenv(
+        "BROADCAST_SEND_CONCURRENCY",
+        8,
+    )
+    # Max recipients claimed by one retry sweep
+    broadcast_retry_batch_size: int = os.getenv(
+        "BROADCAST_RETRY_BATCH_SIZE",
+        500,
+    )
 
     # Dynamic Languages
     languages: list = _config.get(
@@ -272,23 +534,26 @@ class Settings(BaseSettings):
         ],
     )
 
+    @property
+    def language_codes(self) -> Tuple[str, ...]:
+        """Supported language codes, compiled once per languages value."""
+        return self._compiled_value("languages", compile_language_codes)
+
     @property
     def supported_language_codes(self) -> List[str]:
         """Return list of supported language codes."""
-        if not self.languages:
-            return ["en"]
-        return [lang["code"] for lang in self.languages if "code" in lang]
+        return list(self.language_codes)
 
     @property
     def default_language(self) -> str:
         """Return default system language code."""
-        codes = self.supported_language_codes
+        codes = self.language_codes
         return codes[0] if codes else "en"
 
     @property
     def is_single_language(self) -> bool:
         """Return True if 1 or 0 supported languages are configured."""
-        return len(self.supported_language_codes) <= 1
+        return len(self.language_codes) <= 1
 
     # Dynamic Age Groups
     age_groups: list = _config.get(
@@ -342,47 +607,37 @@ class Settings(BaseSettings):
         },
     )
 
+    @property
+    def admin_levels(self) -> AdminLevels:
+        """Administrative hierarchy, compiled once per hierarchy value."""
+        return self._compiled_value(
+            "administrative_hierarchy", AdminLevels.from_hierarchy
+        )
+
     @property
     def admin_level_order(self) -> List[str]:
         """Ordered list of level names excluding root country (level_index > 0)."""  # noqa: E501
-        levels = self.administrative_hierarchy.get("levels", [])
-        filtered = [lvl for lvl in levels if lvl.get("level_index", 0) > 0]
-        filtered.sort(key=lambda lvl: lvl.get("level_index", 99))
-        return [lvl["name"] for lvl in filtered]
+        return list(self.admin_levels.order)
 
     @property
     def admin_country_level_name(self) -> str:
         """Name of the root country level (level_index == 0)."""
-        levels = self.administrative_hierarchy.get("levels", [])
-        root = next(
-            (lvl for lvl in levels if lvl.get("level_index") == 0),
-            None,
-        )
-        return root["name"] if root and "name" in root else "country"
+        return self.admin_levels.country_level_name
 
     @property
     def admin_leaf_level_name(self) -> str:
         """Name of the deepest (leaf) administrative level."""
-        levels = self.administrative_hierarchy.get("levels", [])
-        if not levels:
-            return "ward"
-        leaf = max(levels, key=lambda lvl: lvl.get("level_index", 0))
-        return leaf.get("name", "ward")
+        return self.admin_levels.leaf_level_name
 
     @property
     def admin_leaf_level_index(self) -> int:
         """level_index of the deepest (leaf) administrative level."""
-        levels = self.administrative_hierarchy.get("levels", [])
-        if not levels:
-            return 3
-        return max(levels, key=lambda lvl: lvl.get("level_index", 0)).get(
-            "level_index", 3
-        )
+        return self.admin_levels.leaf_level_index
 
     @property
     def admin_delimiter(self) -> str:
         """Delimiter used in human-readable path strings."""
-        return self.administrative_hierarchy.get("delimiter", " > ")
+        return self.admin_levels.delimiter
 
     # Contact info: Name and Phone number
     contact_name: str = _config.get("contact_info", {}).get("name", "Admin")
@@ -1,21 +1,149 @@
 import os
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from utils.db_metrics import PoolMetrics, metered_pool_class, register_engine
+
 # Use test database when running tests
 if os.getenv("TESTING"):
     DATABASE_URL = os.getenv(
         "DATABASE_URL", "postgresql://akvo:password@db:5432/agriconnect"
     ).replace("agriconnect", "agriconnect_test")
+    READ_DATABASE_URL = os.getenv("READ_DATABASE_URL", "").replace(
+        "agriconnect", "agriconnect_test"
+    )
 else:
     DATABASE_URL = os.getenv(
         "DATABASE_URL", "postgresql://akvo:password@db:5432/agriconnect"
     )
+    READ_DATABASE_URL = os.getenv("READ_DATABASE_URL", "")
+
+# Engine tuning per process role. Every value can be overridden with
+# DB_<PROFILE>_<SETTING>, e.g. DB_WORKER_POOL_SIZE=4.
+# - web: uvicorn workers, many short webhook/dashboard queries
+# - worker: Celery workers, few connections, long batch statements
+# - read: analytics and exports (replica when READ_DATABASE_URL is set)
+ENGINE_PROFILES = {
+    "web": {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_timeout_ms": 30000,
+    },
+    "worker": {
+        "pool_size": 2,
+        "max_overflow": 4,
+        "pool_timeout": 60,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_timeout_ms": 240000,
+    },
+    "read": {
+        "pool_size": 3,
+        "max_overflow": 5,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_timeout_ms": 60000,
+    },
+}
+
+# Process role: web (set by run.sh / dev.sh for uvicorn) or worker (set
+# for Celery containers). Processes that do not set it (migrations,
+# seeders, scripts) get the web pool without a statement timeout, so
+# long COPY and export runs are not cancelled.
+DB_ENGINE_PROFILE_SET = bool(os.getenv("DB_ENGINE_PROFILE"))
+DB_ENGINE_PROFILE = os.getenv("DB_ENGINE_PROFILE", "web").lower()
+if DB_ENGINE_PROFILE not in ENGINE_PROFILES:
+    DB_ENGINE_PROFILE = "web"
+
+
+def get_engine_profile(name: str) -> dict:
+    """Return the named profile with DB_<NAME>_<SETTING> env overrides."""
+    profile = dict(ENGINE_PROFILES[name])
+    for key, default in profile.items():
+        value = os.getenv(f"DB_{name.upper()}_{key.upper()}")
+        if value is None:
+            continue
+        if isinstance(default, bool):
+            profile[key] = value.lower() in ("1", "true", "yes")
+        else:
+            profile[key] = int(value)
+    return profile
+
+
+def connect_options(
+    profile: dict, read_only: bool = False, statement_timeout: bool = True
+) -> str:
+    """libpq options of a profile's connections."""
+    options = []
+    if statement_timeout:
+        options.append(
+            f"-c statement_timeout={profile['statement_timeout_ms']}"
+        )
+    if read_only:
+        options.append("-c default_transaction_read_only=on")
+    return " ".join(options)
+
+
+def create_profiled_engine(
+    url: str,
+    name: str,
+    read_only: bool = False,
+    statement_timeout: bool = True,
+):
+    """Create an engine tuned by profile, with pool metrics attached."""
+    profile = get_engine_profile(name)
+    options = connect_options(profile, read_only, statement_timeout)
+    metrics = PoolMetrics(
+        name,
+        pool_size=profile["pool_size"],
+        max_overflow=profile["max_overflow"],
+    )
+    db_engine = create_engine(
+        url,
+        poolclass=metered_pool_class(metrics),
+        pool_size=profile["pool_size"],
+        max_overflow=profile["max_overflow"],
+        pool_timeout=profile["pool_timeout"],
+        pool_recycle=profile["pool_recycle"],
+        pool_pre_ping=profile["pool_pre_ping"],
+        connect_args={"options": options} if options else {},
+    )
+    register_engine(name, db_engine)
+    return db_engine
+
 
-engine = create_engine(DATABASE_URL)
+engine = create_profiled_engine(
+    DATABASE_URL, DB_ENGINE_PROFILE, statement_timeout=DB_ENGINE_PROFILE_SET
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read-only sessions go to the replica when configured, otherwise they
+# share the primary pool and are made read-only per transaction.
+if READ_DATABASE_URL:
+    read_engine = create_profiled_engine(
+        READ_DATABASE_URL, "read", read_only=True
+    )
+else:
+    read_engine = engine
+ReadSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=read_engine
+)
+READ_STATEMENT_TIMEOUT_MS = get_engine_profile("read")["statement_timeout_ms"]
+
+
+@event.listens_for(ReadSessionLocal, "after_begin")
+def _begin_read_only(session, transaction, connection):
+    connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+    connection.exec_driver_sql(
+        f"SET LOCAL statement_timeout = {READ_STATEMENT_TIMEOUT_MS}"
+    )
+
+
 Base = declarative_base()
 
 
@@ -25,3 +153,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Read-only session for statistics, analytics and exports."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -11,4 +11,5 @@ if [ -f patches/apply_fastapi_mail_fix.py ]; then
 fi
 
 alembic upgrade head
-uvicorn main:app --host 0.0.0.0 --port 8000 --reload
+DB_ENGINE_PROFILE=${DB_ENGINE_PROFILE:-web} \
+    uvicorn main:app --host 0.0.0.0 --port 8000 --reload
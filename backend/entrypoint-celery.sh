@@ -50,6 +50,11 @@ if [ "$CELERY_MODE" = "beat" ]; then
     echo "🚀 Starting Celery beat scheduler..."
     celery -A celery_app beat --loglevel=info
 else
+    # Aggregate metrics of the worker pool processes (exporter on
+    # CELERY_METRICS_PORT, default 9808)
+    export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus-celery}
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
     echo "🚀 Starting Celery worker..."
     celery -A celery_app worker --loglevel=info --concurrency=2
 fi
@@ -0,0 +1 @@
+"""Load-test harness: service stand-ins, scenarios and reporting."""
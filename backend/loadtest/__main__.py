@@ -0,0 +1,192 @@
+"""
+Load-test command line.
+
+Usage:
+    python -m loadtest standins [--port 9000] [--backend-url URL]
+        [--latency-ms twilio=300 --error-rate expo=0.05 ...]
+    python -m loadtest seed --count 500 [--prefix +25579900]
+    python -m loadtest run <scenario> [--farmers N] [--concurrency N]
+        [--base-url URL] [--email E --password P]
+    python -m loadtest cleanup [--prefix +25579900]
+
+See docs/LOAD_TESTING.md for the full setup.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import Dict, List
+
+import httpx
+
+from loadtest.runner import (
+    Recorder,
+    diff_db_queries,
+    format_report,
+    scrape_db_queries,
+)
+from loadtest.scenarios import SCENARIOS, ScenarioContext
+from loadtest.standins import SERVICES, Fault, StandInConfig, create_app
+
+DEFAULT_PREFIX = "+25579900"
+
+
+def _per_service(values: List[str], option: str) -> Dict[str, float]:
+    """Parse repeated service=value options"""
+    parsed = {}
+    for value in values or []:
+        service, _, number = value.partition("=")
+        if service not in SERVICES or not number:
+            raise SystemExit(
+                f"{option} expects service=value with service one of "
+                f"{', '.join(SERVICES)}"
+            )
+        parsed[service] = float(number)
+    return parsed
+
+
+def standins(args) -> None:
+    import uvicorn
+
+    latency = _per_service(args.latency_ms, "--latency-ms")
+    jitter = _per_service(args.jitter_ms, "--jitter-ms")
+    errors = _per_service(args.error_rate, "--error-rate")
+    config = StandInConfig(
+        backend_url=args.backend_url.rstrip("/"),
+        faults={
+            name: Fault(
+                latency_ms=latency.get(name, 0),
+                jitter_ms=jitter.get(name, 0),
+                error_rate=errors.get(name, 0),
+            )
+            for name in SERVICES
+        },
+        status_callbacks=not args.no_status_callbacks,
+        rag_delay_ms=args.rag_delay_ms,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port)
+
+
+def seed(args) -> None:
+    from database import SessionLocal
+    from loadtest.data import seed_customers
+
+    db = SessionLocal()
+    try:
+        created = seed_customers(db, args.prefix, args.count, args.ward_id)
+    finally:
+        db.close()
+    print(f"✓ Created {created} load-test farmers ({args.prefix}...)")
+
+
+def cleanup(args) -> None:
+    from database import SessionLocal
+    from loadtest.data import delete_customers
+
+    db = SessionLocal()
+    try:
+        deleted = delete_customers(db, args.prefix)
+    finally:
+        db.close()
+    print(f"✓ Deleted {deleted} load-test farmers ({args.prefix}...)")
+
+
+async def _run(args) -> int:
+    recorder = Recorder()
+    async with httpx.AsyncClient(
+        base_url=args.base_url.rstrip("/"), timeout=60.0
+    ) as client:
+        before = await scrape_db_queries(client, args.metrics_token)
+        ctx = ScenarioContext(
+            client=client,
+            recorder=recorder,
+            phone_prefix=args.prefix,
+            farmers=args.farmers,
+            concurrency=args.concurrency,
+            email=args.email,
+            password=args.password,
+            iterations=args.iterations,
+        )
+        recorder.start()
+        await SCENARIOS[args.scenario](ctx)
+        recorder.stop()
+        after = await scrape_db_queries(client, args.metrics_token)
+
+    db_queries = diff_db_queries(before, after)
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "scenario": args.scenario,
+                    "duration_s": round(recorder.elapsed, 2),
+                    "endpoints": recorder.summary(),
+                    "db_queries": db_queries,
+                },
+                indent=2,
+            )
+        )
+    else:
+        print(format_report(args.scenario, recorder, db_queries))
+    failed = sum(recorder.errors.values())
+    return 1 if args.fail_on_error and failed else 0
+
+
+def run(args) -> None:
+    sys.exit(asyncio.run(_run(args)))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m loadtest",
+        description="Load-test the backend against local service stand-ins",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("standins", help="Serve the stand-in services")
+    p.add_argument("--host", default="0.0.0.0")
+    p.add_argument("--port", type=int, default=9000)
+    p.add_argument("--backend-url", default="http://localhost:8000")
+    for option in ("--latency-ms", "--jitter-ms", "--error-rate"):
+        p.add_argument(
+            option, action="append", metavar="SERVICE=VALUE",
+            help=f"Per service ({', '.join(SERVICES)}), repeatable",
+        )
+    p.add_argument("--rag-delay-ms", type=float, default=1000)
+    p.add_argument("--no-status-callbacks", action="store_true")
+    p.set_defaults(func=standins)
+
+    for name, func, help_text in (
+        ("seed", seed, "Create onboarded load-test farmers"),
+        ("cleanup", cleanup, "Delete the load-test farmers"),
+    ):
+        p = commands.add_parser(name, help=help_text)
+        p.add_argument("--prefix", default=DEFAULT_PREFIX)
+        p.set_defaults(func=func)
+        if name == "seed":
+            p.add_argument("--count", type=int, default=100)
+            p.add_argument("--ward-id", type=int)
+
+    p = commands.add_parser("run", help="Run a scenario and report")
+    p.add_argument("scenario", choices=sorted(SCENARIOS))
+    p.add_argument("--base-url", default="http://localhost:8000")
+    p.add_argument("--prefix", default=DEFAULT_PREFIX)
+    p.add_argument("--farmers", type=int, default=100)
+    p.add_argument("--concurrency", type=int, default=20)
+    p.add_argument("--iterations", type=int, default=10)
+    p.add_argument("--email")
+    p.add_argument("--password")
+    p.add_argument("--metrics-token")
+    p.add_argument("--json", action="store_true", help="JSON report")
+    p.add_argument(
+        "--fail-on-error", action="store_true",
+        help="Exit with status 1 when any request failed",
+    )
+    p.set_defaults(func=run)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
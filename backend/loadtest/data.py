@@ -0,0 +1,99 @@
+"""
+Load-test farmers: seeding and cleanup.
+
+Seeded farmers have completed onboarding and are assigned to a ward, so
+they receive AI replies, can be broadcast to and show up on the EO
+dashboards. All of them share the run's phone prefix.
+"""
+
+import random
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from loadtest.scenarios import load_test_phone
+from models.administrative import Administrative, CustomerAdministrative
+from models.customer import Customer, OnboardingStatus
+from seeder.bulk import copy_rows, reserve_ids
+from services.customer_service import CustomerService
+from utils.phone import e164_or_none
+
+
+def seed_customers(
+    db: Session, prefix: str, count: int, ward_id: Optional[int] = None
+) -> int:
+    """
+    Create onboarded load-test farmers.
+
+    Args:
+        db: Database session
+        prefix: Phone number prefix of the load-test farmers
+        count: Number of farmers (existing numbers are skipped)
+        ward_id: Ward of every farmer (default: random wards)
+
+    Returns:
+        Number of farmers created
+    """
+    if ward_id:
+        ward_ids = [ward_id]
+    else:
+        ward_ids = [
+            ward.id
+            for ward in db.query(Administrative)
+            .filter(Administrative.level.has(name="ward"))
+            .all()
+        ]
+
+    phones = [load_test_phone(prefix, n) for n in range(count)]
+    existing = {
+        phone
+        for (phone,) in db.query(Customer.phone_number).filter(
+            Customer.phone_number.in_(phones)
+        )
+    }
+    customers = [
+        {
+            "phone_number": phone,
+            "phone_e164": e164_or_none(phone),
+            "full_name": f"Load Test {n}",
+            "language": "en",
+            "onboarding_status": OnboardingStatus.COMPLETED,
+            "profile_data": {"crop_type": "Maize"},
+        }
+        for n, phone in enumerate(phones)
+        if phone not in existing
+    ]
+    for customer, customer_id in zip(
+        customers, reserve_ids(db, Customer, len(customers))
+    ):
+        customer["id"] = customer_id
+    copy_rows(db, Customer, customers)
+    if ward_ids:
+        copy_rows(
+            db,
+            CustomerAdministrative,
+            (
+                {
+                    "customer_id": customer["id"],
+                    "administrative_id": random.choice(ward_ids),
+                }
+                for customer in customers
+            ),
+        )
+    db.commit()
+    return len(customers)
+
+
+def delete_customers(db: Session, prefix: str) -> int:
+    """Delete the load-test farmers and everything they produced"""
+    customer_ids = [
+        customer_id
+        for (customer_id,) in db.query(Customer.id).filter(
+            Customer.phone_number.startswith(prefix)
+        )
+    ]
+    service = CustomerService(db)
+    return sum(
+        1 for customer_id in customer_ids
+        if service.delete_customer(customer_id)
+    )
@@ -0,0 +1,194 @@
+"""
+Request recording and reporting for load-test scenarios.
+
+Client-side latencies are recorded per endpoint (route template, not
+the concrete path). Database query counts come from the backend's own
+agriconnect_db_queries_per_request histogram: /metrics is scraped before
+and after a run and the difference is attributed to each route.
+"""
+
+import math
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import httpx
+from prometheus_client.parser import text_string_to_metric_families
+
+DB_QUERIES_METRIC = "agriconnect_db_queries_per_request"
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+def percentile(values: Sequence[float], p: float) -> Optional[float]:
+    """Linear-interpolated percentile (as PostgreSQL percentile_cont)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * p
+    low, high = math.floor(position), math.ceil(position)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+class Recorder:
+    """Collect request latencies and statuses per endpoint"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    def record(self, endpoint: str, seconds: float, ok: bool) -> None:
+        self.latencies[endpoint].append(seconds)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    async def request(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        url: str,
+        endpoint: Optional[str] = None,
+        **kwargs,
+    ) -> Optional[httpx.Response]:
+        """
+        Send a request and record it.
+
+        Args:
+            client: Client with the backend base URL
+            method: HTTP method
+            url: Request path
+            endpoint: Route template to report under (default: url)
+            **kwargs: Passed to httpx
+
+        Returns:
+            The response, or None when the request itself failed
+        """
+        endpoint = f"{method} {endpoint or url}"
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.record(endpoint, time.perf_counter() - start, ok=False)
+            return None
+        self.record(
+            endpoint,
+            time.perf_counter() - start,
+            ok=response.status_code < 400,
+        )
+        return response
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def stop(self) -> None:
+        self.finished = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished or time.perf_counter()
+        return max(end - self.started, 1e-9)
+
+    def summary(self) -> List[Dict[str, object]]:
+        """Per-endpoint count, errors, req/s and latency percentiles (ms)"""
+        rows = []
+        for endpoint in sorted(self.latencies):
+            values = self.latencies[endpoint]
+            row = {
+                "endpoint": endpoint,
+                "count": len(values),
+                "errors": self.errors.get(endpoint, 0),
+                "rps": round(len(values) / self.elapsed, 2),
+            }
+            for p in PERCENTILES:
+                row[f"p{int(p * 100)}_ms"] = round(
+                    percentile(values, p) * 1000, 1
+                )
+            rows.append(row)
+        return rows
+
+
+def parse_db_queries(text: str) -> Dict[str, Tuple[float, float]]:
+    """(query sum, request count) by route from /metrics output"""
+    totals: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0.0])
+    for family in text_string_to_metric_families(text):
+        if family.name != DB_QUERIES_METRIC:
+            continue
+        for sample in family.samples:
+            route = sample.labels.get("route")
+            if sample.name.endswith("_sum"):
+                totals[route][0] += sample.value
+            elif sample.name.endswith("_count"):
+                totals[route][1] += sample.value
+    return {route: (s, c) for route, (s, c) in totals.items()}
+
+
+def diff_db_queries(
+    before: Dict[str, Tuple[float, float]],
+    after: Dict[str, Tuple[float, float]],
+) -> List[Dict[str, object]]:
+    """Requests and queries per route between two scrapes"""
+    rows = []
+    for route in sorted(after):
+        queries = after[route][0] - before.get(route, (0, 0))[0]
+        requests = after[route][1] - before.get(route, (0, 0))[1]
+        if requests <= 0:
+            continue
+        rows.append(
+            {
+                "route": route,
+                "requests": int(requests),
+                "queries": int(queries),
+                "queries_per_request": round(queries / requests, 1),
+            }
+        )
+    return rows
+
+
+async def scrape_db_queries(
+    client: httpx.AsyncClient, token: Optional[str] = None
+) -> Dict[str, Tuple[float, float]]:
+    """Current DB query histogram of the backend (empty if unavailable)"""
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    try:
+        response = await client.get("/metrics", headers=headers)
+        response.raise_for_status()
+    except httpx.HTTPError:
+        return {}
+    return parse_db_queries(response.text)
+
+
+def format_report(
+    scenario: str,
+    recorder: Recorder,
+    db_queries: List[Dict[str, object]],
+) -> str:
+    """Plain-text report of one scenario run"""
+    rows = recorder.summary()
+    total = sum(row["count"] for row in rows)
+    lines = [
+        f"Scenario: {scenario}",
+        f"Duration: {recorder.elapsed:.1f}s, {total} requests, "
+        f"{total / recorder.elapsed:.1f} req/s",
+        "",
+        f"{'endpoint':<48} {'count':>6} {'err':>5} {'rps':>7} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}",
+    ]
+    for row in rows:
+        lines.append(
+            f"{row['endpoint']:<48} {row['count']:>6} {row['errors']:>5} "
+            f"{row['rps']:>7} {row['p50_ms']:>8} {row['p95_ms']:>8} "
+            f"{row['p99_ms']:>8}"
+        )
+    if db_queries:
+        lines += ["", f"{'route (server side)':<48} {'requests':>8} "
+                  f"{'queries':>8} {'per req':>8}"]
+        for row in db_queries:
+            lines.append(
+                f"{row['route']:<48} {row['requests']:>8} "
+                f"{row['queries']:>8} {row['queries_per_request']:>8}"
+            )
+    return "\n".join(lines)
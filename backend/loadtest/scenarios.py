@@ -0,0 +1,259 @@
+"""
+Load-test scenarios.
+
+Each scenario replays a traffic pattern against a running backend over
+HTTP, the same way Twilio and the dashboards reach it:
+
+    onboarding_storm        new farmers texting for the first time and
+                            answering the onboarding questions
+    questions               onboarded farmers asking questions (AI reply
+                            flow, answered through the RAG stand-in)
+    broadcast_confirmations admin broadcast to the seeded farmers,
+                            followed by every farmer tapping the
+                            confirmation button
+    eo_dashboard            extension officers browsing tickets,
+                            conversations, customers and groups
+
+Farmers use phone numbers starting with the run's phone prefix, so seeded
+and generated farmers can be removed afterwards (python -m loadtest
+cleanup).
+"""
+
+import asyncio
+import uuid
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from loadtest.runner import Recorder
+
+WEBHOOK = "/api/whatsapp/webhook"
+ONBOARDING_ANSWERS = ["Hello", "Arusha", "Maize", "Male", "1985"]
+QUESTIONS = [
+    "When should I plant maize?",
+    "How do I control fall armyworm?",
+    "Which fertilizer is best for beans?",
+    "My tomato leaves are turning yellow, what should I do?",
+]
+
+
+def load_test_phone(prefix: str, n: int) -> str:
+    """Phone number of the n-th load-test farmer (E.164 length)"""
+    width = max(13 - len(prefix), 1)
+    return f"{prefix}{n:0{width}d}"
+
+
+@dataclass
+class ScenarioContext:
+    """
+    Shared settings of a scenario run.
+
+    Args:
+        client: Client with the backend base URL
+        recorder: Collects the request timings
+        phone_prefix: Prefix of the load-test farmers' phone numbers
+        farmers: Number of farmers taking part
+        concurrency: Maximum requests in flight
+        email/password: Dashboard user for authenticated scenarios
+        iterations: Repetitions of per-user loops (eo_dashboard)
+    """
+
+    client: httpx.AsyncClient
+    recorder: Recorder
+    phone_prefix: str = "+25579900"
+    farmers: int = 100
+    concurrency: int = 20
+    email: Optional[str] = None
+    password: Optional[str] = None
+    iterations: int = 10
+    _semaphore: Optional[asyncio.Semaphore] = field(default=None, repr=False)
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    def phone(self, n: int) -> str:
+        return load_test_phone(self.phone_prefix, n)
+
+    async def request(
+        self, method: str, url: str, endpoint: Optional[str] = None, **kw
+    ) -> Optional[httpx.Response]:
+        async with self.semaphore:
+            return await self.recorder.request(
+                self.client, method, url, endpoint=endpoint, **kw
+            )
+
+    async def webhook(
+        self, phone: str, body: str = "", button: Optional[str] = None
+    ) -> Optional[httpx.Response]:
+        """Post an incoming WhatsApp message as Twilio would"""
+        data = {
+            "From": f"whatsapp:{phone}",
+            "Body": body,
+            "MessageSid": f"SM{uuid.uuid4().hex}",
+        }
+        if button:
+            data["ButtonPayload"] = button
+        return await self.request("POST", WEBHOOK, data=data)
+
+    async def login(self) -> Dict[str, str]:
+        """Authorization header of the dashboard user"""
+        if not self.email or not self.password:
+            raise ValueError("This scenario needs --email and --password")
+        response = await self.request(
+            "POST",
+            "/api/auth/login",
+            json={"email": self.email, "password": self.password},
+        )
+        if response is None or response.status_code != 200:
+            raise RuntimeError(f"Login failed for {self.email}")
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def onboarding_storm(ctx: ScenarioContext) -> None:
+    """Many first-time farmers writing in at once"""
+
+    async def farmer(n: int):
+        phone = ctx.phone(n)
+        for answer in ONBOARDING_ANSWERS:
+            await ctx.webhook(phone, answer)
+
+    await asyncio.gather(*(farmer(n) for n in range(ctx.farmers)))
+
+
+async def questions(ctx: ScenarioContext) -> None:
+    """Onboarded (seeded) farmers asking questions"""
+
+    async def farmer(n: int):
+        await ctx.webhook(ctx.phone(n), QUESTIONS[n % len(QUESTIONS)])
+
+    await asyncio.gather(*(farmer(n) for n in range(ctx.farmers)))
+
+
+async def _load_test_customer_ids(
+    ctx: ScenarioContext, headers: Dict[str, str]
+) -> List[int]:
+    ids: List[int] = []
+    page = 1
+    while True:
+        response = await ctx.request(
+            "GET",
+            "/api/customers/list",
+            params={"search": ctx.phone_prefix, "page": page, "size": 100},
+            headers=headers,
+        )
+        if response is None or response.status_code != 200:
+            break
+        customers = response.json()["customers"]
+        ids.extend(c["id"] for c in customers)
+        if len(customers) < 100 or len(ids) >= ctx.farmers:
+            break
+        page += 1
+    return ids[: ctx.farmers]
+
+
+async def broadcast_confirmations(
+    ctx: ScenarioContext,
+    button: str = "read_broadcast",
+    wait_seconds: float = 120,
+) -> None:
+    """
+    Broadcast to the seeded farmers and replay their confirmations.
+
+    The broadcast is sent by the Celery workers; confirmations start once
+    it has reached every recipient or wait_seconds have passed.
+    """
+    headers = await ctx.login()
+    customer_ids = await _load_test_customer_ids(ctx, headers)
+    if not customer_ids:
+        raise RuntimeError(
+            f"No customers match {ctx.phone_prefix}; run the seed command"
+        )
+
+    group_ids = []
+    # Groups hold at most 500 contacts, a broadcast at most 10 groups
+    for start in range(0, min(len(customer_ids), 5000), 500):
+        response = await ctx.request(
+            "POST",
+            "/api/broadcast/groups",
+            headers=headers,
+            json={
+                "name": f"Load test {uuid.uuid4().hex[:8]}",
+                "customer_ids": customer_ids[start:start + 500],
+            },
+        )
+        if response is not None and response.status_code == 201:
+            group_ids.append(response.json()["id"])
+
+    response = await ctx.request(
+        "POST",
+        "/api/broadcast/messages",
+        headers=headers,
+        json={"message": "Load test: rain expected", "group_ids": group_ids},
+    )
+    if response is None or response.status_code != 201:
+        raise RuntimeError("Broadcast could not be created")
+    broadcast_id = response.json()["id"]
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait_seconds
+    while loop.time() < deadline:
+        response = await ctx.request(
+            "GET",
+            f"/api/broadcast/messages/{broadcast_id}",
+            endpoint="/api/broadcast/messages/{broadcast_id}",
+            headers=headers,
+        )
+        if response is not None and response.status_code == 200:
+            data = response.json()
+            done = data["sent_count"] + data["failed_count"]
+            if done >= data["total_recipients"]:
+                break
+        await asyncio.sleep(1)
+
+    await asyncio.gather(
+        *(
+            ctx.webhook(ctx.phone(n), "Read", button=button)
+            for n in range(len(customer_ids))
+        )
+    )
+
+
+async def eo_dashboard(ctx: ScenarioContext) -> None:
+    """One extension officer session browsing the dashboard"""
+    headers = await ctx.login()
+
+    async def session():
+        for _ in range(ctx.iterations):
+            await ctx.request("GET", "/api/auth/profile", headers=headers)
+            response = await ctx.request(
+                "GET", "/api/tickets/", headers=headers
+            )
+            if response is not None and response.status_code == 200:
+                for ticket in response.json().get("tickets", [])[:3]:
+                    await ctx.request(
+                        "GET",
+                        f"/api/tickets/{ticket['id']}/messages",
+                        endpoint="/api/tickets/{ticket_id}/messages",
+                        headers=headers,
+                    )
+            await ctx.request(
+                "GET", "/api/customers/list", headers=headers
+            )
+            await ctx.request(
+                "GET", "/api/broadcast/groups", headers=headers
+            )
+
+    # One dashboard session per concurrent slot
+    await asyncio.gather(*(session() for _ in range(ctx.concurrency)))
+
+
+SCENARIOS: Dict[str, Callable[[ScenarioContext], Awaitable[None]]] = {
+    "onboarding_storm": onboarding_storm,
+    "questions": questions,
+    "broadcast_confirmations": broadcast_confirmations,
+    "eo_dashboard": eo_dashboard,
+}
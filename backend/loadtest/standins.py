@@ -0,0 +1,336 @@
+"""
+Local stand-ins for the external services used by the backend.
+
+One FastAPI app serves all of them so a load test only needs one extra
+process:
+
+    Twilio   POST /2010-04-01/Accounts/{sid}/Messages.json
+             (status callbacks are POSTed back to the backend)
+    OpenAI   POST /v1/chat/completions, /v1/embeddings,
+             /v1/audio/transcriptions
+    RAG      POST /rag/chat (the AI answer is POSTed back to the
+             backend's /api/callback/ai)
+    Expo     POST /expo/push/send
+
+Every service has its own Fault settings: a base latency, random jitter
+and an error rate, so slow or failing providers can be replayed.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+SERVICES = ("twilio", "openai", "rag", "expo")
+EMBEDDING_DIMENSIONS = 1536
+
+
+@dataclass
+class Fault:
+    """Latency and error injection of one stand-in service"""
+
+    latency_ms: float = 0
+    jitter_ms: float = 0
+    error_rate: float = 0.0
+
+    async def delay(self) -> None:
+        delay_ms = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+    def should_fail(self) -> bool:
+        return random.random() < self.error_rate
+
+
+@dataclass
+class StandInConfig:
+    """
+    Settings of the stand-in app.
+
+    Args:
+        backend_url: Base URL of the backend receiving the callbacks
+        faults: Fault settings by service name (see SERVICES)
+        status_callbacks: Send Twilio sent/delivered status callbacks
+        callback_delay_ms: Delay between Twilio status callbacks
+        rag_delay_ms: Time the RAG service "thinks" before answering
+        answer: Answer returned by the RAG and OpenAI stand-ins
+    """
+
+    backend_url: str = "http://localhost:8000"
+    faults: Dict[str, Fault] = field(
+        default_factory=lambda: {name: Fault() for name in SERVICES}
+    )
+    status_callbacks: bool = True
+    callback_delay_ms: float = 200
+    rag_delay_ms: float = 1000
+    answer: str = "Plant maize at the onset of the long rains."
+
+    def fault(self, service: str) -> Fault:
+        return self.faults.setdefault(service, Fault())
+
+
+def embedding_for(text: str) -> List[float]:
+    """Deterministic unit vector, so identical texts embed identically"""
+    seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+    rng = random.Random(seed)
+    vector = [rng.uniform(-1, 1) for _ in range(EMBEDDING_DIMENSIONS)]
+    norm = sum(v * v for v in vector) ** 0.5
+    return [v / norm for v in vector]
+
+
+def create_app(config: Optional[StandInConfig] = None) -> FastAPI:
+    """Build the stand-in app for the given configuration"""
+    config = config or StandInConfig()
+    app = FastAPI(title="AgriConnect load-test stand-ins")
+    app.state.config = config
+    app.state.stats = {name: 0 for name in SERVICES}
+    app.state.callbacks = {"sent": 0, "failed": 0}
+    # Keep references to callback tasks so they are not collected early
+    background = set()
+
+    def schedule(coro) -> None:
+        task = asyncio.ensure_future(coro)
+        background.add(task)
+        task.add_done_callback(background.discard)
+
+    async def post_back(path: str, **kwargs) -> None:
+        try:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                response = await client.post(
+                    f"{config.backend_url}{path}", **kwargs
+                )
+                response.raise_for_status()
+            app.state.callbacks["sent"] += 1
+        except httpx.HTTPError as e:
+            app.state.callbacks["failed"] += 1
+            logger.warning(f"⚠ Callback to {path} failed: {e}")
+
+    async def twilio_status_callbacks(form: Dict[str, str], sid: str):
+        statuses = ["sent", "delivered"]
+        if config.fault("twilio").should_fail():
+            statuses = ["failed"]
+        for status in statuses:
+            await asyncio.sleep(config.callback_delay_ms / 1000)
+            data = {
+                "MessageSid": sid,
+                "MessageStatus": status,
+                "To": form.get("To", ""),
+                "From": form.get("From", ""),
+            }
+            if status == "failed":
+                # 63016: outside the 24h window, the most common failure
+                data["ErrorCode"] = "63016"
+                data["ErrorMessage"] = "Failed to send freeform message"
+            await post_back("/api/whatsapp/status", data=data)
+
+    @app.get("/stats")
+    async def stats():
+        return {
+            "requests": app.state.stats,
+            "callbacks": app.state.callbacks,
+        }
+
+    @app.post("/2010-04-01/Accounts/{account_sid}/Messages.json")
+    async def twilio_messages(account_sid: str, request: Request):
+        app.state.stats["twilio"] += 1
+        fault = config.fault("twilio")
+        await fault.delay()
+        if fault.should_fail():
+            return JSONResponse(
+                status_code=429,
+                content={
+                    "code": 20429,
+                    "message": "Too Many Requests",
+                    "status": 429,
+                },
+            )
+        form = dict(await request.form())
+        sid = f"SM{uuid.uuid4().hex}"
+        if config.status_callbacks:
+            schedule(twilio_status_callbacks(form, sid))
+        return JSONResponse(
+            status_code=201,
+            content={
+                "sid": sid,
+                "account_sid": account_sid,
+                "to": form.get("To"),
+                "from": form.get("From"),
+                "body": form.get("Body", ""),
+                "status": "queued",
+                "num_segments": "1",
+                "num_media": "0",
+                "direction": "outbound-api",
+                "api_version": "2010-04-01",
+                "uri": (
+                    f"/2010-04-01/Accounts/{account_sid}"
+                    f"/Messages/{sid}.json"
+                ),
+            },
+        )
+
+    async def openai_guard() -> Optional[JSONResponse]:
+        app.state.stats["openai"] += 1
+        fault = config.fault("openai")
+        await fault.delay()
+        if fault.should_fail():
+            return JSONResponse(
+                status_code=429,
+                content={
+                    "error": {
+                        "message": "Rate limit reached",
+                        "type": "rate_limit_error",
+                        "code": "rate_limit_exceeded",
+                    }
+                },
+            )
+        return None
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        error = await openai_guard()
+        if error:
+            return error
+        body = await request.json()
+        # Structured output callers parse the content as JSON
+        content = "{}" if body.get("response_format") else config.answer
+        model = body.get("model", "gpt-4o-mini")
+        if body.get("stream"):
+            return StreamingResponse(
+                _stream_chunks(model, content),
+                media_type="text/event-stream",
+            )
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": 100,
+                "completion_tokens": 20,
+                "total_tokens": 120,
+            },
+        }
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        error = await openai_guard()
+        if error:
+            return error
+        body = await request.json()
+        texts = body.get("input")
+        if isinstance(texts, str):
+            texts = [texts]
+        return {
+            "object": "list",
+            "model": body.get("model", "text-embedding-3-small"),
+            "data": [
+                {
+                    "object": "embedding",
+                    "index": n,
+                    "embedding": embedding_for(str(text)),
+                }
+                for n, text in enumerate(texts)
+            ],
+            "usage": {"prompt_tokens": 10, "total_tokens": 10},
+        }
+
+    @app.post("/v1/audio/transcriptions")
+    async def transcriptions(request: Request):
+        error = await openai_guard()
+        if error:
+            return error
+        return {"text": "When should I plant maize?"}
+
+    @app.post("/rag/chat")
+    async def rag_chat(request: Request):
+        app.state.stats["rag"] += 1
+        fault = config.fault("rag")
+        await fault.delay()
+        if fault.should_fail():
+            return JSONResponse(
+                status_code=503, content={"detail": "Service unavailable"}
+            )
+        form = await request.form()
+        job = json.loads(form["payload"])
+        job_id = f"job_{uuid.uuid4().hex}"
+
+        async def answer():
+            await asyncio.sleep(config.rag_delay_ms / 1000)
+            await post_back(
+                "/api/callback/ai",
+                json={
+                    "job_id": job_id,
+                    "status": "completed",
+                    "output": {"answer": config.answer, "citations": []},
+                    "callback_params": job.get("callback_params", {}),
+                    "trace_id": job.get("trace_id"),
+                    "job": "chat",
+                },
+            )
+
+        schedule(answer())
+        return {"job_id": job_id, "status": "queued"}
+
+    @app.post("/expo/push/send")
+    async def expo_push(request: Request):
+        app.state.stats["expo"] += 1
+        fault = config.fault("expo")
+        await fault.delay()
+        messages = await request.json()
+        if isinstance(messages, dict):
+            messages = [messages]
+        tickets = []
+        for _ in messages:
+            if fault.should_fail():
+                tickets.append(
+                    {
+                        "status": "error",
+                        "message": "Device not registered",
+                        "details": {"error": "DeviceNotRegistered"},
+                    }
+                )
+            else:
+                tickets.append(
+                    {"status": "ok", "id": str(uuid.uuid4())}
+                )
+        return {"data": tickets}
+
+    return app
+
+
+async def _stream_chunks(model: str, content: str):
+    created = int(time.time())
+    for piece in (content[: len(content) // 2], content[len(content) // 2:]):
+        chunk = {
+            "id": "chatcmpl-stream",
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {"content": piece},
+                    "finish_reason": None,
+                }
+            ],
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+    yield "data: [DONE]\n\n"
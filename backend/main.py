@@ -16,6 +16,7 @@ from routers import (
     devices,
     knowledge_base,
     messages,
+    metrics,
     service_tokens,
     whatsapp,
     tickets,
@@ -26,11 +27,17 @@ from routers import (
     weather,
     user_stats,
     statistic,
+    sync,
 )
 from fastapi.staticfiles import StaticFiles
 from services.external_ai_service import ExternalAIService
 from services.socketio_service import sio_app
 from database import SessionLocal
+from utils.metrics import (
+    MetricsMiddleware,
+    count_db_queries,
+    mark_process_dead,
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -64,17 +71,10 @@ async def lifespan(app: FastAPI):
     finally:
         db.close()
 
-    # Startup: start retry scheduler for failed messages
-    # logger.info("✓ Starting retry scheduler for failed messages")
-    # start_retry_scheduler()
-
     yield
 
-    # Shutdown: stop retry scheduler
-    # logger.info("✓ Stopping retry scheduler")
-    # stop_retry_scheduler()
-
     # Shutdown: cleanup if needed
+    mark_process_dead()
     logger.info("✓ Application shutdown")
 
 
@@ -95,6 +95,8 @@ app = FastAPI(
     openapi_url="/api/openapi.json",
     lifespan=lifespan,
 )
+app.add_middleware(MetricsMiddleware)
+count_db_queries()
 
 # Include routers
 app.include_router(auth.router, prefix="/api")
@@ -119,6 +121,8 @@ app.include_router(openai_demo.router)
 app.include_router(weather.router, prefix="/api")
 app.include_router(user_stats.router, prefix="/api")
 app.include_router(statistic.router, prefix="/api")
+app.include_router(sync.router, prefix="/api")
+app.include_router(metrics.router)
 
 # Ensure storage directory exists before mounting
 os.makedirs("storage", exist_ok=True)
@@ -4,17 +4,26 @@ from .administrative import (
     CustomerAdministrative,
     UserAdministrative,
 )
+from .answer_cache import AnswerCacheDailyStats, AnswerCacheEntry
+from .conversation_state import ConversationState
 from .customer import Customer, CustomerLanguage
 from .device import Device
 from .knowledge_base import KnowledgeBase
 from .message import Message, MessageFrom
+from .message_archive import MessageArchive
+from .response_trace import ResponsePath, ResponseTrace
 from .service_token import ServiceToken
 from .ticket import Ticket
 from .user import User, UserType
 from .weather_broadcast import WeatherBroadcast, WeatherBroadcastRecipient
+from .weather_observation import WeatherObservation
+from .whatsapp_outbox import OutboxMessage
 from database import Base
 
 __all__ = [
+    "AnswerCacheDailyStats",
+    "AnswerCacheEntry",
+    "ConversationState",
     "User",
     "UserType",
     "Customer",
@@ -22,7 +31,10 @@ __all__ = [
     "Device",
     "KnowledgeBase",
     "Message",
+    "MessageArchive",
     "MessageFrom",
+    "ResponsePath",
+    "ResponseTrace",
     "ServiceToken",
     "Ticket",
     "Administrative",
@@ -31,5 +43,7 @@ __all__ = [
     "UserAdministrative",
     "WeatherBroadcast",
     "WeatherBroadcastRecipient",
+    "WeatherObservation",
+    "OutboxMessage",
     "Base",
 ]
@@ -67,9 +67,11 @@ class CustomerAdministrative(Base):
     __tablename__ = "customer_administrative"
 
     id = Column(Integer, primary_key=True, index=True)
-    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False)
+    customer_id = Column(
+        Integer, ForeignKey("customers.id"), nullable=False, index=True
+    )
     administrative_id = Column(
-        Integer, ForeignKey("administrative.id"), nullable=False
+        Integer, ForeignKey("administrative.id"), nullable=False, index=True
     )
 
     # Relationships
@@ -0,0 +1,72 @@
+"""
+Semantic answer cache models.
+
+Answers previously sent to farmers, keyed by the embedding of the
+question, so near-duplicate questions can be answered without another
+external AI job (services/answer_cache_service.py).
+"""
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+)
+from sqlalchemy.sql import func
+
+from database import Base
+
+
+class AnswerCacheEntry(Base):
+    """A question/answer pair within one language/crop/KB partition"""
+    __tablename__ = "answer_cache_entries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    language = Column(String(10), nullable=False)
+    # Customer crop when the answer was given ("" if unknown)
+    crop_type = Column(String(100), nullable=False, default="")
+    # Fingerprint of the active knowledge bases; entries from other
+    # versions are never served
+    kb_version = Column(String(64), nullable=False)
+    question = Column(Text, nullable=False)
+    answer = Column(Text, nullable=False)
+    # Unit-length embedding stored as float16 bytes
+    embedding = Column(LargeBinary, nullable=False)
+    # "ai" (external AI reply) or "eo" (extension officer reply)
+    source = Column(String(10), nullable=False)
+    has_citations = Column(Boolean, nullable=False, default=False)
+    source_message_id = Column(
+        Integer,
+        ForeignKey("messages.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    # How long the original answer took to reach the farmer
+    answer_latency_ms = Column(Integer, nullable=True)
+    hit_count = Column(Integer, nullable=False, default=0)
+    last_hit_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            "ix_answer_cache_entries_partition",
+            "language",
+            "crop_type",
+            "kb_version",
+        ),
+    )
+
+
+class AnswerCacheDailyStats(Base):
+    """Per-day lookup counters for hit rate and time saved"""
+    __tablename__ = "answer_cache_daily_stats"
+
+    day = Column(Date, primary_key=True)
+    lookups = Column(Integer, nullable=False, default=0)
+    hits = Column(Integer, nullable=False, default=0)
+    time_saved_ms = Column(BigInteger, nullable=False, default=0)
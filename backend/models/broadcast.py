@@ -3,6 +3,7 @@ Broadcast models for managing broadcast groups and messages.
 """
 from datetime import datetime
 from sqlalchemy import (
+    JSON,
     Column,
     Integer,
     String,
@@ -25,6 +26,10 @@ class BroadcastGroup(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
+    # Audience segment (schemas.broadcast.AudienceSegment). Customers
+    # matching it are members in addition to the static contacts and
+    # are resolved whenever a broadcast is sent.
+    segment = Column(JSON(none_as_null=True), nullable=True)
     administrative_id = Column(
         Integer,
         ForeignKey("administrative.id"),
@@ -0,0 +1,247 @@
+"""
+Per-customer conversation state.
+
+The WhatsApp webhook routes every inbound message on a few facts about
+the customer's conversation: whether they ever wrote before, their open
+ticket, how many EO messages are waiting undelivered, and when they last
+got a follow-up question or had a ticket resolved. Those used to be
+separate COUNT and ticket queries per message; this table keeps them in
+one row, read through services/conversation_state_service.py.
+
+The row is maintained by the Message and Ticket mapper events below, in
+the same flush (and transaction) as the change itself. Customers that
+never had a message or ticket have no row, which reads as the empty
+state. The onboarding cursor stays on the customer row
+(onboarding_status, current_onboarding_field), which routing loads
+anyway.
+"""
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    event,
+    func,
+    inspect,
+    select,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, object_session
+
+from database import Base
+from models.message import DeliveryStatus, Message, MessageFrom
+from models.ticket import Ticket
+from schemas.callback import MessageType
+
+
+class ConversationState(Base):
+    __tablename__ = "conversation_states"
+
+    customer_id = Column(
+        Integer,
+        ForeignKey("customers.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    has_messages = Column(Boolean, nullable=False, server_default="false")
+    # Oldest unresolved ticket (routing switches to WHISPER mode)
+    open_ticket_id = Column(
+        Integer,
+        ForeignKey("tickets.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    # EO messages waiting for a reconnection template
+    pending_undelivered = Column(
+        Integer, nullable=False, server_default="0"
+    )
+    last_follow_up_at = Column(DateTime(timezone=True), nullable=True)
+    last_resolved_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+_state = ConversationState.__table__
+_DIRTY_KEY = "conversation_state_dirty"
+
+
+def _is_pending(from_source, delivery_status) -> bool:
+    return (
+        from_source == MessageFrom.USER
+        and delivery_status == DeliveryStatus.UNDELIVERED
+    )
+
+
+def _pending_count(customer_id: int):
+    return (
+        select(func.count(Message.id))
+        .where(
+            Message.customer_id == customer_id,
+            Message.from_source == MessageFrom.USER,
+            Message.delivery_status == DeliveryStatus.UNDELIVERED,
+        )
+        .scalar_subquery()
+    )
+
+
+def _ticket_columns(customer_id: int) -> dict:
+    return {
+        "open_ticket_id": (
+            select(func.min(Ticket.id))
+            .where(
+                Ticket.customer_id == customer_id,
+                Ticket.resolved_at.is_(None),
+            )
+            .scalar_subquery()
+        ),
+        "last_resolved_at": (
+            select(func.max(Ticket.resolved_at))
+            .where(Ticket.customer_id == customer_id)
+            .scalar_subquery()
+        ),
+    }
+
+
+def _full_columns(customer_id: int) -> dict:
+    """Every column computed from the messages and tickets tables"""
+    return {
+        "has_messages": (
+            select(Message.id)
+            .where(Message.customer_id == customer_id)
+            .exists()
+        ),
+        "pending_undelivered": _pending_count(customer_id),
+        "last_follow_up_at": (
+            select(func.max(Message.created_at))
+            .where(
+                Message.customer_id == customer_id,
+                Message.message_type == MessageType.FOLLOW_UP,
+            )
+            .scalar_subquery()
+        ),
+        **_ticket_columns(customer_id),
+    }
+
+
+def apply_change(connection, customer_id: int, values: dict) -> None:
+    """
+    Apply an incremental change to a customer's state row.
+
+    Without a row yet, the row is created from the source tables
+    instead, which already include the change being flushed.
+
+    Args:
+        connection: Connection of the flush
+        customer_id: Customer ID
+        values: Column name to new value or SQL expression
+    """
+    values = {**values, "updated_at": func.now()}
+    update = (
+        _state.update()
+        .where(_state.c.customer_id == customer_id)
+        .values(**values)
+    )
+    if connection.execute(update).rowcount:
+        return
+    insert = (
+        pg_insert(_state)
+        .values(customer_id=customer_id, **_full_columns(customer_id))
+        .on_conflict_do_nothing(index_elements=["customer_id"])
+    )
+    if not connection.execute(insert).rowcount:
+        # Created concurrently; the update now waits for that commit
+        connection.execute(update)
+
+
+def _mark_dirty(target, customer_id: int) -> None:
+    session = object_session(target)
+    if session is not None and customer_id is not None:
+        session.info.setdefault(_DIRTY_KEY, set()).add(customer_id)
+
+
+@event.listens_for(Message, "after_insert")
+def _message_inserted(mapper, connection, target):
+    loaded = inspect(target).dict
+    values = {"has_messages": True}
+    if _is_pending(loaded.get("from_source"), loaded.get("delivery_status")):
+        values["pending_undelivered"] = _state.c.pending_undelivered + 1
+    if loaded.get("message_type") == MessageType.FOLLOW_UP:
+        values["last_follow_up_at"] = func.greatest(
+            _state.c.last_follow_up_at,
+            loaded.get("created_at") or func.now(),
+        )
+    apply_change(connection, target.customer_id, values)
+    _mark_dirty(target, target.customer_id)
+
+
+@event.listens_for(Message, "after_update")
+def _message_updated(mapper, connection, target):
+    state = inspect(target)
+    history = state.attrs.delivery_status.history
+    if not history.has_changes():
+        return
+    from_source = state.dict.get("from_source")
+    if from_source is not None and from_source != MessageFrom.USER:
+        return
+    if history.deleted and history.added and from_source is not None:
+        delta = int(
+            _is_pending(from_source, history.added[0])
+        ) - int(_is_pending(from_source, history.deleted[0]))
+        if not delta:
+            return
+        value = func.greatest(_state.c.pending_undelivered + delta, 0)
+    else:
+        # Previous status unknown (expired attribute): recount
+        value = _pending_count(target.customer_id)
+    apply_change(
+        connection, target.customer_id, {"pending_undelivered": value}
+    )
+    _mark_dirty(target, target.customer_id)
+
+
+@event.listens_for(Message, "after_delete")
+def _message_deleted(mapper, connection, target):
+    loaded = inspect(target).dict
+    if "from_source" in loaded and "delivery_status" in loaded:
+        if not _is_pending(loaded["from_source"], loaded["delivery_status"]):
+            return
+        value = func.greatest(_state.c.pending_undelivered - 1, 0)
+    else:
+        # Deleted without being loaded (expired after a commit): recount
+        value = _pending_count(target.customer_id)
+    apply_change(
+        connection, target.customer_id, {"pending_undelivered": value}
+    )
+    _mark_dirty(target, target.customer_id)
+
+
+@event.listens_for(Ticket, "after_insert")
+@event.listens_for(Ticket, "after_delete")
+def _ticket_changed(mapper, connection, target):
+    apply_change(
+        connection, target.customer_id, _ticket_columns(target.customer_id)
+    )
+    _mark_dirty(target, target.customer_id)
+
+
+@event.listens_for(Ticket, "after_update")
+def _ticket_updated(mapper, connection, target):
+    state = inspect(target)
+    if not (
+        state.attrs.resolved_at.history.has_changes()
+        or state.attrs.customer_id.history.has_changes()
+    ):
+        return
+    _ticket_changed(mapper, connection, target)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_cached_states(session):
+    customer_ids = session.info.pop(_DIRTY_KEY, None)
+    if customer_ids:
+        from services.conversation_state_service import (
+            conversation_state_cache,
+        )
+
+        conversation_state_cache.invalidate(customer_ids)
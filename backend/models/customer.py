@@ -1,18 +1,30 @@
 import enum
 
+from datetime import datetime
+
 from sqlalchemy import (
     Column,
     DateTime,
     Enum,
+    Index,
     Integer,
     String,
     JSON,
+    and_,
+    case,
+    cast,
+    event,
+    inspect,
+    null,
+    text,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from database import Base
+from models.sync import sync_seq_column, track_sync_changes
 from config import settings
+from utils.phone import e164_or_none
 
 
 class CustomerLanguage(str, enum.Enum):
@@ -44,12 +56,17 @@ class Customer(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     phone_number = Column(String, unique=True, index=True, nullable=False)
+    # Validated E.164 form of phone_number, kept by the events below so
+    # sends skip parsing; None when phone_number is not a valid number
+    phone_e164 = Column(String, nullable=True)
     full_name = Column(String, nullable=True)
     language = Column(String(10), default=None, nullable=True)
     # JSON object with profile fields
     profile_data = Column(JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Change sequence for the mobile delta-sync API (profile fields only)
+    sync_seq = sync_seq_column()
 
     # 24-hour reconnection tracking
     last_message_at = Column(DateTime(timezone=True), nullable=True)
@@ -79,6 +96,37 @@ class Customer(Base):
     )
     tickets = relationship("Ticket", back_populates="customer")
 
+    __table_args__ = (
+        # Audience segment filters (CustomerService.segment_condition)
+        Index(
+            "ix_customers_profile_crop_type",
+            text("(profile_data ->> 'crop_type')"),
+        ),
+        Index(
+            "ix_customers_profile_gender",
+            text("(profile_data ->> 'gender')"),
+        ),
+        Index(
+            "ix_customers_profile_weather_subscribed",
+            text("(profile_data ->> 'weather_subscribed')"),
+        ),
+        Index("ix_customers_language", "language"),
+        Index("ix_customers_last_message_at", "last_message_at"),
+        # Name / phone search (utils/search.py), needs pg_trgm
+        Index(
+            "ix_customers_full_name_trgm",
+            "full_name",
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_customers_phone_number_trgm",
+            "phone_number",
+            postgresql_using="gin",
+            postgresql_ops={"phone_number": "gin_trgm_ops"},
+        ),
+    )
+
     # Profile data property accessors
     @property
     def language_code(self) -> str:
@@ -133,6 +181,37 @@ class Customer(Base):
             return group.get("label")
         return None
 
+    @classmethod
+    def age_group_expression(cls):
+        """
+        SQL equivalent of the age_group property.
+
+        Evaluates to the label of the first configured age group the
+        customer's age falls into, or NULL, so age groups can be
+        aggregated in the database.
+        """
+        birth_year_text = cls.profile_data.op("->>")("birth_year")
+        birth_year = case(
+            (
+                birth_year_text.op("~")("^[0-9]{1,4}$"),
+                cast(birth_year_text, Integer),
+            ),
+        )
+        age = datetime.now().year - birth_year
+
+        whens = []
+        for group in settings.age_groups:
+            # birth_year 0 counts as missing, like the property
+            conditions = [birth_year.isnot(None), birth_year != 0]
+            if group.get("min") is not None:
+                conditions.append(age >= group["min"])
+            if group.get("max") is not None:
+                conditions.append(age <= group["max"])
+            whens.append((and_(*conditions), group.get("label")))
+        if not whens:
+            return null()
+        return case(*whens, else_=null())
+
     # Weather subscription properties
     @property
     def weather_subscription_asked(self) -> bool:
@@ -265,6 +344,23 @@ class Customer(Base):
         self.profile_data = profile_dict
 
 
+@event.listens_for(Customer, "before_insert")
+def _normalize_phone_on_insert(mapper, connection, target):
+    target.phone_e164 = e164_or_none(target.phone_number)
+
+
+@event.listens_for(Customer, "before_update")
+def _normalize_phone_on_update(mapper, connection, target):
+    if inspect(target).attrs.phone_number.history.has_changes():
+        target.phone_e164 = e164_or_none(target.phone_number)
+
+
+track_sync_changes(
+    Customer,
+    ("full_name", "phone_number", "language", "profile_data"),
+)
+
+
 class CropType(Base):
     __tablename__ = "crop_types"
 
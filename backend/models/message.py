@@ -1,18 +1,25 @@
 import enum
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 
 from sqlalchemy import (
     Column,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    event,
+    inspect,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
+from config import settings
 from database import Base
+from models.sync import sync_seq_column, track_sync_changes
 from schemas.callback import MessageType
 
 
@@ -22,6 +29,22 @@ class MessageFrom:
     LLM = 3
 
 
+def get_from_source_string(from_source: int) -> str:
+    """Convert from_source integer to string representation.
+    Uses MessageFrom constants:
+    - CUSTOMER = 1 -> "whatsapp"
+    - USER = 2 -> "system"
+    - LLM = 3 -> "llm"
+    """
+    if from_source == MessageFrom.CUSTOMER:
+        return "whatsapp"
+    elif from_source == MessageFrom.USER:
+        return "system"
+    elif from_source == MessageFrom.LLM:
+        return "llm"
+    return "unknown"
+
+
 class MessageStatus:
     """Business logic status (kept for backward compatibility)"""
     PENDING = 1
@@ -42,6 +65,18 @@ class DeliveryStatus(enum.Enum):
     UNDELIVERED = "UNDELIVERED"  # Temporary failure/expired
 
 
+# Twilio error codes that should NOT be retried (permanent failures)
+PERMANENT_ERROR_CODES = frozenset({
+    "21211",  # Invalid 'To' phone number
+    "21408",  # Permission to send SMS/MMS not enabled
+    "21610",  # Message blocked (profanity/spam)
+    "21614",  # 'To' number is not a valid mobile number
+    "63007",  # Message blocked - US A2P compliance
+    "63016",  # Message blocked - spam detected
+    "30007",  # Message filtered (carrier block)
+})
+
+
 class MediaType(enum.Enum):
     """Type of media in message"""
     TEXT = "TEXT"              # Regular text message (default)
@@ -83,6 +118,8 @@ class Message(Base):
     twilio_error_message = Column(Text, nullable=True)
     retry_count = Column(Integer, nullable=False, server_default="0")
     last_retry_at = Column(DateTime(timezone=True), nullable=True)
+    # Retry queue: set when a retryable failure is recorded, NULL otherwise
+    next_retry_at = Column(DateTime(timezone=True), nullable=True)
     delivered_at = Column(DateTime(timezone=True), nullable=True)
 
     # Media tracking (for voice, images, etc.)
@@ -93,11 +130,27 @@ class Message(Base):
         server_default=MediaType.TEXT.value,
     )
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), index=True
+    )
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+    # Change sequence for the mobile delta-sync API
+    sync_seq = sync_seq_column()
 
     customer = relationship("Customer", back_populates="messages")
     user = relationship("User")
 
+    __table_args__ = (
+        # Partial index: only messages waiting in the retry queue
+        Index(
+            "ix_messages_next_retry_at",
+            "next_retry_at",
+            postgresql_where=next_retry_at.isnot(None),
+        ),
+    )
+
     def is_delivery_failed(self) -> bool:
         """Check if message delivery permanently failed"""
         return self.delivery_status in (
@@ -112,3 +165,72 @@ class Message(Base):
             )
             and self.retry_count < max_retries
         )
+
+    def compute_next_retry_at(self) -> Optional[datetime]:
+        """
+        Compute when this message is due for its next delivery retry.
+
+        Returns None when the message is not in the retry queue: it did
+        not fail, is inbound, hit a permanent error or used up its attempts.
+        """
+        if self.delivery_status not in (
+            DeliveryStatus.FAILED, DeliveryStatus.UNDELIVERED
+        ):
+            return None
+        if self.from_source not in (MessageFrom.LLM, MessageFrom.USER):
+            return None
+        if self.twilio_error_code in PERMANENT_ERROR_CODES:
+            return None
+        retry_count = self.retry_count or 0
+        if retry_count >= settings.retry_max_attempts:
+            return None
+
+        backoff_minutes = settings.retry_backoff_minutes
+        if not backoff_minutes:
+            return None
+        retry_index = min(retry_count, len(backoff_minutes) - 1)
+        base_time = (
+            self.last_retry_at
+            or self.created_at
+            or datetime.now(timezone.utc)
+        )
+        return base_time + timedelta(minutes=backoff_minutes[retry_index])
+
+
+# Attributes that affect the retry schedule
+_RETRY_SCHEDULE_ATTRS = (
+    "delivery_status",
+    "retry_count",
+    "last_retry_at",
+    "created_at",
+    "twilio_error_code",
+)
+
+
+@event.listens_for(Message, "before_insert")
+def _schedule_retry_on_insert(mapper, connection, target):
+    target.next_retry_at = target.compute_next_retry_at()
+
+
+@event.listens_for(Message, "before_update")
+def _schedule_retry_on_update(mapper, connection, target):
+    state = inspect(target)
+    if any(
+        state.attrs[attr].history.has_changes()
+        for attr in _RETRY_SCHEDULE_ATTRS
+    ):
+        target.next_retry_at = target.compute_next_retry_at()
+
+
+track_sync_changes(
+    Message,
+    (
+        "body",
+        "status",
+        "delivery_status",
+        "media_url",
+        "media_type",
+        "message_type",
+        "user_id",
+    ),
+)
@@ -0,0 +1,74 @@
+"""
+Archive tier of the messages table.
+
+Messages older than MESSAGE_ARCHIVE_HOT_MONTHS are moved from `messages`
+into `messages_archive` (services/message_archive_service.py), which is
+range-partitioned by month on created_at. The hot table stays small for
+the webhook, inbox and retry queries, while old months can be exported
+to Parquet and dropped as a whole partition.
+
+The archive has the columns of `messages` but none of its foreign keys
+or unique constraints: partitioned tables need the partition key in
+every unique constraint, and archived rows are never written again.
+"""
+
+from datetime import date
+from typing import Tuple
+
+from sqlalchemy import Column, Index, Table
+
+from database import Base
+from models.message import Message
+
+# Partition key; part of the primary key as PostgreSQL requires
+PARTITION_COLUMN = "created_at"
+
+
+def _archive_columns():
+    """Copy of the messages columns, without defaults or constraints"""
+    return [
+        Column(
+            column.name,
+            column.type,
+            primary_key=column.name in ("id", PARTITION_COLUMN),
+            nullable=column.nullable,
+        )
+        for column in Message.__table__.columns
+    ]
+
+
+class MessageArchive(Base):
+    __table__ = Table(
+        "messages_archive",
+        Base.metadata,
+        *_archive_columns(),
+        # Conversation history lookups for one customer
+        Index(
+            "ix_messages_archive_customer_created",
+            "customer_id",
+            PARTITION_COLUMN,
+        ),
+        postgresql_partition_by=f"RANGE ({PARTITION_COLUMN})",
+    )
+
+
+def month_start(day: date) -> date:
+    """First day of the month containing day"""
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month `months` after (or before) month"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_bounds(month: date) -> Tuple[date, date]:
+    """[start, end) of the month containing month"""
+    start = month_start(month)
+    return start, add_months(start, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the archive partition holding month, e.g. ..._y2026m01"""
+    return f"messages_archive_y{month.year:04d}m{month.month:02d}"
@@ -0,0 +1,47 @@
+"""
+Farmer response latency traces.
+
+One row per farmer message handled by the regular (REPLY or WHISPER)
+flow, with the time each stage of the path to our reply was reached
+(services/response_trace_service.py). Delivery time is read from the
+reply message's delivered_at, set by the Twilio status callback.
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+
+from database import Base
+
+
+class ResponsePath:
+    REPLY = "reply"  # External AI job answers the farmer
+    CACHE = "cache"  # Answered from the semantic answer cache
+    WHISPER = "whisper"  # Open ticket; AI suggestion for the EO
+
+
+class ResponseTrace(Base):
+    __tablename__ = "response_traces"
+
+    id = Column(Integer, primary_key=True, index=True)
+    message_id = Column(
+        Integer,
+        ForeignKey("messages.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    # trace_id sent with the external AI job
+    trace_id = Column(String, nullable=True)
+    path = Column(String(16), nullable=False)
+
+    # Stage timestamps, in the order they are reached
+    received_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    transcribed_at = Column(DateTime(timezone=True), nullable=True)
+    onboarded_at = Column(DateTime(timezone=True), nullable=True)
+    ai_job_created_at = Column(DateTime(timezone=True), nullable=True)
+    ai_callback_at = Column(DateTime(timezone=True), nullable=True)
+    # Twilio accepted the reply
+    reply_sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    reply_message_id = Column(
+        Integer,
+        ForeignKey("messages.id", ondelete="SET NULL"),
+        nullable=True,
+    )
@@ -0,0 +1,118 @@
+"""
+Change tracking for the mobile delta-sync API.
+
+Synced tables carry a sync_seq column filled from one shared Postgres
+sequence. A row gets a new value when it is inserted and whenever one of
+its tracked attributes changes, so "everything since cursor N" is a
+single index range scan per table.
+
+Sequence values are taken at flush but become visible at commit, so a
+transaction can commit a lower sync_seq after a client already synced
+past it. Values are therefore taken with sync_next_seq(): before the
+first value of a transaction it takes a shared, transaction-scoped
+advisory lock keyed on the sequence's current value, a lower bound of
+every value the transaction takes. While the transaction is open the
+lock is visible to every session in pg_locks, and sync_cursor_bound()
+keeps the sync cursor below it (services/sync_service.py).
+"""
+
+from typing import Iterable
+
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Column,
+    Sequence,
+    event,
+    func,
+    inspect,
+    text,
+)
+from sqlalchemy.orm import Session
+
+from database import Base
+
+sync_change_seq = Sequence("sync_change_seq", metadata=Base.metadata)
+
+# Advisory lock keys are SYNC_LOCK_SPACE << 48 plus the sequence value;
+# in pg_locks the high 32 bits of the key are the classid
+SYNC_LOCK_SPACE = 0x5359  # "SY"
+SYNC_LOCK_BASE = SYNC_LOCK_SPACE << 48
+
+SYNC_NEXT_SEQ_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION sync_next_seq() RETURNS bigint AS $$
+BEGIN
+    IF current_setting('agriconnect.sync_seq_locked', true)
+        IS DISTINCT FROM 'on' THEN
+        PERFORM pg_advisory_xact_lock_shared(
+            {SYNC_LOCK_BASE} + (SELECT last_value FROM sync_change_seq)
+        );
+        PERFORM set_config('agriconnect.sync_seq_locked', 'on', true);
+    END IF;
+    RETURN nextval('sync_change_seq');
+END
+$$ LANGUAGE plpgsql
+"""
+
+# Created before the tables, whose sync_seq default calls it
+event.listen(Base.metadata, "before_create", DDL(SYNC_NEXT_SEQ_FUNCTION))
+event.listen(
+    Base.metadata,
+    "after_drop",
+    DDL("DROP FUNCTION IF EXISTS sync_next_seq()"),
+)
+
+
+def sync_seq_column() -> Column:
+    """Indexed sync_seq column populated by sync_next_seq()"""
+    return Column(
+        BigInteger,
+        server_default=text("sync_next_seq()"),
+        nullable=False,
+        index=True,
+    )
+
+
+def track_sync_changes(model, attributes: Iterable[str]) -> None:
+    """
+    Bump model.sync_seq on flush when any of the attributes changed.
+
+    Args:
+        model: Mapped class with a sync_seq column
+        attributes: Attribute names the mobile app mirrors
+    """
+    attributes = tuple(attributes)
+
+    @event.listens_for(model, "before_update")
+    def _bump_sync_seq(mapper, connection, target):
+        state = inspect(target)
+        if any(
+            state.attrs[attr].history.has_changes() for attr in attributes
+        ):
+            target.sync_seq = func.sync_next_seq()
+
+
+def sync_cursor_bound(db: Session) -> int:
+    """
+    Highest sync_seq a cursor may advance to.
+
+    Every value up to it was taken by a transaction that has committed
+    or rolled back. The sequence's last value is read before the locks:
+    a transaction taking a value up to it has its lock in place by then.
+    """
+    bound = db.execute(
+        text("SELECT last_value FROM sync_change_seq")
+    ).scalar()
+    held = db.execute(
+        text(
+            "SELECT min(((classid::bigint << 32) | objid::bigint) - :base) "
+            "FROM pg_locks "
+            "WHERE locktype = 'advisory' AND objsubid = 1 "
+            "AND classid::bigint >> 16 = :space"
+        ),
+        {"base": SYNC_LOCK_BASE, "space": SYNC_LOCK_SPACE},
+    ).scalar()
+    if held is not None:
+        # An open transaction may still commit values from its key up
+        bound = min(bound, held - 1)
+    return bound
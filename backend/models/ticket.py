@@ -11,6 +11,7 @@ from sqlalchemy import (
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
+from models.sync import sync_seq_column, track_sync_changes
 
 
 class TicketTag(enum.IntEnum):
@@ -50,6 +51,8 @@ class Ticket(Base):
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
+    # Change sequence for the mobile delta-sync API
+    sync_seq = sync_seq_column()
 
     customer = relationship("Customer", back_populates="tickets")
     message = relationship("Message", foreign_keys=[message_id])
@@ -60,3 +63,18 @@ class Ticket(Base):
     ticket_administrative = relationship(
         "Administrative", back_populates="tickets"
     )
+
+
+track_sync_changes(
+    Ticket,
+    (
+        "administrative_id",
+        "customer_id",
+        "message_id",
+        "context_message_id",
+        "resolved_by",
+        "resolved_at",
+        "tag",
+        "tag_confidence",
+    ),
+)
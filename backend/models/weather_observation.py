@@ -0,0 +1,115 @@
+"""
+Daily weather observations per administrative area.
+
+Each weather fetch for a broadcast area is parsed with
+WeatherAdvisoryService.parse_weather_data() and its scalar fields are
+kept as typed columns, one row per area and day (the last fetch of the
+day wins). The rows are what the rule backtests
+(services/weather_backtest_service.py) replay, so rule and crop
+calendar changes can be checked without calling the weather API.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    UniqueConstraint,
+)
+
+from database import Base
+
+# Parsed weather fields stored per observation (one column each)
+OBSERVATION_FIELDS = (
+    "temperature_c",
+    "temperature_max_c",
+    "temperature_min_c",
+    "soil_temp_estimate_c",
+    "forecast_max_temp_c",
+    "temperature_rising",
+    "relative_humidity_pct",
+    "thi_value",
+    "wind_speed_kmh",
+    "wind_gust_kmh",
+    "cloud_cover_pct",
+    "qpf_today_mm",
+    "rain_probability_today_pct",
+    "rain_probability_next_6h_pct",
+    "cumulative_rain_24h_mm",
+    "cumulative_rain_48h_mm",
+    "cumulative_rain_72h_mm",
+    "cumulative_rain_7d_mm",
+    "forecast_total_rainfall_mm",
+    "forecast_days_count",
+    "consecutive_dry_days",
+    "consecutive_wet_days",
+    "consecutive_days_above_10c",
+    "hours_since_last_rain",
+    "month",
+    "hour",
+    "is_daytime",
+    "is_early_morning_or_late_evening",
+)
+
+
+class WeatherObservation(Base):
+    """Parsed weather of one administrative area on one day"""
+    __tablename__ = "weather_observations"
+    __table_args__ = (
+        UniqueConstraint(
+            "administrative_id",
+            "observed_on",
+            name="uq_weather_observations_area_day",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Leading column of the unique constraint, which indexes it
+    administrative_id = Column(
+        Integer,
+        ForeignKey("administrative.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    observed_on = Column(Date, nullable=False, index=True)
+    fetched_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    # Temperature (°C) and humidity
+    temperature_c = Column(Float)
+    temperature_max_c = Column(Float)
+    temperature_min_c = Column(Float)
+    soil_temp_estimate_c = Column(Float)
+    forecast_max_temp_c = Column(Float)
+    temperature_rising = Column(Boolean)
+    relative_humidity_pct = Column(Float)
+    thi_value = Column(Float)
+
+    # Wind and clouds
+    wind_speed_kmh = Column(Float)
+    wind_gust_kmh = Column(Float)
+    cloud_cover_pct = Column(Float)
+
+    # Rain, today and over the forecast
+    qpf_today_mm = Column(Float)
+    rain_probability_today_pct = Column(Float)
+    rain_probability_next_6h_pct = Column(Float)
+    cumulative_rain_24h_mm = Column(Float)
+    cumulative_rain_48h_mm = Column(Float)
+    cumulative_rain_72h_mm = Column(Float)
+    cumulative_rain_7d_mm = Column(Float)
+    forecast_total_rainfall_mm = Column(Float)
+    forecast_days_count = Column(Integer)
+    consecutive_dry_days = Column(Integer)
+    consecutive_wet_days = Column(Integer)
+    consecutive_days_above_10c = Column(Integer)
+    hours_since_last_rain = Column(Integer)
+
+    # Time of the fetch
+    month = Column(Integer)
+    hour = Column(Integer)
+    is_daytime = Column(Boolean)
+    is_early_morning_or_late_evening = Column(Boolean)
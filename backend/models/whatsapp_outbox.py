@@ -0,0 +1,87 @@
+"""
+Transactional outbox for outbound WhatsApp messages.
+
+Request handlers add an OutboxMessage in the same transaction as the
+business change (services/outbox_service.py) instead of calling Twilio,
+so a message is sent if and only if that change was committed. Sender
+workers (tasks/outbox_tasks.py) drain the table: for each recipient
+only the oldest unsent message is claimed, which keeps the messages to
+one number in order.
+"""
+
+import enum
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.sql import func
+
+from database import Base
+
+
+class OutboxKind(enum.Enum):
+    TEXT = "TEXT"
+    TEMPLATE = "TEMPLATE"
+
+
+class OutboxStatus(enum.Enum):
+    PENDING = "PENDING"  # Waiting for a sender (or for its next attempt)
+    SENDING = "SENDING"  # Claimed by a sender
+    SENT = "SENT"  # Accepted by Twilio
+    FAILED = "FAILED"  # Permanent error or attempts used up
+
+
+# Statuses of messages that still block later messages to the number
+UNSENT_STATUSES = (OutboxStatus.PENDING, OutboxStatus.SENDING)
+
+
+class OutboxMessage(Base):
+    __tablename__ = "whatsapp_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    to_number = Column(String, nullable=False)
+    kind = Column(Enum(OutboxKind), nullable=False)
+    body = Column(Text, nullable=True)
+    content_sid = Column(String, nullable=True)
+    content_variables = Column(JSON, nullable=True)
+    # Tracked message: gets the Twilio SID and delivery status on send
+    message_id = Column(
+        Integer, ForeignKey("messages.id", ondelete="SET NULL"), nullable=True
+    )
+    # Farmer message whose response trace gets reply_sent on send
+    trace_message_id = Column(
+        Integer, ForeignKey("messages.id", ondelete="SET NULL"), nullable=True
+    )
+    status = Column(
+        Enum(OutboxStatus), nullable=False, default=OutboxStatus.PENDING
+    )
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    twilio_sid = Column(String, nullable=True)
+    error_code = Column(String(10), nullable=True)
+    error_message = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Partial index: the head-of-line lookup per recipient only
+        # scans messages that are not sent yet
+        Index(
+            "ix_whatsapp_outbox_unsent",
+            "to_number",
+            "id",
+            postgresql_where=text("status IN ('PENDING', 'SENDING')"),
+        ),
+    )
@@ -13,17 +13,19 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from config import settings
-from database import get_db
+from database import get_read_db
 from models.ticket import Ticket, TicketTag
-from models.user import User, UserType
+from models.user import UserType
 from models.customer import Customer, OnboardingStatus
 from models.administrative import (
     Administrative,
     AdministrativeLevel,
     CustomerAdministrative,
-    UserAdministrative,
 )
-from utils.auth_dependencies import get_current_user
+from services.answer_cache_service import AnswerCacheService
+from services.principal_service import Principal
+from services.response_trace_service import ResponseTraceService
+from utils.auth_dependencies import get_current_principal
 from services.tagging_service import get_all_tags
 from services.administrative_service import AdministrativeService
 
@@ -33,21 +35,6 @@ router = APIRouter(
 )
 
 
-def _get_user_administrative_ids(
-    user: User, db: Session
-) -> Optional[List[int]]:
-    """Get list of administrative IDs accessible by the user."""
-    if user.user_type == UserType.ADMIN:
-        return None  # Admin can access all
-
-    user_admins = (
-        db.query(UserAdministrative)
-        .filter(UserAdministrative.user_id == user.id)
-        .all()
-    )
-    return [ua.administrative_id for ua in user_admins]
-
-
 @router.get("/ticket-tags")
 async def get_ticket_tag_statistics(
     start_date: Optional[str] = Query(
@@ -56,8 +43,8 @@ async def get_ticket_tag_statistics(
     end_date: Optional[str] = Query(
         None, description="Filter end date (ISO 8601)"
     ),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get ticket tag statistics for analytics.
@@ -79,7 +66,9 @@ async def get_ticket_tag_statistics(
     )
 
     # Filter by administrative area for non-admin users
-    admin_ids = _get_user_administrative_ids(current_user, db)
+    admin_ids = (
+        None if current_user.is_admin else list(current_user.ward_ids)
+    )
     if admin_ids is not None:
         query = query.filter(Ticket.administrative_id.in_(admin_ids))
 
@@ -161,7 +150,7 @@ async def get_ticket_tag_statistics(
 
 @router.get("/ticket-tags/available")
 async def get_available_tags(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """
     Get list of available ticket tags with descriptions.
@@ -175,7 +164,7 @@ async def get_available_tags(
 
 @router.get("/statistic-api-token")
 async def get_statistic_api_token(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """
     Get the Statistics API token for external applications.
@@ -211,43 +200,104 @@ async def get_statistic_api_token(
     }
 
 
+@router.get("/answer-cache")
+async def get_answer_cache_statistics(
+    days: int = Query(30, ge=1, le=365, description="Days to include"),
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Get semantic answer cache statistics.
+
+    Only accessible by admin users. Returns lookups, hits, hit rate
+    and the estimated time farmers saved (latency of the original
+    answers that were reused), in total and per day.
+    """
+    if current_user.user_type != UserType.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin users can access this endpoint",
+        )
+
+    return AnswerCacheService(db).get_stats(days=days)
+
+
+@router.get("/response-latency")
+async def get_response_latency(
+    days: int = Query(7, ge=1, le=90, description="Days to include"),
+    path: Optional[str] = Query(
+        None,
+        pattern="^(reply|cache|whisper)$",
+        description="Only traces of this path (reply, cache, whisper)",
+    ),
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Get farmer response latency percentiles per stage.
+
+    Only accessible by admin users. For each stage between a farmer's
+    WhatsApp message and the delivery of our reply (transcription,
+    onboarding, AI job, AI processing, reply send, delivery) returns
+    the number of traces and the p50/p95/p99 duration in ms.
+    """
+    if current_user.user_type != UserType.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin users can access this endpoint",
+        )
+
+    return ResponseTraceService(db).get_latency_percentiles(
+        days=days, path=path
+    )
+
+
+@router.get("/response-latency/{message_id}")
+async def get_response_trace(
+    message_id: int,
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Get the stage timestamps of one farmer message.
+
+    Only accessible by admin users.
+    """
+    if current_user.user_type != UserType.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin users can access this endpoint",
+        )
+
+    trace = ResponseTraceService(db).get_trace(message_id)
+    if trace is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No trace for this message",
+        )
+    return trace
+
+
 def _get_user_customer_ids(
-    user: User, db: Session
+    user: Principal, db: Session
 ) -> Optional[List[int]]:
     """
     Get customer IDs accessible by the user based on their
     administrative area assignment.
     """
-    if user.user_type == UserType.ADMIN:
+    if user.is_admin:
         return None  # Admin can access all
 
-    # Get user's administrative areas
-    user_admins = (
-        db.query(UserAdministrative)
-        .filter(UserAdministrative.user_id == user.id)
-        .all()
-    )
-
-    if not user_admins:
+    if not user.ward_ids:
         return []
 
-    # Get all ward IDs under user's assigned areas
-    all_ward_ids = set()
-    for ua in user_admins:
-        ward_ids = AdministrativeService.get_descendant_ward_ids(
-            db, ua.administrative_id
-        )
-        if ward_ids:
-            all_ward_ids.update(ward_ids)
-        else:
-            # If no descendants, it might be a ward itself
-            all_ward_ids.add(ua.administrative_id)
-
     # Get customer IDs in these wards
     customer_ids = [
         ca.customer_id
         for ca in db.query(CustomerAdministrative)
-        .filter(CustomerAdministrative.administrative_id.in_(all_ward_ids))
+        .filter(
+            CustomerAdministrative.administrative_id.in_(list(user.ward_ids))
+        )
         .all()
     ]
 
@@ -262,8 +312,8 @@ async def get_crop_distribution(
     end_date: Optional[str] = Query(
         None, description="Filter end date (ISO 8601)"
     ),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get farmer count per crop type.
@@ -347,8 +397,8 @@ async def get_crop_distribution_matrix(
     end_date: Optional[str] = Query(
         None, description="Filter end date (ISO 8601)"
     ),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get crop distribution matrix by county (district level).
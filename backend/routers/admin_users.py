@@ -15,6 +15,7 @@ from schemas.user import (
 )
 from services.user_service import UserService
 from utils.auth_dependencies import admin_required
+from utils.search import is_estimate
 
 router = APIRouter(prefix="/admin/users", tags=["admin-users"])
 
@@ -33,6 +34,7 @@ def get_users_list(
     return UserListResponse(
         users=[UserResponse.model_validate(user) for user in users],
         total=total,
+        total_is_estimate=is_estimate(total),
         page=page,
         size=size,
     )
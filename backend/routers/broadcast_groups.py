@@ -3,17 +3,19 @@ Broadcast group management API endpoints.
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from typing import List, Optional
 
 from database import get_db
 from utils.auth_dependencies import get_current_user
 from models.user import User, UserType
 from models.customer import Customer
-from models.broadcast import BroadcastGroupContact
+from models.broadcast import BroadcastGroup
 from models.administrative import UserAdministrative
 from services.broadcast_service import get_broadcast_service
+from services.customer_service import CustomerService
 from schemas.broadcast import (
+    AudienceSegment,
+    AudienceSegmentPreview,
     BroadcastGroupCreate,
     BroadcastGroupUpdate,
     BroadcastGroupResponse,
@@ -24,47 +26,23 @@ from schemas.broadcast import (
 router = APIRouter(prefix="/broadcast/groups", tags=["Broadcast Groups"])
 
 
-def _derive_group_attributes(group_id: int, db: Session) -> dict:
-    """
-    Derive crop_types and age_groups from group members.
-    Returns dict with crop_types (list of names) and age_groups (list).
-    """
-    # Get distinct crop type names from group members
-    # Note: crop_type is now stored in profile_data JSON
-    crop_names = db.query(
-        func.distinct(Customer.profile_data.op("->>")("crop_type"))
-    ).join(
-        BroadcastGroupContact,
-        BroadcastGroupContact.customer_id == Customer.id
-    ).filter(
-        BroadcastGroupContact.broadcast_group_id == group_id,
-        Customer.profile_data.op("->>")("crop_type").isnot(None)
-    ).all()
-    crop_types_list = [name[0] for name in crop_names if name[0]]
-
-    # Get distinct age groups from group members
-    # Note: age_group is now a @property calculated from birth_year,
-    # so we need to fetch customers and calculate age_group in Python
-    customers = db.query(Customer).join(
-        BroadcastGroupContact,
-        BroadcastGroupContact.customer_id == Customer.id
-    ).filter(
-        BroadcastGroupContact.broadcast_group_id == group_id,
-        Customer.profile_data.op("->>")("birth_year").isnot(None)
-    ).all()
-
-    # Calculate age_groups using the Customer.age_group property
-    age_groups_set = set()
-    for customer in customers:
-        age_group = customer.age_group
-        if age_group:
-            age_groups_set.add(age_group)
-    age_groups_list = sorted(list(age_groups_set))
-
-    return {
-        "crop_types": crop_types_list,
-        "age_groups": age_groups_list
-    }
+def _group_response(
+    group: BroadcastGroup, summary: dict
+) -> BroadcastGroupResponse:
+    """Build a group response from its SQL-aggregated summary."""
+    return BroadcastGroupResponse(
+        id=group.id,
+        name=group.name,
+        crop_types=summary["crop_types"],
+        age_groups=summary["age_groups"],
+        age_group_counts=summary["age_group_counts"],
+        segment=group.segment,
+        administrative_id=group.administrative_id,
+        created_by=group.created_by,
+        contact_count=summary["contact_count"],
+        created_at=group.created_at,
+        updated_at=group.updated_at
+    )
 
 
 def _get_user_ward(user: User, db: Session) -> Optional[int]:
@@ -83,6 +61,43 @@ def _get_user_ward(user: User, db: Session) -> Optional[int]:
     return user_admin.administrative_id if user_admin else None
 
 
+def _segment_scope(user: User, db: Session) -> Optional[int]:
+    """
+    Area an EO's segments are restricted to (None for admins).
+
+    EOs without a ward cannot use segments, otherwise a segment would
+    match customers everywhere.
+    """
+    ward_id = _get_user_ward(user, db)
+    if user.user_type != UserType.ADMIN and ward_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Audience segments require an assigned ward"
+        )
+    return ward_id
+
+
+def _segment_data(segment: Optional[AudienceSegment]) -> Optional[dict]:
+    """Stored form of a segment (unset criteria omitted)."""
+    if segment is None:
+        return None
+    return segment.model_dump(exclude_none=True)
+
+
+@router.post("/preview", response_model=AudienceSegmentPreview)
+def preview_audience_segment(
+    segment: AudienceSegment,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Count the customers a segment would currently reach."""
+    scope_id = _segment_scope(current_user, db)
+    count = CustomerService(db).count_segment(
+        _segment_data(segment), scope_administrative_id=scope_id
+    )
+    return AudienceSegmentPreview(count=count)
+
+
 @router.post(
     "",
     response_model=BroadcastGroupResponse,
@@ -106,30 +121,22 @@ def create_broadcast_group(
         )
 
     # Get user's ward
-    ward_id = _get_user_ward(current_user, db)
+    if group_data.segment is not None:
+        ward_id = _segment_scope(current_user, db)
+    else:
+        ward_id = _get_user_ward(current_user, db)
 
     service = get_broadcast_service(db)
     group = service.create_group(
         name=group_data.name,
         customer_ids=group_data.customer_ids,
         created_by=current_user.id,
-        administrative_id=ward_id
+        administrative_id=ward_id,
+        segment=_segment_data(group_data.segment)
     )
 
-    # Derive crop_types and age_groups from members
-    derived_attrs = _derive_group_attributes(group.id, db)
-
-    return BroadcastGroupResponse(
-        id=group.id,
-        name=group.name,
-        crop_types=derived_attrs["crop_types"],
-        age_groups=derived_attrs["age_groups"],
-        administrative_id=group.administrative_id,
-        created_by=group.created_by,
-        contact_count=len(group_data.customer_ids),
-        created_at=group.created_at,
-        updated_at=group.updated_at
-    )
+    summary = service.get_group_summaries([group.id])[group.id]
+    return _group_response(group, summary)
 
 
 @router.get("", response_model=List[BroadcastGroupResponse])
@@ -150,24 +157,9 @@ def list_broadcast_groups(
             administrative_id=ward_id
         )
 
-    result = []
-    for group in groups:
-        # Derive crop_types and age_groups from members
-        derived_attrs = _derive_group_attributes(group.id, db)
-
-        result.append(BroadcastGroupResponse(
-            id=group.id,
-            name=group.name,
-            crop_types=derived_attrs["crop_types"],
-            age_groups=derived_attrs["age_groups"],
-            administrative_id=group.administrative_id,
-            created_by=group.created_by,
-            contact_count=len(group.group_contacts),
-            created_at=group.created_at,
-            updated_at=group.updated_at
-        ))
-
-    return result
+    # Summaries for all groups in two grouped queries
+    summaries = service.get_group_summaries([group.id for group in groups])
+    return [_group_response(group, summaries[group.id]) for group in groups]
 
 
 @router.get("/{group_id}", response_model=BroadcastGroupDetail)
@@ -203,14 +195,15 @@ def get_broadcast_group(
         for c in group.group_contacts
     ]
 
-    # Derive crop_types and age_groups from members
-    derived_attrs = _derive_group_attributes(group.id, db)
+    summary = service.get_group_summaries([group.id])[group.id]
 
     return BroadcastGroupDetail(
         id=group.id,
         name=group.name,
-        crop_types=derived_attrs["crop_types"],
-        age_groups=derived_attrs["age_groups"],
+        crop_types=summary["crop_types"],
+        age_groups=summary["age_groups"],
+        age_group_counts=summary["age_group_counts"],
+        segment=group.segment,
         administrative_id=group.administrative_id,
         created_by=group.created_by,
         contacts=contacts,
@@ -227,7 +220,10 @@ def update_broadcast_group(
     db: Session = Depends(get_db)
 ):
     """Update broadcast group (owner only)."""
-    ward_id = _get_user_ward(current_user, db)
+    if group_data.segment is not None:
+        ward_id = _segment_scope(current_user, db)
+    else:
+        ward_id = _get_user_ward(current_user, db)
 
     service = get_broadcast_service(db)
     group = service.update_group(
@@ -235,7 +231,9 @@ def update_broadcast_group(
         eo_id=current_user.id,
         name=group_data.name,
         customer_ids=group_data.customer_ids,
-        administrative_id=ward_id
+        administrative_id=ward_id,
+        segment=_segment_data(group_data.segment),
+        clear_segment=group_data.clear_segment
     )
 
     if not group:
@@ -244,20 +242,8 @@ def update_broadcast_group(
             detail="Broadcast group not found or not owner"
         )
 
-    # Derive crop_types and age_groups from members
-    derived_attrs = _derive_group_attributes(group.id, db)
-
-    return BroadcastGroupResponse(
-        id=group.id,
-        name=group.name,
-        crop_types=derived_attrs["crop_types"],
-        age_groups=derived_attrs["age_groups"],
-        administrative_id=group.administrative_id,
-        created_by=group.created_by,
-        contact_count=len(group.group_contacts),
-        created_at=group.created_at,
-        updated_at=group.updated_at
-    )
+    summary = service.get_group_summaries([group.id])[group.id]
+    return _group_response(group, summary)
 
 
 @router.delete("/{group_id}", status_code=status.HTTP_204_NO_CONTENT)
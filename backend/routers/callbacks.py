@@ -1,10 +1,12 @@
 import asyncio
 import logging
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from twilio.base.exceptions import TwilioRestException
 
+from config import settings
 from database import get_db
 from models.ticket import Ticket
 from models.message import DeliveryStatus, MessageFrom
@@ -15,9 +17,12 @@ from schemas.callback import (
     MessageType,
     CallbackStage,
 )
+from services.answer_cache_service import AnswerCacheService
 from services.message_service import MessageService
+from services.outbox_service import OutboxService
 from services.whatsapp_service import WhatsAppService
 from services.reconnection_service import ReconnectionService
+from services.response_trace_service import ResponseTraceService
 from services.twilio_status_service import TwilioStatusService
 from services.socketio_service import emit_whisper_created
 from services.socketio_service import emit_playground_response
@@ -152,6 +157,7 @@ async def ai_callback(
     db: Session = Depends(get_db),
 ):
     """Handle AI processing callbacks from external platforms"""
+    callback_at = datetime.now(timezone.utc)
     try:
         # Log the callback for debugging
         print(f"Job ID: {payload.job_id}")
@@ -206,6 +212,10 @@ async def ai_callback(
                     # Still acknowledge the callback even if we can't store
                     return {"status": "received", "job_id": payload.job_id}
 
+                original_message_id = payload.callback_params.message_id
+                tracer = ResponseTraceService(db)
+                tracer.mark(original_message_id, "ai_callback", at=callback_at)
+
                 # Handle message_type for AI callbacks
                 if payload.callback_params.message_type:
                     # Translate AI response if needed
@@ -243,6 +253,8 @@ async def ai_callback(
                                 and payload.output.citations
                                 and len(payload.output.citations) > 0
                             )
+                            # Answer as sent, for the answer cache
+                            answer_text = ai_response_text
                             if has_citations:
                                 disclaimer_text = t(
                                     "ai_response.disclaimer", customer_lang
@@ -255,22 +267,33 @@ async def ai_callback(
                                 f"Sending AI answer to {ai_message.customer.phone_number}"
                             )
 
-                            answer_response = whatsapp_service.send_message_with_tracking(
+                            # With the outbox, the answer and template are
+                            # queued in the commit below and the sender sets
+                            # the Twilio SID and reply_sent
+                            outbox = OutboxService(db, whatsapp_service)
+                            answer_response = outbox.send_message(
                                 to_number=ai_message.customer.phone_number,
                                 message_body=WhatsAppService.sanitize_whatsapp_content(
                                     ai_response_text
                                 ),
                                 message_id=ai_message.id,
-                                db=db,
+                                trace_message_id=original_message_id,
+                                e164=ai_message.customer.phone_e164,
                             )
 
-                            # Update message with real Twilio SID
-                            ai_message.message_sid = answer_response["sid"]
-                            ai_message.delivery_status = DeliveryStatus.SENT
+                            if answer_response:
+                                # Sent inline: update message with real Twilio SID
+                                ai_message.message_sid = answer_response["sid"]
+                                ai_message.delivery_status = DeliveryStatus.SENT
+                                tracer.mark(
+                                    original_message_id,
+                                    "reply_sent",
+                                    reply_message_id=ai_message.id,
+                                )
 
-                            logger.info(
-                                f"✓ AI answer sent successfully: {answer_response['sid']}"
-                            )
+                                logger.info(
+                                    f"✓ AI answer sent successfully: {answer_response['sid']}"
+                                )
 
                             # Step 2: Send confirmation template only if citations exist
                             # Citations indicate the response is from knowledge base
@@ -294,14 +317,15 @@ async def ai_callback(
                                 )
                                 if template_sid:
                                     try:
-                                        template_response = whatsapp_service.send_template_message(
+                                        template_response = outbox.send_template_message(
                                             to=ai_message.customer.phone_number,
                                             content_sid=template_sid,
                                             content_variables={},
                                         )
-                                        logger.info(
-                                            f"✓ Confirmation template sent: {template_response['sid']}"
-                                        )
+                                        if template_response:
+                                            logger.info(
+                                                f"✓ Confirmation template sent: {template_response['sid']}"
+                                            )
                                     except Exception as e:
                                         logger.warning(
                                             f"Failed to send confirmation template (non-critical): {e}"
@@ -326,6 +350,20 @@ async def ai_callback(
                                 f"✓ AI message {ai_message.id} delivered and committed"
                             )
 
+                            if settings.answer_cache_enabled:
+                                question = message_service.get_message_by_id(
+                                    payload.callback_params.message_id
+                                )
+                                if question:
+                                    await AnswerCacheService(
+                                        db
+                                    ).store_ai_reply(
+                                        question_message=question,
+                                        reply=ai_message,
+                                        answer=answer_text,
+                                        has_citations=bool(has_citations),
+                                    )
+
                         except (TwilioRestException, ValueError) as e:
                             # CRITICAL: Rollback on Twilio/validation failure
                             logger.error(f"✗ WhatsApp delivery failed: {e}")
@@ -7,14 +7,13 @@ from collections import defaultdict
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session, joinedload
-from database import get_db
+from database import get_db, get_read_db
 from services.administrative_service import AdministrativeService
 from models.administrative import (
-    UserAdministrative,
     CustomerAdministrative,
 )
 from models.customer import Customer
-from models.user import User, UserType
+from models.user import UserType
 from schemas.customer import (
     CustomerCreate,
     CustomerListResponse,
@@ -22,51 +21,13 @@ from schemas.customer import (
     CustomerUpdate,
 )
 from services.customer_service import CustomerService
-from utils.auth_dependencies import admin_required, get_current_user
+from services.principal_service import Principal
+from utils.auth_dependencies import admin_required, get_current_principal
+from utils.search import is_estimate, search_condition
 
 router = APIRouter(prefix="/customers", tags=["customers"])
 
 
-def _get_user_administrative_ids(user: User, db: Session) -> List[int]:
-    """Get list of administrative IDs accessible by the user.
-
-    For upper-level EOs (assigned to region/district), this returns
-    all descendant ward IDs so they can access customers in subordinate areas.
-
-    Args:
-        user: The current authenticated user
-        db: Database session
-
-    Returns:
-        Empty list for ADMIN (can access all), list of ward IDs for EO
-    """
-    from services.administrative_service import AdministrativeService
-
-    if user.user_type == UserType.ADMIN:
-        # Admin can access all customers
-        return []
-
-    # EO can access customers in their assigned areas and all descendant wards
-    user_admins = (
-        db.query(UserAdministrative)
-        .filter(UserAdministrative.user_id == user.id)
-        .all()
-    )
-
-    # Collect all accessible ward IDs (including descendants)
-    all_ward_ids = set()
-    for ua in user_admins:
-        # Add the assigned area itself
-        all_ward_ids.add(ua.administrative_id)
-        # Add all descendant wards
-        descendant_ids = AdministrativeService.get_descendant_ward_ids(
-            db, ua.administrative_id
-        )
-        all_ward_ids.update(descendant_ids)
-
-    return list(all_ward_ids)
-
-
 @router.post("/", response_model=CustomerResponse)
 async def create_customer(
     customer_data: CustomerCreate,
@@ -108,7 +69,7 @@ async def get_all_customers(
     ),
     search: Optional[str] = Query(None, description="Search by name or phone"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Get all customers with optional filtering by administrative area."""
     # Load customers with administrative data
@@ -126,7 +87,7 @@ async def get_all_customers(
 
     if current_user.user_type != UserType.ADMIN:
         # EO can only see customers in their assigned areas and descendants
-        user_admin_ids = _get_user_administrative_ids(current_user, db)
+        user_admin_ids = current_user.accessible_administrative_ids()
         filter_admin_ids = user_admin_ids
     elif administrative_id:
         # Admin filtering by specific administrative area
@@ -146,12 +107,11 @@ async def get_all_customers(
         )
 
     # Apply search filter
-    if search:
-        search_term = f"%{search.lower()}%"
-        customers = customers.filter(
-            (Customer.full_name.ilike(search_term)) |
-            (Customer.phone_number.ilike(search_term))
+    if search and search.strip():
+        condition, _ = search_condition(
+            search, [Customer.full_name], Customer.phone_number
         )
+        customers = customers.filter(condition)
 
     customers = customers.all()
 
@@ -206,7 +166,7 @@ async def get_customers_list(
         ),
     ),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Get paginated list of customers with optional filters.
 
@@ -225,7 +185,7 @@ async def get_customers_list(
     customer_service = CustomerService(db)
 
     # Get administrative IDs based on user role
-    user_administrative_ids = _get_user_administrative_ids(current_user, db)
+    user_administrative_ids = current_user.accessible_administrative_ids()
 
     # Expand administrative_ids filter to descendant wards if provided
     requested_ward_ids = None
@@ -297,7 +257,11 @@ async def get_customers_list(
     )
 
     return CustomerListResponse(
-        customers=customers, total=total, page=page, size=size
+        customers=customers,
+        total=total,
+        total_is_estimate=is_estimate(total),
+        page=page,
+        size=size,
     )
 
 
@@ -308,8 +272,8 @@ async def export_customers_csv(
         description="Filter by admin area ID (includes descendants)"
     ),
     search: Optional[str] = Query(None, description="Search by name or phone"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Export customers to CSV file.
 
@@ -333,7 +297,7 @@ async def export_customers_csv(
 
     if current_user.user_type != UserType.ADMIN:
         # EO can only see customers in their assigned areas and descendants
-        user_admin_ids = _get_user_administrative_ids(current_user, db)
+        user_admin_ids = current_user.accessible_administrative_ids()
         filter_admin_ids = user_admin_ids
     elif administrative_id:
         # Admin filtering by specific administrative area
@@ -351,12 +315,11 @@ async def export_customers_csv(
         )
 
     # Apply search filter
-    if search:
-        search_term = f"%{search.lower()}%"
-        customers = customers.filter(
-            (Customer.full_name.ilike(search_term)) |
-            (Customer.phone_number.ilike(search_term))
+    if search and search.strip():
+        condition, _ = search_condition(
+            search, [Customer.full_name], Customer.phone_number
         )
+        customers = customers.filter(condition)
 
     customers = customers.all()
 
@@ -447,7 +410,7 @@ async def export_customers_csv(
 async def get_customer(
     customer_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Get specific customer by ID (admin only)."""
     CustomerService(db)
@@ -464,7 +427,7 @@ async def update_customer(
     customer_id: int,
     customer_update: CustomerUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Update customer profile (admin only) - Progressive profiling."""
     customer_service = CustomerService(db)
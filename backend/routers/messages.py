@@ -5,15 +5,14 @@ from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional
 
 from database import get_db
 from models.message import Message, MessageFrom, MessageStatus, MediaType
 from models.ticket import Ticket
-from models.user import User, UserType
-from models.administrative import UserAdministrative
-from utils.auth_dependencies import get_current_user
-from services.administrative_service import AdministrativeService
+from models.user import UserType
+from services.principal_service import Principal
+from utils.auth_dependencies import get_current_principal
 from services.whatsapp_service import WhatsAppService
 from services.socketio_service import (
     emit_message_received,
@@ -23,37 +22,6 @@ from services.socketio_service import (
 router = APIRouter(prefix="/messages", tags=["messages"])
 
 
-def _get_user_administrative_ids(user: User, db: Session) -> List[int]:
-    """Get list of administrative IDs accessible by the user.
-
-    For upper-level EOs (assigned to region/district), this returns
-    all descendant ward IDs so they can access messages in subordinate areas.
-    """
-    if user.user_type == UserType.ADMIN:
-        # Admin can access all messages
-        return []
-
-    # EO can access messages in their assigned areas and all descendant wards
-    user_admins = (
-        db.query(UserAdministrative)
-        .filter(UserAdministrative.user_id == user.id)
-        .all()
-    )
-
-    # Collect all accessible ward IDs (including descendants)
-    all_ward_ids = set()
-    for ua in user_admins:
-        # Add the assigned area itself
-        all_ward_ids.add(ua.administrative_id)
-        # Add all descendant wards
-        descendant_ids = AdministrativeService.get_descendant_ward_ids(
-            db, ua.administrative_id
-        )
-        all_ward_ids.update(descendant_ids)
-
-    return list(all_ward_ids)
-
-
 # Schemas
 class MessageStatusUpdate(BaseModel):
     status: int
@@ -83,7 +51,9 @@ class MessageResponse(BaseModel):
     media_type: str = "TEXT"
 
 
-def _check_message_access(message: Message, user: User, db: Session) -> None:
+def _check_message_access(
+    message: Message, user: Principal, db: Session
+) -> None:
     """Check if user has access to update the message. Raises 403 if not."""
     # Get the ticket associated with this message
     ticket = (
@@ -104,7 +74,7 @@ def _check_message_access(message: Message, user: User, db: Session) -> None:
 
     # EO can only access messages in their administrative area
     # (including descendant wards for upper-level officers)
-    admin_ids = _get_user_administrative_ids(user, db)
+    admin_ids = user.accessible_administrative_ids()
     if ticket.administrative_id not in admin_ids:
         raise HTTPException(
             status_code=403,
@@ -129,7 +99,7 @@ MAX_IMAGE_SIZE = 16 * 1024 * 1024
 @router.post("/upload-image")
 async def upload_message_image(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """
     Upload an image for sending via WhatsApp.
@@ -189,7 +159,7 @@ async def update_message_status(
     message_id: int,
     status_update: MessageStatusUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """
     Update the status of a message.
@@ -282,7 +252,7 @@ async def update_message_status(
 async def create_message(
     message_data: MessageCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """
     Create a new message (User reply).
@@ -303,7 +273,7 @@ async def create_message(
 
     # Check access (including descendant wards for upper-level officers)
     if current_user.user_type != UserType.ADMIN:
-        admin_ids = _get_user_administrative_ids(current_user, db)
+        admin_ids = current_user.accessible_administrative_ids()
 
         if ticket.administrative_id not in admin_ids:
             raise HTTPException(
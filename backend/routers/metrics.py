@@ -0,0 +1,29 @@
+"""
+Prometheus metrics endpoint.
+
+Serves the metrics of all API worker processes (see utils/metrics.py).
+"""
+
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Response, status
+
+from config import settings
+from utils.metrics import render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics(authorization: Optional[str] = Header(None)):
+    """Metrics in the Prometheus text format"""
+    if settings.metrics_token:
+        expected = f"Bearer {settings.metrics_token}"
+        if not secrets.compare_digest(authorization or "", expected):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid metrics token",
+            )
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -10,7 +10,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
-from database import get_db
+from database import get_read_db
 from schemas.statistic import (
     FarmerStatsResponse,
     FarmerStatsByWardResponse,
@@ -33,8 +33,12 @@ from schemas.statistic import (
     TicketWaitingResponseFilters,
     WaitingResponseStats,
     TicketWaitingItem,
+    DeliveryStatsResponse,
+    DBPoolStats,
+    DBPoolStatsResponse,
 )
 from services.statistic_service import StatisticService
+from utils.db_metrics import get_pool_metrics
 from utils.statistic_auth import verify_statistic_token
 
 router = APIRouter(
@@ -66,7 +70,7 @@ async def get_farmer_statistics(
     active_days: int = Query(
         30, description="Days to consider a farmer as 'active' (default: 30)"
     ),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get comprehensive farmer statistics.
@@ -126,7 +130,7 @@ async def get_farmer_statistics_by_ward(
     crop_type: Optional[str] = Query(
         None, description="Filter by crop type (e.g., 'maize', 'coffee')"
     ),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get farmer statistics grouped by ward.
@@ -183,7 +187,7 @@ async def get_registration_chart_data(
     group_by: str = Query(
         "day", description="Group by: 'day', 'week', or 'month'"
     ),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get registration data for charting.
@@ -242,7 +246,7 @@ async def get_eo_statistics(
         description="Filter by administrative area ID. Filters tickets "
         "by customers in that area."
     ),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get EO (Extension Officer) statistics.
@@ -289,7 +293,7 @@ async def get_eo_statistics_by_eo(
         description="Filter to EOs assigned to this area or its "
         "descendant areas."
     ),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get EO statistics grouped by individual EO.
@@ -329,7 +333,7 @@ async def get_eo_count(
         description="Filter to EOs in this administrative area. "
         "Works with any level (region, district, ward)."
     ),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get count of active EOs.
@@ -355,7 +359,7 @@ async def get_eo_count(
 
 @router.get("/eo/list", response_model=EOListResponse)
 async def get_eo_list(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get list of all active EOs for filter dropdown.
@@ -392,7 +396,7 @@ async def get_farmer_aggregate(
     end_date: Optional[str] = Query(
         None, description="Filter end date (ISO 8601 format)"
     ),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get farmer data aggregated by administrative level.
@@ -445,7 +449,7 @@ async def get_eo_aggregate(
     end_date: Optional[str] = Query(
         None, description="Filter end date (ISO 8601 format)"
     ),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get EO data aggregated by administrative level.
@@ -492,7 +496,7 @@ async def get_crop_distribution(
         description="Filter by administrative area ID (region, district, "
         "or ward). Aggregates data from all descendant areas."
     ),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get farmer count per crop type.
@@ -537,7 +541,7 @@ async def get_crop_distribution_matrix(
         description="Filter by administrative area ID (region, district). "
         "Shows only districts under this area."
     ),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get crop distribution matrix by administrative level.
@@ -590,7 +594,7 @@ async def get_tickets_waiting_response(
         description="Filter by administrative area ID (region, district, "
         "or ward). Shows tickets from all descendant wards."
     ),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get tickets waiting for EO response, categorized by wait time.
@@ -637,3 +641,73 @@ async def get_tickets_waiting_response(
         ],
         filters=TicketWaitingResponseFilters(**result["filters"]),
     )
+
+
+@router.get("/messages/delivery", response_model=DeliveryStatsResponse)
+async def get_delivery_statistics(
+    start_date: Optional[str] = Query(
+        None, description="Filter start date (ISO 8601 format)"
+    ),
+    end_date: Optional[str] = Query(
+        None, description="Filter end date (ISO 8601 format)"
+    ),
+    administrative_id: Optional[int] = Query(
+        None,
+        description="Filter by administrative area ID (region, district, "
+        "or ward). Aggregates data from all descendant areas."
+    ),
+    message_type: Optional[str] = Query(
+        None,
+        description="Filter by message type: 'REPLY', 'WHISPER', "
+        "'BROADCAST' or 'FOLLOW_UP'",
+    ),
+    group_by: str = Query(
+        "day", description="Group by: 'day', 'week', or 'month'"
+    ),
+    include_wards: bool = Query(
+        False, description="Include per-ward delivery breakdown"
+    ),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Get outbound WhatsApp delivery statistics for Twilio health monitoring.
+
+    Returns overall delivery counts by status, a delivery-rate time series
+    grouped by day, week, or month, and breakdowns by message type and
+    Twilio error code. Set include_wards to also get per-ward delivery
+    rates.
+
+    Authentication: Bearer token required (STATISTIC_API_TOKEN)
+    """
+    if group_by not in ("day", "week", "month"):
+        group_by = "day"
+
+    service = StatisticService(db)
+    result = service.get_delivery_stats(
+        start_date=start_date,
+        end_date=end_date,
+        administrative_id=administrative_id,
+        message_type=message_type,
+        group_by=group_by,
+        include_wards=include_wards,
+    )
+
+    return DeliveryStatsResponse(**result)
+
+
+@router.get("/system/db-pool", response_model=DBPoolStatsResponse)
+async def get_db_pool_statistics():
+    """
+    Get database connection pool metrics for this worker process.
+
+    Returns pool size, checked-out connections, saturation (checked out
+    divided by pool size plus overflow) and checkout latency for the
+    primary engine and, when READ_DATABASE_URL is set, the read replica.
+    Each uvicorn or Celery worker has its own pools, so poll every
+    worker to get the full picture.
+
+    Authentication: Bearer token required (STATISTIC_API_TOKEN)
+    """
+    return DBPoolStatsResponse(
+        pools=[DBPoolStats(**pool) for pool in get_pool_metrics()]
+    )
@@ -0,0 +1,57 @@
+"""
+Delta-sync API for the mobile app's offline SQLite mirror.
+
+The app stores the returned cursor and sends it back on the next
+refresh. It gets only the tickets, messages (including delivery status
+changes) and customer profiles that changed since then, limited to the
+user's wards.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from database import get_db
+from schemas.sync import SyncResponse
+from services.principal_service import Principal
+from services.sync_service import InvalidSyncCursor, SyncService
+from utils.auth_dependencies import get_current_principal
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@router.get(
+    "/",
+    response_model=SyncResponse,
+    response_model_exclude_none=True,
+)
+async def sync_changes(
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the previous sync, omit for full sync"
+    ),
+    limit: int = Query(
+        SyncService.DEFAULT_LIMIT,
+        ge=1,
+        le=SyncService.MAX_LIMIT,
+        description="Max rows per entity type",
+    ),
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+):
+    """
+    Get changes since the cursor for the mobile app's local database.
+
+    - Rows are upserted by id on the client; the same row can be sent
+      again on a later sync
+    - Null fields are omitted from the payload
+    - When has_more is true, call again right away with the new cursor
+    """
+    try:
+        return SyncService(db).get_changes(
+            current_user, cursor=cursor, limit=limit
+        )
+    except InvalidSyncCursor as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from typing import Optional, List
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
@@ -10,10 +10,10 @@ from datetime import datetime, timezone
 from database import get_db
 from models.ticket import Ticket
 from models.customer import Customer
-from models.message import Message, MessageFrom
+from models.message import Message, get_from_source_string
 from schemas.callback import MessageType
-from models.user import User, UserType
-from models.administrative import UserAdministrative, Administrative
+from models.user import UserType
+from models.administrative import Administrative
 from schemas.ticket import (
     TicketCreate,
     TicketListResponse,
@@ -21,55 +21,25 @@ from schemas.ticket import (
     TicketMessagesResponse,
     TicketStatus,
 )
-from utils.auth_dependencies import get_current_user
+from services.outbox_service import OutboxService
+from services.principal_service import Principal
+from utils.auth_dependencies import get_current_principal
 from services.socketio_service import emit_ticket_resolved
-from services.tagging_service import classify_ticket, get_tag_name
+from services.tagging_service import get_tag_name
+from tasks.tagging_tasks import schedule_ticket_tagging
 
 router = APIRouter(prefix="/tickets", tags=["tickets"])
 logger = logging.getLogger(__name__)
 
 
-def _get_user_administrative_ids(user: User, db: Session) -> List[int]:
-    """Get list of administrative IDs accessible by the user.
-
-    For upper-level EOs (assigned to region/district), this returns
-    all descendant ward IDs so they can access tickets in subordinate areas.
-    """
-    from services.administrative_service import AdministrativeService
-
-    if user.user_type == UserType.ADMIN:
-        # Admin can access all tickets
-        return []
-
-    # EO can access tickets in their assigned areas and all descendant wards
-    user_admins = (
-        db.query(UserAdministrative)
-        .filter(UserAdministrative.user_id == user.id)
-        .all()
-    )
-
-    # Collect all accessible ward IDs (including descendants)
-    all_ward_ids = set()
-    for ua in user_admins:
-        # Add the assigned area itself
-        all_ward_ids.add(ua.administrative_id)
-        # Add all descendant wards
-        descendant_ids = AdministrativeService.get_descendant_ward_ids(
-            db, ua.administrative_id
-        )
-        all_ward_ids.update(descendant_ids)
-
-    return list(all_ward_ids)
-
-
-def _check_ticket_access(ticket: Ticket, user: User, db: Session) -> None:
+def _check_ticket_access(ticket: Ticket, user: Principal, db: Session) -> None:
     """Check if user has access to the ticket. Raises 403 if not."""
     if user.user_type == UserType.ADMIN:
         # Admin has access to all tickets
         return
 
     # EO can only access tickets in their administrative area
-    admin_ids = _get_user_administrative_ids(user, db)
+    admin_ids = user.accessible_administrative_ids()
     if ticket.administrative_id not in admin_ids:
         raise HTTPException(
             status_code=403,
@@ -210,7 +180,7 @@ async def list_tickets(
     status: Optional[TicketStatus] = Query(TicketStatus.OPEN),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """List tickets with pagination and optional status filter.
@@ -225,7 +195,7 @@ async def list_tickets(
     # Get administrative IDs for EO users
     admin_ids = None
     if current_user.user_type == UserType.EXTENSION_OFFICER:
-        admin_ids = _get_user_administrative_ids(current_user, db)
+        admin_ids = current_user.accessible_administrative_ids()
         if not admin_ids:
             # EO has no administrative assignments, return empty
             return {
@@ -290,7 +260,7 @@ async def list_tickets(
 @router.get("/{ticket_id}", response_model=TicketResponse)
 async def get_ticket_header(
     ticket_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Get ticket header information.
@@ -308,29 +278,12 @@ async def get_ticket_header(
     return {"ticket": _serialize_ticket(ticket)}
 
 
-# Helper to convert from_source integer to string
-def get_from_source_string(from_source: int) -> str:
-    """Convert from_source integer to string representation.
-    Uses MessageFrom constants:
-    - CUSTOMER = 1 -> "whatsapp"
-    - USER = 2 -> "system"
-    - LLM = 3 -> "llm"
-    """
-    if from_source == MessageFrom.CUSTOMER:
-        return "whatsapp"
-    elif from_source == MessageFrom.USER:
-        return "system"
-    elif from_source == MessageFrom.LLM:
-        return "llm"
-    return "unknown"
-
-
 @router.get("/{ticket_id}/messages", response_model=TicketMessagesResponse)
 async def get_ticket_conversation(
     ticket_id: int,
     before_ts: Optional[str] = None,
     limit: int = 10,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Get ticket conversation messages.
@@ -513,7 +466,7 @@ async def get_ticket_conversation(
 async def mark_ticket_resolved(
     ticket_id: int,
     payload: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Mark a ticket as resolved.
@@ -546,44 +499,13 @@ async def mark_ticket_resolved(
     ticket.resolved_by = current_user.id
     ticket.updated_at = datetime.utcnow()
 
-    # Auto-tag the ticket using AI
-    # Fetch conversation messages for classification
-    ticket_message = ticket.message
-    msgs_query = db.query(Message).filter(
-        Message.customer_id == ticket.customer_id
-    )
-    if ticket_message and ticket_message.created_at:
-        msgs_query = msgs_query.filter(
-            Message.created_at >= ticket_message.created_at,
-        )
-    msgs = msgs_query.order_by(Message.created_at.asc()).limit(50).all()
-
-    # Build message list for tagging
-    messages_for_tagging = [
-        {
-            "body": m.body,
-            "from_source": get_from_source_string(m.from_source),
-        }
-        for m in msgs
-    ]
-
-    # Classify the ticket
-    tagging_result = await classify_ticket(messages_for_tagging)
-    if tagging_result:
-        ticket.tag = tagging_result.tag.value
-        ticket.tag_confidence = tagging_result.confidence
-
-    db.commit()
-    db.refresh(ticket)
-
-    # Send WhatsApp notification to customer
+    # Notify the customer; queued in the resolution's commit
     try:
         from services.whatsapp_service import (
             WhatsAppService,
             WHATSAPP_MESSAGES,
         )
 
-        whatsapp = WhatsAppService()
         customer = ticket.customer
 
         if customer and customer.phone_number:
@@ -594,10 +516,18 @@ async def mark_ticket_resolved(
             )
 
             if message_template:
-                whatsapp.send_message(customer.phone_number, message_template)
+                OutboxService(db, WhatsAppService()).send_message(
+                    customer.phone_number, message_template
+                )
     except Exception as e:
         logger.error(f"Failed to send ticket closure WhatsApp: {e}")
 
+    db.commit()
+    db.refresh(ticket)
+
+    # Tag in the background; clients get a ticket_tagged event
+    schedule_ticket_tagging()
+
     # Emit WebSocket event for ticket resolution
     asyncio.create_task(
         emit_ticket_resolved(
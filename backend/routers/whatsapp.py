@@ -2,9 +2,11 @@ import asyncio
 import logging
 import os
 import uuid
+from datetime import datetime, timezone
 from typing import Annotated, Optional
 
 from fastapi import APIRouter, Depends, Form, HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from config import settings
@@ -17,13 +19,16 @@ from models.message import (
     MediaType,
     DeliveryStatus,
 )
+from models.response_trace import ResponsePath
 from models.ticket import Ticket
 from models.administrative import Administrative
 from models.customer import (
     OnboardingStatus,
     Customer,
 )
+from services.conversation_state_service import ConversationStateService
 from services.customer_service import CustomerService
+from services.outbox_service import OutboxService
 from services.whatsapp_service import WhatsAppService
 from services.external_ai_service import get_external_ai_service
 from services.reconnection_service import ReconnectionService
@@ -33,7 +38,10 @@ from services.onboarding_service import get_onboarding_service
 from services.openai_service import get_openai_service
 from services.follow_up_service import get_follow_up_service
 from services.administrative_service import AdministrativeService
+from services.answer_cache_service import AnswerCacheService
+from services.response_trace_service import ResponseTraceService
 from utils.i18n import t
+from utils.webhook_dedupe import get_webhook_dedupe
 from schemas.callback import TwilioStatusCallback, TwilioMessageStatus
 from models.broadcast import BroadcastRecipient
 from tasks.broadcast_tasks import send_actual_message
@@ -42,6 +50,14 @@ router = APIRouter(prefix="/whatsapp", tags=["whatsapp"])
 logger = logging.getLogger(__name__)
 
 
+def _is_processed(db: Session, message_sid: str) -> bool:
+    """Whether a message with this Twilio SID is already stored"""
+    return (
+        db.query(Message.id).filter(Message.message_sid == message_sid).first()
+        is not None
+    )
+
+
 @router.post("/webhook")
 async def whatsapp_webhook(
     From: Annotated[str, Form()],
@@ -60,7 +76,15 @@ async def whatsapp_webhook(
     Flow 2: Regular message → Process normally
     Flow 3: Button "escalate" → Create ticket + WHISPER job (AI suggests to EO)
     """
+    # Stage timestamps for the response latency trace
+    received_at = datetime.now(timezone.utc)
+    transcribed_at = None
+    dedupe = get_webhook_dedupe()
     try:
+        # Drop Twilio retries before downloading or transcribing media
+        if not dedupe.claim(MessageSid) or _is_processed(db, MessageSid):
+            return {"status": "success", "message": "Already processed"}
+
         phone_number = From.replace("whatsapp:", "")
         media_url = None
         media_type = MediaType.TEXT
@@ -143,6 +167,8 @@ async def whatsapp_webhook(
                             f"Failed to delete temp file " f"{temp_file}: {e}"
                         )
 
+            transcribed_at = datetime.now(timezone.utc)
+
         # ========================================
         # IMAGE MESSAGE HANDLING
         # ========================================
@@ -216,13 +242,6 @@ async def whatsapp_webhook(
         # (Body is now either original text or transcribed text)
         # ========================================
 
-        # Check if message already processed
-        existing_message = (
-            db.query(Message).filter(Message.message_sid == MessageSid).first()
-        )
-        if existing_message:
-            return {"status": "success", "message": "Already processed"}
-
         customer_service = CustomerService(db)
         customer = customer_service.get_or_create_customer(phone_number, Body)
         if not customer:
@@ -230,25 +249,14 @@ async def whatsapp_webhook(
                 status_code=500, detail="Failed to create or retrieve customer"
             )
 
-        is_new_customer = (
-            db.query(Message)
-            .filter(Message.customer_id == customer.id)
-            .count()
-            == 0
-        )
+        # Message count, open ticket and pending EO messages in one read
+        conversation = ConversationStateService(db).get(customer.id)
+        is_new_customer = not conversation.has_messages
 
         # Check if reconnection template needed (24+ hours inactive)
         if not is_new_customer:
             # Get total pending messages from user to avoid spamming
-            pending_message_count = (
-                db.query(Message)
-                .filter(
-                    Message.customer_id == customer.id,
-                    Message.from_source == MessageFrom.USER,
-                    Message.delivery_status == DeliveryStatus.UNDELIVERED,
-                )
-                .count()
-            )
+            pending_message_count = conversation.pending_undelivered
             reconnection_service = ReconnectionService(db)
             if reconnection_service.check_and_send_reconnection(
                 customer, pending_message_count
@@ -260,12 +268,9 @@ async def whatsapp_webhook(
                 # Continue processing message normally after reconnection
         # Check if customer has an existing unresolved ticket
         existing_ticket = (
-            db.query(Ticket)
-            .filter(
-                Ticket.customer_id == customer.id,
-                Ticket.resolved_at.is_(None),
-            )
-            .first()
+            db.get(Ticket, conversation.open_ticket_id)
+            if conversation.open_ticket_id
+            else None
         )
 
         # ========================================
@@ -291,12 +296,11 @@ async def whatsapp_webhook(
         if customer.delete_requested:
             if body_stripped in confirm_responses:
                 # Send deletion success message BEFORE deleting
-                whatsapp_service = WhatsAppService()
-                whatsapp_service.send_message(
-                    phone_number, t("account.deleted", lang)
-                )
+                outbox = OutboxService(db, WhatsAppService())
+                outbox.send_message(phone_number, t("account.deleted", lang))
 
                 # Delete customer using existing service method
+                # (its commit also queues the message above)
                 customer_service.delete_customer(customer.id)
 
                 logger.info(
@@ -317,12 +321,11 @@ async def whatsapp_webhook(
         if body_stripped in delete_keywords:
             # Set delete_requested flag and send confirmation
             customer.delete_requested = True
-            db.commit()
-
-            whatsapp_service = WhatsAppService()
-            whatsapp_service.send_message(
+            outbox = OutboxService(db, WhatsAppService())
+            outbox.send_message(
                 phone_number, t("account.delete_confirmation", lang)
             )
+            db.commit()
 
             logger.info(
                 f"Customer {phone_number} requested deletion, "
@@ -354,10 +357,9 @@ async def whatsapp_webhook(
             )
 
             # Send onboarding response to farmer
-            whatsapp_service = WhatsAppService()
-            whatsapp_service.send_message(
-                phone_number, onboarding_response.message
-            )
+            outbox = OutboxService(db, WhatsAppService())
+            outbox.send_message(phone_number, onboarding_response.message)
+            db.commit()
 
             logger.info(
                 f"Onboarding response sent to {phone_number} "
@@ -405,7 +407,7 @@ async def whatsapp_webhook(
                     area_name = customer.customer_administrative[
                         0
                     ].administrative.name
-                    whatsapp_service.send_interactive_buttons(
+                    outbox.send_interactive_buttons(
                         to_number=phone_number,
                         body_text=t(
                             "weather_subscription.question", lang
@@ -425,6 +427,7 @@ async def whatsapp_webhook(
                             },
                         ],
                     )
+                    db.commit()
                     logger.info(
                         f"Weather subscription buttons sent to {phone_number}"
                     )
@@ -444,6 +447,7 @@ async def whatsapp_webhook(
                     "message": "Onboarding failed",
                 }
 
+        onboarded_at = datetime.now(timezone.utc)
         escalate_payload = settings.whatsapp_escalate_button_payload
 
         # ========================================
@@ -586,16 +590,17 @@ async def whatsapp_webhook(
                     customer, subscribed=False, lang=lang
                 )
 
-            whatsapp_service = WhatsAppService()
-            whatsapp_service.send_message(phone_number, response_msg)
+            outbox = OutboxService(db, WhatsAppService())
+            outbox.send_message(phone_number, response_msg)
 
             # Send welcome message after weather question (new customers only)
             # This completes the onboarding flow with a helpful prompt
             if is_new_customer:
                 try:
-                    whatsapp_service.send_welcome_message(phone_number, lang)
+                    outbox.send_welcome_message(phone_number, lang)
                 except Exception as e:
                     logger.error(f"Failed to send welcome message: {e}")
+            db.commit()
 
             return {
                 "status": "success",
@@ -764,10 +769,11 @@ async def whatsapp_webhook(
                 )
 
             # Send WhatsApp message to customer
-            whatsapp_service.send_message(
+            OutboxService(db, whatsapp_service).send_message(
                 to_number=customer.phone_number,
                 message_body=confirmation_msg,
             )
+            db.commit()
             logger.info(
                 f"Sent escalation confirmation to {customer.phone_number} "
                 f"with {len(eo_list)} EO contacts"
@@ -794,10 +800,11 @@ async def whatsapp_webhook(
                 .all()
             )
 
-            # Re-send via whatsapp service
-            whatsapp_service = WhatsAppService()
+            # Re-send via whatsapp service; with the outbox the resend
+            # and the delete below are committed together
+            outbox = OutboxService(db, WhatsAppService())
             for undelivered_msg in undelivered_messages:
-                whatsapp_service.send_message(
+                outbox.send_message(
                     to_number=customer.phone_number,
                     message_body=undelivered_msg.body,
                 )
@@ -873,6 +880,16 @@ async def whatsapp_webhook(
             media_type=media_type,
         )
         db.add(message)
+        db.flush()
+        ResponseTraceService(db).start(
+            message_id=message.id,
+            path=(
+                ResponsePath.WHISPER if existing_ticket else ResponsePath.REPLY
+            ),
+            received_at=received_at,
+            transcribed_at=transcribed_at,
+            onboarded_at=onboarded_at,
+        )
         db.commit()
         db.refresh(message)
 
@@ -996,7 +1013,7 @@ async def whatsapp_webhook(
                 follow_up_service = get_follow_up_service(db)
 
                 should_ask = follow_up_service.should_ask_follow_up(
-                    customer, chat_history
+                    customer, chat_history, conversation=conversation
                 )
                 if should_ask:
                     follow_up_message = await follow_up_service.ask_follow_up(
@@ -1029,8 +1046,17 @@ async def whatsapp_webhook(
 
                 chats.append({"role": role, "content": msg.body})
 
+            # Near-duplicate questions are answered from the semantic
+            # answer cache without an external AI job (opt-in)
+            cached_reply = None
+            if settings.answer_cache_enabled:
+                answer_cache = AnswerCacheService(db)
+                cached_reply = await answer_cache.answer_from_cache(
+                    customer=customer, message=message
+                )
+
             # Create REPLY job (AI answers farmer directly) if not testing
-            if not os.getenv("TESTING"):
+            if cached_reply is None and not os.getenv("TESTING"):
                 ai_service = get_external_ai_service(db)
                 asyncio.create_task(
                     ai_service.create_chat_job(
@@ -1056,11 +1082,11 @@ async def whatsapp_webhook(
             and customer.onboarding_status != OnboardingStatus.COMPLETED
         ):
             try:
-                whatsapp_service = WhatsAppService()
                 language_code = customer.language_code
-                whatsapp_service.send_welcome_message(
+                OutboxService(db, WhatsAppService()).send_welcome_message(
                     phone_number, language_code
                 )
+                db.commit()
             except Exception as e:
                 logger.error(f"Failed to send welcome message: {e}")
 
@@ -1074,8 +1100,18 @@ async def whatsapp_webhook(
 
         return {"status": "success", "message": "Message processed"}
 
+    except IntegrityError as e:
+        db.rollback()
+        # A concurrent request stored the same MessageSid first
+        if _is_processed(db, MessageSid):
+            return {"status": "success", "message": "Already processed"}
+        dedupe.release(MessageSid)
+        logger.error(f"Error processing WhatsApp message: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
     except Exception as e:
         db.rollback()
+        # Let Twilio's retry through the dedupe gate
+        dedupe.release(MessageSid)
         logger.error(f"Error processing WhatsApp message: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -2,6 +2,13 @@
 
 alembic upgrade head
 
+# Metrics of all uvicorn workers are aggregated through this directory;
+# samples of earlier runs must not be served
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
 # Use uvicorn for production with WebSocket support
-uvicorn main:app --host 0.0.0.0 --port 8000 --workers 4
+DB_ENGINE_PROFILE=${DB_ENGINE_PROFILE:-web} \
+    uvicorn main:app --host 0.0.0.0 --port 8000 --workers 4
 
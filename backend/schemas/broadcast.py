@@ -2,8 +2,33 @@
 Schemas for broadcast group and message management.
 """
 from datetime import datetime
-from typing import List, Optional
-from pydantic import BaseModel, Field, validator
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field, model_validator, validator
+
+
+# ========== Audience Segment Schemas ==========
+
+class AudienceSegment(BaseModel):
+    """
+    Filter-defined audience, resolved to customers at send time.
+
+    Empty criteria match everyone; values within a criterion are
+    combined with OR, criteria with AND.
+    """
+    # Areas of any level; customers in their subtrees match
+    administrative_ids: Optional[List[int]] = None
+    crop_types: Optional[List[str]] = None
+    genders: Optional[List[str]] = None
+    age_groups: Optional[List[str]] = None  # Configured age group labels
+    languages: Optional[List[str]] = None
+    weather_subscribed: Optional[bool] = None
+    # Customers who sent a message within the last N days
+    active_within_days: Optional[int] = Field(None, ge=1, le=3650)
+
+
+class AudienceSegmentPreview(BaseModel):
+    """Number of customers currently matching a segment"""
+    count: int
 
 
 # ========== Broadcast Group Schemas ==========
@@ -12,9 +37,11 @@ class BroadcastGroupCreate(BaseModel):
     """Request schema for creating a broadcast group"""
     name: str = Field(..., min_length=1, max_length=255)
     customer_ids: List[int] = Field(
-        ..., min_items=1, max_items=500,
+        default_factory=list, max_items=500,
         description="Selected customer IDs"
     )
+    # Dynamic members, resolved when a broadcast is sent
+    segment: Optional[AudienceSegment] = None
 
     @validator('customer_ids')
     def validate_customer_ids(cls, v):
@@ -22,6 +49,12 @@ class BroadcastGroupCreate(BaseModel):
             raise ValueError('Duplicate customer IDs not allowed')
         return v
 
+    @model_validator(mode='after')
+    def validate_members(self):
+        if not self.customer_ids and self.segment is None:
+            raise ValueError('Either customer_ids or segment is required')
+        return self
+
 
 class BroadcastGroupUpdate(BaseModel):
     """Request schema for updating a broadcast group"""
@@ -30,6 +63,9 @@ class BroadcastGroupUpdate(BaseModel):
         None, min_items=1, max_items=500,
         description="Selected customer IDs"
     )
+    segment: Optional[AudienceSegment] = None
+    # Drop the segment, making the group static again
+    clear_segment: bool = False
 
     @validator('customer_ids')
     def validate_customer_ids(cls, v):
@@ -55,6 +91,9 @@ class BroadcastGroupResponse(BaseModel):
     name: str
     crop_types: Optional[List[str]] = None  # Crop names from members
     age_groups: Optional[List[str]] = None  # Age groups from members
+    # Members per age group label
+    age_group_counts: Optional[Dict[str, int]] = None
+    segment: Optional[AudienceSegment] = None
     administrative_id: Optional[int]
     created_by: int
     contact_count: int
@@ -71,6 +110,9 @@ class BroadcastGroupDetail(BaseModel):
     name: str
     crop_types: Optional[List[str]] = None  # Crop names from members
     age_groups: Optional[List[str]] = None  # Age groups from members
+    # Members per age group label
+    age_group_counts: Optional[Dict[str, int]] = None
+    segment: Optional[AudienceSegment] = None
     administrative_id: Optional[int]
     created_by: int
     contacts: List[BroadcastGroupContactResponse]
@@ -89,5 +89,7 @@ class CustomerListResponse(BaseModel):
 
     customers: List[CustomerListItem]
     total: int
+    # total is a planner estimate (beyond SEARCH_EXACT_COUNT_LIMIT)
+    total_is_estimate: bool = False
     page: int
     size: int
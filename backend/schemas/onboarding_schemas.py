@@ -248,13 +248,14 @@ ONBOARDING_FIELDS: List[OnboardingFieldConfig] = [
 ]
 
 
-def load_onboarding_fields() -> List[OnboardingFieldConfig]:
+def build_onboarding_fields(
+    config_fields: Optional[list],
+) -> List[OnboardingFieldConfig]:
     """
-    Load onboarding fields directly from settings config.
+    Build onboarding fields from the onboarding fields config.
     If config_fields is an empty array [], returns empty list (zero
     onboarding).
     """
-    config_fields = settings.onboarding_fields_config
     if config_fields is None:
         return [f for f in ONBOARDING_FIELDS if f.enabled]
     if isinstance(config_fields, list) and len(config_fields) == 0:
@@ -324,11 +325,23 @@ def load_onboarding_fields() -> List[OnboardingFieldConfig]:
     return enabled_fields
 
 
+def load_onboarding_fields() -> List[OnboardingFieldConfig]:
+    """
+    Enabled onboarding fields from settings config, by priority.
+    Served from the compiled config snapshot (utils.config_snapshot).
+    """
+    from utils.config_snapshot import current_snapshot
+
+    return list(current_snapshot().onboarding_fields)
+
+
 def get_field_config(field_name: str) -> Optional[OnboardingFieldConfig]:
     """Get configuration for a specific field by name"""
-    for config in load_onboarding_fields():
-        if config.field_name == field_name:
-            return config
+    from utils.config_snapshot import current_snapshot
+
+    config = current_snapshot().onboarding_fields_by_name.get(field_name)
+    if config is not None:
+        return config
     for config in ONBOARDING_FIELDS:
         if config.field_name == field_name:
             return config
@@ -339,3 +339,91 @@ class TicketWaitingResponseResponse(BaseModel):
     tickets_24_48_hours: List[TicketWaitingItem]
     tickets_over_48_hours: List[TicketWaitingItem]
     filters: TicketWaitingResponseFilters
+
+
+# Delivery statistics schemas
+class DeliveryStatsFilters(BaseModel):
+    """Applied filters for delivery statistics."""
+
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    administrative_id: Optional[int] = None
+    message_type: Optional[str] = None
+    group_by: str = "day"
+
+
+class DeliveryCounts(BaseModel):
+    """Delivery counters shared by every delivery breakdown."""
+
+    total: int
+    delivered: int
+    failed: int
+    success_rate: Optional[float] = None
+    failure_rate: Optional[float] = None
+
+
+class DeliverySummary(DeliveryCounts):
+    """Overall delivery counts with per-status totals."""
+
+    by_status: dict  # {delivery_status: count}
+
+
+class DeliveryDataPoint(DeliveryCounts):
+    """Delivery counts for one time bucket."""
+
+    date: Optional[str] = None
+
+
+class DeliveryByMessageType(DeliveryCounts):
+    """Delivery counts for one message type."""
+
+    message_type: Optional[str] = None
+
+
+class DeliveryErrorCodeCount(BaseModel):
+    """Number of failed deliveries for one Twilio error code."""
+
+    error_code: str
+    count: int
+
+
+class DeliveryByWard(DeliveryCounts):
+    """Delivery counts for one ward."""
+
+    ward_id: int
+    ward_name: str
+    ward_path: Optional[str] = None
+
+
+class DeliveryStatsResponse(BaseModel):
+    """Outbound message delivery statistics."""
+
+    summary: DeliverySummary
+    time_series: List[DeliveryDataPoint]
+    by_message_type: List[DeliveryByMessageType]
+    by_error_code: List[DeliveryErrorCodeCount]
+    by_ward: List[DeliveryByWard] = []
+    filters: DeliveryStatsFilters
+
+
+class DBPoolStats(BaseModel):
+    """Connection pool gauges and checkout latency for one engine."""
+
+    role: str
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    saturation: float
+    checkouts: int
+    timeouts: int
+    slow_checkouts: int
+    avg_checkout_ms: float
+    max_checkout_ms: float
+
+
+class DBPoolStatsResponse(BaseModel):
+    """Connection pool metrics for this process."""
+
+    pools: List[DBPoolStats]
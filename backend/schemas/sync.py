@@ -0,0 +1,58 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+
+class SyncTicket(BaseModel):
+    id: int
+    ticket_number: str
+    customer_id: int
+    administrative_id: int
+    message_id: int
+    context_message_id: Optional[int] = None
+    status: str
+    resolved_by: Optional[int] = None
+    resolved_at: Optional[str] = None
+    tag: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+
+class SyncMessage(BaseModel):
+    id: int
+    message_sid: str
+    customer_id: int
+    user_id: Optional[int] = None
+    body: str
+    from_source: int
+    message_type: Optional[int] = None
+    status: int
+    delivery_status: str
+    media_url: Optional[str] = None
+    media_type: str
+    created_at: Optional[str] = None
+
+
+class SyncCustomer(BaseModel):
+    id: int
+    full_name: Optional[str] = None
+    phone_number: str
+    language: Optional[str] = None
+    crop_type: Optional[str] = None
+    gender: Optional[str] = None
+    age: Optional[int] = None
+    updated_at: Optional[str] = None
+
+
+class SyncUser(BaseModel):
+    id: int
+    full_name: Optional[str] = None
+    user_type: str
+
+
+class SyncResponse(BaseModel):
+    cursor: str
+    has_more: bool
+    tickets: List[SyncTicket] = []
+    messages: List[SyncMessage] = []
+    customers: List[SyncCustomer] = []
+    users: List[SyncUser] = []
@@ -67,6 +67,8 @@ class UserDetailResponse(BaseModel):
 class UserListResponse(BaseModel):
     users: list[UserResponse]
     total: int
+    # total is a planner estimate (beyond SEARCH_EXACT_COUNT_LIMIT)
+    total_is_estimate: bool = False
     page: int
     size: int
 
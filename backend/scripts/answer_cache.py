@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Semantic Answer Cache Tools
+
+evaluate: replays historical farmer questions and their replies from
+the messages table. Each question is looked up among the earlier ones
+(same language and crop) before being added, and the script reports
+the hit rate and time saved per similarity threshold. Nothing is
+written to the database; use it to choose
+ANSWER_CACHE_SIMILARITY_THRESHOLD before enabling the cache.
+
+seed: stores historical replies in the answer cache, by default only
+extension officer replies (EO-approved answers), tagged with the
+currently active knowledge bases.
+
+Both commands call the OpenAI embeddings API once per question.
+
+Usage:
+    # Evaluate the last 5000 answered questions:
+    ./dc.sh exec backend python scripts/answer_cache.py evaluate \\
+        --limit 5000
+
+    # Show sample matches at 0.95:
+    ./dc.sh exec backend python scripts/answer_cache.py evaluate \\
+        --thresholds 0.9 0.95 --samples 20
+
+    # Seed the cache with EO replies from the last 90 days:
+    ./dc.sh exec backend python scripts/answer_cache.py seed --days 90
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings  # noqa: E402
+from database import SessionLocal  # noqa: E402
+from models.customer import Customer  # noqa: E402
+from services.answer_cache_service import (  # noqa: E402
+    SOURCE_AI,
+    SOURCE_EO,
+    AnswerCacheService,
+    replay,
+)
+
+DEFAULT_THRESHOLDS = [0.85, 0.9, 0.93, 0.95, 0.97]
+
+
+async def evaluate(service, pairs, customers, thresholds, samples):
+    questions = []
+    vectors = []
+    for n, item in enumerate(pairs, start=1):
+        vector = await service.embed(item.question)
+        if vector is None:
+            print(f"Embedding failed for message {item.question_id}")
+            continue
+        customer = customers[item.customer_id]
+        questions.append(
+            ((customer.language_code, customer.crop_type or ""), item)
+        )
+        vectors.append(vector)
+        if n % 100 == 0:
+            print(f"  embedded {n}/{len(pairs)}")
+
+    results = replay(questions, vectors, thresholds)
+    print(f"\nReplayed {len(questions)} answered questions\n")
+    print(f"{'threshold':>9}  {'hits':>6}  {'hit rate':>8}  saved (h)")
+    for threshold, result in results.items():
+        print(
+            f"{threshold:>9.2f}  {result['hits']:>6}  "
+            f"{result['hit_rate']:>8.1%}  "
+            f"{result['time_saved_seconds'] / 3600:>9.1f}"
+        )
+
+    if samples:
+        threshold = max(thresholds)
+        print(f"\nSample matches at {threshold}:")
+        for question, cached, similarity in (
+            results[threshold]["matches"][:samples]
+        ):
+            print(f"  [{similarity:.3f}] {question!r}\n"
+                  f"          ~ {cached!r}")
+
+
+async def seed(service, pairs, customers, dry_run):
+    if dry_run:
+        return
+    stored = 0
+    for item in pairs:
+        entry = await service.store_answer(
+            customer=customers[item.customer_id],
+            question=item.question,
+            answer=item.answer,
+            source=item.source,
+            source_message_id=item.answer_id,
+            answer_latency_ms=item.latency_ms,
+        )
+        if entry:
+            stored += 1
+    print(f"Stored {stored} cache entries")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Evaluate or seed the semantic answer cache"
+    )
+    parser.add_argument("command", choices=["evaluate", "seed"])
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=settings.answer_cache_max_age_days,
+        help="Only questions asked in the last N days "
+        f"(default: {settings.answer_cache_max_age_days})",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Maximum number of questions (default: all)",
+    )
+    parser.add_argument(
+        "--source",
+        choices=[SOURCE_EO, SOURCE_AI, "all"],
+        default=None,
+        help="Replies to use (default: all for evaluate, eo for seed)",
+    )
+    parser.add_argument(
+        "--thresholds",
+        type=float,
+        nargs="+",
+        default=DEFAULT_THRESHOLDS,
+        help="Similarity thresholds to evaluate",
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=0,
+        help="Print this many matches at the highest threshold",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="seed: only count the answers that would be stored",
+    )
+    args = parser.parse_args()
+
+    source = args.source or ("all" if args.command == "evaluate" else "eo")
+    sources = [SOURCE_AI, SOURCE_EO] if source == "all" else [source]
+    since = datetime.now(timezone.utc) - timedelta(days=args.days)
+
+    db = SessionLocal()
+    try:
+        service = AnswerCacheService(db)
+        pairs = service.answered_questions(
+            since=since, sources=sources, limit=args.limit
+        )
+        print(f"Answered questions found: {len(pairs)}")
+        if not pairs:
+            return
+        customers = {
+            customer.id: customer
+            for customer in db.query(Customer).filter(
+                Customer.id.in_({item.customer_id for item in pairs})
+            )
+        }
+
+        if args.command == "evaluate":
+            coro = evaluate(
+                service, pairs, customers, args.thresholds, args.samples
+            )
+        else:
+            coro = seed(service, pairs, customers, args.dry_run)
+        asyncio.run(coro)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Backfill Ticket Tags
+
+Tags resolved tickets that have no tag yet (Ticket.tag IS NULL), e.g.
+tickets resolved before auto-tagging existed or while OpenAI was down.
+Tickets are classified in batches, one OpenAI call per batch, using the
+same pipeline as the background tagging task.
+
+Usage:
+    # Show how many tickets would be tagged:
+    ./dc.sh exec backend python scripts/backfill_ticket_tags.py --dry-run
+
+    # Tag every untagged resolved ticket:
+    ./dc.sh exec backend python scripts/backfill_ticket_tags.py
+
+    # Tag at most 500 tickets resolved since 2025-01-01, 20 per call:
+    ./dc.sh exec backend python scripts/backfill_ticket_tags.py \\
+        --since 2025-01-01 --limit 500 --batch-size 20
+
+    # In Kubernetes production:
+    kubectl exec -it <pod-name> -n agriconnect2 -- \\
+        python scripts/backfill_ticket_tags.py
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timezone
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings  # noqa: E402
+from database import SessionLocal  # noqa: E402
+from services.ticket_tagging_service import (  # noqa: E402
+    TicketTaggingService,
+)
+
+
+def parse_since(value: str) -> datetime:
+    """Parse an ISO date or datetime, assuming UTC."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Tag resolved tickets that have no tag yet"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.ticket_tagging_batch_size,
+        help="Tickets classified per OpenAI call "
+        f"(default: {settings.ticket_tagging_batch_size})",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Maximum number of tickets to tag (default: all)",
+    )
+    parser.add_argument(
+        "--since",
+        type=parse_since,
+        default=None,
+        help="Only tickets resolved on or after this date (YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only count untagged tickets",
+    )
+    args = parser.parse_args()
+
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    db = SessionLocal()
+    try:
+        service = TicketTaggingService(db)
+        pending = service.count_untagged(resolved_since=args.since)
+        print(f"Untagged resolved tickets: {pending}")
+        if args.dry_run or not pending:
+            return
+
+        stats = service.tag_pending(
+            batch_size=args.batch_size,
+            resolved_since=args.since,
+            max_tickets=args.limit,
+        )
+        print(
+            f"Tagged {stats['tagged']} of {stats['attempted']} tickets "
+            f"({stats['failed']} failed)"
+        )
+        if stats["failed"]:
+            print("Failed tickets stay untagged; run the script again.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Weather Rule Backtest
+
+Replays the stored daily weather observations (weather_observations)
+through a crop's weather rules and crop calendar, and reports how often
+each rule would have been triggered: per observation (area and day), as
+a rate, and in how many areas. Use it after editing
+data/<crop>_weather_rules.json or data/<crop>_crop_calendar.json; it
+makes no weather API calls.
+
+Observations are recorded by every weather broadcast. --backfill first
+rebuilds them from the raw weather of past broadcasts.
+
+Usage:
+    # Potato rules over the last 90 days:
+    ./dc.sh exec backend python scripts/backtest_weather_rules.py \\
+        --crop potato
+
+    # First backfill from past broadcasts, then a date range, to CSV:
+    ./dc.sh exec backend python scripts/backtest_weather_rules.py \\
+        --crop avocado --backfill --since 2026-01-01 --until 2026-06-30 \\
+        -o /tmp/avocado_backtest.csv
+
+    # Cross-check the counts against evaluate_rules() row by row:
+    ./dc.sh exec backend python scripts/backtest_weather_rules.py \\
+        --crop dairy --verify
+"""
+
+import argparse
+import csv
+import logging
+import os
+import sys
+from datetime import date, timedelta
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import SessionLocal  # noqa: E402
+from services.weather_backtest_service import (  # noqa: E402
+    WeatherBacktestService,
+)
+from services.weather_observation_service import (  # noqa: E402
+    WeatherObservationService,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Backtest weather rules against stored observations"
+    )
+    parser.add_argument(
+        "--crop", required=True, help="Crop with a rules file, e.g. potato"
+    )
+    parser.add_argument(
+        "--since",
+        type=date.fromisoformat,
+        help="First day, YYYY-MM-DD (default: 90 days ago)",
+    )
+    parser.add_argument(
+        "--until",
+        type=date.fromisoformat,
+        help="Last day, YYYY-MM-DD (default: today)",
+    )
+    parser.add_argument(
+        "--area",
+        type=int,
+        action="append",
+        dest="areas",
+        help="Administrative area id (repeatable, default: all areas)",
+    )
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Record observations from past broadcasts first",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Compare with evaluate_rules() per observation (slow)",
+    )
+    parser.add_argument("-o", "--output", help="Write the report as CSV")
+    args = parser.parse_args()
+
+    # evaluate_rules() logs every call
+    logging.getLogger("services.weather_advisory_service").setLevel(
+        logging.WARNING
+    )
+
+    until = args.until or date.today()
+    since = args.since or until - timedelta(days=89)
+
+    db = SessionLocal()
+    try:
+        if args.backfill:
+            written = WeatherObservationService(db).backfill_from_broadcasts(
+                since=since, until=until
+            )
+            print(f"Backfilled {written} observations")
+
+        observations = WeatherObservationService(db).load_frame(
+            since, until, args.areas
+        )
+    finally:
+        db.close()
+
+    service = WeatherBacktestService()
+    report = service.backtest(observations, args.crop)
+    report.start, report.end = since, until
+
+    print(
+        f"{report.crop}: {report.observations} observations in "
+        f"{report.areas} areas, {since} to {until}"
+    )
+    if not report.observations:
+        print("No observations in range (try --backfill)")
+        return
+
+    print(
+        f"{'rule':<24} {'priority':<13} {'matches':>8} "
+        f"{'triggers':>8} {'rate':>7} {'areas':>6}"
+    )
+    for stats in report.rules:
+        print(
+            f"{stats.rule_id:<24} {stats.priority:<13} "
+            f"{stats.weather_matches:>8} {stats.triggers:>8} "
+            f"{report.rate(stats):>7.1%} {stats.areas:>6}"
+        )
+
+    if args.output:
+        rows = report.to_rows()
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Wrote {len(rows)} rules to {args.output}")
+
+    if args.verify:
+        expected = service.replay(observations, args.crop)
+        actual = {s.rule_id: s.triggers for s in report.rules}
+        diffs = {
+            rule_id: (actual.get(rule_id, 0), expected.get(rule_id, 0))
+            for rule_id in set(actual) | set(expected)
+            if actual.get(rule_id, 0) != expected.get(rule_id, 0)
+        }
+        if diffs:
+            for rule_id, (got, want) in sorted(diffs.items()):
+                print(f"MISMATCH {rule_id}: backtest {got}, replay {want}")
+            sys.exit(1)
+        print("Verified against evaluate_rules(): counts match")
+
+
+if __name__ == "__main__":
+    main()
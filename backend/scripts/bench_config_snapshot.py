@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Config Snapshot Microbenchmark
+
+Measures the configuration work done for each incoming webhook: the
+supported languages, the admin level order and suffix tokens, the
+onboarding field table (built by every OnboardingService) and a number
+of translation lookups.
+
+"rebuild" derives everything from the raw settings and walks the nested
+locale dicts, as each webhook did before the compiled snapshot;
+"snapshot" reads the same values from utils.config_snapshot. Needs no
+database or network.
+
+Usage:
+    ./dc.sh exec backend python scripts/bench_config_snapshot.py
+
+    # 20 translations per webhook, 50000 simulated webhooks:
+    ./dc.sh exec backend python scripts/bench_config_snapshot.py \\
+        --lookups 20 --webhooks 50000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (  # noqa: E402
+    AdminLevels,
+    compile_language_codes,
+    settings,
+)
+from schemas.onboarding_schemas import build_onboarding_fields  # noqa: E402
+from utils.config_snapshot import current_snapshot  # noqa: E402
+from utils.i18n import _locales, t  # noqa: E402
+
+
+def nested_lookup(path: str, lang: str):
+    """Translation lookup by walking the nested locale dicts"""
+    codes = compile_language_codes(settings.languages)
+    default = codes[0] if codes else "en"
+    if lang in _locales:
+        target = lang
+    else:
+        target = default if default in _locales else "en"
+
+    def _lookup(data, keys):
+        for key in keys:
+            if not isinstance(data, dict) or key not in data:
+                return None
+            data = data[key]
+        return data
+
+    keys = path.split(".")
+    value = _lookup(_locales.get(target, {}), keys)
+    if value is None and target != "en":
+        value = _lookup(_locales.get("en", {}), keys)
+    return path if value is None else str(value)
+
+
+def sample_paths(count: int):
+    """Translation paths with string values, spread over the locale"""
+    table = current_snapshot().translations.get("en", {})
+    paths = [path for path, value in table.items() if isinstance(value, str)]
+    if not paths:
+        return []
+    step = max(len(paths) // count, 1)
+    return paths[::step][:count]
+
+
+def rebuild_webhook(paths, lang):
+    codes = compile_language_codes(settings.languages)
+    admin = AdminLevels.from_hierarchy(settings.administrative_hierarchy)
+    fields = build_onboarding_fields(settings.onboarding_fields_config)
+    texts = [nested_lookup(path, lang) for path in paths]
+    return codes, admin.order, fields, texts
+
+
+def snapshot_webhook(paths, lang):
+    config = current_snapshot()
+    fields = list(config.onboarding_fields)
+    texts = [t(path, lang) for path in paths]
+    return config.languages, config.admin.order, fields, texts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Per-webhook configuration overhead"
+    )
+    parser.add_argument(
+        "--lookups",
+        type=int,
+        default=10,
+        help="Translation lookups per webhook (default: 10)",
+    )
+    parser.add_argument(
+        "--webhooks",
+        type=int,
+        default=20000,
+        help="Simulated webhooks per run (default: 20000)",
+    )
+    parser.add_argument(
+        "--lang",
+        default="sw",
+        help="Language of the lookups (default: sw)",
+    )
+    args = parser.parse_args()
+
+    paths = sample_paths(args.lookups)
+    print(
+        f"{args.webhooks} webhooks, {len(paths)} translations each, "
+        f"lang={args.lang}"
+    )
+
+    results = {}
+    for name, webhook in (
+        ("rebuild", rebuild_webhook),
+        ("snapshot", snapshot_webhook),
+    ):
+        best = min(
+            timeit.repeat(
+                lambda: webhook(paths, args.lang),
+                number=args.webhooks,
+                repeat=5,
+            )
+        )
+        results[name] = best / args.webhooks * 1e6
+        print(f"  {name:<9} {results[name]:8.2f} us/webhook")
+
+    if results["snapshot"]:
+        print(f"  speedup   {results['rebuild'] / results['snapshot']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
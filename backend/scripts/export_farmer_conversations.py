@@ -8,7 +8,8 @@ Columns:
     date, farmer_id, farmer_name, administrative, primary_crop, age,
     gender, weather_subscription, question, response, response_by
 
-Pairing logic (deterministic, mirrors the app's own reply linkage):
+Pairing logic (deterministic, mirrors the app's own reply linkage; computed
+in one SQL pass by utils/conversation_pairing.question_response_pairs):
 - Messages are walked per customer in chronological order (created_at, id).
 - A customer message (from_source=CUSTOMER) becomes the "pending question".
   A newer customer message supersedes an unanswered older one.
@@ -21,6 +22,8 @@ Pairing logic (deterministic, mirrors the app's own reply linkage):
     * message_type == BROADCAST  (broadcast + weather notification messages)
 - Onboarding / welcome / escalation-confirmation / weather-subscription
   messages are never stored in the `messages` table, so they cannot appear.
+- Archived messages (`messages_archive`) are included; months already
+  exported to Parquet are not.
 
 Usage:
     # From backend container
@@ -45,8 +48,11 @@ from models.administrative import (  # noqa: E402
     CustomerAdministrative,
 )
 from models.customer import Customer  # noqa: E402
-from models.message import Message, MessageFrom  # noqa: E402
-from schemas.callback import MessageType  # noqa: E402
+from models.message import MessageFrom  # noqa: E402
+from utils.conversation_pairing import (  # noqa: E402
+    question_response_pairs,
+    stream,
+)
 
 HEADER = [
     "date",
@@ -132,16 +138,6 @@ def load_customer_admin_map(db):
     return mapping
 
 
-def is_response(from_source, message_type):
-    """True only for AI REPLY messages or plain EO replies."""
-    if from_source == MessageFrom.LLM:
-        return message_type == MessageType.REPLY
-    if from_source == MessageFrom.USER:
-        # EO replies have no message_type; BROADCAST/weather are excluded
-        return message_type is None
-    return False
-
-
 def export(output_path: str) -> int:
     db = SessionLocal()
     exported = 0
@@ -150,75 +146,41 @@ def export(output_path: str) -> int:
         profiles = load_customer_profiles(db)
         customer_admin = load_customer_admin_map(db)
 
-        messages = (
-            db.query(
-                Message.id,
-                Message.customer_id,
-                Message.body,
-                Message.from_source,
-                Message.message_type,
-                Message.created_at,
-            )
-            .order_by(Message.customer_id, Message.created_at, Message.id)
-            .yield_per(1000)
-        )
-
-        current_customer = None
-        pending_question = None
-
         with open(output_path, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
             writer.writerow(HEADER)
 
-            for msg in messages:
-                if msg.customer_id != current_customer:
-                    current_customer = msg.customer_id
-                    pending_question = None
-
-                if msg.from_source == MessageFrom.CUSTOMER:
-                    # latest unanswered farmer message becomes the question
-                    pending_question = msg
-                    continue
-
-                if pending_question is None:
-                    continue
-
-                if not is_response(msg.from_source, msg.message_type):
-                    continue
-
-                profile = profiles.get(msg.customer_id, {})
-                admin_id = customer_admin.get(msg.customer_id)
+            for pair in stream(db, question_response_pairs()):
+                profile = profiles.get(pair.customer_id, {})
+                admin_id = customer_admin.get(pair.customer_id)
                 admin_path = (
                     admin_paths.get(admin_id, "") if admin_id else ""
                 )
 
                 question_ts = ""
-                if pending_question.created_at:
-                    question_ts = pending_question.created_at.isoformat(
-                        sep=" "
-                    )
+                if pair.question_at:
+                    question_ts = pair.question_at.isoformat(sep=" ")
 
                 writer.writerow(
                     [
                         question_ts,
-                        msg.customer_id,
+                        pair.customer_id,
                         profile.get("farmer_name", ""),
                         admin_path,
                         profile.get("primary_crop", ""),
                         profile.get("age", ""),
                         profile.get("gender", ""),
                         profile.get("weather_subscription", ""),
-                        pending_question.body or "",
-                        msg.body or "",
+                        pair.question or "",
+                        pair.response or "",
                         (
                             "AI"
-                            if msg.from_source == MessageFrom.LLM
+                            if pair.response_from == MessageFrom.LLM
                             else "extension_officer"
                         ),
                     ]
                 )
                 exported += 1
-                pending_question = None
 
         print(f"Exported {exported} rows to {output_path}")
         return 0
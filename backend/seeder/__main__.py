@@ -2,6 +2,7 @@ import sys
 
 from seeder.administrative import main as administrative_main
 from seeder.customer import main as customer_main
+from seeder.synthetic import main as synthetic_main
 from seeder.user import main as user_main
 
 
@@ -14,6 +15,8 @@ def main():
         print("  customer [count] [country]  Seed fake customers")
         print("                   count: number of customers (default: 50)")
         print("                   country: tanzania|kenya (default: tanzania)")
+        print("  synthetic [--customers N] [--days N] ...")
+        print("                   Generate a production-scale dataset")
         sys.exit(1)
 
     command = sys.argv[1]
@@ -24,12 +27,15 @@ def main():
         administrative_main()
     elif command == "customer":
         customer_main()
+    elif command == "synthetic":
+        synthetic_main()
     else:
         print(f"Unknown command: {command}")
         print("Available commands:")
         print("  user            Create initial admin user")
         print("  administrative  Seed administrative data")
         print("  customer [count] [country]  Seed fake customers")
+        print("  synthetic       Generate a production-scale dataset")
         sys.exit(1)
 
 
@@ -2,6 +2,7 @@ import argparse
 import csv
 import os
 import sys
+from types import SimpleNamespace
 from typing import Optional
 
 from sqlalchemy.orm import Session
@@ -19,6 +20,7 @@ from models import (
     WeatherBroadcast,
 )
 from models.broadcast import BroadcastGroup
+from seeder.bulk import copy_rows, reserve_ids, update_rows
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -160,7 +162,14 @@ def validate_csv_data(rows: list) -> tuple[bool, str]:
 
 
 def seed_administrative_data(db: Session, rows: list) -> dict:
-    """Seed administrative data from CSV rows"""
+    """
+    Seed administrative data from CSV rows.
+
+    Rows are resolved against each other and the existing areas in
+    memory (parents must come before their children). New areas get
+    their ids from the sequence up front and are written with one COPY;
+    changed areas with one UPDATE. Everything is committed together.
+    """
     stats = {
         "created": 0,
         "updated": 0,
@@ -184,8 +193,37 @@ def seed_administrative_data(db: Session, rows: list) -> dict:
             level = get_or_create_level(db, level_name, level_index=level_idx)
             levels[level_name] = level
 
-    # Create a code_to_admin map for quick lookup
+    # Existing areas of these levels, by (code, level_id)
+    existing_by_key = {
+        (admin.code, admin.level_id): admin
+        for admin in db.query(
+            Administrative.id,
+            Administrative.code,
+            Administrative.level_id,
+            Administrative.parent_id,
+            Administrative.name,
+            Administrative.path,
+            Administrative.long,
+            Administrative.lat,
+        ).filter(
+            Administrative.level_id.in_(
+                [level.id for level in levels.values()]
+            )
+        )
+    }
+    # Ids for the new areas (an upper bound: rows may still fail)
+    new_keys = {
+        ((row.get("code") or "").strip(), levels[row["level"]].id)
+        for row in rows
+    }
+    new_ids = iter(
+        reserve_ids(db, Administrative, len(new_keys - set(existing_by_key)))
+    )
+
+    # code -> (id, path) of every area resolved so far
     code_to_admin = {}
+    created = []
+    updated = []
 
     # Process rows in hierarchical order (parent before children)
     for row in rows:
@@ -205,7 +243,7 @@ def seed_administrative_data(db: Session, rows: list) -> dict:
                 continue
 
             level = levels[level_name]
-            parent = None
+            parent_id, parent_path = None, ""
 
             if parent_code:
                 parent = code_to_admin.get(parent_code)
@@ -215,6 +253,7 @@ def seed_administrative_data(db: Session, rows: list) -> dict:
                         f"Parent not found: {parent_code} for {code}"
                     )
                     continue
+                parent_id, parent_path = parent
 
             # Parse lat/long if present
             long_val = row.get("longitude")
@@ -222,59 +261,82 @@ def seed_administrative_data(db: Session, rows: list) -> dict:
             long_float = float(long_val) if long_val else None
             lat_float = float(lat_val) if lat_val else None
 
-            # Check if administrative already exists
-            existing = get_administrative_by_code(db, code, level.id)
+            existing = existing_by_key.get((code, level.id))
 
             if existing:
-                # Update existing
+                path = existing.path
                 needs_update = (
                     existing.name != name
-                    or existing.parent_id != (parent.id if parent else None)
+                    or existing.parent_id != parent_id
                     or existing.long != long_float
                     or existing.lat != lat_float
                 )
                 if needs_update:
-                    existing.name = name
-                    existing.parent_id = parent.id if parent else None
-                    existing.path = build_human_readable_path(
-                        parent.path if parent else "", name
+                    path = build_human_readable_path(parent_path, name)
+                    updated.append(
+                        {
+                            "id": existing.id,
+                            "name": name,
+                            "parent_id": parent_id,
+                            "path": path,
+                            "long": long_float,
+                            "lat": lat_float,
+                        }
                     )
-                    existing.long = long_float
-                    existing.lat = lat_float
-                    db.commit()
                     stats["updated"] += 1
                 else:
                     stats["skipped"] += 1
+                admin_id = existing.id
             else:
-                # Create new
-                path = build_human_readable_path(
-                    parent.path if parent else "", name
+                path = build_human_readable_path(parent_path, name)
+                admin_id = next(new_ids)
+                created.append(
+                    {
+                        "id": admin_id,
+                        "code": code,
+                        "name": name,
+                        "level_id": level.id,
+                        "parent_id": parent_id,
+                        "path": path,
+                        "long": long_float,
+                        "lat": lat_float,
+                    }
                 )
-                admin = Administrative(
-                    code=code,
+                stats["created"] += 1
+                # A repeated row now updates or skips this one
+                existing_by_key[(code, level.id)] = SimpleNamespace(
+                    id=admin_id,
                     name=name,
-                    level_id=level.id,
-                    parent_id=parent.id if parent else None,
+                    parent_id=parent_id,
                     path=path,
                     long=long_float,
                     lat=lat_float,
                 )
-                db.add(admin)
-                db.commit()
-                db.refresh(admin)
-                stats["created"] += 1
 
             # Add to code_to_admin map
-            current_admin = get_administrative_by_code(db, code, level.id)
-            code_to_admin[code] = current_admin
+            code_to_admin[code] = (admin_id, path)
 
         except Exception as e:
-            db.rollback()
             stats["errors"] += 1
             stats["error_messages"].append(
                 f"Error processing {row.get('code', 'unknown')}: {str(e)}"
             )
 
+    try:
+        copy_rows(db, Administrative, created)
+        update_rows(
+            db,
+            Administrative,
+            updated,
+            ["name", "parent_id", "path", "long", "lat"],
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        stats["errors"] += 1
+        stats["error_messages"].append(f"Error writing areas: {str(e)}")
+        stats["created"] = stats["updated"] = 0
+
     return stats
 
 
@@ -0,0 +1,188 @@
+"""
+Bulk write helpers for the seeders.
+
+Rows go to PostgreSQL with COPY FROM STDIN (inserts) or a single
+execute_values statement (updates) on the session's own connection, so
+they share its transaction and ORM flushes are skipped entirely. The
+helpers apply the columns' Python-side defaults and type conversions
+(enums, JSON) that the ORM would otherwise apply.
+
+Mapper events (conversation state, retry schedule, Customer.phone_e164)
+do not run for rows written here; callers fill anything derived
+themselves.
+"""
+
+import enum
+import io
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from psycopg2.extras import execute_values
+from sqlalchemy import Table, text
+from sqlalchemy.orm import Session
+
+
+def _table(model_or_table) -> Table:
+    return getattr(model_or_table, "__table__", model_or_table)
+
+
+def _python_defaults(table: Table, provided: Sequence[str]) -> Dict[str, Any]:
+    """Python-side column defaults for the columns not provided"""
+    defaults = {}
+    for column in table.columns:
+        default = column.default
+        if column.name in provided or default is None:
+            continue
+        if default.is_callable:
+            # SQLAlchemy wraps callables to take the execution context
+            defaults[column.name] = default.arg(None)
+        elif default.is_scalar:
+            defaults[column.name] = default.arg
+    return defaults
+
+
+def _processors(db: Session, table: Table, names: Sequence[str]) -> dict:
+    dialect = db.get_bind().dialect
+    return {
+        name: table.c[name].type.bind_processor(dialect) for name in names
+    }
+
+
+def _db_values(row: Dict[str, Any], names, processors) -> list:
+    """Row values as the driver expects them (enum names, JSON text)"""
+    values = []
+    for name in names:
+        value = row.get(name)
+        processor = processors[name]
+        if processor is not None and value is not None:
+            value = processor(value)
+        values.append(value)
+    return values
+
+
+def _csv_field(value) -> str:
+    """CSV field for COPY: unquoted empty is NULL, anything else quoted"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        value = "t" if value else "f"
+    elif isinstance(value, enum.Enum):
+        # Plain String columns storing an enum's value
+        value = value.value
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def reserve_ids(db: Session, model, count: int) -> List[int]:
+    """
+    Take `count` ids from a table's id sequence.
+
+    Lets callers know primary keys before a COPY, so child rows can
+    reference their parents without reading them back.
+    """
+    if count <= 0:
+        return []
+    table = _table(model)
+    return list(
+        db.execute(
+            text(
+                "SELECT nextval(pg_get_serial_sequence(:table, 'id')) "
+                "FROM generate_series(1, :count)"
+            ),
+            {"table": table.name, "count": count},
+        ).scalars()
+    )
+
+
+def copy_rows(
+    db: Session,
+    model,
+    rows: Iterable[Dict[str, Any]],
+    columns: Optional[Sequence[str]] = None,
+) -> int:
+    """
+    Insert rows with COPY FROM STDIN.
+
+    Args:
+        db: Database session (the COPY joins its transaction)
+        model: Mapped class or Table
+        rows: Dicts of column name to Python value
+        columns: Columns to write (default: keys of the first row)
+
+    Returns:
+        Number of rows written
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    table = _table(model)
+    columns = list(columns or rows[0].keys())
+    defaults = _python_defaults(table, columns)
+    names = columns + list(defaults)
+
+    processors = _processors(db, table, names)
+
+    buffer = io.StringIO()
+    for row in rows:
+        values = _db_values({**row, **defaults}, names, processors)
+        buffer.write(",".join(_csv_field(value) for value in values))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(names)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+    return len(rows)
+
+
+def update_rows(
+    db: Session,
+    model,
+    rows: Iterable[Dict[str, Any]],
+    columns: Sequence[str],
+    key: str = "id",
+) -> int:
+    """
+    Update rows by key with one UPDATE ... FROM (VALUES ...) statement.
+
+    Args:
+        db: Database session
+        model: Mapped class or Table
+        rows: Dicts with the key and the columns to set
+        columns: Columns to set
+        key: Column matching the rows
+
+    Returns:
+        Number of rows given
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    table = _table(model)
+    dialect = db.get_bind().dialect
+    names = [key] + list(columns)
+    processors = _processors(db, table, names)
+    # Typed placeholders, so all-NULL columns still match their target
+    template = "(" + ", ".join(
+        f"%s::{table.c[name].type.compile(dialect)}" for name in names
+    ) + ")"
+    assignments = ", ".join(f"{name} = v.{name}" for name in columns)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        execute_values(
+            cursor,
+            f"UPDATE {table.name} SET {assignments} "
+            f"FROM (VALUES %s) AS v ({', '.join(names)}) "
+            f"WHERE {table.name}.{key} = v.{key}",
+            [tuple(_db_values(row, names, processors)) for row in rows],
+            template=template,
+            page_size=1000,
+        )
+    finally:
+        cursor.close()
+    return len(rows)
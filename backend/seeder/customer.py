@@ -16,6 +16,8 @@ from models.customer import (
     OnboardingStatus,
 )
 from config import settings
+from seeder.bulk import copy_rows, reserve_ids
+from utils.phone import e164_or_none
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -85,6 +87,7 @@ def generate_customer_data(index: int, country: str = "tanzania"):
 
     return {
         "phone_number": phone_number,
+        "phone_e164": e164_or_none(phone_number),
         "full_name": full_name,
         "language": language,
         "onboarding_status": OnboardingStatus.COMPLETED,
@@ -99,56 +102,65 @@ def generate_customer_data(index: int, country: str = "tanzania"):
 def create_fake_customers(
     db: Session, count: int = 50, country: str = "tanzania"
 ):
-    """Create fake customers in database"""
+    """
+    Create fake customers in database.
+
+    Customers and their ward assignments are generated in memory and
+    written with COPY; random numbers that already exist are skipped.
+    """
     # Get all ward-level administrative areas
-    wards = (
-        db.query(Administrative)
+    ward_ids = [
+        ward_id
+        for (ward_id,) in db.query(Administrative.id)
         .join(Administrative.level)
         .filter(Administrative.level.has(name="ward"))
-        .all()
-    )
+    ]
 
-    if not wards:
+    if not ward_ids:
         print("❌ No wards found. Please seed administrative data first.")
         print("   Run: python -m seeder administrative")
         return 0
 
-    print(f"Found {len(wards)} wards")
+    print(f"Found {len(ward_ids)} wards")
     print(f"Creating {count} fake customers...")
 
-    created_count = 0
+    candidates = {}
     for i in range(count):
-        # Generate customer data
         customer_data = generate_customer_data(i, country)
+        candidates.setdefault(customer_data["phone_number"], customer_data)
 
-        # Check if phone number already exists
-        existing = (
-            db.query(Customer)
-            .filter(Customer.phone_number == customer_data["phone_number"])
-            .first()
-        )
-        if existing:
-            continue
-
-        # Create customer
-        customer = Customer(**customer_data)
-        db.add(customer)
-        db.commit()
-        db.refresh(customer)
-
-        # Assign to random ward
-        ward = random.choice(wards)
-        customer_admin = CustomerAdministrative(
-            customer_id=customer.id, administrative_id=ward.id
+    # Skip phone numbers that already exist
+    existing = {
+        phone
+        for (phone,) in db.query(Customer.phone_number).filter(
+            Customer.phone_number.in_(list(candidates))
         )
-        db.add(customer_admin)
-        db.commit()
-
-        created_count += 1
-        if (created_count % 10) == 0:
-            print(f"  Created {created_count}/{count} customers...")
+    }
+    customers = [
+        data for phone, data in candidates.items() if phone not in existing
+    ]
+
+    for customer_id, data in zip(
+        reserve_ids(db, Customer, len(customers)), customers
+    ):
+        data["id"] = customer_id
+    copy_rows(db, Customer, customers)
+
+    # Assign to random wards
+    copy_rows(
+        db,
+        CustomerAdministrative,
+        (
+            {
+                "customer_id": data["id"],
+                "administrative_id": random.choice(ward_ids),
+            }
+            for data in customers
+        ),
+    )
+    db.commit()
 
-    return created_count
+    return len(customers)
 
 
 def main():
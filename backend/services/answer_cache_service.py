@@ -0,0 +1,678 @@
+"""
+AnswerCacheService - Semantic cache for repeated farmer questions
+
+Many farmer questions in a ward and season are near-duplicates ("when
+to spray avocado for thrips"). When enabled (ANSWER_CACHE_ENABLED), a
+REPLY-mode question is embedded with OpenAIService.create_embedding and
+compared with the questions of earlier answers. Above the similarity
+threshold the earlier answer is sent right away and no external AI job
+is created.
+
+Entries are partitioned by customer language, crop and a fingerprint of
+the active knowledge bases and embedding model, so switching knowledge
+bases never serves answers grounded in the old ones. Each partition is
+searched as a float16 matrix of unit vectors held in process memory and
+reloaded from the answer_cache_entries table every few minutes.
+
+Answers come from AI replies (stored by the AI callback) and from
+extension officer replies on resolved tickets (scripts/answer_cache.py).
+Lookups, hits and time saved are counted per day in
+answer_cache_daily_stats.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from twilio.base.exceptions import TwilioRestException
+
+from config import settings
+from models.answer_cache import AnswerCacheDailyStats, AnswerCacheEntry
+from models.customer import Customer
+from models.message import DeliveryStatus, Message, MessageFrom
+from models.response_trace import ResponsePath
+from schemas.callback import MessageType
+from services.knowledge_base_service import KnowledgeBaseService
+from services.message_service import MessageService
+from services.openai_service import get_openai_service
+from services.outbox_service import OutboxService
+from services.response_trace_service import ResponseTraceService
+from services.whatsapp_service import WhatsAppService
+from utils.i18n import t
+
+logger = logging.getLogger(__name__)
+
+SOURCE_AI = "ai"
+SOURCE_EO = "eo"
+
+# (language, crop_type, kb_version)
+Partition = Tuple[str, str, str]
+
+
+class CacheHit(NamedTuple):
+    entry: AnswerCacheEntry
+    similarity: float
+
+
+class AnsweredQuestion(NamedTuple):
+    """A farmer question and the reply that followed it"""
+    question_id: int
+    customer_id: int
+    question: str
+    answer_id: int
+    answer: str
+    source: str
+    latency_ms: int
+
+
+def normalize_question(text: Optional[str]) -> str:
+    """Lowercase and collapse whitespace before embedding"""
+    return re.sub(r"\s+", " ", (text or "")).strip().lower()
+
+
+def unit_vector(embedding: Sequence[float]) -> np.ndarray:
+    """Embedding as a float32 vector of length 1"""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class VectorIndex:
+    """Unit vectors in one float16 matrix, searched by cosine similarity"""
+
+    SEARCH_BLOCK_ROWS = 1024
+
+    def __init__(self):
+        self.ids: List[int] = []
+        self._rows: List[np.ndarray] = []
+        self._matrix: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, item_id: int, vector: np.ndarray) -> None:
+        self.ids.append(item_id)
+        self._rows.append(np.asarray(vector, dtype=np.float16))
+        self._matrix = None
+
+    def search(self, vector: np.ndarray) -> Optional[Tuple[int, float]]:
+        """
+        Most similar stored vector.
+
+        Returns:
+            (item_id, cosine similarity) or None if the index is empty
+            or holds vectors of another dimension
+        """
+        if not self.ids:
+            return None
+        if self._matrix is None:
+            self._matrix = np.vstack(self._rows)
+        if self._matrix.shape[1] != vector.shape[0]:
+            return None
+        # float16 keeps the matrix small; score in float32 blocks so
+        # the product runs through BLAS
+        vector = vector.astype(np.float32)
+        scores = np.concatenate(
+            [
+                self._matrix[start:start + self.SEARCH_BLOCK_ROWS].astype(
+                    np.float32
+                ) @ vector
+                for start in range(
+                    0, len(self._matrix), self.SEARCH_BLOCK_ROWS
+                )
+            ]
+        )
+        best = int(np.argmax(scores))
+        return self.ids[best], float(scores[best])
+
+
+class AnswerCacheService:
+    """Look up, serve and store cached answers"""
+
+    # Seconds a loaded partition is reused before reloading
+    INDEX_TTL_SECONDS = 300
+
+    # Process-wide partition indexes: partition -> (loaded_at, index)
+    _indexes: Dict[Partition, Tuple[float, VectorIndex]] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """Drop every loaded partition index"""
+        with cls._lock:
+            cls._indexes.clear()
+
+    # ========== Partitions ==========
+
+    def kb_version(self) -> str:
+        """Fingerprint of the active knowledge bases and embedding model"""
+        kb_ids = sorted(
+            kb.external_id or str(kb.id)
+            for kb in KnowledgeBaseService.get_active_knowledge_bases(
+                self.db
+            )
+        )
+        key = "|".join([settings.openai_embedding_model, *kb_ids])
+        return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+    def partition_for(self, customer: Customer) -> Partition:
+        return (
+            customer.language_code,
+            customer.crop_type or "",
+            self.kb_version(),
+        )
+
+    def _load_index(self, partition: Partition) -> VectorIndex:
+        """Newest entries of a partition, from memory or the database"""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._indexes.get(partition)
+        if cached and now - cached[0] < self.INDEX_TTL_SECONDS:
+            return cached[1]
+
+        language, crop_type, kb_version = partition
+        min_created_at = datetime.now(timezone.utc) - timedelta(
+            days=settings.answer_cache_max_age_days
+        )
+        rows = (
+            self.db.query(AnswerCacheEntry.id, AnswerCacheEntry.embedding)
+            .filter(
+                AnswerCacheEntry.language == language,
+                AnswerCacheEntry.crop_type == crop_type,
+                AnswerCacheEntry.kb_version == kb_version,
+                AnswerCacheEntry.created_at >= min_created_at,
+            )
+            .order_by(AnswerCacheEntry.id.desc())
+            .limit(settings.answer_cache_max_entries)
+            .all()
+        )
+        index = VectorIndex()
+        for entry_id, embedding in rows:
+            index.add(entry_id, np.frombuffer(embedding, dtype=np.float16))
+
+        with self._lock:
+            self._indexes[partition] = (now, index)
+        return index
+
+    # ========== Lookup ==========
+
+    async def embed(self, question: str) -> Optional[np.ndarray]:
+        """Unit embedding of a question, or None if OpenAI is unavailable"""
+        openai_service = get_openai_service()
+        if not openai_service.is_configured():
+            return None
+        response = await openai_service.create_embedding(
+            normalize_question(question)
+        )
+        if not response:
+            return None
+        return unit_vector(response.embedding)
+
+    async def lookup(
+        self, customer: Customer, question: str
+    ) -> Optional[CacheHit]:
+        """
+        Find a cached answer for a question.
+
+        Args:
+            customer: Customer asking (selects the partition)
+            question: Question text
+
+        Returns:
+            CacheHit if an entry is above the similarity threshold
+        """
+        if len(normalize_question(question)) < (
+            settings.answer_cache_min_question_chars
+        ):
+            return None
+
+        index = self._load_index(self.partition_for(customer))
+        if not len(index):
+            return None
+        vector = await self.embed(question)
+        if vector is None:
+            return None
+
+        match = index.search(vector)
+        if match is None:
+            return None
+        entry_id, similarity = match
+        if similarity < settings.answer_cache_similarity_threshold:
+            logger.info(
+                f"Answer cache miss (best similarity {similarity:.3f})"
+            )
+            return None
+
+        entry = self.db.get(AnswerCacheEntry, entry_id)
+        if entry is None:
+            return None
+        return CacheHit(entry=entry, similarity=similarity)
+
+    async def answer_from_cache(
+        self, customer: Customer, message: Message
+    ) -> Optional[Message]:
+        """
+        Answer a farmer message from the cache, if possible.
+
+        Sends the cached answer over WhatsApp (through the outbox when
+        enabled) and stores it as an LLM reply, like the AI callback
+        does. Never raises: on any failure the caller falls back to the
+        external AI service.
+
+        Args:
+            customer: Customer who sent the message
+            message: The farmer's (committed) message
+
+        Returns:
+            The sent reply message, or None on a miss
+        """
+        try:
+            hit = await self.lookup(customer, message.body)
+            reply = None
+            if hit is not None:
+                reply = self._send_answer(customer, message, hit.entry)
+            if reply is None:
+                self.record_lookup(hit=False)
+                self.db.commit()
+                return None
+
+            self.record_lookup(
+                hit=True, time_saved_ms=hit.entry.answer_latency_ms or 0
+            )
+            hit.entry.hit_count += 1
+            hit.entry.last_hit_at = datetime.now(timezone.utc)
+            self.db.commit()
+            logger.info(
+                f"✓ Answered message {message.id} from cache entry "
+                f"{hit.entry.id} (similarity {hit.similarity:.3f})"
+            )
+            return reply
+
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"✗ Answer cache lookup failed: {e}")
+            return None
+
+    def _send_answer(
+        self, customer: Customer, message: Message, entry: AnswerCacheEntry
+    ) -> Optional[Message]:
+        """Send a cached answer; returns the committed reply or None"""
+        message_service = MessageService(self.db)
+        reply = message_service.create_ai_response_pending(
+            original_message_id=message.id,
+            ai_response=entry.answer,
+            message_sid=f"pending_cache_{message.id}",
+            message_type=MessageType.REPLY,
+        )
+        if not reply:
+            return None
+
+        body = entry.answer
+        if entry.has_citations:
+            disclaimer = t("ai_response.disclaimer", customer.language_code)
+            body += f"\n\n— _{disclaimer}_"
+
+        # With the outbox, the answer and template are queued behind any
+        # earlier messages to the customer and the sender sets the
+        # Twilio SID and reply_sent
+        whatsapp_service = WhatsAppService()
+        outbox = OutboxService(self.db, whatsapp_service)
+        tracer = ResponseTraceService(self.db)
+        try:
+            response = outbox.send_message(
+                to_number=customer.phone_number,
+                message_body=WhatsAppService.sanitize_whatsapp_content(body),
+                message_id=reply.id,
+                trace_message_id=message.id,
+                e164=customer.phone_e164,
+            )
+        except (TwilioRestException, ValueError) as e:
+            logger.error(f"✗ Cached answer delivery failed: {e}")
+            message_service.rollback_message(reply)
+            return None
+
+        if response:
+            # Sent inline
+            reply.message_sid = response["sid"]
+            reply.delivery_status = DeliveryStatus.SENT
+            tracer.mark(
+                message.id,
+                "reply_sent",
+                path=ResponsePath.CACHE,
+                reply_message_id=reply.id,
+            )
+        else:
+            tracer.set_path(message.id, ResponsePath.CACHE)
+
+        # Same escalation prompt as knowledge-base backed AI answers
+        if entry.has_citations:
+            template_sid = whatsapp_service.get_template_sid(
+                template_type="confirmation",
+                customer_language=customer.language_code,
+            )
+            if template_sid:
+                try:
+                    outbox.send_template_message(
+                        to=customer.phone_number,
+                        content_sid=template_sid,
+                        content_variables={},
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to send confirmation template "
+                        f"(non-critical): {e}"
+                    )
+
+        return message_service.commit_message(reply)
+
+    # ========== Storing answers ==========
+
+    async def store_answer(
+        self,
+        customer: Customer,
+        question: str,
+        answer: str,
+        source: str,
+        has_citations: bool = False,
+        source_message_id: Optional[int] = None,
+        answer_latency_ms: Optional[int] = None,
+    ) -> Optional[AnswerCacheEntry]:
+        """
+        Add an answered question to the cache and commit.
+
+        Args:
+            customer: Customer who asked (selects the partition)
+            question: Question text
+            answer: Answer exactly as sent to the farmer
+            source: SOURCE_AI or SOURCE_EO
+            has_citations: Answer is grounded in the knowledge base
+            source_message_id: Message holding the answer
+            answer_latency_ms: Time from question to answer
+
+        Returns:
+            The new entry, or None if the question was skipped
+        """
+        if not answer or len(normalize_question(question)) < (
+            settings.answer_cache_min_question_chars
+        ):
+            return None
+        vector = await self.embed(question)
+        if vector is None:
+            return None
+
+        partition = self.partition_for(customer)
+        language, crop_type, kb_version = partition
+        entry = AnswerCacheEntry(
+            language=language,
+            crop_type=crop_type,
+            kb_version=kb_version,
+            question=question,
+            answer=answer,
+            embedding=vector.astype(np.float16).tobytes(),
+            source=source,
+            has_citations=has_citations,
+            source_message_id=source_message_id,
+            answer_latency_ms=answer_latency_ms,
+        )
+        self.db.add(entry)
+        self.db.commit()
+
+        # Make the new entry visible to this process right away
+        with self._lock:
+            cached = self._indexes.get(partition)
+        if cached:
+            cached[1].add(entry.id, vector)
+        return entry
+
+    async def store_ai_reply(
+        self,
+        question_message: Message,
+        reply: Message,
+        answer: str,
+        has_citations: bool,
+    ) -> Optional[AnswerCacheEntry]:
+        """
+        Cache an AI reply delivered by the AI callback. Never raises.
+
+        Args:
+            question_message: The farmer's question
+            reply: The committed LLM reply
+            answer: Reply text as sent, without disclaimer
+            has_citations: Reply is grounded in the knowledge base
+        """
+        try:
+            latency_ms = None
+            if question_message.created_at and reply.created_at:
+                latency_ms = int(
+                    (
+                        reply.created_at - question_message.created_at
+                    ).total_seconds()
+                    * 1000
+                )
+            return await self.store_answer(
+                customer=question_message.customer,
+                question=question_message.body,
+                answer=answer,
+                source=SOURCE_AI,
+                has_citations=has_citations,
+                source_message_id=reply.id,
+                answer_latency_ms=latency_ms,
+            )
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"✗ Failed to cache AI reply {reply.id}: {e}")
+            return None
+
+    def answered_questions(
+        self,
+        since: Optional[datetime] = None,
+        sources: Sequence[str] = (SOURCE_AI, SOURCE_EO),
+        limit: Optional[int] = None,
+    ) -> List[AnsweredQuestion]:
+        """
+        Historical farmer questions directly followed by a reply.
+
+        A reply is the customer's next message when it comes from the
+        AI (LLM) or an extension officer (USER). Pairs are found with
+        one LEAD() window query over messages, oldest first.
+
+        Args:
+            since: Only questions asked after this time
+            sources: Reply sources to include (SOURCE_AI, SOURCE_EO)
+            limit: Maximum number of pairs
+
+        Returns:
+            List of AnsweredQuestion
+        """
+        window = {
+            "partition_by": Message.customer_id,
+            "order_by": (Message.created_at, Message.id),
+        }
+        query = self.db.query(
+            Message.id.label("question_id"),
+            Message.customer_id.label("customer_id"),
+            Message.body.label("question"),
+            Message.from_source.label("from_source"),
+            Message.created_at.label("asked_at"),
+            func.lead(Message.id).over(**window).label("answer_id"),
+            func.lead(Message.body).over(**window).label("answer"),
+            func.lead(Message.from_source).over(**window).label(
+                "answer_from"
+            ),
+            func.lead(Message.created_at).over(**window).label(
+                "answered_at"
+            ),
+        )
+        if since is not None:
+            query = query.filter(Message.created_at >= since)
+        timeline = query.subquery()
+
+        reply_sources = {
+            source: from_source
+            for source, from_source in (
+                (SOURCE_AI, MessageFrom.LLM),
+                (SOURCE_EO, MessageFrom.USER),
+            )
+            if source in sources
+        }
+        pairs = (
+            self.db.query(timeline)
+            .filter(
+                timeline.c.from_source == MessageFrom.CUSTOMER,
+                timeline.c.answer_from.in_(list(reply_sources.values())),
+                timeline.c.question.isnot(None),
+                timeline.c.answer.isnot(None),
+            )
+            .order_by(timeline.c.asked_at, timeline.c.question_id)
+        )
+        if limit:
+            pairs = pairs.limit(limit)
+
+        source_by_from = {v: k for k, v in reply_sources.items()}
+        return [
+            AnsweredQuestion(
+                question_id=row.question_id,
+                customer_id=row.customer_id,
+                question=row.question,
+                answer_id=row.answer_id,
+                answer=row.answer,
+                source=source_by_from[row.answer_from],
+                latency_ms=int(
+                    (row.answered_at - row.asked_at).total_seconds() * 1000
+                ),
+            )
+            for row in pairs
+            if len(normalize_question(row.question))
+            >= settings.answer_cache_min_question_chars
+        ]
+
+    # ========== Statistics ==========
+
+    def record_lookup(self, hit: bool, time_saved_ms: int = 0) -> None:
+        """Count one lookup in today's statistics (does not commit)"""
+        values = {
+            "day": date.today(),
+            "lookups": 1,
+            "hits": 1 if hit else 0,
+            "time_saved_ms": time_saved_ms if hit else 0,
+        }
+        stmt = pg_insert(AnswerCacheDailyStats).values(**values)
+        stats = AnswerCacheDailyStats.__table__.c
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["day"],
+            set_={
+                "lookups": stats.lookups + stmt.excluded.lookups,
+                "hits": stats.hits + stmt.excluded.hits,
+                "time_saved_ms": (
+                    stats.time_saved_ms + stmt.excluded.time_saved_ms
+                ),
+            },
+        )
+        self.db.execute(stmt)
+
+    def get_stats(self, days: int = 30) -> Dict[str, object]:
+        """
+        Hit rate and time saved over the last days.
+
+        Returns:
+            Dict with totals, hit_rate, entry count and a daily list
+        """
+        since = date.today() - timedelta(days=days - 1)
+        rows = (
+            self.db.query(AnswerCacheDailyStats)
+            .filter(AnswerCacheDailyStats.day >= since)
+            .order_by(AnswerCacheDailyStats.day.asc())
+            .all()
+        )
+        lookups = sum(row.lookups for row in rows)
+        hits = sum(row.hits for row in rows)
+        return {
+            "enabled": settings.answer_cache_enabled,
+            "days": days,
+            "lookups": lookups,
+            "hits": hits,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "time_saved_seconds": round(
+                sum(row.time_saved_ms for row in rows) / 1000, 1
+            ),
+            "entries": self.db.query(AnswerCacheEntry).count(),
+            "daily": [
+                {
+                    "day": row.day.isoformat(),
+                    "lookups": row.lookups,
+                    "hits": row.hits,
+                    "time_saved_seconds": round(row.time_saved_ms / 1000, 1),
+                }
+                for row in rows
+            ],
+        }
+
+
+def replay(
+    questions: Sequence[Tuple[Partition, AnsweredQuestion]],
+    vectors: Sequence[np.ndarray],
+    thresholds: Sequence[float],
+) -> Dict[float, Dict[str, object]]:
+    """
+    Replay answered questions in order against a growing cache.
+
+    Each question is first looked up among the earlier questions of its
+    partition, then added, as if the cache had been on from the start.
+
+    Args:
+        questions: (partition, answered question) pairs, oldest first
+        vectors: Unit embedding of each question
+        thresholds: Similarity thresholds to evaluate
+
+    Returns:
+        Dict of threshold -> lookups, hits, hit_rate,
+        time_saved_seconds and matches (list of (question, cached
+        question, similarity))
+    """
+    indexes: Dict[Partition, VectorIndex] = {}
+    results = {
+        threshold: {
+            "lookups": 0,
+            "hits": 0,
+            "time_saved_ms": 0,
+            "matches": [],
+        }
+        for threshold in thresholds
+    }
+    by_position: List[AnsweredQuestion] = []
+
+    for (partition, item), vector in zip(questions, vectors):
+        index = indexes.setdefault(partition, VectorIndex())
+        match = index.search(vector)
+        for threshold, result in results.items():
+            result["lookups"] += 1
+            if match and match[1] >= threshold:
+                cached = by_position[match[0]]
+                result["hits"] += 1
+                result["time_saved_ms"] += item.latency_ms
+                result["matches"].append(
+                    (item.question, cached.question, match[1])
+                )
+        index.add(len(by_position), vector)
+        by_position.append(item)
+
+    for result in results.values():
+        lookups = result["lookups"]
+        result["hit_rate"] = (
+            round(result["hits"] / lookups, 4) if lookups else 0.0
+        )
+        result["time_saved_seconds"] = round(
+            result.pop("time_saved_ms") / 1000, 1
+        )
+    return results
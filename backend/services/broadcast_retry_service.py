@@ -0,0 +1,187 @@
+"""
+BroadcastRetryService - Claim-and-dispatch retry sweeps for broadcasts.
+
+Shared by the broadcast and weather broadcast retry tasks. Each sweep:
+1. Selects due FAILED recipients joined with their customer and broadcast
+   in a single query. The backoff per retry_count is a SQL CASE over
+   settings.broadcast_retry_intervals, so no per-interval queries.
+2. Claims them with FOR UPDATE SKIP LOCKED and marks them SENDING in the
+   same transaction, so overlapping beats never double-send.
+3. Hands the batch to BulkSendService and writes all outcomes back in
+   one commit.
+
+Recipients stuck in SENDING (worker died after claiming) become eligible
+again once CLAIM_TIMEOUT_MINUTES has passed.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, case, or_
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.customer import Customer
+from models.message import DeliveryStatus
+from services.bulk_send_service import BulkSendService, BulkSendTarget
+
+logger = logging.getLogger(__name__)
+
+
+class BroadcastRetryService:
+    """Retry failed broadcast template deliveries in claimed batches"""
+
+    CLAIM_TIMEOUT_MINUTES = 15
+
+    def __init__(
+        self,
+        db: Session,
+        recipient_model,
+        broadcast_model,
+        broadcast_fk,
+        bulk_sender: BulkSendService,
+    ):
+        """
+        Args:
+            db: Database session
+            recipient_model: BroadcastRecipient or WeatherBroadcastRecipient
+            broadcast_model: Parent broadcast model joined for eligibility
+            broadcast_fk: Recipient column referencing the broadcast
+            bulk_sender: Bulk send engine used to dispatch the batch
+        """
+        self.db = db
+        self.recipient_model = recipient_model
+        self.broadcast_model = broadcast_model
+        self.broadcast_fk = broadcast_fk
+        self.bulk_sender = bulk_sender
+        self.retry_intervals = [
+            int(m) for m in settings.broadcast_retry_intervals
+        ]
+
+    def claim_due_recipients(
+        self, limit: Optional[int] = None
+    ) -> List[Tuple[Any, str, Optional[str]]]:
+        """
+        Claim due recipients with their phone number and language.
+
+        Returns:
+            List of (recipient, phone_number, language) tuples, already
+            committed as SENDING
+        """
+        model = self.recipient_model
+        now = datetime.utcnow()
+
+        # Latest sent_at that makes a recipient due, per retry attempt
+        due_before = case(
+            {
+                attempt: now - timedelta(minutes=minutes)
+                for attempt, minutes in enumerate(self.retry_intervals)
+            },
+            value=model.retry_count,
+        )
+        stale_claim = now - timedelta(minutes=self.CLAIM_TIMEOUT_MINUTES)
+
+        rows = (
+            self.db.query(model, Customer.phone_number, Customer.language)
+            .join(Customer, Customer.id == model.customer_id)
+            .join(
+                self.broadcast_model,
+                self.broadcast_model.id == self.broadcast_fk,
+            )
+            .filter(
+                model.retry_count < len(self.retry_intervals),
+                or_(
+                    and_(
+                        model.status == DeliveryStatus.FAILED,
+                        model.sent_at < due_before,
+                    ),
+                    and_(
+                        model.status == DeliveryStatus.SENDING,
+                        model.sent_at < stale_claim,
+                    ),
+                ),
+            )
+            .order_by(model.sent_at)
+            .limit(limit or settings.broadcast_retry_batch_size)
+            .with_for_update(of=model, skip_locked=True)
+            .all()
+        )
+
+        for recipient, _, _ in rows:
+            recipient.status = DeliveryStatus.SENDING
+            recipient.sent_at = now
+        self.db.commit()
+
+        return [tuple(row) for row in rows]
+
+    def sweep(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run one retry sweep.
+
+        Returns:
+            Dict with per-sweep metrics (retried, succeeded, failed,
+            exhausted, send_ms, duration_ms)
+        """
+        started = time.perf_counter()
+        claimed = self.claim_due_recipients(limit)
+
+        stats = {
+            "retried": len(claimed),
+            "succeeded": 0,
+            "failed": 0,
+            "exhausted": 0,
+            "send_ms": 0.0,
+            "duration_ms": 0.0,
+        }
+        if not claimed:
+            stats["duration_ms"] = round(
+                (time.perf_counter() - started) * 1000, 1
+            )
+            return stats
+
+        recipients = {recipient.id: recipient for recipient, _, _ in claimed}
+        result = self.bulk_sender.send_templates(
+            [
+                BulkSendTarget(
+                    key=recipient.id,
+                    phone_number=phone_number,
+                    language=language or settings.default_language,
+                )
+                for recipient, phone_number, language in claimed
+            ],
+            template_type="broadcast",
+        )
+
+        now = datetime.utcnow()
+        for outcome in result.outcomes:
+            recipient = recipients[outcome.key]
+            if outcome.ok:
+                recipient.status = DeliveryStatus.SENT
+                recipient.confirm_message_sid = outcome.sid
+                recipient.sent_at = now
+                recipient.error_message = None
+                stats["succeeded"] += 1
+                continue
+
+            logger.error(
+                f"Retry failed for recipient {recipient.id}: {outcome.error}"
+            )
+            recipient.retry_count = (recipient.retry_count or 0) + 1
+            recipient.error_message = outcome.error
+            if recipient.retry_count >= len(self.retry_intervals):
+                recipient.status = DeliveryStatus.UNDELIVERED
+                stats["exhausted"] += 1
+                logger.warning(
+                    f"Max retries reached for recipient {recipient.id}"
+                )
+            else:
+                recipient.status = DeliveryStatus.FAILED
+            stats["failed"] += 1
+
+        self.db.commit()
+
+        stats["send_ms"] = round(result.duration_ms, 1)
+        stats["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return stats
@@ -2,11 +2,32 @@
 Broadcast service for managing broadcast groups and messages.
 
 Part 2: Integrated with Celery for async message processing.
+
+Group membership and broadcast recipients are written set-based: one
+INSERT ... SELECT per operation, so creating a large broadcast never
+builds a Python object per recipient.
+
+A group may also carry an audience segment (filters on location and
+profile fields). Its matching customers are members alongside the static
+contacts; they are resolved in SQL whenever summaries are computed or a
+broadcast is sent, so the audience follows profile changes.
 """
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, distinct
+from sqlalchemy import (
+    Integer,
+    and_,
+    bindparam,
+    distinct,
+    func,
+    insert,
+    literal,
+    select,
+    union,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from models.broadcast import (
     BroadcastGroup,
@@ -15,8 +36,8 @@ from models.broadcast import (
     BroadcastMessageGroup,
     BroadcastRecipient,
 )
-from models.message import DeliveryStatus
 from models.customer import Customer
+from services.customer_service import CustomerService
 from tasks.broadcast_tasks import process_broadcast
 
 logger = logging.getLogger(__name__)
@@ -33,27 +54,24 @@ class BroadcastService:
         name: str,
         customer_ids: List[int],
         created_by: int,
-        administrative_id: Optional[int] = None
+        administrative_id: Optional[int] = None,
+        segment: Optional[dict] = None
     ) -> BroadcastGroup:
         """
         Create a new broadcast group with selected customer IDs.
         crop_types and age_groups are derived from group members.
+        Customers matching segment (if any) are dynamic members.
         """
         group = BroadcastGroup(
             name=name,
             administrative_id=administrative_id,
-            created_by=created_by
+            created_by=created_by,
+            segment=segment
         )
         self.db.add(group)
         self.db.flush()
 
-        # Add selected contacts
-        for customer_id in customer_ids:
-            contact = BroadcastGroupContact(
-                broadcast_group_id=group.id,
-                customer_id=customer_id
-            )
-            self.db.add(contact)
+        self.add_group_contacts(group.id, customer_ids)
 
         self.db.commit()
         self.db.refresh(group)
@@ -65,6 +83,35 @@ class BroadcastService:
 
         return group
 
+    def add_group_contacts(
+        self, group_id: int, customer_ids: List[int]
+    ) -> int:
+        """
+        Add customers to a group in one statement.
+
+        Customers already in the group (and duplicate IDs) are skipped
+        via ON CONFLICT DO NOTHING. Does not commit.
+
+        Args:
+            group_id: Broadcast group ID
+            customer_ids: Customer IDs to add
+
+        Returns:
+            Number of contacts inserted
+        """
+        if not customer_ids:
+            return 0
+        customer_id = func.unnest(
+            bindparam("customer_ids", customer_ids, type_=ARRAY(Integer))
+        )
+        stmt = pg_insert(BroadcastGroupContact).from_select(
+            ["broadcast_group_id", "customer_id"],
+            select(literal(group_id), customer_id),
+        ).on_conflict_do_nothing(
+            constraint="unique_broadcast_group_contact"
+        )
+        return self.db.execute(stmt).rowcount
+
     def get_all_groups(self) -> List[BroadcastGroup]:
         """Get all broadcast groups (for admin users)."""
         return self.db.query(BroadcastGroup).order_by(
@@ -115,13 +162,126 @@ class BroadcastService:
 
         return query.first()
 
+    def _members_select(self, group_ids: List[int]):
+        """
+        SELECT of (group_id, customer_id) for every member of the groups.
+
+        Static contacts are UNIONed with the customers matching each
+        group's segment, scoped to the group's ward.
+        """
+        static = select(
+            BroadcastGroupContact.broadcast_group_id.label("group_id"),
+            BroadcastGroupContact.customer_id.label("customer_id"),
+        ).where(BroadcastGroupContact.broadcast_group_id.in_(group_ids))
+
+        dynamic_groups = self.db.query(
+            BroadcastGroup.id,
+            BroadcastGroup.segment,
+            BroadcastGroup.administrative_id,
+        ).filter(
+            BroadcastGroup.id.in_(group_ids),
+            BroadcastGroup.segment.isnot(None),
+        ).all()
+        if not dynamic_groups:
+            return static
+
+        customer_service = CustomerService(self.db)
+        segments = [
+            select(
+                literal(group_id, Integer).label("group_id"),
+                Customer.id.label("customer_id"),
+            ).where(
+                customer_service.segment_condition(
+                    segment, scope_administrative_id=administrative_id
+                )
+            )
+            for group_id, segment, administrative_id in dynamic_groups
+        ]
+        return union(static, *segments)
+
+    def get_group_summaries(
+        self, group_ids: List[int]
+    ) -> Dict[int, dict]:
+        """
+        Summary attributes for several groups, aggregated in SQL.
+
+        Uses two grouped queries regardless of the number of groups or
+        members, instead of loading every member. Segment members are
+        included.
+
+        Args:
+            group_ids: Broadcast group IDs
+
+        Returns:
+            Dict of group ID -> dict with contact_count, crop_types,
+            age_groups and age_group_counts (label -> member count)
+        """
+        summaries = {
+            group_id: {
+                "contact_count": 0,
+                "crop_types": [],
+                "age_groups": [],
+                "age_group_counts": {},
+            }
+            for group_id in group_ids
+        }
+        if not summaries:
+            return summaries
+
+        members = self._members_select(group_ids).subquery()
+
+        # Member count and distinct crop types per group
+        crop_type = Customer.profile_data.op("->>")("crop_type")
+        rows = self.db.query(
+            members.c.group_id,
+            func.count(members.c.customer_id),
+            func.array_agg(distinct(crop_type)).filter(
+                crop_type.isnot(None)
+            ),
+        ).outerjoin(
+            Customer, Customer.id == members.c.customer_id
+        ).group_by(
+            members.c.group_id
+        ).all()
+        for group_id, contact_count, crop_types in rows:
+            summaries[group_id]["contact_count"] = contact_count
+            summaries[group_id]["crop_types"] = sorted(
+                name for name in crop_types or [] if name
+            )
+
+        # Age group histogram per group (grouped in an outer query so the
+        # CASE expression is not repeated in GROUP BY)
+        ages = self.db.query(
+            members.c.group_id.label("group_id"),
+            Customer.age_group_expression().label("age_group"),
+        ).join(
+            Customer, Customer.id == members.c.customer_id
+        ).subquery()
+        rows = self.db.query(
+            ages.c.group_id,
+            ages.c.age_group,
+            func.count(),
+        ).filter(
+            ages.c.age_group.isnot(None)
+        ).group_by(
+            ages.c.group_id, ages.c.age_group
+        ).all()
+        for group_id, age_group, count in rows:
+            summaries[group_id]["age_group_counts"][age_group] = count
+        for summary in summaries.values():
+            summary["age_groups"] = sorted(summary["age_group_counts"])
+
+        return summaries
+
     def update_group(
         self,
         group_id: int,
         eo_id: int,
         name: Optional[str] = None,
         customer_ids: Optional[List[int]] = None,
-        administrative_id: Optional[int] = None
+        administrative_id: Optional[int] = None,
+        segment: Optional[dict] = None,
+        clear_segment: bool = False
     ) -> Optional[BroadcastGroup]:
         """Update broadcast group (only if EO is owner)."""
         group = self.get_group_by_id(group_id, eo_id, administrative_id)
@@ -140,18 +300,19 @@ class BroadcastService:
         if name is not None:
             group.name = name
 
-        # Update contacts if provided
+        # Update contacts if provided: drop removed members, add new ones
         if customer_ids is not None:
             self.db.query(BroadcastGroupContact).filter(
-                BroadcastGroupContact.broadcast_group_id == group_id
-            ).delete()
+                BroadcastGroupContact.broadcast_group_id == group_id,
+                BroadcastGroupContact.customer_id.notin_(customer_ids),
+            ).delete(synchronize_session=False)
+            self.add_group_contacts(group_id, customer_ids)
+            self.db.expire(group, ["group_contacts"])
 
-            for customer_id in customer_ids:
-                contact = BroadcastGroupContact(
-                    broadcast_group_id=group_id,
-                    customer_id=customer_id
-                )
-                self.db.add(contact)
+        if clear_segment:
+            group.segment = None
+        elif segment is not None:
+            group.segment = segment
 
         self.db.commit()
         self.db.refresh(group)
@@ -208,25 +369,6 @@ class BroadcastService:
                 logger.error(f"Group {group_id} not accessible")
                 return None
 
-        # Get all unique recipients across all groups
-        recipients = (
-            self.db.query(
-                distinct(BroadcastGroupContact.customer_id),
-                Customer.phone_number,
-                Customer.full_name
-            )
-            .join(
-                Customer,
-                Customer.id == BroadcastGroupContact.customer_id
-            )
-            .filter(BroadcastGroupContact.broadcast_group_id.in_(group_ids))
-            .all()
-        )
-
-        if not recipients:
-            logger.error(f"No recipients found for groups {group_ids}")
-            return None
-
         # Create BroadcastMessage with 'queued' status
         broadcast = BroadcastMessage(
             message=message,
@@ -237,21 +379,37 @@ class BroadcastService:
         self.db.flush()
 
         # Link to groups (many-to-many)
-        for group_id in group_ids:
-            link = BroadcastMessageGroup(
-                broadcast_message_id=broadcast.id,
-                broadcast_group_id=group_id
-            )
-            self.db.add(link)
-
-        # Create BroadcastRecipient entries for delivery tracking
-        for customer_id, phone, name in recipients:
-            contact = BroadcastRecipient(
-                broadcast_message_id=broadcast.id,
-                customer_id=customer_id,
-                status=DeliveryStatus.PENDING
+        self.db.execute(
+            insert(BroadcastMessageGroup),
+            [
+                {
+                    "broadcast_message_id": broadcast.id,
+                    "broadcast_group_id": group_id,
+                }
+                for group_id in dict.fromkeys(group_ids)
+            ],
+        )
+
+        # Create BroadcastRecipient entries for delivery tracking: one
+        # row per unique customer across all groups (static contacts and
+        # current segment matches), in one statement.
+        # status comes from its server default (PENDING).
+        members = self._members_select(group_ids).subquery()
+        recipients = select(
+            literal(broadcast.id),
+            members.c.customer_id,
+        ).distinct()
+        recipient_count = self.db.execute(
+            insert(BroadcastRecipient).from_select(
+                ["broadcast_message_id", "customer_id"],
+                recipients,
             )
-            self.db.add(contact)
+        ).rowcount
+
+        if not recipient_count:
+            self.db.rollback()
+            logger.error(f"No recipients found for groups {group_ids}")
+            return None
 
         self.db.commit()
         self.db.refresh(broadcast)
@@ -261,7 +419,7 @@ class BroadcastService:
             task = process_broadcast.delay(broadcast.id)
             logger.info(
                 f"Broadcast {broadcast.id} queued with "
-                f"{len(recipients)} recipients (task_id={task.id})"
+                f"{recipient_count} recipients (task_id={task.id})"
             )
         except Exception as e:
             logger.error(
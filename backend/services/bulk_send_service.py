@@ -0,0 +1,153 @@
+"""
+BulkSendService - Send WhatsApp templates to many customers at once.
+
+The bulk send engine used by broadcast sweeps. Given a batch of
+already-resolved targets (no database access), it:
+- Resolves each language's template SID once per batch
+- Sends through a bounded thread pool, so Twilio round trips overlap
+- Reports per-target outcomes plus batch metrics
+
+Callers own the database: they claim rows, hand the batch over, and
+write the outcomes back in one transaction.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BulkSendTarget:
+    """A single template send: key is opaque to the engine."""
+
+    key: Any
+    phone_number: str
+    language: Optional[str] = None
+
+
+@dataclass
+class BulkSendOutcome:
+    """Result of sending to one target."""
+
+    key: Any
+    sid: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BulkSendResult:
+    """Outcomes and metrics for one batch."""
+
+    outcomes: List[BulkSendOutcome] = field(default_factory=list)
+    duration_ms: float = 0.0
+
+    @property
+    def sent(self) -> int:
+        return sum(1 for o in self.outcomes if o.ok)
+
+    @property
+    def failed(self) -> int:
+        return len(self.outcomes) - self.sent
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "total": len(self.outcomes),
+            "sent": self.sent,
+            "failed": self.failed,
+            "duration_ms": round(self.duration_ms, 1),
+        }
+
+
+class BulkSendService:
+    """Send one WhatsApp template type to a batch of customers."""
+
+    def __init__(
+        self,
+        whatsapp_service,
+        max_workers: Optional[int] = None,
+        dry_run: bool = False,
+        dry_run_sid_prefix: str = "TEST_BULK_SID",
+    ):
+        self.whatsapp_service = whatsapp_service
+        self.max_workers = max(
+            1, int(max_workers or settings.broadcast_send_concurrency)
+        )
+        self.dry_run = dry_run
+        self.dry_run_sid_prefix = dry_run_sid_prefix
+
+    def send_templates(
+        self,
+        targets: List[BulkSendTarget],
+        template_type: str = "broadcast",
+        content_variables: Optional[Dict[str, str]] = None,
+    ) -> BulkSendResult:
+        """
+        Send a template to every target.
+
+        Args:
+            targets: Recipients to send to
+            template_type: Template type for get_template_sid()
+            content_variables: Template variables shared by all targets
+
+        Returns:
+            BulkSendResult with one outcome per target, in input order
+        """
+        started = time.perf_counter()
+        if not targets:
+            return BulkSendResult()
+
+        # One template lookup per language instead of per recipient
+        template_sids = {
+            language: self.whatsapp_service.get_template_sid(
+                template_type=template_type,
+                customer_language=language,
+            )
+            for language in {t.language for t in targets}
+        }
+        variables = content_variables or {}
+
+        def send_one(target: BulkSendTarget) -> BulkSendOutcome:
+            if self.dry_run:
+                return BulkSendOutcome(
+                    key=target.key,
+                    sid=f"{self.dry_run_sid_prefix}_{target.key}",
+                )
+            try:
+                response = self.whatsapp_service.send_template_message(
+                    to=target.phone_number,
+                    content_sid=template_sids[target.language],
+                    content_variables=variables,
+                )
+                return BulkSendOutcome(
+                    key=target.key, sid=response.get("sid")
+                )
+            except Exception as e:
+                return BulkSendOutcome(key=target.key, error=str(e))
+
+        if self.max_workers == 1 or len(targets) == 1:
+            outcomes = [send_one(t) for t in targets]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(targets))
+            ) as executor:
+                outcomes = list(executor.map(send_one, targets))
+
+        result = BulkSendResult(
+            outcomes=outcomes,
+            duration_ms=(time.perf_counter() - started) * 1000,
+        )
+        logger.info(
+            f"Bulk {template_type} send: {result.sent} sent, "
+            f"{result.failed} failed in {result.duration_ms:.0f}ms"
+        )
+        return result
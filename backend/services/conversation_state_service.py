@@ -0,0 +1,174 @@
+"""
+ConversationStateService - One-read routing state of a customer
+
+Reads the per-customer conversation state (models/conversation_state.py)
+from Redis, falling back to the conversation_states row. Rows are kept
+up to date by mapper events in the writing transaction; after the commit
+the cached copies of the changed customers are invalidated.
+
+Invalidation leaves a short-lived tombstone instead of deleting the key.
+Readers only cache with SET NX, so a reader that loaded the row before a
+concurrent commit cannot put the old state back into Redis.
+"""
+
+import json
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Iterable, Optional
+
+import redis
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.conversation_state import ConversationState
+
+logger = logging.getLogger(__name__)
+
+_TOMBSTONE = b"-"
+_TOMBSTONE_TTL_MS = 5000
+
+
+@dataclass(frozen=True)
+class ConversationSnapshot:
+    """Routing facts about a customer's conversation"""
+
+    customer_id: int
+    has_messages: bool = False
+    open_ticket_id: Optional[int] = None
+    pending_undelivered: int = 0
+    last_follow_up_at: Optional[datetime] = None
+    last_resolved_at: Optional[datetime] = None
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        for key in ("last_follow_up_at", "last_resolved_at"):
+            if data[key] is not None:
+                data[key] = data[key].isoformat()
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw) -> "ConversationSnapshot":
+        data = json.loads(raw)
+        for key in ("last_follow_up_at", "last_resolved_at"):
+            if data.get(key):
+                data[key] = datetime.fromisoformat(data[key])
+        return cls(**data)
+
+
+class ConversationStateCache:
+    """Redis copy of conversation snapshots keyed by customer ID"""
+
+    def __init__(
+        self,
+        client: Optional[redis.Redis] = None,
+        prefix: str = "conversation_state",
+    ):
+        self._client = client
+        self.prefix = prefix
+
+    @property
+    def enabled(self) -> bool:
+        return (
+            self._client is not None
+            or settings.conversation_state_cache_enabled
+        )
+
+    def _get_client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(
+                settings.celery_broker_url,
+                socket_timeout=1,
+                socket_connect_timeout=1,
+            )
+        return self._client
+
+    def _key(self, customer_id: int) -> str:
+        return f"{self.prefix}:{customer_id}"
+
+    def get(self, customer_id: int) -> Optional[ConversationSnapshot]:
+        if not self.enabled:
+            return None
+        try:
+            raw = self._get_client().get(self._key(customer_id))
+            if raw is None or raw == _TOMBSTONE:
+                return None
+            return ConversationSnapshot.from_json(raw)
+        except (redis.RedisError, ValueError, TypeError) as e:
+            logger.warning(f"⚠ Conversation state cache read failed: {e}")
+            return None
+
+    def set(self, snapshot: ConversationSnapshot) -> None:
+        if not self.enabled:
+            return
+        try:
+            self._get_client().set(
+                self._key(snapshot.customer_id),
+                snapshot.to_json(),
+                nx=True,
+                px=settings.conversation_state_cache_ttl_seconds * 1000,
+            )
+        except redis.RedisError as e:
+            logger.warning(f"⚠ Conversation state cache write failed: {e}")
+
+    def invalidate(self, customer_ids: Iterable[int]) -> None:
+        """Drop cached snapshots after their rows changed"""
+        if not self.enabled:
+            return
+        try:
+            client = self._get_client()
+            for customer_id in customer_ids:
+                client.set(
+                    self._key(customer_id), _TOMBSTONE, px=_TOMBSTONE_TTL_MS
+                )
+        except redis.RedisError as e:
+            # Entries expire after the TTL at the latest
+            logger.warning(
+                f"⚠ Conversation state cache invalidation failed: {e}"
+            )
+
+
+conversation_state_cache = ConversationStateCache()
+
+
+class ConversationStateService:
+    def __init__(
+        self, db: Session, cache: Optional[ConversationStateCache] = None
+    ):
+        self.db = db
+        self.cache = cache or conversation_state_cache
+
+    def get(self, customer_id: int) -> ConversationSnapshot:
+        """
+        Conversation snapshot of a customer, from cache when possible.
+
+        Args:
+            customer_id: Customer ID
+
+        Returns:
+            The snapshot; the empty state if the customer has no
+            messages or tickets yet
+        """
+        snapshot = self.cache.get(customer_id)
+        if snapshot is not None:
+            return snapshot
+
+        row = (
+            self.db.query(
+                ConversationState.has_messages,
+                ConversationState.open_ticket_id,
+                ConversationState.pending_undelivered,
+                ConversationState.last_follow_up_at,
+                ConversationState.last_resolved_at,
+            )
+            .filter(ConversationState.customer_id == customer_id)
+            .first()
+        )
+        if row is None:
+            snapshot = ConversationSnapshot(customer_id=customer_id)
+        else:
+            snapshot = ConversationSnapshot(
+                customer_id=customer_id, **row._asdict()
+            )
+        self.cache.set(snapshot)
+        return snapshot
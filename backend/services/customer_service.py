@@ -1,9 +1,10 @@
-from typing import List, Tuple, Dict, Optional
-from datetime import datetime, timezone
+from typing import Any, List, Tuple, Dict, Optional
+from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import or_, and_, Integer, cast
+from sqlalchemy import or_, and_, func, select, true, Integer, cast
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, aliased, joinedload
 
 from config import settings
 from models.administrative import (
@@ -20,6 +21,8 @@ from models.message import Message
 from schemas.callback import MessageType
 from models.broadcast import BroadcastGroupContact, BroadcastRecipient
 from models.weather_broadcast import WeatherBroadcastRecipient
+from utils.phone import e164_or_none
+from utils.search import count_matches, search_condition
 
 
 class CustomerService:
@@ -58,14 +61,40 @@ class CustomerService:
     def get_or_create_customer(
         self, phone_number: str, message_text: str = None
     ) -> Customer:
-        """Get existing customer or create new one with language detection."""
-        customer = self.get_customer_by_phone(phone_number)
-        if customer:
-            return customer
+        """
+        Get existing customer or create a new one in a single statement.
+
+        INSERT ... ON CONFLICT (phone_number) DO UPDATE ... RETURNING
+        resolves concurrent webhooks for a new number without a
+        SELECT/INSERT race or a rollback. The no-op update is what makes
+        RETURNING yield the existing row.
+
+        Args:
+            phone_number: Farmer's phone number
+            message_text: Unused; the language is set during onboarding
 
-        # The language will be set during onboarding based on user input.
+        Returns:
+            The existing or newly created customer
+        """
         language = None
-        return self.create_customer(phone_number, language)
+        if settings.is_single_language:
+            language = settings.default_language
+
+        # Core INSERT: mapper events do not fill phone_e164
+        insert = pg_insert(Customer).values(
+            phone_number=phone_number,
+            phone_e164=e164_or_none(phone_number),
+            language=language,
+        )
+        stmt = insert.on_conflict_do_update(
+            index_elements=[Customer.phone_number],
+            set_={"phone_number": insert.excluded.phone_number},
+        ).returning(Customer)
+        customer = self.db.scalars(
+            stmt, execution_options={"populate_existing": True}
+        ).one()
+        self.db.commit()
+        return customer
 
     def update_customer_profile(self, customer_id: int, **kwargs) -> Customer:
         """Update customer profile with new information."""
@@ -254,7 +283,8 @@ class CustomerService:
                 (e.g., {"crop_type": ["Maize"], "gender": ["male"]})
 
         Returns:
-            Tuple of (list of customer dicts, total count)
+            Tuple of (list of customer dicts, total count). Totals above
+            settings.search_exact_count_limit are planner estimates.
         """
         # Base query with eager loading of relationships
         query = self.db.query(Customer).options(
@@ -271,26 +301,25 @@ class CustomerService:
                 )
             )
 
-        # Apply search filter
-        if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Customer.full_name.ilike(search_term),
-                    Customer.phone_number.ilike(search_term),
-                )
+        # Apply search filter, closest matches first
+        order_by = [Customer.created_at.desc()]
+        if search and search.strip():
+            condition, rank = search_condition(
+                search, [Customer.full_name], Customer.phone_number
             )
+            query = query.filter(condition)
+            order_by.insert(0, rank.desc())
 
         # Apply profile filters
         if profile_filters:
             query = self._apply_profile_filters(query, profile_filters)
 
-        # Get total count before pagination
-        total = query.count()
+        # Get total count before pagination (estimated for large lists)
+        total = count_matches(self.db, query)
 
         # Apply pagination
         customers = (
-            query.order_by(Customer.created_at.desc())
+            query.order_by(*order_by)
             .offset((page - 1) * size)
             .limit(size)
             .all()
@@ -407,29 +436,48 @@ class CustomerService:
         Returns:
             Updated query with filters applied
         """
+        conditions = self._profile_filter_conditions(profile_filters)
+        if conditions:
+            query = query.filter(*conditions)
+        return query
+
+    def _profile_filter_conditions(
+        self, profile_filters: Dict[str, List[str]]
+    ) -> list:
+        """Build one SQL condition per profile field filter.
+
+        Values of a field are combined with OR, fields with AND.
+
+        Args:
+            profile_filters: Dict of field names to lists of values
+
+        Returns:
+            List of SQLAlchemy conditions
+        """
+        conditions = []
         for field_name, field_values in profile_filters.items():
             if not isinstance(field_values, list):
                 field_values = [field_values]
 
             if field_name == "age_group":
-                query = self._filter_by_age_groups(query, field_values)
-            else:
+                condition = self._age_group_condition(field_values)
+                if condition is not None:
+                    conditions.append(condition)
+            elif len(field_values) == 1:
                 # JSON field filter with OR logic
                 # Use ->> operator to extract text value without quotes
-                if len(field_values) == 1:
-                    query = query.filter(
-                        Customer.profile_data.op("->>")(field_name)
-                        == str(field_values[0])
+                conditions.append(
+                    Customer.profile_data.op("->>")(field_name)
+                    == str(field_values[0])
+                )
+            elif field_values:
+                conditions.append(
+                    Customer.profile_data.op("->>")(field_name).in_(
+                        [str(value) for value in field_values]
                     )
-                else:
-                    or_conditions = [
-                        Customer.profile_data.op("->>")(field_name)
-                        == str(value)
-                        for value in field_values
-                    ]
-                    query = query.filter(or_(*or_conditions))
+                )
 
-        return query
+        return conditions
 
     def _filter_by_age_groups(self, query, age_groups: List[str]):
         """Filter by age groups (calculated from birth_year).
@@ -442,6 +490,20 @@ class CustomerService:
         Returns:
             Updated query with age group filters applied
         """
+        condition = self._age_group_condition(age_groups)
+        if condition is not None:
+            query = query.filter(condition)
+        return query
+
+    def _age_group_condition(self, age_groups: List[str]):
+        """Birth year range condition matching any of the age groups.
+
+        Args:
+            age_groups: List of age group labels (e.g., ["20-35"])
+
+        Returns:
+            SQLAlchemy condition, or None if no label is configured
+        """
         current_year = datetime.now().year
 
         age_conditions = []
@@ -475,10 +537,126 @@ class CustomerService:
             if conditions:
                 age_conditions.append(and_(*conditions))
 
-        if age_conditions:
-            query = query.filter(or_(*age_conditions))
+        if not age_conditions:
+            return None
+        return or_(*age_conditions)
 
-        return query
+    def _administrative_subtree_condition(
+        self, administrative_ids: List[int]
+    ):
+        """Customers located in any of the areas or their descendants.
+
+        Uses the materialized administrative path, so a region matches
+        every customer in its districts and wards.
+
+        Args:
+            administrative_ids: Administrative area IDs (any level)
+
+        Returns:
+            SQLAlchemy condition on Customer.id
+        """
+        root = aliased(Administrative)
+        area = aliased(Administrative)
+        customer_ids = (
+            select(CustomerAdministrative.customer_id)
+            .join(area, area.id == CustomerAdministrative.administrative_id)
+            .join(
+                root,
+                or_(
+                    area.id == root.id,
+                    area.path.like(
+                        root.path + settings.admin_delimiter + "%"
+                    ),
+                ),
+            )
+            .where(root.id.in_(administrative_ids))
+        )
+        return Customer.id.in_(customer_ids)
+
+    def segment_condition(
+        self,
+        segment: Dict[str, Any],
+        scope_administrative_id: Optional[int] = None,
+    ):
+        """Compile an audience segment into a single SQL predicate.
+
+        Empty criteria match everyone; values within a criterion are
+        combined with OR, criteria with AND.
+
+        Args:
+            segment: Segment definition (see schemas.broadcast.
+                AudienceSegment)
+            scope_administrative_id: Restrict matches to this area's
+                subtree (e.g. the ward of the EO owning the segment)
+
+        Returns:
+            SQLAlchemy condition on Customer
+        """
+        conditions = []
+
+        if segment.get("administrative_ids"):
+            conditions.append(
+                self._administrative_subtree_condition(
+                    segment["administrative_ids"]
+                )
+            )
+        if scope_administrative_id is not None:
+            conditions.append(
+                self._administrative_subtree_condition(
+                    [scope_administrative_id]
+                )
+            )
+
+        profile_filters = {
+            field: segment[key]
+            for key, field in (
+                ("crop_types", "crop_type"),
+                ("genders", "gender"),
+                ("age_groups", "age_group"),
+            )
+            if segment.get(key)
+        }
+        conditions.extend(self._profile_filter_conditions(profile_filters))
+
+        languages = segment.get("languages")
+        if languages:
+            language_condition = Customer.language.in_(languages)
+            # Customers without a language use the default one
+            if settings.default_language in languages:
+                language_condition = or_(
+                    language_condition, Customer.language.is_(None)
+                )
+            conditions.append(language_condition)
+
+        weather_subscribed = segment.get("weather_subscribed")
+        if weather_subscribed is not None:
+            subscribed = Customer.profile_data.op("->>")("weather_subscribed")
+            if weather_subscribed:
+                conditions.append(subscribed == "true")
+            else:
+                conditions.append(func.coalesce(subscribed, "") != "true")
+
+        active_within_days = segment.get("active_within_days")
+        if active_within_days:
+            conditions.append(
+                Customer.last_message_at
+                >= datetime.now(timezone.utc)
+                - timedelta(days=active_within_days)
+            )
+
+        return and_(true(), *conditions)
+
+    def count_segment(
+        self,
+        segment: Dict[str, Any],
+        scope_administrative_id: Optional[int] = None,
+    ) -> int:
+        """Number of customers currently matching a segment."""
+        return self.db.scalar(
+            select(func.count(Customer.id)).where(
+                self.segment_condition(segment, scope_administrative_id)
+            )
+        )
 
     def create_ticket_for_customer(
         self, customer: Customer, message_id: int
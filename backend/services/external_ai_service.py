@@ -12,6 +12,7 @@ from fastapi import HTTPException
 from models.service_token import ServiceToken
 from services.service_token_service import ServiceTokenService
 from services.knowledge_base_service import KnowledgeBaseService
+from services.response_trace_service import ResponseTraceService
 from models.message import MessageType
 
 logger = logging.getLogger(__name__)
@@ -190,6 +191,8 @@ class ExternalAIService:
                     f"for message {message_id} "
                     f"(service: {self.token.service_name})"
                 )
+                if not additional_callback_params:
+                    self._trace_job_created(message_id, trace_id)
                 return data
         except httpx.HTTPStatusError as e:
             logger.error(
@@ -201,6 +204,19 @@ class ExternalAIService:
             logger.error(f"✗ Failed to create chat job: {e}")
             return None
 
+    def _trace_job_created(
+        self, message_id: int, trace_id: Optional[str]
+    ) -> None:
+        """Record the ai_job_created stage of the message's trace"""
+        try:
+            ResponseTraceService(self.db).mark(
+                message_id, "ai_job_created", trace_id=trace_id
+            )
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"⚠ Could not trace job creation: {e}")
+
     async def create_upload_job(
         self,
         upload_file,
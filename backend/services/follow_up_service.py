@@ -17,6 +17,7 @@ from models.customer import Customer
 from models.message import Message, MessageFrom, DeliveryStatus
 from models.ticket import Ticket
 from schemas.callback import MessageType
+from services.conversation_state_service import ConversationSnapshot
 from services.openai_service import get_openai_service
 from services.whatsapp_service import WhatsAppService
 
@@ -114,7 +115,8 @@ class FollowUpService:
     def should_ask_follow_up(
         self,
         customer: Customer,
-        chat_history: List[Message]
+        chat_history: List[Message],
+        conversation: Optional[ConversationSnapshot] = None,
     ) -> bool:
         """
         Determine if a follow-up question should be asked.
@@ -127,10 +129,15 @@ class FollowUpService:
         Args:
             customer: Customer object
             chat_history: List of recent messages
+            conversation: Conversation state of the customer; its
+                timestamps replace the scan and the ticket query
 
         Returns:
             bool: True if follow-up should be asked
         """
+        if conversation is not None:
+            return self._should_ask_from_state(chat_history, conversation)
+
         # Find last FOLLOW_UP in chat history
         last_follow_up = None
         for msg in chat_history:
@@ -183,6 +190,42 @@ class FollowUpService:
         )
         return False
 
+    def _should_ask_from_state(
+        self,
+        chat_history: List[Message],
+        conversation: ConversationSnapshot,
+    ) -> bool:
+        """should_ask_follow_up on the conversation state timestamps"""
+        last_follow_up_at = conversation.last_follow_up_at
+        # The last follow-up only counts while it is within the history
+        oldest = min((m.created_at for m in chat_history), default=None)
+        if (
+            last_follow_up_at is None
+            or oldest is None
+            or last_follow_up_at < oldest
+        ):
+            logger.info(
+                f"[FollowUp] No FOLLOW_UP in history for customer "
+                f"{conversation.customer_id}, will ask"
+            )
+            return True
+
+        last_resolved_at = conversation.last_resolved_at
+        if last_resolved_at is not None and (
+            last_resolved_at > last_follow_up_at
+        ):
+            logger.info(
+                f"[FollowUp] Ticket resolved after last FOLLOW_UP for "
+                f"customer {conversation.customer_id}, will ask new follow-up"
+            )
+            return True
+
+        logger.info(
+            f"[FollowUp] FOLLOW_UP already asked for customer "
+            f"{conversation.customer_id}, skipping"
+        )
+        return False
+
     async def generate_follow_up_question(
         self,
         customer: Customer,
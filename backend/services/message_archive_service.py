@@ -0,0 +1,315 @@
+"""
+MessageArchiveService - Moves old messages to the partitioned archive
+
+`messages` only keeps the recent months that the webhook, inbox, retry
+queue and delivery statistics work on. A monthly Celery task
+(tasks/archive_tasks.py) moves older messages into `messages_archive`,
+one partition per month (see models/message_archive.py), and exports
+archived months past the retention period to Parquet files before
+dropping their partition.
+
+Messages that other rows still point at (tickets, broadcast recipients)
+or that may still be sent (retry queue, undelivered EO replies waiting
+for a reconnect) stay in `messages`. Response traces of archived farmer
+messages are deleted with them.
+
+message_history() reads both tiers; bounding it by created_at lets
+PostgreSQL skip the archive partitions outside the range.
+"""
+
+import logging
+import os
+import re
+from datetime import date, datetime, time, timezone
+from typing import Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    and_,
+    delete,
+    exists,
+    func,
+    insert,
+    not_,
+    select,
+    text,
+    union_all,
+)
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.broadcast import BroadcastRecipient
+from models.message import DeliveryStatus, Message, MessageFrom
+from models.message_archive import (
+    MessageArchive,
+    add_months,
+    month_bounds,
+    month_start,
+    partition_name,
+)
+from models.ticket import Ticket
+from models.weather_broadcast import WeatherBroadcastRecipient
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_TABLE = MessageArchive.__table__.name
+PARTITION_PATTERN = re.compile(r"^messages_archive_y(\d{4})m(\d{2})$")
+
+
+def _utc(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _utc_bounds(month: date) -> Tuple[datetime, datetime]:
+    start, end = month_bounds(month)
+    return _utc(start), _utc(end)
+
+
+def message_history(
+    *names: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """
+    Hot and archived messages as one subquery.
+
+    Args:
+        names: Message column names to select
+        since: Only messages created at or after this time
+        until: Only messages created before this time
+
+    Returns:
+        Subquery with the requested columns (UNION ALL of both tiers)
+    """
+    parts = []
+    for table in (Message.__table__, MessageArchive.__table__):
+        query = select(*[table.c[name] for name in names])
+        if since is not None:
+            query = query.where(table.c.created_at >= since)
+        if until is not None:
+            query = query.where(table.c.created_at < until)
+        parts.append(query)
+    return union_all(*parts).subquery("message_history")
+
+
+class MessageArchiveService:
+    """Move old messages to messages_archive and export old partitions"""
+
+    def __init__(self, db: Session, archive_dir: Optional[str] = None):
+        self.db = db
+        self.archive_dir = archive_dir or settings.message_archive_dir
+        self.batch_size = settings.message_archive_batch_size
+
+    def ensure_partition(self, month: date) -> str:
+        """
+        Create the archive partition for month if it does not exist.
+
+        Returns:
+            Partition table name
+        """
+        start, end = _utc_bounds(month)
+        name = partition_name(start)
+        self.db.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} "
+                f"PARTITION OF {ARCHIVE_TABLE} "
+                f"FOR VALUES FROM ('{start.isoformat()}') "
+                f"TO ('{end.isoformat()}')"
+            )
+        )
+        return name
+
+    def list_partitions(self) -> List[date]:
+        """Months that have an archive partition, oldest first"""
+        rows = self.db.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.relname = :parent"
+            ),
+            {"parent": ARCHIVE_TABLE},
+        ).scalars()
+        months = []
+        for name in rows:
+            match = PARTITION_PATTERN.match(name)
+            if match:
+                months.append(date(int(match[1]), int(match[2]), 1))
+        return sorted(months)
+
+    def _archivable(self, start: datetime, end: datetime):
+        """Messages of [start, end) that nothing needs in the hot table"""
+        return and_(
+            Message.created_at >= start,
+            Message.created_at < end,
+            # Retry queue
+            Message.next_retry_at.is_(None),
+            # EO replies re-sent when the farmer reconnects
+            not_(
+                and_(
+                    Message.from_source == MessageFrom.USER,
+                    Message.delivery_status == DeliveryStatus.UNDELIVERED,
+                )
+            ),
+            ~exists().where(Ticket.message_id == Message.id),
+            ~exists().where(Ticket.context_message_id == Message.id),
+            ~exists().where(BroadcastRecipient.message_id == Message.id),
+            ~exists().where(
+                WeatherBroadcastRecipient.message_id == Message.id
+            ),
+        )
+
+    def archive_month(self, month: date) -> int:
+        """
+        Move the archivable messages of month to its archive partition.
+
+        Each batch is one DELETE ... RETURNING feeding an INSERT, committed
+        on its own so locks stay short.
+
+        Args:
+            month: Any day of the month to archive
+
+        Returns:
+            Number of messages moved
+        """
+        start, end = _utc_bounds(month)
+        self.ensure_partition(month)
+        self.db.commit()
+
+        messages = Message.__table__
+        names = [column.name for column in messages.columns]
+        moved_total = 0
+        while True:
+            batch = (
+                select(messages.c.id)
+                .where(self._archivable(start, end))
+                .order_by(messages.c.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            moved = (
+                delete(messages)
+                .where(messages.c.id.in_(batch.scalar_subquery()))
+                .returning(*messages.columns)
+                .cte("moved")
+            )
+            statement = (
+                insert(MessageArchive.__table__)
+                .from_select(names, select(*[moved.c[n] for n in names]))
+                .add_cte(moved)
+            )
+            moved_count = self.db.execute(statement).rowcount
+            self.db.commit()
+            moved_total += moved_count
+            if moved_count < self.batch_size:
+                break
+
+        logger.info(
+            f"✓ Archived {moved_total} messages to {partition_name(start)}"
+        )
+        return moved_total
+
+    def archive_due(self, today: Optional[date] = None) -> Dict[str, int]:
+        """
+        Archive every month older than the hot period.
+
+        Returns:
+            Messages moved per partition
+        """
+        today = today or datetime.now(timezone.utc).date()
+        cutoff = add_months(
+            month_start(today), -settings.message_archive_hot_months
+        )
+        oldest = self.db.scalar(
+            select(func.min(Message.created_at)).where(
+                Message.created_at < _utc(cutoff)
+            )
+        )
+        if oldest is None:
+            return {}
+
+        results = {}
+        month = month_start(oldest.astimezone(timezone.utc).date())
+        while month < cutoff:
+            results[partition_name(month)] = self.archive_month(month)
+            month = add_months(month, 1)
+        return results
+
+    def _arrow_schema(self) -> pa.Schema:
+        fields = []
+        for column in MessageArchive.__table__.columns:
+            if isinstance(column.type, DateTime):
+                arrow_type = pa.timestamp("us", tz="UTC")
+            elif isinstance(column.type, Integer):
+                arrow_type = pa.int64()
+            else:
+                # Strings, texts and enum names
+                arrow_type = pa.string()
+            fields.append(pa.field(column.name, arrow_type))
+        return pa.schema(fields)
+
+    def export_partition(self, month: date) -> str:
+        """
+        Write an archive partition to a Parquet file, then drop it.
+
+        The file is written under a temporary name and renamed once
+        complete, so a failed export leaves the partition in place.
+
+        Args:
+            month: Any day of the month to export
+
+        Returns:
+            Path of the Parquet file
+        """
+        name = partition_name(month)
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(self.archive_dir, f"{name}.parquet")
+        partial_path = f"{path}.partial"
+
+        schema = self._arrow_schema()
+        result = self.db.execute(
+            text(f"SELECT * FROM {name} ORDER BY id"),
+            execution_options={"stream_results": True},
+        )
+        exported = 0
+        with pq.ParquetWriter(
+            partial_path, schema, compression="zstd"
+        ) as writer:
+            for rows in result.mappings().partitions(self.batch_size):
+                writer.write_table(
+                    pa.Table.from_pylist(
+                        [dict(row) for row in rows], schema=schema
+                    )
+                )
+                exported += len(rows)
+        os.replace(partial_path, path)
+
+        self.db.execute(
+            text(f"ALTER TABLE {ARCHIVE_TABLE} DETACH PARTITION {name}")
+        )
+        self.db.execute(text(f"DROP TABLE {name}"))
+        self.db.commit()
+        logger.info(f"✓ Exported {exported} archived messages to {path}")
+        return path
+
+    def export_due(self, today: Optional[date] = None) -> List[str]:
+        """
+        Export every archive partition older than the retention period.
+
+        Returns:
+            Paths of the written Parquet files
+        """
+        if settings.message_archive_export_months <= 0:
+            return []
+        today = today or datetime.now(timezone.utc).date()
+        cutoff = add_months(
+            month_start(today), -settings.message_archive_export_months
+        )
+        return [
+            self.export_partition(month)
+            for month in self.list_partitions()
+            if month < cutoff
+        ]
@@ -30,11 +30,11 @@ from schemas.onboarding_schemas import (
     OnboardingResponse,
     OnboardingFieldConfig,
     CropIdentificationResult,
-    load_onboarding_fields,
 )
 from services.openai_service import get_openai_service
 from services.user_service import UserService
 from config import settings
+from utils.config_snapshot import current_snapshot
 from utils.i18n import t, get_crop_name_translated
 
 logger = logging.getLogger(__name__)
@@ -64,7 +64,10 @@ class OnboardingService:
         """Initialize generic onboarding service"""
         self.db = db
         self.openai_service = get_openai_service()
-        self.fields_config = load_onboarding_fields()
+        # Field table and admin levels come precompiled from the config
+        # snapshot instead of being rebuilt for every webhook
+        config = current_snapshot()
+        self.fields_config = list(config.onboarding_fields)
         self.supported_crops = settings.crop_types
 
         # Configuration (can be overridden per field)
@@ -75,30 +78,9 @@ class OnboardingService:
 
         # Administrative level hierarchy (in order of selection)
         # Sourced dynamically from settings (levels with level_index > 0)
-        self.admin_level_order = settings.admin_level_order
-        self._admin_level_suffixes = self._build_admin_level_suffixes()
-
-    def _build_admin_level_suffixes(self) -> List[str]:
-        """
-        Dynamically build administrative level suffix tokens from config.json.
-        """
-        tokens = set()
-        hierarchy = settings.administrative_hierarchy
-        if hierarchy and isinstance(hierarchy, dict):
-            for level in hierarchy.get("levels", []):
-                name = level.get("name")
-                if name:
-                    tokens.add(name.lower().strip())
-                display = level.get("display")
-                if isinstance(display, dict):
-                    for label in display.values():
-                        if label:
-                            tokens.add(label.lower().strip())
-                elif isinstance(display, str) and display:
-                    tokens.add(display.lower().strip())
-
-        # Return formatted suffixes sorted by length descending
-        return [f" {t}" for t in sorted(tokens, key=len, reverse=True)]
+        self.admin_level_order = list(config.admin.order)
+        # Level names and labels stripped from ward names when matching
+        self._admin_level_suffixes = config.admin.suffixes
 
     def _format_crops_numbered(self, lang: str = "en") -> str:
         """
@@ -20,6 +20,8 @@ from openai import AsyncOpenAI, OpenAIError
 from openai.types.chat import ChatCompletion
 
 from config import settings
+from utils.metrics import OPENAI_REQUESTS, OPENAI_TOKENS
+from utils.single_flight import get_single_flight, request_key
 from schemas.openai_schemas import (
     ChatCompletionResponse,
     ChatCompletionUsage,
@@ -95,6 +97,9 @@ class OpenAIService:
 
     def _track_usage(self, prompt_tokens: int, completion_tokens: int) -> None:
         """Track token usage for monitoring"""
+        OPENAI_REQUESTS.inc()
+        OPENAI_TOKENS.labels(kind="prompt").inc(prompt_tokens)
+        OPENAI_TOKENS.labels(kind="completion").inc(completion_tokens)
         if settings.openai_cost_tracking_enabled:
             self.usage_stats["total_requests"] += 1
             self.usage_stats["prompt_tokens"] += prompt_tokens
@@ -583,6 +588,24 @@ class OpenAIService:
             )
             return text
 
+        # Concurrent identical translations share one request
+        key = request_key(
+            "openai:translate", text, target_language, source_language
+        )
+        return await get_single_flight().do(
+            key,
+            lambda: self._translate_text(
+                text, target_language, source_language
+            ),
+        )
+
+    async def _translate_text(
+        self,
+        text: str,
+        target_language: str,
+        source_language: Optional[str],
+    ) -> Optional[str]:
+        """Upstream part of translate_text"""
         # Auto-detect source language if not provided
         if source_language is None:
             source_language = await self.classify_language(text)
@@ -666,6 +689,16 @@ class OpenAIService:
         if not text or not text.strip():
             return "en"  # Default to English
 
+        # Case and spacing do not change the language
+        key = request_key(
+            "openai:classify_language", " ".join(text.lower().split())
+        )
+        return await get_single_flight().do(
+            key, lambda: self._classify_language(text)
+        )
+
+    async def _classify_language(self, text: str) -> str:
+        """Upstream part of classify_language"""
         system_prompt = """
         You are a language detection AI that identifies the language of
         any given text.
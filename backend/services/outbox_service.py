@@ -0,0 +1,467 @@
+"""
+OutboxService - Outbound WhatsApp messages through a transactional outbox
+
+Request handlers used to call Twilio inline: every request waited on
+Twilio's REST latency, and a crash between the database commit and the
+send lost the message (send after commit) or sent it for a change that
+was rolled back (send before commit). With the outbox enabled,
+OutboxService only adds a row to whatsapp_outbox (models/whatsapp_outbox.py)
+in the caller's transaction; the caller's commit makes it visible and
+kicks a drain task.
+
+OutboxDispatcher drains the table with a pool of async sender workers:
+    - claims batches with FOR UPDATE SKIP LOCKED, at most the oldest
+      unsent message per recipient, so messages to one number keep
+      their order across workers
+    - sends each batch concurrently, rate limited per drain task
+    - retries retryable Twilio errors with exponential backoff
+    - copies the Twilio SID and delivery status to the tracked Message;
+      a tracked message that fails for good is marked FAILED, which
+      puts it in the regular retry queue (services/retry_service.py)
+
+Delivery is at least once: a sender that dies after Twilio accepted a
+message but before recording it leaves the claim to expire, and the
+message is sent again.
+
+With the outbox disabled (WHATSAPP_OUTBOX_ENABLED=false, the default
+under TESTING) the same calls send inline through WhatsAppService.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, event, or_, select
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal
+from models.message import DeliveryStatus, Message
+from models.whatsapp_outbox import (
+    UNSENT_STATUSES,
+    OutboxKind,
+    OutboxMessage,
+    OutboxStatus,
+)
+from services.response_trace_service import ResponseTraceService
+from services.whatsapp_service import WhatsAppService
+from utils.metrics import OUTBOX_MESSAGES
+
+logger = logging.getLogger(__name__)
+
+# Twilio error codes worth another attempt (rate limit, server errors)
+RETRYABLE_ERROR_CODES = frozenset({20429, 20500, 20503})
+
+_KICK_KEY = "whatsapp_outbox_kick"
+
+
+class OutboxService:
+    """Send WhatsApp messages through the outbox, or inline if disabled"""
+
+    def __init__(
+        self, db: Session, whatsapp_service: Optional[WhatsAppService] = None
+    ):
+        self.db = db
+        self._whatsapp_service = whatsapp_service
+
+    @property
+    def enabled(self) -> bool:
+        return settings.whatsapp_outbox_enabled
+
+    @property
+    def whatsapp_service(self) -> WhatsAppService:
+        if self._whatsapp_service is None:
+            self._whatsapp_service = WhatsAppService()
+        return self._whatsapp_service
+
+    def send_message(
+        self,
+        to_number: str,
+        message_body: str,
+        message_id: Optional[int] = None,
+        trace_message_id: Optional[int] = None,
+        e164: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Send a text message.
+
+        Args:
+            to_number: Recipient phone number
+            message_body: Message content
+            message_id: Message to track (SID and delivery status)
+            trace_message_id: Farmer message whose response trace gets
+                reply_sent once the reply is sent
+            e164: to_number already validated (Customer.phone_e164)
+
+        Returns:
+            Twilio response when sent inline, None when queued
+
+        Raises:
+            ValueError: Invalid phone number (tracked messages only)
+        """
+        if not self.enabled:
+            if message_id is None:
+                return self.whatsapp_service.send_message(
+                    to_number, message_body
+                )
+            return self.whatsapp_service.send_message_with_tracking(
+                to_number=to_number,
+                message_body=message_body,
+                message_id=message_id,
+                db=self.db,
+                e164=e164,
+            )
+        if message_id is not None:
+            to_number = e164 or (
+                WhatsAppService.validate_and_format_phone_number(to_number)
+            )
+        self._enqueue(
+            OutboxKind.TEXT,
+            to_number,
+            body=message_body,
+            message_id=message_id,
+            trace_message_id=trace_message_id,
+        )
+        return None
+
+    def send_template_message(
+        self, to: str, content_sid: str, content_variables: Dict[str, str]
+    ) -> Optional[Dict[str, Any]]:
+        """Send a pre-approved template; None when queued"""
+        if not self.enabled:
+            return self.whatsapp_service.send_template_message(
+                to=to,
+                content_sid=content_sid,
+                content_variables=content_variables,
+            )
+        self._enqueue(
+            OutboxKind.TEMPLATE,
+            to,
+            content_sid=content_sid,
+            content_variables=content_variables,
+        )
+        return None
+
+    def send_welcome_message(
+        self, to_number: str, language: str = "en"
+    ) -> Optional[Dict[str, Any]]:
+        """Send the welcome message; None when queued"""
+        if not self.enabled:
+            return self.whatsapp_service.send_welcome_message(
+                to_number, language
+            )
+        message = WhatsAppService.welcome_message_text(language)
+        if not message:
+            logger.warning(f"No welcome message for language {language}")
+            return None
+        self._enqueue(OutboxKind.TEXT, to_number, body=message)
+        return None
+
+    def send_interactive_buttons(
+        self,
+        to_number: str,
+        body_text: str,
+        buttons: List[Dict[str, str]],
+    ) -> Optional[Dict[str, Any]]:
+        """Send a question with numbered options; None when queued"""
+        if not self.enabled:
+            return self.whatsapp_service.send_interactive_buttons(
+                to_number=to_number, body_text=body_text, buttons=buttons
+            )
+        self._enqueue(
+            OutboxKind.TEXT,
+            to_number,
+            body=WhatsAppService.buttons_text(body_text, buttons),
+        )
+        return None
+
+    def _enqueue(self, kind: OutboxKind, to_number: str, **fields) -> None:
+        self.db.add(OutboxMessage(kind=kind, to_number=to_number, **fields))
+        self.db.info[_KICK_KEY] = True
+        logger.debug(f"Queued WhatsApp {kind.value} message to {to_number}")
+
+
+@event.listens_for(Session, "after_commit")
+def _kick_drain(session):
+    if session.info.pop(_KICK_KEY, False):
+        kick_outbox_drain()
+
+
+def kick_outbox_drain() -> None:
+    """Start a drain task now instead of at the next beat tick"""
+    try:
+        from tasks.outbox_tasks import drain_outbox
+
+        drain_outbox.delay()
+    except Exception as e:
+        # The periodic drain picks the messages up
+        logger.warning(f"⚠ Could not start outbox drain: {e}")
+
+
+@dataclass
+class _Job:
+    """Claimed outbox message, detached from the claiming session"""
+
+    id: int
+    kind: OutboxKind
+    to_number: str
+    body: Optional[str]
+    content_sid: Optional[str]
+    content_variables: Optional[Dict[str, str]]
+    attempts: int
+    result: Any = None
+    error: Optional[Exception] = None
+
+
+class _RateLimiter:
+    """Spaces out acquisitions to at most rate per second"""
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1 / rate_per_second if rate_per_second > 0 else 0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def _is_retryable(error: Exception) -> bool:
+    code = getattr(error, "code", None)
+    if code is None:
+        # Not a Twilio API error: network failure or timeout
+        return True
+    return code in RETRYABLE_ERROR_CODES or (
+        getattr(error, "status", 0) or 0
+    ) >= 500
+
+
+def _delivery_status(twilio_status) -> DeliveryStatus:
+    return DeliveryStatus.__members__.get(
+        str(twilio_status).upper(), DeliveryStatus.QUEUED
+    )
+
+
+class OutboxDispatcher:
+    """Drain the outbox with a pool of async sender workers"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        whatsapp_factory: Callable[[], WhatsAppService] = WhatsAppService,
+        concurrency: Optional[int] = None,
+        rate_per_second: Optional[float] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self.session_factory = session_factory
+        self.whatsapp_factory = whatsapp_factory
+        self.concurrency = concurrency or settings.outbox_concurrency
+        self.rate_per_second = (
+            rate_per_second
+            if rate_per_second is not None
+            else settings.outbox_rate_per_second
+        )
+        self.batch_size = batch_size or settings.outbox_batch_size
+
+    def claim_batch(self, db: Session) -> List[_Job]:
+        """
+        Claim the oldest unsent message of up to batch_size recipients.
+
+        A recipient whose oldest unsent message is being sent, or waits
+        for a retry, gets nothing, so later messages cannot overtake it.
+        Claims are committed; a claim older than the lease is taken over.
+
+        Args:
+            db: Session used for the claim
+
+        Returns:
+            Claimed jobs, oldest first
+        """
+        now = datetime.now(timezone.utc)
+        lease_expired = now - timedelta(
+            seconds=settings.outbox_claim_lease_seconds
+        )
+        heads = (
+            select(OutboxMessage.id)
+            .where(OutboxMessage.status.in_(UNSENT_STATUSES))
+            .distinct(OutboxMessage.to_number)
+            .order_by(OutboxMessage.to_number, OutboxMessage.id)
+        )
+        rows = (
+            db.query(OutboxMessage)
+            .filter(
+                OutboxMessage.id.in_(heads),
+                # Repeated on the row so a row claimed meanwhile is
+                # rechecked after its lock is released
+                or_(
+                    and_(
+                        OutboxMessage.status == OutboxStatus.PENDING,
+                        OutboxMessage.next_attempt_at <= now,
+                    ),
+                    and_(
+                        OutboxMessage.status == OutboxStatus.SENDING,
+                        OutboxMessage.claimed_at < lease_expired,
+                    ),
+                ),
+            )
+            .order_by(OutboxMessage.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        jobs = []
+        for row in rows:
+            row.status = OutboxStatus.SENDING
+            row.claimed_at = now
+            row.attempts += 1
+            jobs.append(
+                _Job(
+                    id=row.id,
+                    kind=row.kind,
+                    to_number=row.to_number,
+                    body=row.body,
+                    content_sid=row.content_sid,
+                    content_variables=row.content_variables,
+                    attempts=row.attempts,
+                )
+            )
+        db.commit()
+        return jobs
+
+    async def drain(self, max_batches: Optional[int] = None) -> Dict[str, int]:
+        """
+        Send claimed batches until nothing is due.
+
+        Args:
+            max_batches: Stop after this many batches (default: no limit)
+
+        Returns:
+            Counts of sent, retried and failed messages
+        """
+        stats = {"sent": 0, "retried": 0, "failed": 0}
+        limiter = _RateLimiter(self.rate_per_second)
+        clients: List[WhatsAppService] = []
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            db = self.session_factory()
+            try:
+                jobs = self.claim_batch(db)
+                if not jobs:
+                    break
+                workers = min(self.concurrency, len(jobs))
+                while len(clients) < workers:
+                    clients.append(self.whatsapp_factory())
+                await self._send_all(jobs, clients[:workers], limiter)
+                self._record(db, jobs, stats)
+            finally:
+                db.close()
+            batches += 1
+        if any(stats.values()):
+            logger.info(
+                f"✓ Outbox drained: {stats['sent']} sent, "
+                f"{stats['retried']} to retry, {stats['failed']} failed"
+            )
+        return stats
+
+    async def _send_all(
+        self,
+        jobs: List[_Job],
+        clients: List[WhatsAppService],
+        limiter: _RateLimiter,
+    ) -> None:
+        queue: asyncio.Queue = asyncio.Queue()
+        for job in jobs:
+            queue.put_nowait(job)
+        await asyncio.gather(
+            *(self._worker(queue, client, limiter) for client in clients)
+        )
+
+    async def _worker(
+        self,
+        queue: asyncio.Queue,
+        client: WhatsAppService,
+        limiter: _RateLimiter,
+    ) -> None:
+        while True:
+            try:
+                job = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await limiter.acquire()
+            try:
+                job.result = await asyncio.to_thread(
+                    client.create_message,
+                    job.to_number,
+                    body=job.body,
+                    content_sid=job.content_sid,
+                    content_variables=job.content_variables,
+                )
+            except Exception as e:
+                job.error = e
+
+    def _record(
+        self, db: Session, jobs: List[_Job], stats: Dict[str, int]
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        tracer = ResponseTraceService(db)
+        for job in jobs:
+            row = db.get(OutboxMessage, job.id)
+            if row is None:
+                continue
+            message = (
+                db.get(Message, row.message_id) if row.message_id else None
+            )
+
+            if job.error is None:
+                row.status = OutboxStatus.SENT
+                row.sent_at = now
+                row.twilio_sid = job.result.sid
+                if message is not None:
+                    message.message_sid = job.result.sid
+                    message.delivery_status = _delivery_status(
+                        job.result.status
+                    )
+                if row.trace_message_id and row.message_id:
+                    tracer.mark(
+                        row.trace_message_id,
+                        "reply_sent",
+                        at=now,
+                        reply_message_id=row.message_id,
+                    )
+                result = "sent"
+            else:
+                code = getattr(job.error, "code", None)
+                row.error_code = str(code)[:10] if code else None
+                row.error_message = str(job.error)
+                if (
+                    _is_retryable(job.error)
+                    and job.attempts < settings.outbox_max_attempts
+                ):
+                    row.status = OutboxStatus.PENDING
+                    row.next_attempt_at = now + timedelta(
+                        seconds=settings.outbox_retry_backoff_seconds
+                        * 2 ** (job.attempts - 1)
+                    )
+                    result = "retried"
+                else:
+                    row.status = OutboxStatus.FAILED
+                    if message is not None:
+                        message.delivery_status = DeliveryStatus.FAILED
+                        message.twilio_error_code = row.error_code
+                        message.twilio_error_message = row.error_message
+                    result = "failed"
+                logger.warning(
+                    f"⚠ Outbox message {job.id} to {job.to_number} "
+                    f"{result}: {job.error}"
+                )
+            stats[result] += 1
+            OUTBOX_MESSAGES.labels(result=result).inc()
+        db.commit()
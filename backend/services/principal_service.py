@@ -0,0 +1,197 @@
+"""
+PrincipalService - Lightweight, cached view of the authenticated user
+
+Every dashboard request used to load the user by email and then resolve
+the user's ward set (assignments + descendant wards) in each router.
+A Principal holds just what authorization needs and is cached per
+token subject for a short TTL, so most requests skip those queries.
+
+The cache is per process: updates invalidate the local entry immediately,
+other workers pick up changes once the TTL expires.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.administrative import UserAdministrative
+from models.user import User, UserType
+from services.administrative_service import AdministrativeService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authorization snapshot of a user"""
+
+    id: int
+    email: str
+    full_name: Optional[str]
+    user_type: UserType
+    is_active: bool
+    ward_ids: FrozenSet[int]
+
+    @property
+    def is_admin(self) -> bool:
+        return self.user_type == UserType.ADMIN
+
+    def accessible_administrative_ids(self) -> List[int]:
+        """
+        Administrative IDs the user may access.
+
+        Returns:
+            Empty list for ADMIN (can access all), assigned areas plus
+            all descendant wards for EO
+        """
+        if self.is_admin:
+            return []
+        return list(self.ward_ids)
+
+
+class PrincipalCache:
+    """Thread-safe TTL cache of principals keyed by token subject"""
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self._ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, Principal]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ttl_seconds(self) -> int:
+        if self._ttl_seconds is not None:
+            return self._ttl_seconds
+        return int(settings.auth_principal_cache_ttl_seconds)
+
+    def get(self, subject: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at <= time.monotonic():
+                del self._entries[subject]
+                return None
+            return principal
+
+    def set(self, subject: str, principal: Principal) -> None:
+        ttl = self.ttl_seconds
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[subject] = (time.monotonic() + ttl, principal)
+
+    def invalidate(
+        self, email: Optional[str] = None, user_id: Optional[int] = None
+    ) -> None:
+        """Drop cached entries matching the email or the user ID"""
+        with self._lock:
+            for subject, (_, principal) in list(self._entries.items()):
+                if subject == email or principal.id == user_id:
+                    del self._entries[subject]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache()
+
+
+class PrincipalService:
+    @staticmethod
+    def resolve_ward_ids(db: Session, user_id: int) -> FrozenSet[int]:
+        """
+        Resolve the areas a user can access.
+
+        For upper-level EOs (assigned to region/district), this includes
+        all descendant ward IDs so they can access subordinate areas.
+
+        Args:
+            db: Database session
+            user_id: ID of the user
+
+        Returns:
+            Assigned administrative IDs plus all their descendant wards
+        """
+        assigned_ids = [
+            administrative_id
+            for (administrative_id,) in db.query(
+                UserAdministrative.administrative_id
+            )
+            .filter(UserAdministrative.user_id == user_id)
+            .all()
+        ]
+
+        ward_ids = set(assigned_ids)
+        for administrative_id in assigned_ids:
+            ward_ids.update(
+                AdministrativeService.get_descendant_ward_ids(
+                    db, administrative_id
+                )
+            )
+        return frozenset(ward_ids)
+
+    @staticmethod
+    def build_principal(db: Session, user: User) -> Principal:
+        """Build a principal from a loaded user"""
+        ward_ids = (
+            frozenset()
+            if user.user_type == UserType.ADMIN
+            else PrincipalService.resolve_ward_ids(db, user.id)
+        )
+        return Principal(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            user_type=user.user_type,
+            is_active=bool(user.is_active),
+            ward_ids=ward_ids,
+        )
+
+    @staticmethod
+    def get_principal(db: Session, email: str) -> Optional[Principal]:
+        """
+        Get the principal for a token subject, from cache when possible.
+
+        Args:
+            db: Database session
+            email: Token subject (user email)
+
+        Returns:
+            Principal, or None if no user has this email.
+            Inactive users are returned but never cached.
+        """
+        principal = principal_cache.get(email)
+        if principal is not None:
+            return principal
+
+        user = db.query(User).filter(User.email == email).first()
+        if user is None:
+            return None
+
+        principal = PrincipalService.build_principal(db, user)
+        if principal.is_active:
+            principal_cache.set(email, principal)
+        return principal
+
+    @staticmethod
+    def invalidate(
+        email: Optional[str] = None, user_id: Optional[int] = None
+    ) -> None:
+        """Invalidate the cached principal after a user change"""
+        principal_cache.invalidate(email=email, user_id=user_id)
+        logger.debug(
+            f"Principal cache invalidated (email={email}, user_id={user_id})"
+        )
+
+    @staticmethod
+    def invalidate_cache() -> None:
+        """Drop every cached principal"""
+        principal_cache.clear()
+        logger.info("[PrincipalService] Cache invalidated")
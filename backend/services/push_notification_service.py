@@ -17,6 +17,7 @@ User Acceptance Criteria:
 """
 
 import logging
+import os
 import time
 from typing import List, Dict, Any, Optional
 
@@ -25,11 +26,14 @@ from sqlalchemy.orm import Session
 
 from models.device import Device
 from models.user import User, UserType
+from utils.metrics import EXPO_PUSH_FAILURES
 
 logger = logging.getLogger(__name__)
 
-# Expo Push Notification API endpoint
-EXPO_PUSH_URL = "https://exp.host/--/api/v2/push/send"
+# Expo Push Notification API endpoint (overridable for load tests)
+EXPO_PUSH_URL = os.getenv(
+    "EXPO_PUSH_URL", "https://exp.host/--/api/v2/push/send"
+)
 
 # Retry configuration
 MAX_RETRIES = 3
@@ -123,6 +127,10 @@ class PushNotificationService:
                 error_details = ticket.get("details", {})
                 error_code = error_details.get("error")
 
+                EXPO_PUSH_FAILURES.labels(
+                    reason=error_code or "unknown"
+                ).inc()
+
                 # "DeviceNotRegistered" means the token is invalid/expired
                 if error_code == "DeviceNotRegistered":
                     if idx < len(push_tokens):
@@ -240,6 +248,7 @@ class PushNotificationService:
                 )
 
             except Exception as e:
+                EXPO_PUSH_FAILURES.labels(reason="request").inc(len(batch))
                 logger.error(f"Failed to send notification batch: {e}")
                 # Continue with next batch even if this one fails
 
@@ -16,6 +16,7 @@ from sqlalchemy.orm import Session
 from config import settings
 from models.customer import Customer
 from models.message import MessageFrom
+from services.outbox_service import OutboxService
 from services.whatsapp_service import WhatsAppService
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,7 @@ class ReconnectionService:
     def __init__(self, db: Session):
         self.db = db
         self.whatsapp_service = WhatsAppService()
+        self.outbox = OutboxService(db, self.whatsapp_service)
         self.threshold_hours = settings.whatsapp_reconnection_threshold_hours
 
     def check_and_send_reconnection(
@@ -75,7 +77,8 @@ class ReconnectionService:
                 f"(inactive for {self.threshold_hours}+ hours)"
             )
 
-            response = self.whatsapp_service.send_template_message(
+            # Queued in the same commit as the last_message update
+            response = self.outbox.send_template_message(
                 to=customer.phone_number,
                 content_sid=template_sid,
                 content_variables={
@@ -91,7 +94,7 @@ class ReconnectionService:
 
             logger.info(
                 f"✓ Sent reconnection template to customer {customer.id}: "
-                f"{response['sid']}"
+                f"{response['sid'] if response else 'queued'}"
             )
             return True
 
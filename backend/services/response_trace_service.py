@@ -0,0 +1,254 @@
+"""
+Farmer response latency tracing.
+
+Records when each stage between a farmer's WhatsApp message and our
+reply landing on their phone is reached, keyed by the farmer message:
+
+    received       webhook receipt
+    transcribed    voice message transcribed (voice only)
+    onboarded      customer resolved and onboarding gate passed
+    ai_job_created external AI job accepted (create_chat_job)
+    ai_callback    AI answer received on /callback/ai
+    reply_sent     Twilio accepted the reply
+    delivered      Twilio reported delivery (reply message delivered_at)
+
+Tracing never affects message handling: write errors are logged and
+swallowed. Nothing is committed here; the callers' own commits persist
+the marks together with the work they describe.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, aliased
+
+from config import settings
+from models.message import Message
+from models.response_trace import ResponseTrace
+
+logger = logging.getLogger(__name__)
+
+STAGE_COLUMNS = {
+    "transcribed": ResponseTrace.transcribed_at,
+    "onboarded": ResponseTrace.onboarded_at,
+    "ai_job_created": ResponseTrace.ai_job_created_at,
+    "ai_callback": ResponseTrace.ai_callback_at,
+    "reply_sent": ResponseTrace.reply_sent_at,
+}
+
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ResponseTraceService:
+    """Write stage timestamps and report latency percentiles"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def start(
+        self,
+        message_id: int,
+        path: str,
+        received_at: datetime,
+        transcribed_at: Optional[datetime] = None,
+        onboarded_at: Optional[datetime] = None,
+    ) -> None:
+        """
+        Create the trace of a farmer message (does not commit).
+
+        Args:
+            message_id: Farmer message ID
+            path: ResponsePath value
+            received_at: Webhook receipt time
+            transcribed_at: End of voice transcription, if any
+            onboarded_at: Time the onboarding gate was passed
+        """
+        if not settings.response_tracing_enabled:
+            return
+        try:
+            with self.db.begin_nested():
+                self.db.add(
+                    ResponseTrace(
+                        message_id=message_id,
+                        path=path,
+                        received_at=received_at,
+                        transcribed_at=transcribed_at,
+                        onboarded_at=onboarded_at,
+                    )
+                )
+        except Exception as e:
+            logger.warning(
+                f"⚠ Could not start response trace for message "
+                f"{message_id}: {e}"
+            )
+
+    def mark(
+        self,
+        message_id: int,
+        stage: str,
+        at: Optional[datetime] = None,
+        path: Optional[str] = None,
+        **fields,
+    ) -> None:
+        """
+        Record that a stage was reached (does not commit).
+
+        The first time recorded for a stage is kept, so retried
+        callbacks do not move it. Messages without a trace (playground,
+        escalations of older messages) are ignored.
+
+        Args:
+            message_id: Farmer message ID
+            stage: Key of STAGE_COLUMNS
+            at: Time the stage was reached (default: now)
+            path: Overrides the trace path when given
+            **fields: trace_id and/or reply_message_id, kept if set
+        """
+        if not settings.response_tracing_enabled:
+            return
+        column = STAGE_COLUMNS[stage]
+        values = {column: func.coalesce(column, at or _now())}
+        for name, value in fields.items():
+            attr = getattr(ResponseTrace, name)
+            values[attr] = func.coalesce(attr, value)
+        if path:
+            values[ResponseTrace.path] = path
+        try:
+            with self.db.begin_nested():
+                self.db.query(ResponseTrace).filter(
+                    ResponseTrace.message_id == message_id
+                ).update(values, synchronize_session=False)
+        except Exception as e:
+            logger.warning(
+                f"⚠ Could not record {stage} for message {message_id}: {e}"
+            )
+
+    def set_path(self, message_id: int, path: str) -> None:
+        """
+        Change the path of a trace (does not commit).
+
+        For replies queued in the WhatsApp outbox, whose sender records
+        reply_sent later without knowing the path.
+        """
+        if not settings.response_tracing_enabled:
+            return
+        try:
+            with self.db.begin_nested():
+                self.db.query(ResponseTrace).filter(
+                    ResponseTrace.message_id == message_id
+                ).update(
+                    {ResponseTrace.path: path}, synchronize_session=False
+                )
+        except Exception as e:
+            logger.warning(
+                f"⚠ Could not set path of message {message_id}: {e}"
+            )
+
+    def get_trace(self, message_id: int) -> Optional[Dict[str, object]]:
+        """Stage timestamps of one farmer message, or None"""
+        row = (
+            self.db.query(ResponseTrace, Message.delivered_at)
+            .outerjoin(Message, Message.id == ResponseTrace.reply_message_id)
+            .filter(ResponseTrace.message_id == message_id)
+            .first()
+        )
+        if row is None:
+            return None
+        trace, delivered_at = row
+        timestamps = {
+            "received": trace.received_at,
+            **{
+                stage: getattr(trace, column.key)
+                for stage, column in STAGE_COLUMNS.items()
+            },
+            "delivered": delivered_at,
+        }
+        return {
+            "message_id": trace.message_id,
+            "trace_id": trace.trace_id,
+            "path": trace.path,
+            "reply_message_id": trace.reply_message_id,
+            "stages": {
+                stage: value.isoformat() if value else None
+                for stage, value in timestamps.items()
+            },
+        }
+
+    def get_latency_percentiles(
+        self, days: int = 7, path: Optional[str] = None
+    ) -> Dict[str, object]:
+        """
+        p50/p95/p99 duration of each stage over recent traces.
+
+        A stage's duration runs from the previous stage reached to the
+        stage itself; traces that did not reach both ends are left out
+        of that stage.
+
+        Args:
+            days: Only messages received in the last N days
+            path: Only traces of this ResponsePath
+
+        Returns:
+            Dict with the trace count and per-stage count/p50/p95/p99 (ms)
+        """
+        t = ResponseTrace
+        reply = aliased(Message)
+        after_gate = func.coalesce(t.transcribed_at, t.received_at)
+        spans = [
+            ("transcription", t.received_at, t.transcribed_at),
+            ("onboarding", after_gate, t.onboarded_at),
+            ("ai_job", t.onboarded_at, t.ai_job_created_at),
+            ("ai_processing", t.ai_job_created_at, t.ai_callback_at),
+            (
+                "reply_send",
+                func.coalesce(t.ai_callback_at, t.onboarded_at),
+                t.reply_sent_at,
+            ),
+            ("delivery", t.reply_sent_at, reply.delivered_at),
+            ("time_to_reply", t.received_at, t.reply_sent_at),
+            ("total", t.received_at, reply.delivered_at),
+        ]
+
+        columns = [func.count(t.id)]
+        for _, start, end in spans:
+            duration = func.extract("epoch", end - start) * 1000
+            columns.append(func.count(duration))
+            columns.extend(
+                func.percentile_cont(p).within_group(duration)
+                for p in PERCENTILES
+            )
+
+        query = (
+            self.db.query(*columns)
+            .select_from(t)
+            .outerjoin(reply, reply.id == t.reply_message_id)
+            .filter(t.received_at >= _now() - timedelta(days=days))
+        )
+        if path:
+            query = query.filter(t.path == path)
+        row = list(query.one())
+
+        stages: List[Dict[str, object]] = []
+        values = row[1:]
+        width = 1 + len(PERCENTILES)
+        for n, (name, _, _) in enumerate(spans):
+            count, *percentiles = values[n * width:(n + 1) * width]
+            stage = {"stage": name, "count": count}
+            for p, value in zip(PERCENTILES, percentiles):
+                key = f"p{int(p * 100)}_ms"
+                stage[key] = round(float(value)) if value is not None else None
+            stages.append(stage)
+
+        return {
+            "enabled": settings.response_tracing_enabled,
+            "days": days,
+            "path": path,
+            "traces": row[0],
+            "stages": stages,
+        }
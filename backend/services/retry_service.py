@@ -8,6 +8,12 @@ Implements exponential backoff retry mechanism for failed message delivery:
 
 Only retries messages that failed due to temporary/retryable errors.
 Permanent errors (invalid number, blocked customer) are not retried.
+
+Failed messages form an indexed retry queue: ``Message.next_retry_at`` is
+computed whenever a failure is recorded (see models/message.py), so finding
+due messages is a range scan on a partial index. Workers claim due messages
+with ``SELECT ... FOR UPDATE SKIP LOCKED`` and lease them before sending,
+so several Celery workers can drain the queue without double sends.
 """
 
 import logging
@@ -18,7 +24,11 @@ from sqlalchemy.orm import Session
 from twilio.base.exceptions import TwilioRestException
 
 from config import settings
-from models.message import Message, DeliveryStatus, MessageFrom
+from models.message import (
+    Message,
+    DeliveryStatus,
+    PERMANENT_ERROR_CODES,
+)
 from services.whatsapp_service import WhatsAppService
 
 logger = logging.getLogger(__name__)
@@ -28,15 +38,10 @@ class RetryService:
     """Handle automatic retry of failed WhatsApp messages"""
 
     # Twilio error codes that should NOT be retried (permanent failures)
-    PERMANENT_ERROR_CODES = {
-        "21211",  # Invalid 'To' phone number
-        "21408",  # Permission to send SMS/MMS not enabled
-        "21610",  # Message blocked (profanity/spam)
-        "21614",  # 'To' number is not a valid mobile number
-        "63007",  # Message blocked - US A2P compliance
-        "63016",  # Message blocked - spam detected
-        "30007",  # Message filtered (carrier block)
-    }
+    PERMANENT_ERROR_CODES = PERMANENT_ERROR_CODES
+
+    # How long a claimed message stays hidden from other workers
+    CLAIM_LEASE_MINUTES = 10
 
     def __init__(self, db: Session):
         self.db = db
@@ -44,13 +49,29 @@ class RetryService:
         self.max_attempts = settings.retry_max_attempts
         self.backoff_minutes = settings.retry_backoff_minutes
 
-    def get_messages_needing_retry(self) -> List[Message]:
+    def _due_messages_query(self):
+        """Query for queued messages whose next retry time has passed."""
+        return (
+            self.db.query(Message)
+            .filter(
+                Message.next_retry_at.isnot(None),
+                Message.next_retry_at <= datetime.now(timezone.utc),
+            )
+            .order_by(Message.next_retry_at)
+        )
+
+    def get_messages_needing_retry(
+        self, limit: Optional[int] = None
+    ) -> List[Message]:
         """
-        Get messages that need retry based on:
-        1. Status is FAILED or UNDELIVERED
-        2. retry_count < max_attempts
-        3. Enough time has passed based on exponential backoff
-        4. Not a permanent error
+        Get messages that are due for retry, without claiming them.
+
+        A message is in the retry queue when it is a FAILED or UNDELIVERED
+        LLM/USER message with a retryable error and retry_count below
+        max_attempts; it is due once its backoff window has passed.
+
+        Args:
+            limit: Maximum number of messages to return
 
         Returns:
             List of messages ready for retry
@@ -59,34 +80,50 @@ class RetryService:
             logger.debug("Retry mechanism is disabled in config")
             return []
 
+        query = self._due_messages_query()
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+
+    def claim_messages_for_retry(
+        self, limit: Optional[int] = None
+    ) -> List[Message]:
+        """
+        Atomically claim a batch of due messages for this worker.
+
+        Rows locked by another worker are skipped. Claimed messages are
+        leased by pushing next_retry_at forward and committing, so a
+        worker that dies mid-batch only delays its messages.
+
+        Args:
+            limit: Maximum number of messages to claim
+                   (defaults to settings.retry_batch_size)
+
+        Returns:
+            List of claimed messages
+        """
+        if not settings.retry_enabled:
+            logger.debug("Retry mechanism is disabled in config")
+            return []
+
         messages = (
-            self.db.query(Message)
-            .filter(
-                Message.delivery_status.in_(
-                    [DeliveryStatus.FAILED, DeliveryStatus.UNDELIVERED]
-                ),
-                Message.retry_count < self.max_attempts,
-                Message.from_source.in_([MessageFrom.LLM, MessageFrom.USER]),
-            )
+            self._due_messages_query()
+            .limit(limit or settings.retry_batch_size)
+            .with_for_update(skip_locked=True)
             .all()
         )
+        if not messages:
+            self.db.rollback()
+            return []
 
-        # Filter out permanent errors and messages not ready for retry
-        ready_messages = []
-        for msg in messages:
-            # Skip permanent errors
-            if msg.twilio_error_code in self.PERMANENT_ERROR_CODES:
-                logger.debug(
-                    f"Message {msg.id} has permanent error code "
-                    f"{msg.twilio_error_code}, skipping retry"
-                )
-                continue
-
-            # Check if enough time has passed
-            if self._is_ready_for_retry(msg):
-                ready_messages.append(msg)
+        lease_until = datetime.now(timezone.utc) + timedelta(
+            minutes=self.CLAIM_LEASE_MINUTES
+        )
+        for message in messages:
+            message.next_retry_at = lease_until
+        self.db.commit()
 
-        return ready_messages
+        return messages
 
     def _is_ready_for_retry(self, message: Message) -> bool:
         """
@@ -136,6 +173,7 @@ class RetryService:
                 message_body=message.body,
                 message_id=message.id,
                 db=self.db,
+                e164=message.customer.phone_e164,
             )
 
             # Update message with new SID and status
@@ -182,17 +220,38 @@ class RetryService:
             logger.error(
                 f"✗ Unexpected error retrying message {message.id}: {e}"
             )
+            # Count the attempt as well: the claim's lease only delays
+            # the message, it would be re-claimed without ever reaching
+            # max_attempts
             self.db.rollback()
+            try:
+                message.retry_count += 1
+                message.last_retry_at = datetime.now(timezone.utc)
+                message.delivery_status = DeliveryStatus.FAILED
+                message.twilio_error_code = None
+                message.twilio_error_message = (
+                    f"{type(e).__name__}: {e}"[:500]
+                )
+                self.db.commit()
+            except Exception as commit_error:
+                logger.error(
+                    f"✗ Could not record retry failure of message "
+                    f"{message.id}: {commit_error}"
+                )
+                self.db.rollback()
             return False
 
-    def retry_all_pending(self) -> dict:
+    def retry_all_pending(self, limit: Optional[int] = None) -> dict:
         """
-        Retry all messages that are ready for retry.
+        Claim and retry a batch of messages that are ready for retry.
+
+        Args:
+            limit: Maximum number of messages to retry in this batch
 
         Returns:
             Dict with retry statistics
         """
-        messages = self.get_messages_needing_retry()
+        messages = self.claim_messages_for_retry(limit)
 
         stats = {
             "total_attempted": len(messages),
@@ -244,11 +303,7 @@ class RetryService:
             ]
         )
 
-        next_retry_time = None
-        if can_retry and message.retry_count < len(self.backoff_minutes):
-            base_time = message.last_retry_at or message.created_at
-            backoff_minutes = self.backoff_minutes[message.retry_count]
-            next_retry_time = base_time + timedelta(minutes=backoff_minutes)
+        next_retry_time = message.next_retry_at if can_retry else None
 
         return {
             "message_id": message.id,
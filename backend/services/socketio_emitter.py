@@ -0,0 +1,121 @@
+"""
+Socket.IO emitter for processes without a Socket.IO server (Celery).
+
+Events are published on the Redis channel the API's AsyncServer listens
+on (see socketio_service.sio_server) and addressed to the same
+"user:<id>" rooms. A worker cannot see live connections, so recipients
+are resolved from the database; emitting to an empty room is a no-op.
+"""
+
+import logging
+from typing import Optional, Set
+
+import socketio
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.administrative import UserAdministrative
+from models.user import User, UserType
+from services.administrative_service import AdministrativeService
+
+logger = logging.getLogger(__name__)
+
+_emitter: Optional[socketio.RedisManager] = None
+
+
+def get_emitter() -> Optional[socketio.RedisManager]:
+    """Write-only Redis manager, or None when Redis emits are disabled"""
+    global _emitter
+    if not settings.socketio_redis_enabled:
+        return None
+    if _emitter is None:
+        _emitter = socketio.RedisManager(
+            settings.celery_broker_url,
+            channel=settings.socketio_redis_channel,
+            write_only=True,
+        )
+    return _emitter
+
+
+def get_ticket_recipient_ids(
+    db: Session, administrative_id: Optional[int]
+) -> Set[int]:
+    """
+    Users who may see tickets of a ward.
+
+    Args:
+        db: Database session
+        administrative_id: Ward of the ticket
+
+    Returns:
+        IDs of active admins plus active EOs assigned to the ward or
+        one of its ancestors
+    """
+    user_ids = {
+        user_id
+        for (user_id,) in db.query(User.id).filter(
+            User.user_type == UserType.ADMIN,
+            User.is_active.is_(True),
+        )
+    }
+    if administrative_id is None:
+        return user_ids
+
+    area_ids = [administrative_id] + AdministrativeService.get_ancestor_ids(
+        db, administrative_id
+    )
+    user_ids.update(
+        user_id
+        for (user_id,) in db.query(UserAdministrative.user_id)
+        .join(User, User.id == UserAdministrative.user_id)
+        .filter(
+            UserAdministrative.administrative_id.in_(area_ids),
+            User.is_active.is_(True),
+        )
+    )
+    return user_ids
+
+
+def emit_ticket_tagged(
+    db: Session,
+    ticket_id: int,
+    tag: Optional[str],
+    tag_confidence: Optional[float],
+    administrative_id: Optional[int] = None,
+) -> int:
+    """
+    Emit ticket_tagged to everyone who can see the ticket.
+
+    Failures are logged and swallowed: the tag is already stored and
+    clients pick it up on their next fetch.
+
+    Returns:
+        Number of user rooms the event was published to
+    """
+    emitter = get_emitter()
+    if emitter is None:
+        return 0
+
+    event_data = {
+        "ticket_id": ticket_id,
+        "tag": tag,
+        "tag_confidence": tag_confidence,
+    }
+    try:
+        user_ids = get_ticket_recipient_ids(db, administrative_id)
+        for user_id in user_ids:
+            emitter.emit(
+                "ticket_tagged",
+                event_data,
+                room=f"user:{user_id}",
+                namespace="/",
+            )
+    except Exception as e:
+        logger.error(f"✗ Failed to emit ticket_tagged for {ticket_id}: {e}")
+        return 0
+
+    logger.info(
+        f"[EMIT:TICKETS] ticket_tagged for {ticket_id} - "
+        f"published to {len(user_ids)} users (ward_id: {administrative_id})"
+    )
+    return len(user_ids)
@@ -4,18 +4,35 @@ from typing import Dict, Optional
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 
+from config import settings
 from database import get_db
 from models.user import User, UserType
-from models.administrative import UserAdministrative
 from services.push_notification_service import PushNotificationService
+from services.principal_service import PrincipalService
 from services.user_service import UserService
 from utils.auth import verify_token
+from utils.metrics import SOCKETIO_CONNECTIONS
 
 logger = logging.getLogger(__name__)
 
+
+def _create_client_manager():
+    """
+    Redis-backed client manager, so events published by other processes
+    (Celery workers, see services/socketio_emitter.py) reach clients.
+    """
+    if not settings.socketio_redis_enabled:
+        return None
+    return socketio.AsyncRedisManager(
+        settings.celery_broker_url,
+        channel=settings.socketio_redis_channel,
+    )
+
+
 # Configure Socket.IO server with mobile-optimized settings
 sio_server = socketio.AsyncServer(
     async_mode="asgi",
+    client_manager=_create_client_manager(),
     cors_allowed_origins="*",
     logger=True,
     engineio_logger=True,  # Enable for debugging WebSocket issues
@@ -84,28 +101,10 @@ def get_user_wards(user: User, db: Session) -> list[int]:
     For upper-level EOs (assigned to region/district), this returns
     all descendant ward IDs so they receive events for subordinate areas.
     """
-    from services.administrative_service import AdministrativeService
-
     if user.user_type == UserType.ADMIN:
         return []  # Admin receives all events (handled in emit logic)
 
-    user_admins = (
-        db.query(UserAdministrative)
-        .filter(UserAdministrative.user_id == user.id)
-        .all()
-    )
-
-    all_ward_ids = set()
-    for ua in user_admins:
-        # Add the assigned area itself
-        all_ward_ids.add(ua.administrative_id)
-        # Add all descendant wards
-        descendant_ids = AdministrativeService.get_descendant_ward_ids(
-            db, ua.administrative_id
-        )
-        all_ward_ids.update(descendant_ids)
-
-    return list(all_ward_ids)
+    return list(PrincipalService.resolve_ward_ids(db, user.id))
 
 
 def check_rate_limit(sid: str, action: str) -> bool:
@@ -190,6 +189,7 @@ async def connect(
 
             # Track multi-device connections
             add_user_connection(user.id, sid)
+            SOCKETIO_CONNECTIONS.inc()
 
             # Join user-specific room (ONLY room needed - simplified!)
             user_room = f"user:{user.id}"
@@ -221,6 +221,7 @@ async def disconnect(sid: str):
     # Clean connection
     if sid in CONNECTIONS:
         user_info = CONNECTIONS.pop(sid)
+        SOCKETIO_CONNECTIONS.dec()
         user_id = user_info.get("user_id")
         duration = datetime.now(timezone.utc) - user_info['connected_at']
         logger.info(f"[DISCONNECT] User {user_id}, duration: {duration}")
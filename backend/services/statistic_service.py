@@ -19,7 +19,7 @@ from models.administrative import (
 )
 from models.broadcast import BroadcastMessage
 from models.customer import Customer, OnboardingStatus
-from models.message import Message, MessageFrom
+from models.message import DeliveryStatus, Message, MessageFrom
 from schemas.callback import MessageType
 from models.ticket import Ticket
 from models.user import User, UserType
@@ -29,6 +29,13 @@ from services.administrative_service import AdministrativeService
 class StatisticService:
     """Service for computing statistics."""
 
+    # Delivery statuses counted as successful / failed deliveries
+    DELIVERY_SUCCESS_STATUSES = (DeliveryStatus.DELIVERED, DeliveryStatus.READ)
+    DELIVERY_FAILURE_STATUSES = (
+        DeliveryStatus.FAILED,
+        DeliveryStatus.UNDELIVERED,
+    )
+
     def __init__(self, db: Session):
         self.db = db
 
@@ -1845,3 +1852,244 @@ class StatisticService:
                 "administrative_id": administrative_id,
             },
         }
+
+    @classmethod
+    def _new_delivery_bucket(cls) -> dict:
+        """Create an empty delivery counter bucket."""
+        return {"total": 0, "delivered": 0, "failed": 0}
+
+    @classmethod
+    def _add_delivery_count(
+        cls, bucket: dict, delivery_status: DeliveryStatus, count: int
+    ) -> None:
+        """Accumulate a grouped row count into a delivery bucket."""
+        bucket["total"] += count
+        if delivery_status in cls.DELIVERY_SUCCESS_STATUSES:
+            bucket["delivered"] += count
+        elif delivery_status in cls.DELIVERY_FAILURE_STATUSES:
+            bucket["failed"] += count
+
+    @staticmethod
+    def _delivery_rate(part: int, total: int) -> Optional[float]:
+        """Percentage of part over total, or None when there is no data."""
+        if not total:
+            return None
+        return round(part / total * 100, 2)
+
+    def _finalize_delivery_bucket(self, bucket: dict) -> dict:
+        """Add success and failure rates to a delivery bucket."""
+        bucket["success_rate"] = self._delivery_rate(
+            bucket["delivered"], bucket["total"]
+        )
+        bucket["failure_rate"] = self._delivery_rate(
+            bucket["failed"], bucket["total"]
+        )
+        return bucket
+
+    def get_delivery_stats(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        administrative_id: Optional[int] = None,
+        message_type: Optional[str] = None,
+        group_by: str = "day",
+        include_wards: bool = False,
+    ) -> dict:
+        """
+        Get outbound WhatsApp delivery statistics.
+
+        Status totals, the time series, message type and error code
+        breakdowns are all folded from a single
+        ``GROUP BY (bucket, delivery_status, message_type, error_code)``
+        query. The optional ward breakdown is one additional grouped query.
+
+        Args:
+            start_date: Filter messages created on or after this date
+            end_date: Filter messages created on or before this date
+            administrative_id: Filter by administrative area (any level).
+                              Aggregates data from all descendant wards.
+            message_type: Filter by message type name (e.g., "REPLY")
+            group_by: "day", "week", or "month"
+            include_wards: Also return per-ward delivery counts
+
+        Returns:
+            Dict with summary, time_series, by_message_type, by_error_code,
+            by_ward and applied filters
+        """
+        if group_by not in ("day", "week", "month"):
+            group_by = "day"
+        bucket_column = func.date_trunc(group_by, Message.created_at)
+
+        query = self.db.query(
+            bucket_column.label("bucket"),
+            Message.delivery_status,
+            Message.message_type,
+            Message.twilio_error_code,
+            func.count(Message.id).label("count"),
+        )
+        query = self._apply_delivery_filters(
+            query, start_date, end_date, administrative_id, message_type
+        )
+        rows = query.group_by(
+            bucket_column,
+            Message.delivery_status,
+            Message.message_type,
+            Message.twilio_error_code,
+        ).all()
+
+        by_status = {status.value: 0 for status in DeliveryStatus}
+        summary = self._new_delivery_bucket()
+        series = {}
+        by_type = {}
+        by_error_code = {}
+
+        for row in rows:
+            by_status[row.delivery_status.value] += row.count
+            self._add_delivery_count(summary, row.delivery_status, row.count)
+
+            date_str = (
+                row.bucket.strftime("%Y-%m-%d") if row.bucket else None
+            )
+            self._add_delivery_count(
+                series.setdefault(date_str, self._new_delivery_bucket()),
+                row.delivery_status,
+                row.count,
+            )
+
+            type_name = row.message_type.name if row.message_type else None
+            self._add_delivery_count(
+                by_type.setdefault(type_name, self._new_delivery_bucket()),
+                row.delivery_status,
+                row.count,
+            )
+
+            if (
+                row.twilio_error_code
+                and row.delivery_status in self.DELIVERY_FAILURE_STATUSES
+            ):
+                by_error_code[row.twilio_error_code] = (
+                    by_error_code.get(row.twilio_error_code, 0) + row.count
+                )
+
+        summary = self._finalize_delivery_bucket(summary)
+        summary["by_status"] = by_status
+
+        return {
+            "summary": summary,
+            "time_series": [
+                {"date": date_str, **self._finalize_delivery_bucket(b)}
+                for date_str, b in sorted(
+                    series.items(), key=lambda item: item[0] or ""
+                )
+            ],
+            "by_message_type": [
+                {"message_type": name, **self._finalize_delivery_bucket(b)}
+                for name, b in sorted(
+                    by_type.items(), key=lambda item: -item[1]["total"]
+                )
+            ],
+            "by_error_code": [
+                {"error_code": code, "count": count}
+                for code, count in sorted(
+                    by_error_code.items(), key=lambda item: -item[1]
+                )
+            ],
+            "by_ward": (
+                self._get_delivery_stats_by_ward(
+                    start_date, end_date, administrative_id, message_type
+                )
+                if include_wards
+                else []
+            ),
+            "filters": {
+                "start_date": start_date,
+                "end_date": end_date,
+                "administrative_id": administrative_id,
+                "message_type": message_type,
+                "group_by": group_by,
+            },
+        }
+
+    def _apply_delivery_filters(
+        self,
+        query,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        administrative_id: Optional[int],
+        message_type: Optional[str],
+    ):
+        """Restrict a message query to filtered outbound messages."""
+        query = query.filter(Message.from_source != MessageFrom.CUSTOMER)
+        query = self._apply_date_filter(
+            query, Message.created_at, start_date, end_date
+        )
+
+        if message_type and message_type.upper() in MessageType.__members__:
+            query = query.filter(
+                Message.message_type == MessageType[message_type.upper()]
+            )
+
+        if administrative_id:
+            ward_ids = self._get_administrative_ward_ids(administrative_id)
+            if not ward_ids:
+                ward_ids = [administrative_id]
+            # Subquery keeps this a single round trip
+            customer_ids = self.db.query(
+                CustomerAdministrative.customer_id
+            ).filter(CustomerAdministrative.administrative_id.in_(ward_ids))
+            query = query.filter(Message.customer_id.in_(customer_ids))
+
+        return query
+
+    def _get_delivery_stats_by_ward(
+        self,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        administrative_id: Optional[int],
+        message_type: Optional[str],
+    ) -> List[dict]:
+        """Get delivery counts per ward from one grouped query."""
+        query = (
+            self.db.query(
+                Administrative.id.label("ward_id"),
+                Administrative.name.label("ward_name"),
+                Administrative.path.label("ward_path"),
+                Message.delivery_status,
+                func.count(Message.id).label("count"),
+            )
+            .join(
+                CustomerAdministrative,
+                CustomerAdministrative.customer_id == Message.customer_id,
+            )
+            .join(
+                Administrative,
+                Administrative.id == CustomerAdministrative.administrative_id,
+            )
+        )
+        query = self._apply_delivery_filters(
+            query, start_date, end_date, administrative_id, message_type
+        )
+        rows = query.group_by(
+            Administrative.id,
+            Administrative.name,
+            Administrative.path,
+            Message.delivery_status,
+        ).all()
+
+        wards = {}
+        for row in rows:
+            ward = wards.setdefault(
+                row.ward_id,
+                {
+                    "ward_id": row.ward_id,
+                    "ward_name": row.ward_name,
+                    "ward_path": row.ward_path,
+                    **self._new_delivery_bucket(),
+                },
+            )
+            self._add_delivery_count(ward, row.delivery_status, row.count)
+
+        return sorted(
+            (self._finalize_delivery_bucket(w) for w in wards.values()),
+            key=lambda w: -w["total"],
+        )
@@ -0,0 +1,271 @@
+"""
+SyncService - Delta sync for the mobile app's local SQLite mirror
+
+Returns tickets, messages (including delivery status changes) and
+customer profile updates that changed after an opaque cursor, scoped
+to the extension officer's ward set. Every synced table carries a
+sync_seq from one shared sequence (see models/sync.py), so each refresh
+is one index range scan per table.
+
+Sequence values are assigned at flush but become visible at commit, so
+a slow transaction can commit a lower sync_seq after a client already
+synced past it. The cursor is therefore never moved past a value an
+open transaction may still commit (models.sync.sync_cursor_bound).
+Rows above it are returned anyway and sent again on the next refresh;
+the client upserts them by id.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from models.customer import Customer
+from models.message import Message
+from models.sync import sync_cursor_bound
+from models.ticket import Ticket
+from models.user import User
+from schemas.callback import MessageType
+from services.principal_service import Principal
+from services.tagging_service import get_tag_name
+
+CURSOR_PREFIX = "v1:"
+
+
+class InvalidSyncCursor(ValueError):
+    """Raised when a client sends a cursor this server cannot decode"""
+
+
+def encode_cursor(sync_seq: int) -> str:
+    raw = f"{CURSOR_PREFIX}{sync_seq}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """Decode an opaque cursor; an empty cursor means a full sync."""
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidSyncCursor("Invalid sync cursor")
+    if not raw.startswith(CURSOR_PREFIX):
+        raise InvalidSyncCursor("Invalid sync cursor")
+    try:
+        sync_seq = int(raw[len(CURSOR_PREFIX):])
+    except ValueError:
+        raise InvalidSyncCursor("Invalid sync cursor")
+    if sync_seq < 0:
+        raise InvalidSyncCursor("Invalid sync cursor")
+    return sync_seq
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+class SyncService:
+    """Build delta-sync payloads for the mobile app"""
+
+    DEFAULT_LIMIT = 200
+    MAX_LIMIT = 1000
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_changes(
+        self,
+        principal: Principal,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> dict:
+        """
+        Get everything that changed after the cursor.
+
+        Args:
+            principal: Authenticated user (scopes results to their wards)
+            cursor: Cursor from the previous response, None for full sync
+            limit: Max rows per entity type in one response
+
+        Returns:
+            Dict with tickets, messages, customers, users, the next
+            cursor and has_more (call again immediately when True)
+
+        Raises:
+            InvalidSyncCursor: If the cursor cannot be decoded
+        """
+        since = decode_cursor(cursor)
+        limit = max(1, min(limit, self.MAX_LIMIT))
+        if not principal.is_admin and not principal.ward_ids:
+            return self._response(since, False, [], [], [], [])
+
+        # Read before the rows, so transactions committing meanwhile
+        # cannot move the cursor past a value that is still open
+        bound = sync_cursor_bound(self.db)
+
+        ticket_scope = self.db.query(Ticket.customer_id)
+        tickets_query = self.db.query(Ticket).filter(Ticket.sync_seq > since)
+        if not principal.is_admin:
+            ward_ids = list(principal.ward_ids)
+            ticket_scope = ticket_scope.filter(
+                Ticket.administrative_id.in_(ward_ids)
+            )
+            tickets_query = tickets_query.filter(
+                Ticket.administrative_id.in_(ward_ids)
+            )
+        customer_ids = ticket_scope.scalar_subquery()
+
+        tickets = self._fetch(tickets_query, Ticket, limit)
+        messages = self._fetch(
+            self.db.query(Message).filter(
+                Message.sync_seq > since,
+                Message.customer_id.in_(customer_ids),
+                # Broadcasts are not part of ticket conversations
+                or_(
+                    Message.message_type.is_(None),
+                    Message.message_type != MessageType.BROADCAST,
+                ),
+            ),
+            Message,
+            limit,
+        )
+        customers = self._fetch(
+            self.db.query(Customer).filter(
+                Customer.sync_seq > since,
+                Customer.id.in_(customer_ids),
+            ),
+            Customer,
+            limit,
+        )
+
+        # When any entity was truncated, only return rows up to the
+        # smallest truncated sync_seq so the cursor never skips a row
+        truncated_at = [
+            rows[limit - 1].sync_seq
+            for rows in (tickets, messages, customers)
+            if len(rows) > limit
+        ]
+        if truncated_at:
+            high = min(truncated_at)
+            tickets, messages, customers = (
+                [row for row in rows if row.sync_seq <= high]
+                for rows in (tickets, messages, customers)
+            )
+        else:
+            high = max(
+                (
+                    row.sync_seq
+                    for rows in (tickets, messages, customers)
+                    for row in rows
+                ),
+                default=since,
+            )
+
+        # Never past a value an open transaction may still commit
+        high = min(high, bound)
+        next_seq = max(high, since)
+
+        return self._response(
+            next_seq,
+            bool(truncated_at) and next_seq > since,
+            tickets,
+            messages,
+            customers,
+            self._get_users(tickets, messages),
+        )
+
+    def _fetch(self, query, model, limit: int) -> list:
+        return query.order_by(model.sync_seq.asc()).limit(limit + 1).all()
+
+    def _get_users(
+        self, tickets: List[Ticket], messages: List[Message]
+    ) -> List[dict]:
+        """Names of message authors and resolvers, sent once per sync"""
+        user_ids = {t.resolved_by for t in tickets if t.resolved_by}
+        user_ids.update(m.user_id for m in messages if m.user_id)
+        if not user_ids:
+            return []
+        users = (
+            self.db.query(User.id, User.full_name, User.user_type)
+            .filter(User.id.in_(user_ids))
+            .all()
+        )
+        return [
+            {
+                "id": user.id,
+                "full_name": user.full_name,
+                "user_type": user.user_type.value,
+            }
+            for user in users
+        ]
+
+    def _response(
+        self,
+        next_seq: int,
+        has_more: bool,
+        tickets: List[Ticket],
+        messages: List[Message],
+        customers: List[Customer],
+        users: List[dict],
+    ) -> Dict:
+        return {
+            "cursor": encode_cursor(next_seq),
+            "has_more": has_more,
+            "tickets": [self._serialize_ticket(t) for t in tickets],
+            "messages": [self._serialize_message(m) for m in messages],
+            "customers": [self._serialize_customer(c) for c in customers],
+            "users": users,
+        }
+
+    @staticmethod
+    def _serialize_ticket(ticket: Ticket) -> dict:
+        return {
+            "id": ticket.id,
+            "ticket_number": ticket.ticket_number,
+            "customer_id": ticket.customer_id,
+            "administrative_id": ticket.administrative_id,
+            "message_id": ticket.message_id,
+            "context_message_id": ticket.context_message_id,
+            "status": "resolved" if ticket.resolved_at else "open",
+            "resolved_by": ticket.resolved_by,
+            "resolved_at": _iso(ticket.resolved_at),
+            "tag": get_tag_name(ticket.tag) if ticket.tag else None,
+            "created_at": _iso(ticket.created_at),
+            "updated_at": _iso(ticket.updated_at),
+        }
+
+    @staticmethod
+    def _serialize_message(message: Message) -> dict:
+        return {
+            "id": message.id,
+            "message_sid": message.message_sid,
+            "customer_id": message.customer_id,
+            "user_id": message.user_id,
+            "body": message.body,
+            "from_source": message.from_source,
+            "message_type": (
+                message.message_type.value if message.message_type else None
+            ),
+            "status": message.status,
+            "delivery_status": message.delivery_status.value,
+            "media_url": message.media_url,
+            "media_type": message.media_type.value,
+            "created_at": _iso(message.created_at),
+        }
+
+    @staticmethod
+    def _serialize_customer(customer: Customer) -> dict:
+        return {
+            "id": customer.id,
+            "full_name": customer.full_name,
+            "phone_number": customer.phone_number,
+            "language": customer.language,
+            "crop_type": customer.crop_type,
+            "gender": customer.gender,
+            "age": customer.age,
+            "updated_at": _iso(customer.updated_at or customer.created_at),
+        }
@@ -3,6 +3,10 @@ Tagging Service for automatic ticket classification.
 
 Uses OpenAI to analyze conversation content and classify tickets
 into predefined categories for analytics purposes.
+
+Resolved tickets are tagged in the background (see
+tasks/tagging_tasks.py), several tickets per model call via
+classify_tickets().
 """
 
 import logging
@@ -13,6 +17,9 @@ from services.openai_service import get_openai_service
 
 logger = logging.getLogger(__name__)
 
+# Per-ticket conversation cap in batch prompts (characters)
+MAX_CONVERSATION_CHARS = 4000
+
 
 # Tag descriptions for AI context
 TAG_DESCRIPTIONS = {
@@ -78,9 +85,7 @@ async def classify_ticket(
         )
 
     # Build the classification prompt
-    tag_options = "\n".join(
-        [f"- {tag.name}: {desc}" for tag, desc in TAG_DESCRIPTIONS.items()]
-    )
+    tag_options = _build_tag_options()
 
     system_prompt = f"""You are an agricultural support ticket classifier.
 Analyze the conversation and classify it into ONE of these categories:
@@ -117,33 +122,156 @@ Example response:
             logger.error("[TaggingService] Empty response from OpenAI")
             return None
 
-        data = response.data
-        tag_name = data.get("tag", "OTHER").upper()
-        confidence = float(data.get("confidence", 0.5))
-        reason = data.get("reason", "")
+        result = _parse_tagging_result(response.data)
+
+        logger.info(
+            f"[TaggingService] Classified ticket as {result.tag.name} "
+            f"(confidence: {result.confidence:.2f})"
+        )
+
+        return result
+
+    except Exception as e:
+        logger.error(f"[TaggingService] Classification failed: {e}")
+        return None
+
+
+async def classify_tickets(
+    conversations: Dict[int, List[Dict[str, Any]]],
+) -> Dict[int, TaggingResult]:
+    """
+    Classify several tickets with a single OpenAI call.
+
+    Args:
+        conversations: Ticket ID -> list of message dicts with 'body'
+                       and 'from_source' keys
+
+    Returns:
+        Ticket ID -> TaggingResult. Tickets the model skipped, or every
+        ticket when classification fails, are left out so they can be
+        retried later.
+    """
+    openai_service = get_openai_service()
+
+    if not openai_service.is_configured():
+        logger.warning(
+            "[TaggingService] OpenAI not configured, skipping tagging"
+        )
+        return {}
+
+    results: Dict[int, TaggingResult] = {}
+    sections = []
+    for ticket_id, messages in conversations.items():
+        conversation_text = _build_conversation_text(messages).strip()
+        if not conversation_text:
+            results[ticket_id] = TaggingResult(
+                tag=TicketTag.OTHER, confidence=1.0, reason="No content"
+            )
+            continue
+        # Keep the latest part of long conversations
+        conversation_text = conversation_text[-MAX_CONVERSATION_CHARS:]
+        sections.append(f"### Ticket {ticket_id}\n{conversation_text}")
 
-        # Map tag name to enum
+    if not sections:
+        return results
+
+    system_prompt = f"""You are an agricultural support ticket classifier.
+You will receive several conversations, each under a "### Ticket <id>"
+heading. Classify EACH conversation into ONE of these categories:
+
+{_build_tag_options()}
+
+Rules:
+- Classify every ticket independently
+- Choose the MOST relevant category based on the primary topic
+- If multiple topics are discussed, choose the dominant one
+- Use OTHER only if no other category fits well
+- Provide a confidence score (0.0-1.0) based on how clearly the
+  conversation fits the category
+
+Respond with valid JSON in this exact format:
+{{"results": [{{"ticket_id": 12, "tag": "CATEGORY_NAME", "confidence": 0.85,
+"reason": "brief explanation"}}]}}
+"""
+
+    ai_messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": "Classify these conversations:\n\n"
+         + "\n\n".join(sections)},
+    ]
+
+    try:
+        response = await openai_service.structured_output(
+            messages=ai_messages,
+            response_format={"type": "json_object"},
+        )
+    except Exception as e:
+        logger.error(f"[TaggingService] Batch classification failed: {e}")
+        return results
+
+    if not response or not response.data:
+        logger.error("[TaggingService] Empty response from OpenAI")
+        return results
+
+    items = response.data.get("results")
+    if not isinstance(items, list):
+        logger.error("[TaggingService] Batch response has no results list")
+        return results
+
+    for item in items:
+        if not isinstance(item, dict):
+            continue
         try:
-            tag = TicketTag[tag_name]
-        except KeyError:
+            ticket_id = int(item.get("ticket_id"))
+        except (TypeError, ValueError):
+            continue
+        if ticket_id not in conversations or ticket_id in results:
+            continue
+        try:
+            results[ticket_id] = _parse_tagging_result(item)
+        except (TypeError, ValueError):
             logger.warning(
-                f"[TaggingService] Unknown tag '{tag_name}', using OTHER"
+                f"[TaggingService] Invalid result for ticket {ticket_id}"
             )
-            tag = TicketTag.OTHER
 
-        # Clamp confidence to valid range
-        confidence = max(0.0, min(1.0, confidence))
+    missing = len(conversations) - len(results)
+    logger.info(
+        f"[TaggingService] Classified {len(results)} tickets in one call"
+        + (f" ({missing} missing)" if missing else "")
+    )
+    return results
 
-        logger.info(
-            f"[TaggingService] Classified ticket as {tag.name} "
-            f"(confidence: {confidence:.2f})"
+
+def _build_tag_options() -> str:
+    """Tag list with descriptions for classification prompts"""
+    return "\n".join(
+        [f"- {tag.name}: {desc}" for tag, desc in TAG_DESCRIPTIONS.items()]
+    )
+
+
+def _parse_tagging_result(data: Dict[str, Any]) -> TaggingResult:
+    """
+    Build a TaggingResult from one classification JSON object.
+
+    Unknown tags map to OTHER and confidence is clamped to 0.0-1.0.
+    """
+    tag_name = str(data.get("tag", "OTHER")).upper()
+    confidence = float(data.get("confidence", 0.5))
+    reason = data.get("reason", "")
+
+    # Map tag name to enum
+    try:
+        tag = TicketTag[tag_name]
+    except KeyError:
+        logger.warning(
+            f"[TaggingService] Unknown tag '{tag_name}', using OTHER"
         )
+        tag = TicketTag.OTHER
 
-        return TaggingResult(tag=tag, confidence=confidence, reason=reason)
+    # Clamp confidence to valid range
+    confidence = max(0.0, min(1.0, confidence))
 
-    except Exception as e:
-        logger.error(f"[TaggingService] Classification failed: {e}")
-        return None
+    return TaggingResult(tag=tag, confidence=confidence, reason=reason)
 
 
 def _build_conversation_text(messages: List[Dict[str, Any]]) -> str:
@@ -0,0 +1,226 @@
+"""
+TicketTaggingService - Background auto-tagging of resolved tickets
+
+Resolving a ticket only writes resolved_at/resolved_by; tagging happens
+later in a Celery task (tasks/tagging_tasks.py) or the backfill script
+(scripts/backfill_ticket_tags.py). Untagged resolved tickets are claimed
+in batches with FOR UPDATE SKIP LOCKED, classified with one OpenAI call
+per batch and announced to dashboards with a ticket_tagged event.
+
+Tickets the model fails to classify stay untagged and are picked up by
+a later sweep.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from models.message import Message, get_from_source_string
+from models.ticket import Ticket
+from services.socketio_emitter import emit_ticket_tagged
+from services.tagging_service import classify_tickets, get_tag_name
+
+logger = logging.getLogger(__name__)
+
+
+class TicketTaggingService:
+    """Claim, classify and tag resolved tickets in batches"""
+
+    # Conversation messages sent to the model per ticket
+    MAX_MESSAGES_PER_TICKET = 50
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _untagged_query(
+        self,
+        resolved_since: Optional[datetime] = None,
+        after_id: int = 0,
+    ):
+        """Resolved tickets without a tag, oldest ID first"""
+        query = self.db.query(Ticket).filter(
+            Ticket.tag.is_(None),
+            Ticket.resolved_at.isnot(None),
+            Ticket.id > after_id,
+        )
+        if resolved_since is not None:
+            query = query.filter(Ticket.resolved_at >= resolved_since)
+        return query.order_by(Ticket.id.asc())
+
+    def count_untagged(self, resolved_since: Optional[datetime] = None) -> int:
+        """Number of resolved tickets still waiting for a tag"""
+        return self._untagged_query(resolved_since).count()
+
+    def claim_batch(
+        self,
+        limit: int,
+        resolved_since: Optional[datetime] = None,
+        after_id: int = 0,
+    ) -> List[Ticket]:
+        """
+        Lock a batch of untagged tickets for this worker.
+
+        Rows locked by another worker are skipped. Locks are held until
+        the batch is committed or rolled back.
+
+        Args:
+            limit: Maximum number of tickets to claim
+            resolved_since: Only claim tickets resolved after this time
+            after_id: Only claim tickets with a higher ID
+
+        Returns:
+            List of claimed tickets
+        """
+        return (
+            self._untagged_query(resolved_since, after_id)
+            .limit(limit)
+            .with_for_update(skip_locked=True, of=Ticket)
+            .all()
+        )
+
+    def get_conversation(self, ticket: Ticket) -> List[Dict[str, Any]]:
+        """
+        Messages between the escalation and the resolution of a ticket.
+
+        Returns:
+            List of message dicts with 'body' and 'from_source' keys
+        """
+        query = self.db.query(Message.body, Message.from_source).filter(
+            Message.customer_id == ticket.customer_id
+        )
+        ticket_message = ticket.message
+        if ticket_message and ticket_message.created_at:
+            query = query.filter(
+                Message.created_at >= ticket_message.created_at
+            )
+        if ticket.resolved_at:
+            query = query.filter(Message.created_at <= ticket.resolved_at)
+        rows = (
+            query.order_by(Message.created_at.asc())
+            .limit(self.MAX_MESSAGES_PER_TICKET)
+            .all()
+        )
+        return [
+            {
+                "body": body,
+                "from_source": get_from_source_string(from_source),
+            }
+            for body, from_source in rows
+        ]
+
+    def tag_batch(
+        self,
+        limit: int,
+        resolved_since: Optional[datetime] = None,
+        after_id: int = 0,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> Dict[str, int]:
+        """
+        Claim one batch, classify it with a single model call and store
+        the tags.
+
+        Args:
+            limit: Maximum number of tickets in the batch
+            resolved_since: Only tag tickets resolved after this time
+            after_id: Only tag tickets with a higher ID
+            loop: Event loop for the model call (a new one if omitted)
+
+        Returns:
+            Dict with claimed, tagged and last_id (highest claimed ID)
+        """
+        tickets = self.claim_batch(limit, resolved_since, after_id)
+        if not tickets:
+            self.db.rollback()
+            return {"claimed": 0, "tagged": 0, "last_id": after_id}
+
+        conversations = {
+            ticket.id: self.get_conversation(ticket) for ticket in tickets
+        }
+        try:
+            if loop is None:
+                results = asyncio.run(classify_tickets(conversations))
+            else:
+                results = loop.run_until_complete(
+                    classify_tickets(conversations)
+                )
+        except Exception as e:
+            logger.error(f"✗ Ticket tagging batch failed: {e}")
+            results = {}
+
+        tagged = []
+        for ticket in tickets:
+            result = results.get(ticket.id)
+            if result is None:
+                continue
+            ticket.tag = result.tag.value
+            ticket.tag_confidence = result.confidence
+            tagged.append(ticket)
+        self.db.commit()
+
+        for ticket in tagged:
+            emit_ticket_tagged(
+                self.db,
+                ticket_id=ticket.id,
+                tag=get_tag_name(ticket.tag),
+                tag_confidence=ticket.tag_confidence,
+                administrative_id=ticket.administrative_id,
+            )
+
+        return {
+            "claimed": len(tickets),
+            "tagged": len(tagged),
+            "last_id": tickets[-1].id,
+        }
+
+    def tag_pending(
+        self,
+        batch_size: int,
+        resolved_since: Optional[datetime] = None,
+        max_tickets: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        Tag untagged resolved tickets batch by batch.
+
+        Each ticket is attempted at most once per run. The run stops
+        early when a whole batch fails, so a degraded model does not
+        burn one call per batch.
+
+        Args:
+            batch_size: Tickets classified per model call
+            resolved_since: Only tag tickets resolved after this time
+            max_tickets: Stop after attempting this many tickets
+
+        Returns:
+            Dict with attempted, tagged and failed counts
+        """
+        totals = {"attempted": 0, "tagged": 0, "failed": 0}
+        last_id = 0
+        # One event loop per run, shared by every batch's model call
+        loop = asyncio.new_event_loop()
+        try:
+            while max_tickets is None or totals["attempted"] < max_tickets:
+                limit = batch_size
+                if max_tickets is not None:
+                    limit = min(limit, max_tickets - totals["attempted"])
+                stats = self.tag_batch(limit, resolved_since, last_id, loop)
+                if not stats["claimed"]:
+                    break
+                last_id = stats["last_id"]
+                totals["attempted"] += stats["claimed"]
+                totals["tagged"] += stats["tagged"]
+                totals["failed"] += stats["claimed"] - stats["tagged"]
+                if not stats["tagged"]:
+                    logger.warning(
+                        "⚠ Ticket tagging batch produced no tags, "
+                        "stopping this run"
+                    )
+                    break
+                # A short batch means nothing else is waiting
+                if stats["claimed"] < limit:
+                    break
+        finally:
+            loop.close()
+        return totals
@@ -15,10 +15,12 @@ import logging
 from datetime import datetime, timezone
 from typing import Optional
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from models.message import Message, DeliveryStatus
 from schemas.callback import TwilioMessageStatus, TwilioStatusCallback
+from utils.metrics import TWILIO_ERRORS
 
 logger = logging.getLogger(__name__)
 
@@ -101,6 +103,9 @@ class TwilioStatusService:
             ]:
                 if callback.ErrorCode:
                     message.twilio_error_code = str(callback.ErrorCode)
+                    TWILIO_ERRORS.labels(
+                        code=str(callback.ErrorCode), source="status"
+                    ).inc()
                 if callback.ErrorMessage:
                     message.twilio_error_message = str(
                         callback.ErrorMessage
@@ -143,14 +148,18 @@ class TwilioStatusService:
             Dict with delivery statistics by status
         """
         try:
-            stats = {}
-            for status in DeliveryStatus:
-                count = (
-                    self.db.query(Message)
-                    .filter(Message.delivery_status == status)
-                    .count()
+            # Single GROUP BY instead of one COUNT per status
+            rows = (
+                self.db.query(
+                    Message.delivery_status,
+                    func.count(Message.id),
                 )
-                stats[status.value] = count
+                .group_by(Message.delivery_status)
+                .all()
+            )
+            stats = {status.value: 0 for status in DeliveryStatus}
+            for delivery_status, count in rows:
+                stats[delivery_status.value] = count
 
             return {
                 "total_messages": sum(stats.values()),
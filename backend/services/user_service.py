@@ -2,7 +2,6 @@ import uuid
 from datetime import datetime, timedelta
 
 from fastapi import HTTPException, status
-from sqlalchemy import or_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
@@ -19,7 +18,9 @@ from schemas.user import (
 )
 from services.administrative_service import AdministrativeService
 from services.email_service import email_service
+from services.principal_service import PrincipalService
 from utils.auth import get_password_hash, verify_password
+from utils.search import count_matches, search_condition
 from utils.constants import (
     CANNOT_DELETE_OWN_ACCOUNT,
     DELETE_FAILED,
@@ -229,17 +230,15 @@ class UserService:
         """Get paginated list of users with optional search"""
         query = db.query(User)
 
-        if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                or_(
-                    User.full_name.ilike(search_term),
-                    User.email.ilike(search_term),
-                    User.phone_number.ilike(search_term),
-                )
+        if search and search.strip():
+            condition, rank = search_condition(
+                search, [User.full_name, User.email], User.phone_number
+            )
+            query = query.filter(condition).order_by(
+                rank.desc(), User.id
             )
 
-        total = query.count()
+        total = count_matches(db, query)
         users = query.offset((page - 1) * size).limit(size).all()
 
         # Convert users to dict format with administrative location info
@@ -496,6 +495,7 @@ class UserService:
         try:
             db.commit()
             db.refresh(actual_user)
+            PrincipalService.invalidate(user_id=user_id)
             # Return updated user with administrative location info
             return UserService.get_user_by_id(db, user_id)
         except IntegrityError:
@@ -524,6 +524,7 @@ class UserService:
         try:
             db.delete(user)
             db.commit()
+            PrincipalService.invalidate(user_id=user_id)
             return True
         except Exception:
             db.rollback()
@@ -595,6 +596,7 @@ class UserService:
         try:
             db.commit()
             db.refresh(current_user)
+            PrincipalService.invalidate(user_id=current_user.id)
             return current_user
         except IntegrityError:
             db.rollback()
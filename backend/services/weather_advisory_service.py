@@ -301,6 +301,14 @@ class WeatherAdvisoryService:
 
         return filtered
 
+    # Weather fields read by _generate_calendar_rules()
+    CALENDAR_RULE_FIELDS = (
+        "qpf_today_mm",
+        "wind_speed_kmh",
+        "relative_humidity_pct",
+        "thi_value",
+    )
+
     def _generate_calendar_rules(
         self, calendar_ctx: dict, weather: dict
     ) -> List[dict]:
@@ -722,8 +730,16 @@ class WeatherAdvisoryService:
         )
         return triggered
 
-    def parse_weather_data(self, raw: dict) -> dict:
-        """Parse weather API output into normalized format."""
+    def parse_weather_data(
+        self, raw: dict, now: Optional[datetime] = None
+    ) -> dict:
+        """
+        Parse weather API output into normalized format.
+
+        Args:
+            raw: Weather API response
+            now: Time of the fetch (month, hour), defaults to now
+        """
         parsed = {}
 
         try:
@@ -760,7 +776,8 @@ class WeatherAdvisoryService:
                 parsed["relative_humidity_pct"] = 55
 
             # Time
-            now = datetime.now()
+            if now is None:
+                now = datetime.now()
             parsed["month"] = now.month
             parsed["hour"] = now.hour
 
@@ -0,0 +1,362 @@
+"""
+WeatherBacktestService - Replays stored weather through the rules
+
+Answers "how often would this rule have fired?" for a crop's weather
+rules (data/<crop>_weather_rules.json) and crop calendar, over months of
+stored observations (services/weather_observation_service.py) for all
+areas at once, without calling the weather API.
+
+The result per observation is the same as calling
+WeatherAdvisoryService.evaluate_rules() with its parsed weather and the
+month it was observed, but conditions are evaluated on whole columns:
+
+- A condition is evaluated once per distinct value of its field (with
+  the advisory service's own _evaluate_condition()) and the results are
+  mapped back to every row. Fields the calendar adds to the weather
+  (season, disease and pest risk) are evaluated once per month.
+- AND / OR groups combine the row masks.
+- The growth stage filter is decided per month.
+- Calendar management rules depend on the month and a few weather
+  fields only (CALENDAR_RULE_FIELDS); they are generated once per
+  distinct combination.
+
+replay() runs evaluate_rules() row by row instead; it is the reference
+the vectorized counts are checked against.
+"""
+
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from services.weather_advisory_service import (
+    WeatherAdvisoryService,
+    get_weather_advisory_service,
+)
+from services.weather_observation_service import (
+    ObservationFrame,
+    WeatherObservationService,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RuleStats:
+    """Backtest result of one rule"""
+
+    rule_id: str
+    name: str
+    category: str
+    priority: str
+    source: str  # "rules" or "crop_calendar"
+    weather_matches: int = 0  # Conditions met, before the stage filter
+    triggers: int = 0  # Observations the rule was triggered for
+    areas: int = 0  # Areas it was triggered for at least once
+
+
+@dataclass
+class BacktestReport:
+    """Trigger frequencies of a crop's rules over stored observations"""
+
+    crop: str
+    observations: int
+    areas: int
+    start: Optional[date] = None
+    end: Optional[date] = None
+    rules: List[RuleStats] = field(default_factory=list)
+
+    def rate(self, stats: RuleStats) -> float:
+        """Share of observations a rule was triggered for"""
+        if not self.observations:
+            return 0.0
+        return stats.triggers / self.observations
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """One dict per rule, e.g. for a CSV export"""
+        return [
+            {
+                "crop": self.crop,
+                "rule_id": stats.rule_id,
+                "name": stats.name,
+                "category": stats.category,
+                "priority": stats.priority,
+                "source": stats.source,
+                "weather_matches": stats.weather_matches,
+                "triggers": stats.triggers,
+                "trigger_rate": round(self.rate(stats), 4),
+                "areas": stats.areas,
+                "observations": self.observations,
+            }
+            for stats in self.rules
+        ]
+
+
+class _ColumnEvaluator:
+    """Rule conditions as boolean masks over an ObservationFrame"""
+
+    def __init__(
+        self,
+        frame: ObservationFrame,
+        crop: str,
+        advisory: WeatherAdvisoryService,
+    ):
+        self.frame = frame
+        self.size = len(frame)
+        self.advisory = advisory
+        self.month_values, self.month_index = np.unique(
+            frame.months, return_inverse=True
+        )
+        self.contexts = [
+            advisory.get_calendar_context(int(month), crop)
+            for month in self.month_values
+        ]
+        # What evaluate_rules() adds to the weather, per month
+        self.enriched = [
+            advisory._enrich_weather_with_calendar({}, context)
+            for context in self.contexts
+        ]
+        self.calendar_fields = set().union(*self.enriched)
+        self._distinct: Dict[str, Any] = {}
+
+    def _zeros(self) -> np.ndarray:
+        return np.zeros(self.size, dtype=bool)
+
+    def _per_month(self, results: List[bool]) -> np.ndarray:
+        return np.asarray(results, dtype=bool)[self.month_index]
+
+    def _distinct_values(self, name: str):
+        """(present mask, distinct values, inverse) of a column"""
+        if name not in self._distinct:
+            column = self.frame.columns[name]
+            present = ~np.isnan(column)
+            values, inverse = np.unique(column[present], return_inverse=True)
+            self._distinct[name] = (present, values, inverse)
+        return self._distinct[name]
+
+    def condition(self, condition: dict) -> np.ndarray:
+        """Rows for which a single condition holds"""
+        name = condition.get("field")
+        if name in self.calendar_fields:
+            return self._per_month(
+                [
+                    self.advisory._evaluate_condition(condition, weather)
+                    for weather in self.enriched
+                ]
+            )
+        if name not in self.frame.columns:
+            # Never in the parsed weather: the condition never holds
+            return self._zeros()
+
+        present, values, inverse = self._distinct_values(name)
+        hits = np.array(
+            [
+                self.advisory._evaluate_condition(
+                    condition, {name: float(value)}
+                )
+                for value in values
+            ],
+            dtype=bool,
+        )
+        mask = self._zeros()
+        if values.size:
+            mask[present] = hits[inverse]
+        return mask
+
+    def group(self, weather_condition: dict) -> np.ndarray:
+        """Rows for which a (nested) weather_condition block holds"""
+        operator = weather_condition.get("operator", "AND")
+        if operator == "ALWAYS":
+            return np.ones(self.size, dtype=bool)
+
+        conditions = weather_condition.get("conditions", [])
+        if not conditions:
+            return self._zeros()
+
+        masks = [
+            (
+                self.group(cond)
+                if "operator" in cond and "conditions" in cond
+                else self.condition(cond)
+            )
+            for cond in conditions
+        ]
+        if operator == "AND":
+            return np.logical_and.reduce(masks)
+        if operator == "OR":
+            return np.logical_or.reduce(masks)
+        return self._zeros()
+
+    def applies(self, rule: dict) -> np.ndarray:
+        """Rows whose month's growth stages the rule applies to"""
+        return self._per_month(
+            [
+                bool(
+                    self.advisory._filter_by_growth_stage(
+                        [rule], weather["_active_stages"]
+                    )
+                )
+                for weather in self.enriched
+            ]
+        )
+
+    def calendar_rules(self) -> List[Any]:
+        """
+        Calendar management rules, with the rows they are generated for.
+
+        Returns:
+            List of (rule dict, row mask), one per rule id
+        """
+        names = WeatherAdvisoryService.CALENDAR_RULE_FIELDS
+        keys = np.column_stack(
+            [self.month_index.astype(float)]
+            + [self.frame.columns[name] for name in names]
+        )
+        combos, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        # rule id -> (rule, indexes of the combinations generating it)
+        generated: Dict[str, Any] = {}
+        for combo_index, combo in enumerate(combos):
+            month_index = int(combo[0])
+            weather = dict(self.enriched[month_index])
+            for name, value in zip(names, combo[1:]):
+                if not np.isnan(value):
+                    weather[name] = float(value)
+            for rule in self.advisory._generate_calendar_rules(
+                self.contexts[month_index], weather
+            ):
+                rule_id = rule.get("id", "unknown")
+                generated.setdefault(rule_id, (rule, []))[1].append(
+                    combo_index
+                )
+
+        return [
+            (rule, np.isin(inverse, indexes))
+            for rule, indexes in generated.values()
+        ]
+
+
+class WeatherBacktestService:
+    """Backtests crop weather rules against stored observations"""
+
+    def __init__(
+        self,
+        db: Optional[Session] = None,
+        advisory_service: Optional[WeatherAdvisoryService] = None,
+    ):
+        self.db = db
+        self.advisory_service = (
+            advisory_service or get_weather_advisory_service()
+        )
+
+    def run(
+        self,
+        crop: str,
+        start: date,
+        end: date,
+        administrative_ids: Optional[List[int]] = None,
+    ) -> BacktestReport:
+        """
+        Backtest a crop's rules over the observations of a date range.
+
+        Args:
+            crop: Crop type with a rules file (avocado, potato, dairy)
+            start: First observation day
+            end: Last observation day
+            administrative_ids: Only these areas (default: all)
+        """
+        frame = WeatherObservationService(self.db).load_frame(
+            start, end, administrative_ids
+        )
+        report = self.backtest(frame, crop)
+        report.start, report.end = start, end
+        return report
+
+    def backtest(self, frame: ObservationFrame, crop: str) -> BacktestReport:
+        """Trigger counts of a crop's rules over an ObservationFrame"""
+        crop = crop.lower()
+        report = BacktestReport(
+            crop=crop,
+            observations=len(frame),
+            areas=int(np.unique(frame.administrative_ids).size),
+        )
+        if not len(frame):
+            return report
+
+        evaluator = _ColumnEvaluator(frame, crop, self.advisory_service)
+        # rule id -> (rule, source, weather matches, triggered)
+        masks: Dict[str, Any] = {}
+
+        def _add(rule, source, matches, triggered):
+            # Rules sharing an id count once per observation, as in
+            # replay()
+            rule_id = rule.get("id", "unknown")
+            if rule_id in masks:
+                rule, source, previous, previous_triggered = masks[rule_id]
+                matches = matches | previous
+                triggered = triggered | previous_triggered
+            masks[rule_id] = (rule, source, matches, triggered)
+
+        for rule in self.advisory_service.load_rules(crop).get("rules", []):
+            try:
+                matches = evaluator.group(rule.get("weather_condition", {}))
+            except Exception as e:
+                logger.warning(
+                    f"Error evaluating rule {rule.get('id', 'unknown')}: {e}"
+                )
+                matches = evaluator._zeros()
+            _add(rule, "rules", matches, matches & evaluator.applies(rule))
+
+        for rule, mask in evaluator.calendar_rules():
+            _add(rule, "crop_calendar", mask, mask)
+
+        report.rules = sorted(
+            (
+                self._stats(frame, rule, matches, triggered, source)
+                for rule, source, matches, triggered in masks.values()
+            ),
+            key=lambda s: (-s.triggers, s.rule_id),
+        )
+        return report
+
+    def _stats(
+        self,
+        frame: ObservationFrame,
+        rule: dict,
+        matches: np.ndarray,
+        triggered: np.ndarray,
+        source: str,
+    ) -> RuleStats:
+        return RuleStats(
+            rule_id=rule.get("id", "unknown"),
+            name=rule.get("name", ""),
+            category=rule.get("category", ""),
+            priority=rule.get("priority", "low"),
+            source=source,
+            weather_matches=int(matches.sum()),
+            triggers=int(triggered.sum()),
+            areas=int(np.unique(frame.administrative_ids[triggered]).size),
+        )
+
+    def replay(self, frame: ObservationFrame, crop: str) -> Counter:
+        """
+        Reference counts: evaluate_rules() for every observation.
+
+        Returns:
+            Counter of rule id -> observations it was triggered for
+        """
+        counts: Counter = Counter()
+        months = frame.months
+        for index in range(len(frame)):
+            triggered = self.advisory_service.evaluate_rules(
+                weather_data=frame.row(index),
+                crop=crop,
+                month=int(months[index]),
+            )
+            counts.update({rule.get("id", "unknown") for rule in triggered})
+        return counts
@@ -6,6 +6,7 @@ message generation for farmer broadcasts.
 """
 
 import logging
+from datetime import date
 from pathlib import Path
 from typing import Optional, Dict, Any
 
@@ -14,6 +15,7 @@ from jinja2 import Template
 from config import settings
 from services.openai_service import get_openai_service
 from services.weather_advisory_service import get_weather_advisory_service
+from utils.single_flight import get_distributed_single_flight, request_key
 
 
 logger = logging.getLogger(__name__)
@@ -313,6 +315,31 @@ class WeatherBroadcastService:
                 logger.error(f"✗ No weather data for {location}")
                 return None
 
+        # Recipients of one area/language/crop ask for the same message
+        # at once, from the API and from several Celery workers
+        key = request_key(
+            "weather:message",
+            location,
+            language,
+            farmer_crop,
+            date.today().isoformat(),
+            weather_data,
+        )
+        return await get_distributed_single_flight().do(
+            key,
+            lambda: self._generate_message(
+                location, language, weather_data, farmer_crop
+            ),
+        )
+
+    async def _generate_message(
+        self,
+        location: str,
+        language: str,
+        weather_data: Dict[str, Any],
+        farmer_crop: Optional[str],
+    ) -> Optional[str]:
+        """Upstream part of generate_message"""
         # Get advisory service
         advisory_service = get_weather_advisory_service()
 
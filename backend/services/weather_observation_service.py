@@ -0,0 +1,256 @@
+"""
+WeatherObservationService - Daily weather observations per area
+
+Weather is fetched for each broadcast area (tasks/weather_tasks.py).
+Besides the raw response kept on the WeatherBroadcast, the parsed
+scalar fields are stored in `weather_observations`, one typed row per
+area and day (models/weather_observation.py). Observations recorded
+before the table existed can be rebuilt from the stored broadcasts with
+backfill_from_broadcasts().
+
+load_frame() reads a date range back as columns (NumPy arrays), the
+input of the rule backtests in services/weather_backtest_service.py.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from models.weather_broadcast import WeatherBroadcast
+from models.weather_observation import OBSERVATION_FIELDS, WeatherObservation
+from services.weather_advisory_service import get_weather_advisory_service
+
+logger = logging.getLogger(__name__)
+
+
+def _scalar(value: Any) -> Any:
+    """Numbers and booleans are stored, anything else becomes NULL"""
+    if isinstance(value, (bool, int, float)):
+        return value
+    return None
+
+
+@dataclass
+class ObservationFrame:
+    """
+    Observations as columns, one entry per area and day.
+
+    Missing values (fields the weather response did not have) are NaN;
+    booleans are 1.0 / 0.0.
+    """
+
+    administrative_ids: np.ndarray
+    observed_on: np.ndarray  # datetime64[D]
+    columns: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.administrative_ids)
+
+    @property
+    def months(self) -> np.ndarray:
+        """Month (1-12) of each observation"""
+        return self.observed_on.astype("datetime64[M]").astype(int) % 12 + 1
+
+    def row(self, index: int) -> Dict[str, float]:
+        """Parsed weather of one observation, without missing fields"""
+        return {
+            name: float(values[index])
+            for name, values in self.columns.items()
+            if not np.isnan(values[index])
+        }
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]):
+        """
+        Build a frame from dicts with administrative_id, observed_on
+        and any of the OBSERVATION_FIELDS.
+        """
+        records = list(records)
+        return cls(
+            administrative_ids=np.array(
+                [r["administrative_id"] for r in records], dtype=np.int64
+            ),
+            observed_on=np.array(
+                [r["observed_on"] for r in records], dtype="datetime64[D]"
+            ),
+            columns={
+                name: np.array(
+                    [_scalar(r.get(name)) for r in records], dtype=float
+                )
+                for name in OBSERVATION_FIELDS
+            },
+        )
+
+
+class WeatherObservationService:
+    """Stores and reads daily weather observations"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.advisory_service = get_weather_advisory_service()
+
+    def record(
+        self,
+        administrative_id: int,
+        raw: Dict[str, Any],
+        fetched_at: Optional[datetime] = None,
+    ) -> bool:
+        """
+        Store the parsed weather of an area for the day of the fetch
+        (does not commit).
+
+        A later fetch on the same day replaces the observation. Errors
+        are logged and rolled back to a savepoint, so a failing
+        observation never fails the broadcast that fetched the weather.
+
+        Args:
+            administrative_id: Area the weather was fetched for
+            raw: Weather API response (WeatherBroadcast.weather_data)
+            fetched_at: Time of the fetch (UTC), defaults to now
+
+        Returns:
+            True if the observation was stored
+        """
+        if fetched_at is None:
+            fetched_at = datetime.utcnow()
+        try:
+            parsed = self.advisory_service.parse_weather_data(
+                raw, now=fetched_at
+            )
+            values = {
+                name: _scalar(parsed.get(name)) for name in OBSERVATION_FIELDS
+            }
+            stmt = pg_insert(WeatherObservation).values(
+                administrative_id=administrative_id,
+                observed_on=fetched_at.date(),
+                fetched_at=fetched_at,
+                **values,
+            )
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_weather_observations_area_day",
+                set_={
+                    name: stmt.excluded[name]
+                    for name in ("fetched_at",) + OBSERVATION_FIELDS
+                },
+                # Backfills must not overwrite a newer fetch
+                where=(
+                    WeatherObservation.fetched_at <= stmt.excluded.fetched_at
+                ),
+            )
+            with self.db.begin_nested():
+                self.db.execute(stmt)
+            return True
+        except Exception as e:
+            logger.warning(
+                f"Failed to store weather observation for area "
+                f"{administrative_id}: {e}"
+            )
+            return False
+
+    def backfill_from_broadcasts(
+        self,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        batch_size: int = 500,
+    ) -> int:
+        """
+        Record observations from the raw weather of past broadcasts.
+
+        Args:
+            since: First broadcast day (inclusive)
+            until: Last broadcast day (inclusive)
+            batch_size: Broadcasts read and committed at a time
+
+        Returns:
+            Number of observations written
+        """
+        query = select(
+            WeatherBroadcast.id,
+            WeatherBroadcast.administrative_id,
+            WeatherBroadcast.weather_data,
+            WeatherBroadcast.started_at,
+            WeatherBroadcast.created_at,
+        ).where(WeatherBroadcast.weather_data.isnot(None))
+        if since is not None:
+            query = query.where(
+                WeatherBroadcast.created_at
+                >= datetime.combine(since, time.min)
+            )
+        if until is not None:
+            query = query.where(
+                WeatherBroadcast.created_at
+                < datetime.combine(until + timedelta(days=1), time.min)
+            )
+
+        # Pages in id order; record() keeps the latest fetch of a day
+        # whatever the order
+        written = 0
+        last_id = 0
+        while True:
+            rows = self.db.execute(
+                query.where(WeatherBroadcast.id > last_id)
+                .order_by(WeatherBroadcast.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            for row in rows:
+                fetched_at = row.started_at or row.created_at
+                if self.record(
+                    row.administrative_id, row.weather_data, fetched_at
+                ):
+                    written += 1
+            self.db.commit()
+            last_id = rows[-1].id
+
+        logger.info(f"Backfilled {written} weather observations")
+        return written
+
+    def load_frame(
+        self,
+        start: date,
+        end: date,
+        administrative_ids: Optional[List[int]] = None,
+    ) -> ObservationFrame:
+        """
+        Observations from start to end (inclusive) as columns.
+
+        Args:
+            start: First day
+            end: Last day
+            administrative_ids: Only these areas (default: all)
+        """
+        table = WeatherObservation.__table__.c
+        query = (
+            select(
+                table.administrative_id,
+                table.observed_on,
+                *(table[name] for name in OBSERVATION_FIELDS),
+            )
+            .where(table.observed_on >= start, table.observed_on <= end)
+            .order_by(table.observed_on, table.administrative_id)
+        )
+        if administrative_ids:
+            query = query.where(
+                table.administrative_id.in_(administrative_ids)
+            )
+        rows = self.db.execute(query).all()
+
+        # Column-wise: None becomes NaN, booleans 1.0 / 0.0
+        columns = list(zip(*rows))
+        if not columns:
+            columns = [()] * (len(OBSERVATION_FIELDS) + 2)
+        return ObservationFrame(
+            administrative_ids=np.array(columns[0], dtype=np.int64),
+            observed_on=np.array(columns[1], dtype="datetime64[D]"),
+            columns={
+                name: np.array(values, dtype=float)
+                for name, values in zip(OBSERVATION_FIELDS, columns[2:])
+            },
+        )
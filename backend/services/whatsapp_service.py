@@ -3,18 +3,20 @@ import logging
 import os
 import re
 import uuid
-import phonenumbers
 import httpx
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 from models.message import Message, DeliveryStatus
 from twilio.rest import Client
+from twilio.http.http_client import TwilioHttpClient
 from twilio.base.exceptions import TwilioRestException
 from sqlalchemy.sql import func
-from phonenumbers import NumberParseException
 from sqlalchemy.orm import Session
 from unittest.mock import Mock
 
+import config
 from config import settings
+from utils.metrics import TWILIO_ERRORS
+from utils.phone import to_e164
 
 logger = logging.getLogger(__name__)
 
@@ -45,9 +47,99 @@ def load_message_templates():
 
 # Load WhatsApp messages from template
 WHATSAPP_MESSAGES = load_message_templates()
+
+TEMPLATE_TYPES = ("confirmation", "reconnection", "broadcast")
+
+
+def build_template_sids() -> Dict[Tuple[str, Optional[str]], str]:
+    """
+    (template_type, language) -> content SID for the configured languages.
+
+    A template's "sid" is the English, default one. Swahili uses
+    "sid_sw" (settings.whatsapp_<type>_template_sid_sw), any other
+    language "sid_<code>"; languages without one fall back to the
+    default, stored under the language None.
+    """
+    # config.settings rather than this module's name, which some tests
+    # replace with a mock
+    settings = config.settings
+    table = {}
+    for template_type in TEMPLATE_TYPES:
+        default_sid = getattr(
+            settings, f"whatsapp_{template_type}_template_sid"
+        )
+        table[(template_type, None)] = default_sid
+        configured = settings.whatsapp_templates.get(template_type, {})
+        for language in settings.supported_language_codes:
+            if language == "sw":
+                sid = getattr(
+                    settings, f"whatsapp_{template_type}_template_sid_sw"
+                )
+            else:
+                sid = configured.get(f"sid_{language}")
+            if not sid and language != "en":
+                logger.warning(
+                    f"[WhatsAppService] {language} template not configured "
+                    f"for {template_type}, using English"
+                )
+            table[(template_type, language)] = sid or default_sid
+    return table
+
+
+# Settings the template SID table is built from
+TEMPLATE_SID_SETTINGS = ("languages", "whatsapp_templates") + tuple(
+    f"whatsapp_{template_type}_template_sid{suffix}"
+    for template_type in TEMPLATE_TYPES
+    for suffix in ("", "_sw")
+)
+
+_template_sids = None  # (source values, table)
+
+
+def template_sids() -> Dict[Tuple[str, Optional[str]], str]:
+    """
+    The template SID table, rebuilt when a source setting changes.
+
+    Like Settings._compiled_value(), the table is keyed on the identity
+    of the TEMPLATE_SID_SETTINGS values, so assigning a new value
+    (including monkeypatch in tests) is picked up on the next call.
+    """
+    global _template_sids
+    sources = tuple(
+        getattr(config.settings, name) for name in TEMPLATE_SID_SETTINGS
+    )
+    cached = _template_sids
+    if cached is None or any(
+        old is not new for old, new in zip(cached[0], sources)
+    ):
+        cached = (sources, build_template_sids())
+        _template_sids = cached
+    return cached[1]
+
+
 MAX_WHATSAPP_MESSAGE_LENGTH = 1500
 
 
+def _count_twilio_error(error: Exception) -> None:
+    """Count a failed Twilio API call by its error code"""
+    code = getattr(error, "code", None)
+    TWILIO_ERRORS.labels(
+        code=str(code) if code else "unknown", source="send"
+    ).inc()
+
+
+class _BaseUrlHttpClient(TwilioHttpClient):
+    """Sends Twilio API requests to another host (load-test stand-ins)"""
+
+    def __init__(self, base_url: str):
+        super().__init__()
+        self.base_url = base_url.rstrip("/")
+
+    def request(self, method: str, url: str, *args, **kwargs):
+        url = re.sub(r"^https://[\w.-]+\.twilio\.com", self.base_url, url)
+        return super().request(method, url, *args, **kwargs)
+
+
 class WhatsAppService:
     def __init__(self):
         self.account_sid = os.getenv("TWILIO_ACCOUNT_SID")
@@ -102,7 +194,17 @@ class WhatsAppService:
                 "WhatsAppService initialized in PRODUCTION mode - "
                 "using real Twilio client"
             )
-            self.client = Client(self.account_sid, self.auth_token)
+            # TWILIO_API_BASE_URL points the client at a stand-in
+            # (see loadtest/); never set it in production
+            base_url = os.getenv("TWILIO_API_BASE_URL")
+            if base_url:
+                self.client = Client(
+                    self.account_sid,
+                    self.auth_token,
+                    http_client=_BaseUrlHttpClient(base_url),
+                )
+            else:
+                self.client = Client(self.account_sid, self.auth_token)
 
     @staticmethod
     def sanitize_whatsapp_content(text: str) -> str:
@@ -173,55 +275,22 @@ class WhatsAppService:
         Args:
             template_type: Type of template
                 ("confirmation", "reconnection", "broadcast")
-            customer_language: Customer's language preference ("en" or "sw")
+            customer_language: Customer's language code; languages
+                without their own template get the default (English) one
 
         Returns:
             Template SID string
         """
-        from config import settings
-
-        # Map template types to config attributes
-        template_map = {
-            "confirmation": {
-                "en": settings.whatsapp_confirmation_template_sid,
-                "sw": settings.whatsapp_confirmation_template_sid_sw,
-            },
-            "reconnection": {
-                "en": settings.whatsapp_reconnection_template_sid,
-                "sw": settings.whatsapp_reconnection_template_sid_sw,
-            },
-            "broadcast": {
-                "en": settings.whatsapp_broadcast_template_sid,
-                "sw": settings.whatsapp_broadcast_template_sid_sw,
-            },
-        }
-
-        if template_type not in template_map:
+        if template_type not in TEMPLATE_TYPES:
             logger.warning(
                 f"[WhatsAppService] Unknown template type: {template_type}, "
                 f"defaulting to confirmation"
             )
             template_type = "confirmation"
-
-        # Get SID for customer's language, fallback to English
-        language = (
-            customer_language if customer_language in ["en", "sw"] else "en"
-        )
-        sid = template_map[template_type].get(language)
-
-        # Fallback to English if Swahili SID not available
-        if not sid and language == "sw":
-            logger.warning(
-                f"[WhatsAppService] Swahili template not configured for "
-                f"{template_type}, using English"
-            )
-            sid = template_map[template_type].get("en")
-
-        logger.info(
-            f"[WhatsAppService] Selected {template_type} template "
-            f"for language '{language}': {sid}"
-        )
-
+        table = template_sids()
+        sid = table.get((template_type, customer_language))
+        if sid is None:
+            sid = table[(template_type, None)]
         return sid
 
     def send_template_message(
@@ -242,11 +311,9 @@ class WhatsAppService:
             )
 
         try:
-            message = self.client.messages.create(
-                from_=self.whatsapp_number,
-                to=f"whatsapp:{to}",
-                content_sid=content_sid,
-                content_variables=json.dumps(content_variables),
+            message = self.create_message(
+                to, content_sid=content_sid,
+                content_variables=content_variables,
             )
             return {
                 "sid": message.sid,
@@ -268,11 +335,7 @@ class WhatsAppService:
             )
 
         try:
-            message = self.client.messages.create(
-                from_=self.whatsapp_number,
-                body=message_body,
-                to=f"whatsapp:{to_number}",
-            )
+            message = self.create_message(to_number, body=message_body)
             return {
                 "sid": message.sid,
                 "status": message.status,
@@ -282,6 +345,41 @@ class WhatsAppService:
         except Exception as e:
             raise Exception(f"Failed to send WhatsApp message: {e}")
 
+    def create_message(
+        self,
+        to_number: str,
+        body: Optional[str] = None,
+        content_sid: Optional[str] = None,
+        content_variables: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Create a Twilio message, a text body or a template.
+
+        Unlike the send_* helpers, Twilio errors are raised unchanged so
+        callers can tell retryable error codes from permanent ones.
+
+        Args:
+            to_number: Recipient phone number (without whatsapp: prefix)
+            body: Message text
+            content_sid: Template SID, instead of body
+            content_variables: Template variables
+
+        Returns:
+            The Twilio message resource
+        """
+        kwargs = {"from_": self.whatsapp_number, "to": f"whatsapp:{to_number}"}
+        if content_sid:
+            kwargs["content_sid"] = content_sid
+            if content_variables is not None:
+                kwargs["content_variables"] = json.dumps(content_variables)
+        else:
+            kwargs["body"] = body
+        try:
+            return self.client.messages.create(**kwargs)
+        except Exception as e:
+            _count_twilio_error(e)
+            raise
+
     def send_message_with_media(
         self, to_number: str, message_body: str, media_url: str
     ) -> Dict[str, Any]:
@@ -322,23 +420,26 @@ class WhatsAppService:
                 "body": message.body,
             }
         except Exception as e:
+            _count_twilio_error(e)
             raise Exception(f"Failed to send WhatsApp message with media: {e}")
 
     def send_welcome_message(
         self, to_number: str, language: str = "en"
     ) -> Dict[str, Any]:
         """Send welcome message to new customer."""
-        welcome_messages = WHATSAPP_MESSAGES.get("welcome_messages", {})
-
-        message = welcome_messages.get(
-            language, welcome_messages.get("en", "")
-        )
+        message = self.welcome_message_text(language)
         if not message:
             print("No welcome message found for language: {}".format(language))
             return {}
 
         return self.send_message(to_number, message)
 
+    @staticmethod
+    def welcome_message_text(language: str = "en") -> str:
+        """Welcome message in the language, English as fallback"""
+        welcome_messages = WHATSAPP_MESSAGES.get("welcome_messages", {})
+        return welcome_messages.get(language, welcome_messages.get("en", ""))
+
     def send_confirmation_template(
         self, to_number: str, ai_answer: str
     ) -> Dict[str, Any]:
@@ -448,13 +549,7 @@ class WhatsAppService:
             )
             return {"sid": "TESTING_MODE", "status": "sent"}
 
-        # Build the message with button options as numbered list
-        # This provides a text-based fallback that works without
-        # Twilio Content API templates
-        button_options = "\n".join(
-            f"{i+1}. {btn['title']}" for i, btn in enumerate(buttons)
-        )
-        full_message = f"{body_text}\n\n{button_options}"
+        full_message = self.buttons_text(body_text, buttons)
 
         try:
             message = self.client.messages.create(
@@ -478,6 +573,16 @@ class WhatsAppService:
             logger.error(f"✗ Error sending interactive buttons: {e}")
             raise Exception(f"Failed to send interactive buttons: {e}")
 
+    @staticmethod
+    def buttons_text(body_text: str, buttons: list[Dict[str, str]]) -> str:
+        """Body followed by the button titles as a numbered list"""
+        # This provides a text-based fallback that works without
+        # Twilio Content API templates
+        button_options = "\n".join(
+            f"{i+1}. {btn['title']}" for i, btn in enumerate(buttons)
+        )
+        return f"{body_text}\n\n{button_options}"
+
     def download_twilio_media(
         self, media_url: str, save_path: str
     ) -> Optional[str]:
@@ -559,6 +664,9 @@ class WhatsAppService:
         """
         Validate and format phone number to E.164 format.
 
+        Customers carry this precomputed in Customer.phone_e164; pass
+        that as `e164` to the send methods instead.
+
         Args:
             phone: Phone number in any format
 
@@ -568,31 +676,7 @@ class WhatsAppService:
         Raises:
             ValueError: If phone number is invalid
         """
-        try:
-            # Remove whatsapp: prefix if present
-            phone = phone.replace("whatsapp:", "").strip()
-
-            # If number doesn't start with +, try adding it
-            if not phone.startswith("+"):
-                phone = "+" + phone
-
-            # Parse phone number (None = detect country from number)
-            parsed = phonenumbers.parse(phone, None)
-
-            # Validate
-            if not phonenumbers.is_valid_number(parsed):
-                raise ValueError(f"Invalid phone number: {phone}")
-
-            # Format to E.164
-            formatted = phonenumbers.format_number(
-                parsed, phonenumbers.PhoneNumberFormat.E164
-            )
-
-            logger.info(f"Validated phone: {phone} → {formatted}")
-            return formatted
-
-        except NumberParseException as e:
-            raise ValueError(f"Cannot parse phone number '{phone}': {e}")
+        return to_e164(phone)
 
     def send_message_with_tracking(
         self,
@@ -600,6 +684,7 @@ class WhatsAppService:
         message_body: str,
         message_id: Optional[int] = None,
         db: Optional[Session] = None,
+        e164: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Send WhatsApp message with delivery tracking and error handling.
@@ -609,6 +694,8 @@ class WhatsAppService:
             message_body: Message content
             message_id: Database message ID (for status updates)
             db: Database session (for status updates)
+            e164: to_number already validated (Customer.phone_e164);
+                skips parsing it again
 
         Returns:
             Dict with sid, status, error info
@@ -619,7 +706,9 @@ class WhatsAppService:
         """
         # Validate phone number first
         try:
-            validated_number = self.validate_and_format_phone_number(to_number)
+            validated_number = e164 or self.validate_and_format_phone_number(
+                to_number
+            )
         except ValueError as e:
             logger.error(f"Phone validation failed: {e}")
             if message_id and db:
@@ -709,6 +798,7 @@ class WhatsAppService:
             }
 
         except TwilioRestException as e:
+            _count_twilio_error(e)
             logger.error(f"Twilio API error {e.code}: {e.msg}")
 
             # Update message status
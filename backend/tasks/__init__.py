@@ -5,6 +5,7 @@ Contains scheduled tasks and background workers for:
 - Message retry with exponential backoff
 - Broadcast messaging
 - Weather broadcast messaging
+- Ticket auto-tagging
 """
 
 # Import tasks to register them with Celery
@@ -19,6 +20,8 @@ from tasks.weather_tasks import (
     send_weather_message,
     retry_failed_weather_broadcasts,
 )
+from tasks.retry_tasks import retry_failed_messages
+from tasks.tagging_tasks import tag_resolved_tickets
 
 __all__ = [
     "process_broadcast",
@@ -28,4 +31,6 @@ __all__ = [
     "send_weather_templates",
     "send_weather_message",
     "retry_failed_weather_broadcasts",
+    "retry_failed_messages",
+    "tag_resolved_tickets",
 ]
@@ -0,0 +1,49 @@
+"""
+Celery task archiving old messages.
+
+Runs monthly: moves messages older than MESSAGE_ARCHIVE_HOT_MONTHS into
+the partitioned messages_archive table, then exports archive partitions
+older than MESSAGE_ARCHIVE_EXPORT_MONTHS to Parquet and drops them.
+See services/message_archive_service.py.
+"""
+import logging
+from typing import Any, Dict
+
+from celery_app import celery_app
+from config import settings
+from database import SessionLocal
+from services.message_archive_service import MessageArchiveService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    name="tasks.archive_tasks.archive_messages",
+    # The first run after enabling may move several months at once
+    soft_time_limit=3300,
+    time_limit=3600,
+)
+def archive_messages() -> Dict[str, Any]:
+    """
+    Archive old messages and export expired archive partitions.
+
+    Returns:
+        Messages moved per partition and the written Parquet files
+    """
+    if not settings.message_archive_enabled:
+        logger.debug("Message archival is disabled, skipping")
+        return {"archived": {}, "exported": []}
+
+    db = SessionLocal()
+    try:
+        service = MessageArchiveService(db)
+        return {
+            "archived": service.archive_due(),
+            "exported": service.export_due(),
+        }
+    except Exception as e:
+        db.rollback()
+        logger.error(f"✗ Message archival failed: {e}")
+        raise
+    finally:
+        db.close()
@@ -8,7 +8,7 @@ Tasks handle:
 """
 import logging
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, Any
 
 from celery_app import celery_app
@@ -21,6 +21,8 @@ from models.message import (
     MessageFrom,
 )
 from models.customer import Customer
+from services.broadcast_retry_service import BroadcastRetryService
+from services.bulk_send_service import BulkSendService
 from services.whatsapp_service import WhatsAppService
 from config import _config, settings
 
@@ -285,133 +287,36 @@ def retry_failed_broadcasts() -> Dict[str, Any]:
     Periodic task to retry failed broadcast deliveries.
 
     Runs every 5 minutes (configured in celery_app.py beat_schedule).
-    Retries recipients with FAILED status based on retry_intervals config.
+    Claims due FAILED recipients (backoff from retry_intervals config) in
+    one joined query and dispatches them through the bulk send engine.
 
     Returns:
-        Dict with retry statistics
+        Dict with retry statistics and per-sweep metrics
     """
     db = SessionLocal()
     try:
         logger.info("Starting broadcast retry task")
 
-        # Get content SID from settings or config
-        content_sid = settings.whatsapp_broadcast_template_sid
-        if not content_sid:
-            content_sid = (
-                _config.get("whatsapp", {})
-                .get("templates", {})
-                .get("broadcast", {})
-                .get("sid", "")
-            )
-        # [5, 15, 60] minutes
-        retry_intervals = settings.broadcast_retry_intervals
-        now = datetime.utcnow()
-        retried_count = 0
-        success_count = 0
-        failed_count = 0
-
-        # Get all failed recipients eligible for retry
-        for retry_attempt, interval_minutes in enumerate(retry_intervals):
-            # Calculate time threshold for this retry attempt
-            threshold = now - timedelta(minutes=interval_minutes)
-
-            # Find recipients at this retry attempt
-            recipients = db.query(BroadcastRecipient).filter(
-                BroadcastRecipient.status == DeliveryStatus.FAILED,
-                BroadcastRecipient.retry_count == retry_attempt,
-                BroadcastRecipient.sent_at < threshold
-            ).all()
-
-            if not recipients:
-                continue
-
-            logger.info(
-                f"Found {len(recipients)} recipients for retry attempt "
-                f"{retry_attempt + 1} (interval: {interval_minutes}min)"
-            )
-
-            whatsapp_service = WhatsAppService()
-
-            for recipient in recipients:
-                try:
-                    # Get customer and broadcast
-                    customer = db.query(Customer).filter(
-                        Customer.id == recipient.customer_id
-                    ).first()
-                    broadcast = db.query(BroadcastMessage).filter(
-                        BroadcastMessage.id == recipient.broadcast_message_id
-                    ).first()
-
-                    if not customer or not broadcast:
-                        logger.warning(
-                            f"Customer or broadcast not found for "
-                            f"recipient {recipient.id}"
-                        )
-                        continue
-
-                    # Get language-specific template SID for retry
-                    customer_lang = customer.language_code
-                    retry_template_sid = whatsapp_service.get_template_sid(
-                        template_type="broadcast",
-                        customer_language=customer_lang
-                    )
-
-                    # Retry sending template (skip in test mode)
-                    if os.getenv("TESTING"):
-                        # In test mode, simulate success without sending
-                        result = {"sid": f"TEST_RETRY_SID_{recipient.id}"}
-                        logger.info(
-                            "TEST MODE: Skipped retry"
-                            f"for recipient {recipient.id}"
-                        )
-                    else:
-                        result = whatsapp_service.send_template_message(
-                            to=customer.phone_number,
-                            content_sid=retry_template_sid,
-                            content_variables={},
-                        )
-                        logger.info(
-                            f"Retry successful for recipient {recipient.id} "
-                            f"(attempt {retry_attempt + 1})"
-                        )
-
-                    # Update status
-                    recipient.status = DeliveryStatus.SENT
-                    recipient.confirm_message_sid = result.get("sid")
-                    recipient.sent_at = datetime.utcnow()
-                    recipient.error_message = None
-                    success_count += 1
-                    retried_count += 1
-
-                except Exception as e:
-                    logger.error(
-                        f"Retry failed for recipient {recipient.id}: {e}"
-                    )
-                    recipient.retry_count += 1
-                    recipient.error_message = str(e)
-
-                    # Max retries reached?
-                    if recipient.retry_count >= len(retry_intervals):
-                        recipient.status = DeliveryStatus.UNDELIVERED
-                        logger.warning(
-                            f"Max retries reached for recipient {recipient.id}"
-                        )
-
-                    failed_count += 1
-                    retried_count += 1
-
-            db.commit()
+        bulk_sender = BulkSendService(
+            WhatsAppService(),
+            dry_run=bool(os.getenv("TESTING")),
+            dry_run_sid_prefix="TEST_RETRY_SID",
+        )
+        stats = BroadcastRetryService(
+            db,
+            recipient_model=BroadcastRecipient,
+            broadcast_model=BroadcastMessage,
+            broadcast_fk=BroadcastRecipient.broadcast_message_id,
+            bulk_sender=bulk_sender,
+        ).sweep()
 
         logger.info(
-            f"Broadcast retry task completed: {retried_count} retried, "
-            f"{success_count} succeeded, {failed_count} failed"
+            f"Broadcast retry task completed: {stats['retried']} retried, "
+            f"{stats['succeeded']} succeeded, {stats['failed']} failed "
+            f"in {stats['duration_ms']}ms"
         )
 
-        return {
-            "retried": retried_count,
-            "succeeded": success_count,
-            "failed": failed_count
-        }
+        return stats
 
     except Exception as e:
         logger.error(f"Error in broadcast retry task: {e}")
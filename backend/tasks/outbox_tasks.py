@@ -0,0 +1,31 @@
+"""
+Celery task draining the WhatsApp outbox.
+
+Every commit that queued a message starts a drain (see
+services/outbox_service.py); Celery beat also runs one every few
+seconds for messages whose kick was lost or that wait for a retry.
+Overlapping drains are safe: claims use FOR UPDATE SKIP LOCKED.
+"""
+import asyncio
+import logging
+from typing import Dict
+
+from celery_app import celery_app
+from config import settings
+from services.outbox_service import OutboxDispatcher
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="tasks.outbox_tasks.drain_outbox")
+def drain_outbox() -> Dict[str, int]:
+    """
+    Send all due outbox messages.
+
+    Returns:
+        Counts of sent, retried and failed messages
+    """
+    if not settings.whatsapp_outbox_enabled:
+        logger.debug("WhatsApp outbox is disabled, skipping drain")
+        return {"sent": 0, "retried": 0, "failed": 0}
+    return asyncio.run(OutboxDispatcher().drain())
@@ -0,0 +1,67 @@
+"""
+Celery tasks for automatic retry of failed WhatsApp messages.
+
+Replaces the in-process APScheduler job, which would have fired once per
+uvicorn worker. Celery beat schedules a single sweep; each sweep claims
+due messages with FOR UPDATE SKIP LOCKED, so overlapping sweeps or several
+workers never retry the same message twice.
+"""
+import logging
+from typing import Any, Dict
+
+from celery_app import celery_app
+from config import settings
+from database import SessionLocal
+from services.retry_service import RetryService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="tasks.retry_tasks.retry_failed_messages")
+def retry_failed_messages() -> Dict[str, Any]:
+    """
+    Periodic task to retry failed WhatsApp messages.
+
+    Runs every minute (configured in celery_app.py beat_schedule) and
+    drains due messages from the retry queue in claimed batches.
+
+    Returns:
+        Dict with retry statistics
+    """
+    if not settings.retry_enabled:
+        logger.debug("Message retry is disabled in config, skipping")
+        return {"total_attempted": 0, "successful": 0, "failed": 0}
+
+    db = SessionLocal()
+    try:
+        retry_service = RetryService(db)
+        totals = {
+            "total_attempted": 0,
+            "successful": 0,
+            "failed": 0,
+            "permanent_errors": 0,
+        }
+
+        while True:
+            stats = retry_service.retry_all_pending(
+                limit=settings.retry_batch_size
+            )
+            for key in totals:
+                totals[key] += stats[key]
+            # A short batch means the queue is drained
+            if stats["total_attempted"] < settings.retry_batch_size:
+                break
+
+        logger.info(
+            "Retry task completed: "
+            f"{totals['total_attempted']} messages retried, "
+            f"{totals['successful']} succeeded, {totals['failed']} failed"
+        )
+        return totals
+
+    except Exception as e:
+        logger.error(f"Error in retry task: {e}")
+        return {"error": str(e)}
+
+    finally:
+        db.close()
@@ -0,0 +1,73 @@
+"""
+Celery tasks for background ticket auto-tagging.
+
+Resolving a ticket schedules tag_resolved_tickets with a short delay so
+tickets resolved close together share one OpenAI call. Celery beat also
+runs the task every few minutes to pick up tickets whose scheduling or
+classification failed. Each run claims tickets with FOR UPDATE SKIP
+LOCKED, so overlapping runs never tag the same ticket twice.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+
+from celery_app import celery_app
+from config import settings
+from database import SessionLocal
+from services.ticket_tagging_service import TicketTaggingService
+
+logger = logging.getLogger(__name__)
+
+# Upper bound per run, keeps a run well inside the task time limit
+MAX_TICKETS_PER_RUN = 200
+
+
+@celery_app.task(name="tasks.tagging_tasks.tag_resolved_tickets")
+def tag_resolved_tickets() -> Dict[str, Any]:
+    """
+    Tag recently resolved tickets that have no tag yet.
+
+    Only tickets resolved within ticket_tagging_sweep_hours are
+    considered; older ones are handled by scripts/backfill_ticket_tags.py.
+
+    Returns:
+        Dict with tagging statistics
+    """
+    resolved_since = datetime.now(timezone.utc) - timedelta(
+        hours=settings.ticket_tagging_sweep_hours
+    )
+    db = SessionLocal()
+    try:
+        stats = TicketTaggingService(db).tag_pending(
+            batch_size=settings.ticket_tagging_batch_size,
+            resolved_since=resolved_since,
+            max_tickets=MAX_TICKETS_PER_RUN,
+        )
+        if stats["attempted"]:
+            logger.info(
+                "Ticket tagging completed: "
+                f"{stats['tagged']} of {stats['attempted']} tickets tagged"
+            )
+        return stats
+
+    except Exception as e:
+        logger.error(f"Error in ticket tagging task: {e}")
+        return {"error": str(e)}
+
+    finally:
+        db.close()
+
+
+def schedule_ticket_tagging() -> None:
+    """
+    Queue a tagging run after a ticket is resolved.
+
+    Never raises: if the broker is unavailable the periodic sweep tags
+    the ticket later.
+    """
+    try:
+        tag_resolved_tickets.apply_async(
+            countdown=settings.ticket_tagging_delay_seconds
+        )
+    except Exception as e:
+        logger.error(f"✗ Failed to queue ticket tagging: {e}")
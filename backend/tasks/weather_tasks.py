@@ -6,11 +6,12 @@ Tasks handle:
 - Sending template messages to subscribed customers
 - Sending actual weather messages after confirmation
 - Retrying failed deliveries
+- Recording the fetched weather as daily observations (for backtests)
 """
 import asyncio
 import logging
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, Any
 
 from celery_app import celery_app
@@ -27,8 +28,11 @@ from models.message import (
 )
 from models.customer import Customer
 from models.administrative import Administrative, CustomerAdministrative
+from services.broadcast_retry_service import BroadcastRetryService
+from services.bulk_send_service import BulkSendService
 from services.whatsapp_service import WhatsAppService
 from services.weather_broadcast_service import get_weather_broadcast_service
+from services.weather_observation_service import WeatherObservationService
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -244,6 +248,9 @@ def send_weather_templates(weather_broadcast_id: int) -> Dict[str, Any]:
             return {"error": "Failed to get weather data"}
 
         broadcast.weather_data = weather_data
+        WeatherObservationService(db).record(
+            broadcast.administrative_id, weather_data
+        )
 
         # Generate messages in both languages with ALL varieties included
         loop = asyncio.new_event_loop()
@@ -468,6 +475,11 @@ def send_weather_message(
             logger.error(f"Failed to get fresh weather data for {location}")
             return {"error": "Failed to get weather data"}
 
+        WeatherObservationService(db).record(
+            broadcast.administrative_id, weather_data
+        )
+        db.commit()
+
         # Generate fresh message in customer's language
         customer_lang = customer.language_code
 
@@ -547,7 +559,8 @@ def retry_failed_weather_broadcasts() -> Dict[str, Any]:
     Periodic task to retry failed weather broadcast deliveries.
 
     Runs every 5 minutes.
-    Retries recipients with FAILED status based on retry_intervals config.
+    Claims due FAILED recipients (backoff from retry_intervals config) in
+    one joined query and dispatches them through the bulk send engine.
 
     Respects the weather.broadcast_enabled flag - when disabled,
     retries are also paused to reduce Twilio API usage.
@@ -564,112 +577,26 @@ def retry_failed_weather_broadcasts() -> Dict[str, Any]:
     try:
         logger.info("Starting weather broadcast retry task")
 
-        retry_intervals = settings.broadcast_retry_intervals
-        now = datetime.utcnow()
-        retried_count = 0
-        success_count = 0
-        failed_count = 0
-
-        for retry_attempt, interval_minutes in enumerate(retry_intervals):
-            # Calculate time threshold for this retry attempt
-            threshold = now - timedelta(minutes=interval_minutes)
-
-            # Find recipients at this retry attempt
-            recipients = db.query(WeatherBroadcastRecipient).filter(
-                WeatherBroadcastRecipient.status == DeliveryStatus.FAILED,
-                WeatherBroadcastRecipient.retry_count == retry_attempt,
-                WeatherBroadcastRecipient.sent_at < threshold
-            ).all()
-
-            if not recipients:
-                continue
-
-            logger.info(
-                f"Found {len(recipients)} weather recipients for "
-                f"retry attempt {retry_attempt + 1} "
-                f"(interval: {interval_minutes}min)"
-            )
-
-            whatsapp_service = WhatsAppService()
-
-            for recipient in recipients:
-                try:
-                    # Get customer
-                    customer = db.query(Customer).filter(
-                        Customer.id == recipient.customer_id
-                    ).first()
-
-                    if not customer:
-                        logger.warning(
-                            f"Customer not found for recipient {recipient.id}"
-                        )
-                        continue
-
-                    # Get language-specific template SID
-                    customer_lang = customer.language_code
-                    template_sid = whatsapp_service.get_template_sid(
-                        template_type="broadcast",
-                        customer_language=customer_lang
-                    )
-
-                    # Retry sending template (skip in test mode)
-                    if os.getenv("TESTING"):
-                        result = {"sid": f"TEST_WEATHER_RETRY_{recipient.id}"}
-                        logger.info(
-                            f"TEST MODE: Skipped retry for recipient "
-                            f"{recipient.id}"
-                        )
-                    else:
-                        result = whatsapp_service.send_template_message(
-                            to=customer.phone_number,
-                            content_sid=template_sid,
-                            content_variables={},
-                        )
-                        logger.info(
-                            f"Retry successful for weather recipient "
-                            f"{recipient.id} (attempt {retry_attempt + 1})"
-                        )
-
-                    # Update status
-                    recipient.status = DeliveryStatus.SENT
-                    recipient.confirm_message_sid = result.get("sid")
-                    recipient.sent_at = datetime.utcnow()
-                    recipient.error_message = None
-                    success_count += 1
-                    retried_count += 1
-
-                except Exception as e:
-                    logger.error(
-                        f"Retry failed for weather recipient "
-                        f"{recipient.id}: {e}"
-                    )
-                    recipient.retry_count += 1
-                    recipient.error_message = str(e)
-
-                    # Max retries reached?
-                    if recipient.retry_count >= len(retry_intervals):
-                        recipient.status = DeliveryStatus.UNDELIVERED
-                        logger.warning(
-                            f"Max retries reached for weather recipient "
-                            f"{recipient.id}"
-                        )
-
-                    failed_count += 1
-                    retried_count += 1
-
-            db.commit()
+        bulk_sender = BulkSendService(
+            WhatsAppService(),
+            dry_run=bool(os.getenv("TESTING")),
+            dry_run_sid_prefix="TEST_WEATHER_RETRY",
+        )
+        stats = BroadcastRetryService(
+            db,
+            recipient_model=WeatherBroadcastRecipient,
+            broadcast_model=WeatherBroadcast,
+            broadcast_fk=WeatherBroadcastRecipient.weather_broadcast_id,
+            bulk_sender=bulk_sender,
+        ).sweep()
 
         logger.info(
             f"Weather broadcast retry task completed: "
-            f"{retried_count} retried, {success_count} succeeded, "
-            f"{failed_count} failed"
+            f"{stats['retried']} retried, {stats['succeeded']} succeeded, "
+            f"{stats['failed']} failed in {stats['duration_ms']}ms"
         )
 
-        return {
-            "retried": retried_count,
-            "succeeded": success_count,
-            "failed": failed_count
-        }
+        return stats
 
     except Exception as e:
         logger.error(f"Error in weather broadcast retry task: {e}")
@@ -57,11 +57,12 @@ from fastapi.testclient import TestClient  # noqa: E402
 from sqlalchemy import create_engine  # noqa: E402
 from sqlalchemy.orm import sessionmaker  # noqa: E402
 
-from database import Base, get_db  # noqa: E402
+from database import Base, get_db, get_read_db  # noqa: E402
 from main import app  # noqa: E402
 from models.customer import AgeGroup, OnboardingStatus  # noqa: E402
 from models.message import DeliveryStatus  # noqa: E402
 from services.external_ai_service import ExternalAIService  # noqa: E402
+from services.principal_service import PrincipalService  # noqa: E402
 
 # Test database URL
 TEST_DATABASE_URL = "postgresql://akvo:password@db:5432/agriconnect_test"
@@ -80,6 +81,10 @@ def test_db():
     delivery_status_enum = sa.Enum(DeliveryStatus, name="deliverystatus")
     onboarding_status_enum = sa.Enum(OnboardingStatus, name="onboardingstatus")
 
+    # Trigram search indexes (utils/search.py)
+    with engine.begin() as connection:
+        connection.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
     age_group_enum.create(engine, checkfirst=True)
     delivery_status_enum.create(engine, checkfirst=True)
     onboarding_status_enum.create(engine, checkfirst=True)
@@ -132,6 +137,16 @@ def db_session(test_db):
             BroadcastGroup,
         )
 
+        # Import answer cache models
+        from models.answer_cache import (
+            AnswerCacheDailyStats,
+            AnswerCacheEntry,
+        )
+        from models.response_trace import ResponseTrace
+        from models.conversation_state import ConversationState
+        from models.whatsapp_outbox import OutboxMessage
+        from models.message_archive import MessageArchive
+
         # Import Weather Broadcast models
         from models.weather_broadcast import (
             WeatherBroadcast,
@@ -141,12 +156,18 @@ def db_session(test_db):
         # Delete in correct order to respect foreign key constraints
         db.query(UserAdministrative).delete(synchronize_session=False)
         db.query(CustomerAdministrative).delete(synchronize_session=False)
+        db.query(ConversationState).delete(synchronize_session=False)
         db.query(Ticket).delete(synchronize_session=False)
         # Weather broadcast recipients must be deleted BEFORE messages
         db.query(WeatherBroadcastRecipient).delete(synchronize_session=False)
         # Broadcast recipients must be deleted BEFORE messages (FK: message_id)
         db.query(BroadcastRecipient).delete(synchronize_session=False)
+        db.query(AnswerCacheEntry).delete(synchronize_session=False)
+        db.query(AnswerCacheDailyStats).delete(synchronize_session=False)
+        db.query(ResponseTrace).delete(synchronize_session=False)
+        db.query(OutboxMessage).delete(synchronize_session=False)
         db.query(Message).delete(synchronize_session=False)
+        db.query(MessageArchive).delete(synchronize_session=False)
         db.query(PlaygroundMessage).delete(synchronize_session=False)
         # Weather broadcasts must be deleted before Administrative
         db.query(WeatherBroadcast).delete(synchronize_session=False)
@@ -181,6 +202,7 @@ def client(db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -336,6 +358,11 @@ def mock_websocket_emitters(monkeypatch):
         MockPushNotificationService,
     )
 
+    # Background ticket tagging needs a Celery broker
+    monkeypatch.setattr(
+        "routers.tickets.schedule_ticket_tagging", lambda: None
+    )
+
     # CRITICAL: Patch WhatsAppService in ALL routers to prevent real API calls
     # This is defense-in-depth: even if TESTING env var isn't set,
     # these mocks ensure no real messages are sent during tests
@@ -363,6 +390,14 @@ def reset_external_ai_cache():
     ExternalAIService.invalidate_cache()
 
 
+@pytest.fixture(autouse=True)
+def reset_principal_cache():
+    """Reset cached authenticated principals between tests."""
+    PrincipalService.invalidate_cache()
+    yield
+    PrincipalService.invalidate_cache()
+
+
 @pytest.fixture
 def customer(db_session):
     """Fixture to create a customer for testing."""
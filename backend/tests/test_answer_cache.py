@@ -0,0 +1,350 @@
+"""Tests for the semantic answer cache."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from models.answer_cache import AnswerCacheDailyStats
+from models.customer import Customer, OnboardingStatus
+from models.knowledge_base import KnowledgeBase
+from models.message import DeliveryStatus, Message, MessageFrom
+from services.answer_cache_service import (
+    SOURCE_AI,
+    SOURCE_EO,
+    AnswerCacheService,
+    VectorIndex,
+    replay,
+    unit_vector,
+)
+
+THRIPS = "When should I spray avocado for thrips?"
+THRIPS_AGAIN = "when to spray avocado against thrips"
+MAIZE = "Which fertilizer is best for maize at planting?"
+
+# Fake embeddings: the two thrips questions are near-duplicates
+EMBEDDINGS = {
+    THRIPS.lower(): [1.0, 0.0, 0.0],
+    THRIPS_AGAIN.lower(): [0.98, 0.2, 0.0],
+    MAIZE.lower(): [0.0, 0.0, 1.0],
+}
+
+
+@pytest.fixture(autouse=True)
+def fake_openai():
+    AnswerCacheService.invalidate_cache()
+    service = MagicMock()
+    service.is_configured.return_value = True
+
+    async def create_embedding(text):
+        response = MagicMock()
+        response.embedding = EMBEDDINGS[text]
+        return response
+
+    service.create_embedding = AsyncMock(side_effect=create_embedding)
+    with patch(
+        "services.answer_cache_service.get_openai_service",
+        return_value=service,
+    ):
+        yield service
+    AnswerCacheService.invalidate_cache()
+
+
+@pytest.fixture
+def make_customer(db_session):
+    counter = {"n": 0}
+
+    def _make_customer(crop_type="Avocado", language="en"):
+        counter["n"] += 1
+        customer = Customer(
+            phone_number=f"+2557100004{counter['n']:02d}",
+            full_name=f"Farmer {counter['n']}",
+            language=language,
+            onboarding_status=OnboardingStatus.COMPLETED,
+            profile_data={"crop_type": crop_type},
+        )
+        db_session.add(customer)
+        db_session.commit()
+        return customer
+
+    return _make_customer
+
+
+def _question(db_session, customer, body, created_at=None, sid=None):
+    message = Message(
+        message_sid=sid or f"AC_Q_{customer.id}_{len(body)}",
+        customer_id=customer.id,
+        body=body,
+        from_source=MessageFrom.CUSTOMER,
+        created_at=created_at,
+    )
+    db_session.add(message)
+    db_session.commit()
+    return message
+
+
+class TestVectorIndex:
+    def test_search_returns_most_similar(self):
+        index = VectorIndex()
+        assert index.search(unit_vector([1, 0])) is None
+        index.add(10, unit_vector([1, 0]))
+        index.add(11, unit_vector([0, 1]))
+
+        item_id, similarity = index.search(unit_vector([0.1, 1]))
+
+        assert item_id == 11
+        assert similarity == pytest.approx(0.995, abs=1e-3)
+
+    def test_other_dimension_is_ignored(self):
+        index = VectorIndex()
+        index.add(1, unit_vector([1, 0]))
+        assert index.search(unit_vector([1, 0, 0])) is None
+
+
+class TestLookup:
+    @pytest.mark.asyncio
+    async def test_near_duplicate_hits_within_partition(
+        self, db_session, make_customer
+    ):
+        service = AnswerCacheService(db_session)
+        asker = make_customer()
+        entry = await service.store_answer(
+            asker, THRIPS, "Spray at flowering.", SOURCE_EO
+        )
+        assert entry.crop_type == "Avocado"
+        assert np.frombuffer(entry.embedding, np.float16).shape == (3,)
+
+        hit = await service.lookup(make_customer(), THRIPS_AGAIN)
+        assert hit.entry.id == entry.id
+        assert hit.similarity > 0.97
+
+        # Different question, crop or language: no hit
+        assert await service.lookup(make_customer(), MAIZE) is None
+        assert await service.lookup(
+            make_customer(crop_type="Maize"), THRIPS
+        ) is None
+        assert await service.lookup(
+            make_customer(language="sw"), THRIPS
+        ) is None
+
+    @pytest.mark.asyncio
+    async def test_knowledge_base_change_starts_a_new_partition(
+        self, db_session, make_customer
+    ):
+        service = AnswerCacheService(db_session)
+        customer = make_customer()
+        await service.store_answer(customer, THRIPS, "Old", SOURCE_AI)
+
+        db_session.add(KnowledgeBase(external_id="kb-2025", is_active=True))
+        db_session.commit()
+
+        assert await service.lookup(customer, THRIPS) is None
+
+    @pytest.mark.asyncio
+    async def test_short_messages_are_skipped(
+        self, db_session, make_customer, fake_openai
+    ):
+        service = AnswerCacheService(db_session)
+        customer = make_customer()
+        assert await service.store_answer(
+            customer, "ok thanks", "You're welcome", SOURCE_AI
+        ) is None
+        assert await service.lookup(customer, "ok thanks") is None
+        fake_openai.create_embedding.assert_not_called()
+
+
+class TestAnswerFromCache:
+    @pytest.mark.asyncio
+    async def test_hit_sends_cached_answer(self, db_session, make_customer):
+        service = AnswerCacheService(db_session)
+        entry = await service.store_answer(
+            make_customer(),
+            THRIPS,
+            "Spray at flowering.",
+            SOURCE_AI,
+            answer_latency_ms=8000,
+        )
+        customer = make_customer()
+        question = _question(db_session, customer, THRIPS_AGAIN)
+
+        with patch(
+            "services.answer_cache_service.WhatsAppService"
+        ) as whatsapp:
+            whatsapp.return_value.send_message_with_tracking.return_value = {
+                "sid": "SM_CACHED"
+            }
+            whatsapp.sanitize_whatsapp_content.side_effect = lambda x: x
+            reply = await service.answer_from_cache(customer, question)
+
+        assert reply.body == "Spray at flowering."
+        assert reply.from_source == MessageFrom.LLM
+        assert reply.message_sid == "SM_CACHED"
+        assert reply.delivery_status == DeliveryStatus.SENT
+        db_session.refresh(entry)
+        assert entry.hit_count == 1
+
+        stats = service.get_stats(days=1)
+        assert stats["lookups"] == 1
+        assert stats["hits"] == 1
+        assert stats["hit_rate"] == 1.0
+        assert stats["time_saved_seconds"] == 8.0
+
+    @pytest.mark.asyncio
+    async def test_miss_is_counted(self, db_session, make_customer):
+        customer = make_customer()
+        question = _question(db_session, customer, MAIZE)
+
+        reply = await AnswerCacheService(db_session).answer_from_cache(
+            customer, question
+        )
+
+        assert reply is None
+        stats = db_session.query(AnswerCacheDailyStats).one()
+        assert (stats.lookups, stats.hits) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_store_ai_reply_records_latency(
+        self, db_session, make_customer
+    ):
+        customer = make_customer()
+        now = datetime.now(timezone.utc)
+        question = _question(
+            db_session, customer, THRIPS, created_at=now - timedelta(seconds=9)
+        )
+        reply = Message(
+            message_sid="AC_REPLY",
+            customer_id=customer.id,
+            body="Spray at flowering. [citation:1]",
+            from_source=MessageFrom.LLM,
+            created_at=now,
+        )
+        db_session.add(reply)
+        db_session.commit()
+
+        entry = await AnswerCacheService(db_session).store_ai_reply(
+            question, reply, "Spray at flowering.", has_citations=True
+        )
+
+        assert entry.source == SOURCE_AI
+        assert entry.answer == "Spray at flowering."
+        assert entry.has_citations is True
+        assert entry.answer_latency_ms == 9000
+        assert entry.source_message_id == reply.id
+
+
+class TestReplay:
+    def test_answered_questions_pairs_replies(
+        self, db_session, make_customer
+    ):
+        customer = make_customer()
+        start = datetime.now(timezone.utc) - timedelta(hours=1)
+        rows = [
+            (MessageFrom.CUSTOMER, THRIPS, 0),
+            (MessageFrom.LLM, "Spray at flowering.", 5),
+            (MessageFrom.CUSTOMER, "ok thanks", 60),
+            (MessageFrom.LLM, "You're welcome", 65),
+            (MessageFrom.CUSTOMER, MAIZE, 120),
+            (MessageFrom.USER, "Use DAP at planting.", 600),
+        ]
+        for n, (from_source, body, seconds) in enumerate(rows):
+            db_session.add(
+                Message(
+                    message_sid=f"AC_R_{n}",
+                    customer_id=customer.id,
+                    body=body,
+                    from_source=from_source,
+                    created_at=start + timedelta(seconds=seconds),
+                )
+            )
+        db_session.commit()
+
+        service = AnswerCacheService(db_session)
+        pairs = service.answered_questions()
+        assert [(p.question, p.source, p.latency_ms) for p in pairs] == [
+            (THRIPS, SOURCE_AI, 5000),
+            (MAIZE, SOURCE_EO, 480000),
+        ]
+        assert [
+            p.answer for p in service.answered_questions(sources=[SOURCE_EO])
+        ] == ["Use DAP at planting."]
+
+    def test_replay_counts_hits_per_threshold(self):
+        def item(question, latency_ms):
+            pair = MagicMock()
+            pair.question = question
+            pair.latency_ms = latency_ms
+            return pair
+
+        partition = ("en", "Avocado")
+        questions = [
+            (partition, item(THRIPS, 1000)),
+            (partition, item(THRIPS_AGAIN, 2000)),
+            (("en", "Maize"), item(THRIPS, 3000)),
+        ]
+        vectors = [
+            unit_vector(EMBEDDINGS[q.question.lower()])
+            for _, q in questions
+        ]
+
+        results = replay(questions, vectors, [0.9, 0.99])
+
+        assert results[0.9]["hits"] == 1
+        assert results[0.9]["hit_rate"] == pytest.approx(0.3333)
+        assert results[0.9]["time_saved_seconds"] == 2.0
+        assert results[0.9]["matches"][0][1] == THRIPS
+        assert results[0.99]["hits"] == 0
+
+
+class TestWebhookUsesCache:
+    def test_cache_hit_skips_ai_job(
+        self, client, db_session, make_customer, monkeypatch
+    ):
+        customer = make_customer()
+        monkeypatch.setattr(
+            "routers.whatsapp.settings.answer_cache_enabled", True
+        )
+        answer_from_cache = AsyncMock(return_value=MagicMock())
+
+        with patch(
+            "routers.whatsapp.AnswerCacheService.answer_from_cache",
+            answer_from_cache,
+        ), patch(
+            "routers.whatsapp.get_external_ai_service"
+        ) as get_ai_service, patch(
+            "routers.whatsapp.get_onboarding_service"
+        ) as onboarding:
+            onboarding.return_value.needs_onboarding.return_value = False
+            response = client.post(
+                "/api/whatsapp/webhook",
+                data={
+                    "From": f"whatsapp:{customer.phone_number}",
+                    "Body": THRIPS_AGAIN,
+                    "MessageSid": "SM_CACHE_HIT",
+                },
+            )
+
+        assert response.status_code == 200
+        answer_from_cache.assert_awaited_once()
+        assert (
+            answer_from_cache.call_args.kwargs["message"].body
+            == THRIPS_AGAIN
+        )
+        get_ai_service.assert_not_called()
+
+    def test_admin_stats_endpoint(self, client, auth_headers_factory):
+        headers, _ = auth_headers_factory(user_type="admin")
+        response = client.get(
+            "/api/admin/analytics/answer-cache?days=7", headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json()["lookups"] == 0
+        assert response.json()["entries"] == 0
+
+        eo_headers, _ = auth_headers_factory(
+            user_type="eo", email="cache-eo@test.com"
+        )
+        response = client.get(
+            "/api/admin/analytics/answer-cache", headers=eo_headers
+        )
+        assert response.status_code == 403
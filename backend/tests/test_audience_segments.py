@@ -0,0 +1,312 @@
+"""Tests for filter-defined audience segments on broadcast groups."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from models.administrative import Administrative, CustomerAdministrative
+from models.customer import Customer
+from seeder.administrative import seed_administrative_data
+from services.broadcast_service import BroadcastService
+from services.customer_service import CustomerService
+
+
+@pytest.fixture(autouse=True)
+def mock_celery_task():
+    """Mock the Celery task to prevent Redis connections during tests."""
+    with patch("services.broadcast_service.process_broadcast") as mock:
+        mock.delay.return_value.id = "mock-task-id"
+        yield mock
+
+
+@pytest.fixture
+def areas(db_session):
+    seed_administrative_data(
+        db_session,
+        [
+            {"code": "TZ", "name": "Tanzania", "level": "Country",
+             "parent_code": ""},
+            {"code": "MWZ", "name": "Mwanza", "level": "Region",
+             "parent_code": "TZ"},
+            {"code": "MWZ-KWM", "name": "Kwimba", "level": "District",
+             "parent_code": "MWZ"},
+            {"code": "MWZ-KWM-NGU", "name": "Ngudu", "level": "Ward",
+             "parent_code": "MWZ-KWM"},
+            {"code": "MWZ-KWM-BUK", "name": "Bukandwe", "level": "Ward",
+             "parent_code": "MWZ-KWM"},
+            {"code": "MWZ-MSW", "name": "Misungwi", "level": "District",
+             "parent_code": "MWZ"},
+            {"code": "MWZ-MSW-MBA", "name": "Mbarika", "level": "Ward",
+             "parent_code": "MWZ-MSW"},
+        ],
+    )
+    return {
+        area.code: area
+        for area in db_session.query(Administrative).all()
+    }
+
+
+@pytest.fixture
+def farmers(db_session, areas):
+    """Customers spread over three wards with varied profiles."""
+    now = datetime.now(timezone.utc)
+    year = now.year
+    rows = [
+        # name, ward, language, profile, days since last message
+        ("ngu-maize-f", "MWZ-KWM-NGU", "sw",
+         {"crop_type": "Maize", "gender": "female",
+          "birth_year": year - 30, "weather_subscribed": True}, 2),
+        ("ngu-maize-m", "MWZ-KWM-NGU", None,
+         {"crop_type": "Maize", "gender": "male",
+          "birth_year": year - 60}, 40),
+        ("buk-rice-f", "MWZ-KWM-BUK", "en",
+         {"crop_type": "Rice", "gender": "female",
+          "birth_year": year - 45, "weather_subscribed": False}, None),
+        ("mba-maize-f", "MWZ-MSW-MBA", "sw",
+         {"crop_type": "Maize", "gender": "female",
+          "birth_year": year - 25, "weather_subscribed": True}, 1),
+    ]
+    customers = {}
+    for n, (name, ward, language, profile, days) in enumerate(rows):
+        customer = Customer(
+            phone_number=f"+2557000003{n:02d}",
+            full_name=name,
+            language=language,
+            profile_data=profile,
+            last_message_at=(
+                now - timedelta(days=days) if days is not None else None
+            ),
+        )
+        db_session.add(customer)
+        db_session.flush()
+        db_session.add(
+            CustomerAdministrative(
+                customer_id=customer.id,
+                administrative_id=areas[ward].id,
+            )
+        )
+        customers[name] = customer
+    db_session.commit()
+    return customers
+
+
+def _matching(db_session, segment, scope_administrative_id=None):
+    condition = CustomerService(db_session).segment_condition(
+        segment, scope_administrative_id
+    )
+    return {
+        c.full_name for c in db_session.query(Customer).filter(condition)
+    }
+
+
+class TestSegmentCondition:
+    def test_empty_segment_matches_everyone(self, db_session, farmers):
+        assert _matching(db_session, {}) == set(farmers)
+
+    def test_administrative_subtree(self, db_session, areas, farmers):
+        district = {"administrative_ids": [areas["MWZ-KWM"].id]}
+        assert _matching(db_session, district) == {
+            "ngu-maize-f", "ngu-maize-m", "buk-rice-f",
+        }
+        assert _matching(
+            db_session,
+            {"administrative_ids": [areas["MWZ"].id]},
+        ) == set(farmers)
+        # The owner's ward narrows any segment
+        assert _matching(
+            db_session, district, areas["MWZ-KWM-BUK"].id
+        ) == {"buk-rice-f"}
+
+    def test_profile_criteria_are_combined(self, db_session, farmers):
+        segment = {
+            "crop_types": ["Maize"],
+            "genders": ["female"],
+            "age_groups": ["20-35"],
+        }
+        assert _matching(db_session, segment) == {
+            "ngu-maize-f", "mba-maize-f",
+        }
+        assert _matching(
+            db_session, {"crop_types": ["Rice", "Maize"]}
+        ) == set(farmers)
+        assert _matching(
+            db_session, {"age_groups": ["36-50", "51+"]}
+        ) == {"ngu-maize-m", "buk-rice-f"}
+
+    def test_language_includes_default(self, db_session, farmers):
+        # Customers without a language get the default (en)
+        assert _matching(db_session, {"languages": ["en"]}) == {
+            "ngu-maize-m", "buk-rice-f",
+        }
+        assert _matching(db_session, {"languages": ["sw"]}) == {
+            "ngu-maize-f", "mba-maize-f",
+        }
+
+    def test_weather_subscription(self, db_session, farmers):
+        assert _matching(db_session, {"weather_subscribed": True}) == {
+            "ngu-maize-f", "mba-maize-f",
+        }
+        assert _matching(db_session, {"weather_subscribed": False}) == {
+            "ngu-maize-m", "buk-rice-f",
+        }
+
+    def test_active_within_days(self, db_session, farmers):
+        assert _matching(db_session, {"active_within_days": 7}) == {
+            "ngu-maize-f", "mba-maize-f",
+        }
+
+    def test_count_segment(self, db_session, areas, farmers):
+        service = CustomerService(db_session)
+        assert service.count_segment({"crop_types": ["Maize"]}) == 3
+        assert service.count_segment(
+            {"crop_types": ["Maize"]}, areas["MWZ-KWM"].id
+        ) == 2
+
+
+class TestSegmentGroups:
+    def test_broadcast_resolves_segment_at_send_time(
+        self, db_session, auth_headers_factory, areas, farmers
+    ):
+        _, admin = auth_headers_factory(user_type="admin")
+        service = BroadcastService(db_session)
+        group = service.create_group(
+            name="Maize growers",
+            customer_ids=[farmers["buk-rice-f"].id],
+            created_by=admin.id,
+            segment={"crop_types": ["Maize"], "genders": ["female"]},
+        )
+
+        summary = service.get_group_summaries([group.id])[group.id]
+        assert summary["contact_count"] == 3
+        assert summary["crop_types"] == ["Maize", "Rice"]
+
+        # A profile change after the group was created is picked up
+        late = farmers["ngu-maize-m"]
+        late.update_profile_data({"gender": "female"})
+        db_session.commit()
+
+        broadcast = service.create_broadcast(
+            message="Fall armyworm alert",
+            group_ids=[group.id],
+            created_by=admin.id,
+            is_admin=True,
+        )
+
+        assert {r.customer_id for r in broadcast.broadcast_recipients} == {
+            farmers[name].id
+            for name in (
+                "ngu-maize-f", "ngu-maize-m", "mba-maize-f", "buk-rice-f"
+            )
+        }
+
+    def test_ward_group_segment_is_scoped(
+        self, db_session, auth_headers_factory, areas, farmers
+    ):
+        _, eo = auth_headers_factory(
+            user_type="eo",
+            administrative_ids=[areas["MWZ-KWM-NGU"].id],
+        )
+        service = BroadcastService(db_session)
+        group = service.create_group(
+            name="Ward maize",
+            customer_ids=[],
+            created_by=eo.id,
+            administrative_id=areas["MWZ-KWM-NGU"].id,
+            segment={"crop_types": ["Maize"]},
+        )
+
+        broadcast = service.create_broadcast(
+            message="Planting advice",
+            group_ids=[group.id],
+            created_by=eo.id,
+            administrative_id=areas["MWZ-KWM-NGU"].id,
+        )
+
+        assert {r.customer_id for r in broadcast.broadcast_recipients} == {
+            farmers["ngu-maize-f"].id, farmers["ngu-maize-m"].id,
+        }
+
+
+class TestSegmentEndpoints:
+    def test_preview_counts_matches(
+        self, client, auth_headers_factory, areas, farmers
+    ):
+        headers, _ = auth_headers_factory(user_type="admin")
+
+        response = client.post(
+            "/api/broadcast/groups/preview",
+            json={"crop_types": ["Maize"], "active_within_days": 7},
+            headers=headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"count": 2}
+
+    def test_eo_preview_is_scoped_to_ward(
+        self, client, auth_headers_factory, areas, farmers
+    ):
+        headers, _ = auth_headers_factory(
+            user_type="eo",
+            administrative_ids=[areas["MWZ-KWM-BUK"].id],
+        )
+
+        response = client.post(
+            "/api/broadcast/groups/preview", json={}, headers=headers
+        )
+
+        assert response.json() == {"count": 1}
+
+    def test_eo_without_ward_cannot_use_segments(
+        self, client, auth_headers_factory, farmers
+    ):
+        headers, _ = auth_headers_factory(user_type="eo")
+
+        response = client.post(
+            "/api/broadcast/groups",
+            json={"name": "Everyone", "segment": {}},
+            headers=headers,
+        )
+
+        assert response.status_code == 403
+
+    def test_create_and_clear_segment_group(
+        self, client, auth_headers_factory, areas, farmers
+    ):
+        headers, _ = auth_headers_factory(user_type="admin")
+
+        response = client.post(
+            "/api/broadcast/groups",
+            json={
+                "name": "Subscribed",
+                "segment": {"weather_subscribed": True},
+            },
+            headers=headers,
+        )
+        assert response.status_code == 201
+        data = response.json()
+        assert data["segment"]["weather_subscribed"] is True
+        assert data["segment"]["crop_types"] is None
+        assert data["contact_count"] == 2
+
+        response = client.patch(
+            f"/api/broadcast/groups/{data['id']}",
+            json={"clear_segment": True},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert response.json()["segment"] is None
+        assert response.json()["contact_count"] == 0
+
+    def test_group_needs_contacts_or_segment(
+        self, client, auth_headers_factory
+    ):
+        headers, _ = auth_headers_factory(user_type="admin")
+
+        response = client.post(
+            "/api/broadcast/groups",
+            json={"name": "Nobody", "customer_ids": []},
+            headers=headers,
+        )
+
+        assert response.status_code == 422
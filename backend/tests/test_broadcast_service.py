@@ -8,6 +8,7 @@ Tests cover:
 - Owner-only updates/deletes
 """
 import pytest
+from datetime import datetime
 from unittest.mock import patch
 from sqlalchemy.orm import Session
 
@@ -18,6 +19,7 @@ from models.customer import (
     Customer,
     CustomerLanguage,
 )
+from models.message import DeliveryStatus
 from models.user import User, UserType
 from models.administrative import (
     Administrative,
@@ -310,6 +312,110 @@ class TestBroadcastGroupManagement:
         ]
         assert set(contact_customer_ids) == {2, 3, 4}
 
+    def test_add_group_contacts_skips_existing_members(
+        self, db_session: Session, test_users, test_customers
+    ):
+        """Test ON CONFLICT DO NOTHING membership inserts."""
+        service = BroadcastService(db_session)
+        group = service.create_group(
+            name="Test Group",
+            customer_ids=[1, 2, 2],
+            created_by=test_users["eo1"].id,
+            administrative_id=test_users["eo1"].administrative_id,
+        )
+        assert len(group.group_contacts) == 2
+
+        added = service.add_group_contacts(group.id, [2, 3, 4])
+        db_session.commit()
+
+        assert added == 2
+        db_session.expire(group, ["group_contacts"])
+        assert {c.customer_id for c in group.group_contacts} == {1, 2, 3, 4}
+
+    def test_update_group_keeps_unchanged_contacts(
+        self, db_session: Session, test_users, test_customers
+    ):
+        """Test that members kept in an update are not re-created."""
+        service = BroadcastService(db_session)
+        group = service.create_group(
+            name="Test Group",
+            customer_ids=[1, 2],
+            created_by=test_users["eo1"].id,
+            administrative_id=test_users["eo1"].administrative_id,
+        )
+        kept_id = next(
+            c.id for c in group.group_contacts if c.customer_id == 2
+        )
+
+        updated_group = service.update_group(
+            group_id=group.id,
+            eo_id=test_users["eo1"].id,
+            customer_ids=[2, 3],
+            administrative_id=test_users["eo1"].administrative_id,
+        )
+
+        contacts = {
+            c.customer_id: c.id for c in updated_group.group_contacts
+        }
+        assert set(contacts) == {2, 3}
+        assert contacts[2] == kept_id
+
+    def test_get_group_summaries(
+        self, db_session: Session, test_users, test_customers
+    ):
+        """Test member count, crops and age histogram per group."""
+        current_year = datetime.now().year
+        profiles = {
+            1: {"crop_type": "rice", "birth_year": current_year - 25},
+            2: {"crop_type": "coffee", "birth_year": current_year - 30},
+            3: {"crop_type": "rice", "birth_year": current_year - 60},
+            4: {"birth_year": "unknown"},
+        }
+        for customer in test_customers:
+            customer.profile_data = profiles.get(customer.id)
+        db_session.commit()
+
+        service = BroadcastService(db_session)
+        group = service.create_group(
+            name="Mixed",
+            customer_ids=[1, 2, 3, 4, 5],
+            created_by=test_users["eo1"].id,
+            administrative_id=test_users["eo1"].administrative_id,
+        )
+        empty = service.create_group(
+            name="Empty",
+            customer_ids=[],
+            created_by=test_users["eo1"].id,
+            administrative_id=test_users["eo1"].administrative_id,
+        )
+
+        summaries = service.get_group_summaries([group.id, empty.id])
+
+        assert summaries[group.id] == {
+            "contact_count": 5,
+            "crop_types": ["coffee", "rice"],
+            "age_groups": ["20-35", "51+"],
+            "age_group_counts": {"20-35": 2, "51+": 1},
+        }
+        assert summaries[empty.id]["contact_count"] == 0
+        assert summaries[empty.id]["age_groups"] == []
+
+    def test_age_group_expression_matches_property(
+        self, db_session: Session, test_customers
+    ):
+        """SQL age groups must agree with Customer.age_group."""
+        current_year = datetime.now().year
+        for customer, age in zip(test_customers, (19, 20, 35, 36, 80)):
+            customer.profile_data = {"birth_year": current_year - age}
+        db_session.commit()
+
+        rows = db_session.query(
+            Customer.id, Customer.age_group_expression()
+        ).all()
+        by_id = {customer.id: customer for customer in test_customers}
+        for customer_id, age_group in rows:
+            assert age_group == by_id[customer_id].age_group
+
     def test_delete_group_owner_only(
         self, db_session: Session, test_users, test_customers
     ):
@@ -445,6 +551,10 @@ class TestBroadcastMessageCreation:
         assert len(broadcast.broadcast_recipients) == 4
         recipient_ids = {c.customer_id for c in broadcast.broadcast_recipients}
         assert recipient_ids == {1, 2, 3, 4}
+        for recipient in broadcast.broadcast_recipients:
+            assert recipient.status == DeliveryStatus.PENDING
+            assert recipient.retry_count == 0
+            assert recipient.created_at is not None
 
     def test_create_broadcast_validates_access(
         self, db_session: Session, test_users, test_customers
@@ -804,3 +804,97 @@ class TestBroadcastTasksCoveragePaths:
         result = retry_failed_broadcasts()
 
         assert "error" not in result
+
+
+class TestRetrySweepClaiming:
+    """Tests for claim-and-dispatch broadcast retry sweeps"""
+
+    def _fail_all(self, db_session, broadcast_id, minutes_ago=6):
+        recipients = db_session.query(BroadcastRecipient).filter(
+            BroadcastRecipient.broadcast_message_id == broadcast_id
+        ).all()
+        for recipient in recipients:
+            recipient.status = DeliveryStatus.FAILED
+            recipient.retry_count = 0
+            recipient.sent_at = datetime.utcnow() - timedelta(
+                minutes=minutes_ago
+            )
+        db_session.commit()
+        return recipients
+
+    def _service(self, db_session, whatsapp_service):
+        from services.broadcast_retry_service import BroadcastRetryService
+        from services.bulk_send_service import BulkSendService
+
+        return BroadcastRetryService(
+            db_session,
+            recipient_model=BroadcastRecipient,
+            broadcast_model=BroadcastMessage,
+            broadcast_fk=BroadcastRecipient.broadcast_message_id,
+            bulk_sender=BulkSendService(whatsapp_service, max_workers=4),
+        )
+
+    def test_claimed_recipients_not_claimed_twice(
+        self, db_session, test_broadcast_setup
+    ):
+        """Overlapping sweeps must not pick up the same recipients"""
+        recipients = self._fail_all(
+            db_session, test_broadcast_setup["broadcast"].id
+        )
+        service = self._service(db_session, MagicMock())
+
+        claimed = service.claim_due_recipients()
+        assert len(claimed) == len(recipients)
+        for recipient, phone_number, _ in claimed:
+            assert recipient.status == DeliveryStatus.SENDING
+            assert phone_number
+
+        # A second, overlapping sweep finds nothing left to claim
+        assert service.claim_due_recipients() == []
+
+    def test_not_due_recipients_are_skipped(
+        self, db_session, test_broadcast_setup
+    ):
+        """Recipients inside their backoff window are not claimed"""
+        self._fail_all(
+            db_session, test_broadcast_setup["broadcast"].id, minutes_ago=2
+        )
+        service = self._service(db_session, MagicMock())
+
+        assert service.claim_due_recipients() == []
+
+    def test_sweep_dispatches_batch_and_reports_metrics(
+        self, db_session, test_broadcast_setup
+    ):
+        """Sweep sends the whole batch and records per-sweep metrics"""
+        recipients = self._fail_all(
+            db_session, test_broadcast_setup["broadcast"].id
+        )
+        whatsapp_service = MagicMock()
+        whatsapp_service.get_template_sid.return_value = "HX123"
+        whatsapp_service.send_template_message.side_effect = [
+            {"sid": f"SM_SWEEP_{i}"} for i in range(len(recipients) - 1)
+        ] + [Exception("Twilio down")]
+        service = self._service(db_session, whatsapp_service)
+
+        stats = service.sweep()
+
+        assert stats["retried"] == len(recipients)
+        assert stats["succeeded"] == len(recipients) - 1
+        assert stats["failed"] == 1
+        assert "duration_ms" in stats
+        # Template SID resolved once per language, not per recipient
+        assert whatsapp_service.get_template_sid.call_count == 1
+
+        db_session.expire_all()
+        statuses = sorted(
+            r.status.value
+            for r in db_session.query(BroadcastRecipient).filter(
+                BroadcastRecipient.broadcast_message_id
+                == test_broadcast_setup["broadcast"].id
+            )
+        )
+        assert statuses.count(DeliveryStatus.SENT.value) == (
+            len(recipients) - 1
+        )
+        assert statuses.count(DeliveryStatus.FAILED.value) == 1
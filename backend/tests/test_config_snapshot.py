@@ -0,0 +1,146 @@
+"""Tests for the compiled configuration snapshot."""
+
+import dataclasses
+
+import pytest
+
+from config import AdminLevels, settings
+from schemas.onboarding_schemas import get_field_config, load_onboarding_fields
+from services.onboarding_service import OnboardingService
+from utils.config_snapshot import (
+    current_snapshot,
+    flatten_translations,
+    reload_snapshot,
+)
+from utils.i18n import reload_translations, t
+
+HIERARCHY = {
+    "delimiter": " / ",
+    "levels": [
+        {"level_index": 2, "name": "district", "display": {"sw": "Wilaya"}},
+        {"level_index": 0, "name": "country"},
+        {"level_index": 1, "name": "region", "display": "Mkoa"},
+    ],
+}
+
+
+class TestAdminLevels:
+    def test_from_hierarchy(self):
+        levels = AdminLevels.from_hierarchy(HIERARCHY)
+
+        assert levels.order == ("region", "district")
+        assert levels.country_level_name == "country"
+        assert levels.leaf_level_name == "district"
+        assert levels.leaf_level_index == 2
+        assert levels.delimiter == " / "
+        assert levels.suffixes[0] == " district"
+        assert set(levels.suffixes) == {
+            " district",
+            " wilaya",
+            " country",
+            " region",
+            " mkoa",
+        }
+
+    def test_empty_hierarchy_defaults(self):
+        levels = AdminLevels.from_hierarchy({})
+        assert levels.order == ()
+        assert levels.country_level_name == "country"
+        assert (levels.leaf_level_name, levels.leaf_level_index) == (
+            "ward",
+            3,
+        )
+        assert levels.delimiter == " > "
+
+    def test_settings_recompile_on_assignment(self, monkeypatch):
+        monkeypatch.setattr(settings, "administrative_hierarchy", HIERARCHY)
+        assert settings.admin_levels is settings.admin_levels
+        assert settings.admin_level_order == ["region", "district"]
+
+        monkeypatch.setattr(settings, "languages", [{"code": "sw"}])
+        assert settings.supported_language_codes == ["sw"]
+        assert settings.default_language == "sw"
+
+
+class TestSnapshot:
+    def test_flatten_translations(self):
+        flat = flatten_translations(
+            {"en": {"a": {"b": "B", "c": {"d": "D"}}}, "sw": {}}
+        )
+        assert flat["en"]["a.b"] == "B"
+        assert flat["en"]["a.c.d"] == "D"
+        # Intermediate nodes resolve like the nested lookup did
+        assert flat["en"]["a.c"] == {"d": "D"}
+        assert flat["sw"] == {}
+
+    def test_snapshot_is_immutable_and_reused(self):
+        snapshot = current_snapshot()
+        assert current_snapshot() is snapshot
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            snapshot.default_language = "xx"
+        with pytest.raises(TypeError):
+            snapshot.translations["en"]["new.key"] = "value"
+
+    def test_setting_change_swaps_snapshot(self, monkeypatch):
+        before = current_snapshot()
+        monkeypatch.setattr(
+            settings,
+            "onboarding_fields_config",
+            [
+                {"field_name": "farm_size", "priority": 2},
+                {"field_name": "crop_type", "priority": 1},
+                {"field_name": "gender", "enabled": False},
+            ],
+        )
+
+        after = current_snapshot()
+        assert after is not before
+        assert [f.field_name for f in after.onboarding_fields] == [
+            "crop_type",
+            "farm_size",
+        ]
+        assert [f.field_name for f in load_onboarding_fields()] == [
+            "crop_type",
+            "farm_size",
+        ]
+        assert get_field_config("farm_size").priority == 2
+        # Disabled fields fall back to the built-in definition
+        assert get_field_config("gender").field_name == "gender"
+        # Readers holding the old snapshot keep a consistent view
+        assert "farm_size" not in before.onboarding_fields_by_name
+
+    def test_reload_translations_swaps_snapshot(self):
+        before = current_snapshot()
+        text = t("account.delete_confirmation", "sw")
+
+        reload_translations()
+
+        assert current_snapshot() is not before
+        assert t("account.delete_confirmation", "sw") == text
+        # Unknown language falls back to the default, unknown path to
+        # itself
+        assert t("account.delete_confirmation", "xx") == t(
+            "account.delete_confirmation", settings.default_language
+        )
+        assert t("no.such.path", "sw") == "no.such.path"
+
+    def test_reload_keeps_locales(self):
+        text = t("account.delete_confirmation", "en")
+        reload_snapshot()
+        assert t("account.delete_confirmation", "en") == text
+
+
+class TestOnboardingService:
+    def test_uses_compiled_tables(self, db_session, monkeypatch):
+        monkeypatch.setattr(settings, "administrative_hierarchy", HIERARCHY)
+
+        service = OnboardingService(db_session)
+
+        assert service.admin_level_order == ["region", "district"]
+        assert service._admin_level_suffixes == (
+            current_snapshot().admin.suffixes
+        )
+        assert [f.field_name for f in service.fields_config] == [
+            f.field_name for f in current_snapshot().onboarding_fields
+        ]
@@ -0,0 +1,90 @@
+"""Tests for the single-pass conversation pairing queries."""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from models.customer import Customer
+from models.message import Message, MessageFrom
+from schemas.callback import MessageType
+from utils.conversation_pairing import (
+    follow_up_questions,
+    question_response_pairs,
+    stream,
+)
+
+BASE_TIME = datetime(2026, 10, 1, 8, 0, tzinfo=timezone.utc)
+
+
+def _conversation(db_session: Session, phone_number, messages):
+    """Store (body, from_source, message_type) tuples a minute apart"""
+    customer = Customer(phone_number=phone_number, language="en")
+    db_session.add(customer)
+    db_session.flush()
+    for minute, (body, from_source, message_type) in enumerate(messages):
+        db_session.add(
+            Message(
+                message_sid=f"pair_{phone_number}_{minute}",
+                customer_id=customer.id,
+                body=body,
+                from_source=from_source,
+                message_type=message_type,
+                created_at=BASE_TIME + timedelta(minutes=minute),
+            )
+        )
+    db_session.commit()
+    return customer
+
+
+class TestQuestionResponsePairs:
+    def test_pairs_latest_question_with_first_reply(
+        self, db_session: Session
+    ):
+        customer = _conversation(
+            db_session,
+            "+255710000951",
+            [
+                ("Old question", MessageFrom.CUSTOMER, None),
+                ("New question", MessageFrom.CUSTOMER, None),
+                ("Suggestion", MessageFrom.LLM, MessageType.WHISPER),
+                ("AI answer", MessageFrom.LLM, MessageType.REPLY),
+                ("Extra EO note", MessageFrom.USER, None),
+                ("Second question", MessageFrom.CUSTOMER, None),
+                ("Broadcast", MessageFrom.USER, MessageType.BROADCAST),
+                ("EO answer", MessageFrom.USER, None),
+            ],
+        )
+
+        pairs = list(stream(db_session, question_response_pairs()))
+
+        assert [(p.question, p.response, p.response_from) for p in pairs] == [
+            ("New question", "AI answer", MessageFrom.LLM),
+            ("Second question", "EO answer", MessageFrom.USER),
+        ]
+        assert pairs[0].customer_id == customer.id
+        assert pairs[0].question_at == BASE_TIME + timedelta(minutes=1)
+
+
+class TestFollowUpQuestions:
+    def test_picks_closest_farmer_messages_in_threshold(
+        self, db_session: Session
+    ):
+        _conversation(
+            db_session,
+            "+255710000952",
+            [
+                ("Older farmer message", MessageFrom.CUSTOMER, None),
+                ("My maize is wilting", MessageFrom.CUSTOMER, None),
+                ("Since when?", MessageFrom.LLM, MessageType.FOLLOW_UP),
+                ("Which variety?", MessageFrom.LLM, MessageType.FOLLOW_UP),
+                ("Two weeks", MessageFrom.CUSTOMER, None),
+                ("Later farmer message", MessageFrom.CUSTOMER, None),
+            ],
+        )
+
+        rows = list(stream(db_session, follow_up_questions(1)))
+
+        assert [(r.before_body, r.after_body) for r in rows] == [
+            ("My maize is wilting", None),
+            (None, "Two weeks"),
+        ]
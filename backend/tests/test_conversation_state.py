@@ -0,0 +1,204 @@
+"""Tests for the per-customer conversation state snapshot."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+import redis
+
+from models.administrative import Administrative, AdministrativeLevel
+from models.conversation_state import ConversationState
+from models.customer import Customer, OnboardingStatus
+from models.message import DeliveryStatus, Message, MessageFrom
+from models.ticket import Ticket
+from schemas.callback import MessageType
+from services.conversation_state_service import (
+    ConversationSnapshot,
+    ConversationStateCache,
+    ConversationStateService,
+)
+from services.follow_up_service import FollowUpService
+
+
+class FakeRedis:
+    """Just enough of redis.Redis for SET NX/PX and GET"""
+
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, nx=False, px=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        return True
+
+    def get(self, key):
+        return self.data.get(key)
+
+
+@pytest.fixture
+def customer(db_session):
+    customer = Customer(
+        phone_number="+255710000601",
+        full_name="State Farmer",
+        language="en",
+        onboarding_status=OnboardingStatus.COMPLETED,
+    )
+    db_session.add(customer)
+    db_session.commit()
+    return customer
+
+
+@pytest.fixture
+def ward(db_session):
+    level = AdministrativeLevel(name="state-ward")
+    db_session.add(level)
+    db_session.flush()
+    ward = Administrative(
+        code="STATE-W", name="State Ward", level_id=level.id, path="STATE-W"
+    )
+    db_session.add(ward)
+    db_session.commit()
+    return ward
+
+
+def _message(db_session, customer, sid, **kwargs):
+    message = Message(
+        message_sid=sid,
+        customer_id=customer.id,
+        body="Hello",
+        from_source=kwargs.pop("from_source", MessageFrom.CUSTOMER),
+        **kwargs,
+    )
+    db_session.add(message)
+    db_session.commit()
+    return message
+
+
+def _state(db_session, customer):
+    db_session.expire_all()
+    return db_session.get(ConversationState, customer.id)
+
+
+class TestStateMaintenance:
+    def test_messages_and_deliveries(self, db_session, customer):
+        assert _state(db_session, customer) is None
+        assert not ConversationStateService(db_session).get(
+            customer.id
+        ).has_messages
+
+        _message(db_session, customer, "SM_STATE_1")
+        eo_message = _message(
+            db_session,
+            customer,
+            "SM_STATE_2",
+            from_source=MessageFrom.USER,
+            delivery_status=DeliveryStatus.UNDELIVERED,
+        )
+        state = _state(db_session, customer)
+        assert state.has_messages is True
+        assert state.pending_undelivered == 1
+
+        eo_message.delivery_status = DeliveryStatus.DELIVERED
+        db_session.commit()
+        assert _state(db_session, customer).pending_undelivered == 0
+
+        eo_message.delivery_status = DeliveryStatus.UNDELIVERED
+        db_session.commit()
+        assert _state(db_session, customer).pending_undelivered == 1
+
+        # Expired after the commit: the delete recounts
+        db_session.delete(eo_message)
+        db_session.commit()
+        assert _state(db_session, customer).pending_undelivered == 0
+
+    def test_tickets_and_follow_ups(self, db_session, customer, ward):
+        question = _message(db_session, customer, "SM_STATE_Q")
+        follow_up = _message(
+            db_session,
+            customer,
+            "SM_STATE_F",
+            from_source=MessageFrom.LLM,
+            message_type=MessageType.FOLLOW_UP,
+        )
+        assert _state(db_session, customer).last_follow_up_at == (
+            follow_up.created_at
+        )
+
+        ticket = Ticket(
+            ticket_number="STATE-T1",
+            administrative_id=ward.id,
+            customer_id=customer.id,
+            message_id=question.id,
+        )
+        db_session.add(ticket)
+        db_session.commit()
+        assert _state(db_session, customer).open_ticket_id == ticket.id
+
+        resolved_at = datetime.now(timezone.utc)
+        ticket.resolved_at = resolved_at
+        db_session.commit()
+        state = _state(db_session, customer)
+        assert state.open_ticket_id is None
+        assert state.last_resolved_at == resolved_at
+
+
+class TestCache:
+    def test_commit_invalidates_and_blocks_stale_writes(
+        self, db_session, customer, monkeypatch
+    ):
+        cache = ConversationStateCache(client=FakeRedis())
+        monkeypatch.setattr(
+            "services.conversation_state_service.conversation_state_cache",
+            cache,
+        )
+        service = ConversationStateService(db_session)
+
+        stale = service.get(customer.id)
+        assert cache.get(customer.id) == stale
+
+        _message(db_session, customer, "SM_STATE_CACHE")
+        # The commit replaced the entry with a tombstone
+        assert cache.get(customer.id) is None
+        cache.set(stale)
+        assert cache.get(customer.id) is None
+        assert service.get(customer.id).has_messages is True
+
+    def test_redis_errors_fall_back_to_database(self, db_session, customer):
+        _message(db_session, customer, "SM_STATE_DOWN")
+        client = MagicMock()
+        client.get.side_effect = redis.ConnectionError("down")
+        client.set.side_effect = redis.ConnectionError("down")
+        service = ConversationStateService(
+            db_session, cache=ConversationStateCache(client=client)
+        )
+
+        assert service.get(customer.id).has_messages is True
+
+
+class TestFollowUpFromState:
+    def test_matches_history_rules(self, db_session, customer):
+        service = FollowUpService(db_session)
+        now = datetime.now(timezone.utc)
+        history = [
+            MagicMock(created_at=now - timedelta(minutes=m))
+            for m in (0, 5, 10)
+        ]
+
+        def ask(**state):
+            return service.should_ask_follow_up(
+                customer,
+                history,
+                conversation=ConversationSnapshot(
+                    customer_id=customer.id, has_messages=True, **state
+                ),
+            )
+
+        assert ask() is True
+        # Follow-up older than the history window
+        assert ask(last_follow_up_at=now - timedelta(hours=1)) is True
+        assert ask(last_follow_up_at=now - timedelta(minutes=5)) is False
+        assert ask(
+            last_follow_up_at=now - timedelta(minutes=5),
+            last_resolved_at=now - timedelta(minutes=1),
+        ) is True
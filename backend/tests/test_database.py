@@ -0,0 +1,106 @@
+"""
+Tests for database engine profiles, read-only sessions and pool metrics.
+"""
+
+from sqlalchemy import create_engine, text
+
+from database import (
+    DATABASE_URL,
+    ReadSessionLocal,
+    connect_options,
+    get_engine_profile,
+)
+from utils.db_metrics import PoolMetrics, metered_pool_class
+
+
+class TestEngineProfiles:
+    """Test profile defaults and environment overrides."""
+
+    def test_profile_env_override(self, monkeypatch):
+        monkeypatch.setenv("DB_WORKER_POOL_SIZE", "7")
+        monkeypatch.setenv("DB_WORKER_POOL_PRE_PING", "false")
+
+        profile = get_engine_profile("worker")
+
+        assert profile["pool_size"] == 7
+        assert profile["pool_pre_ping"] is False
+        assert profile["statement_timeout_ms"] == 240000
+
+    def test_web_profile_defaults(self):
+        profile = get_engine_profile("web")
+
+        assert profile["pool_pre_ping"] is True
+        assert profile["statement_timeout_ms"] == 30000
+
+    def test_statement_timeout_can_be_left_unset(self):
+        profile = get_engine_profile("web")
+
+        assert connect_options(profile) == "-c statement_timeout=30000"
+        # Processes that did not choose a profile (scripts, seeders)
+        assert connect_options(profile, statement_timeout=False) == ""
+        assert connect_options(
+            profile, read_only=True, statement_timeout=False
+        ) == "-c default_transaction_read_only=on"
+
+
+class TestReadSession:
+    """Test the read-only session used by analytics routes."""
+
+    def test_read_session_is_read_only(self):
+        db = ReadSessionLocal()
+        try:
+            read_only = db.execute(
+                text("SHOW transaction_read_only")
+            ).scalar()
+            timeout = db.execute(text("SHOW statement_timeout")).scalar()
+        finally:
+            db.close()
+
+        assert read_only == "on"
+        assert timeout == "1min"
+
+
+class TestPoolMetrics:
+    """Test checkout latency and saturation tracking."""
+
+    def test_checkout_metrics(self):
+        metrics = PoolMetrics("test", pool_size=2, max_overflow=0)
+        engine = create_engine(
+            DATABASE_URL,
+            poolclass=metered_pool_class(metrics),
+            pool_size=2,
+            max_overflow=0,
+        )
+        try:
+            first = engine.connect()
+            second = engine.connect()
+            snapshot = metrics.snapshot(engine.pool)
+            assert snapshot["checked_out"] == 2
+            assert snapshot["saturation"] == 1.0
+            first.close()
+            second.close()
+
+            snapshot = metrics.snapshot(engine.pool)
+            assert snapshot["checkouts"] == 2
+            assert snapshot["checked_out"] == 0
+            assert snapshot["checked_in"] == 2
+            assert snapshot["max_checkout_ms"] >= 0
+        finally:
+            engine.dispose()
+
+    def test_metrics_survive_pool_recreate(self):
+        metrics = PoolMetrics("test", pool_size=1, max_overflow=0)
+        engine = create_engine(
+            DATABASE_URL,
+            poolclass=metered_pool_class(metrics),
+            pool_size=1,
+            max_overflow=0,
+        )
+        try:
+            engine.dispose()
+            with engine.connect():
+                pass
+            assert engine.pool.metrics is metrics
+            assert metrics.checkouts == 1
+        finally:
+            engine.dispose()
@@ -20,8 +20,11 @@ from models.administrative import CustomerAdministrative
 from models.ticket import Ticket
 from models.message import Message, MessageFrom
 from models.device import Device
+from schemas.user import UserUpdate
 from services.administrative_service import AdministrativeService
+from services.principal_service import PrincipalService
 from services.socketio_service import get_user_wards
+from services.user_service import UserService
 
 
 @pytest.fixture
@@ -902,3 +905,137 @@ class TestMessageReplyHierarchicalAccess:
         )
         assert response.status_code == 403
         assert "outside your administrative area" in response.json()["detail"]
+
+
+class TestPrincipalCache:
+    """Test the cached principal used by dashboard endpoints."""
+
+    def test_principal_ward_ids_include_descendants(
+        self, db_session, administrative_hierarchy, auth_headers_factory
+    ):
+        """District EO principal covers the district and its wards."""
+        central = administrative_hierarchy["districts"]["central"]
+        wards = administrative_hierarchy["wards"]
+        _, eo_user = auth_headers_factory(
+            user_type="eo",
+            email="principal_eo@example.com",
+            administrative_ids=[central.id],
+        )
+
+        principal = PrincipalService.get_principal(
+            db_session, "principal_eo@example.com"
+        )
+
+        assert principal.id == eo_user.id
+        assert principal.ward_ids == frozenset({
+            central.id,
+            wards["westlands"].id,
+            wards["kilimani"].id,
+        })
+        assert set(principal.accessible_administrative_ids()) == set(
+            principal.ward_ids
+        )
+
+    def test_admin_principal_has_no_ward_filter(
+        self, db_session, auth_headers_factory
+    ):
+        """Admin principal returns empty list (can access all)."""
+        auth_headers_factory(user_type="admin")
+
+        principal = PrincipalService.get_principal(
+            db_session, "admin@example.com"
+        )
+
+        assert principal.is_admin
+        assert principal.accessible_administrative_ids() == []
+
+    def test_principal_is_cached_until_reassignment(
+        self, db_session, administrative_hierarchy, auth_headers_factory
+    ):
+        """Reassigning an EO through UserService refreshes the cache."""
+        central = administrative_hierarchy["districts"]["central"]
+        nyali = administrative_hierarchy["wards"]["nyali"]
+        _, eo_user = auth_headers_factory(
+            user_type="eo",
+            email="cached_eo@example.com",
+            administrative_ids=[central.id],
+        )
+
+        first = PrincipalService.get_principal(
+            db_session, "cached_eo@example.com"
+        )
+        assert PrincipalService.get_principal(
+            db_session, "cached_eo@example.com"
+        ) is first
+
+        admin = User(
+            email="reassigning_admin@example.com",
+            phone_number="+254700000200",
+            hashed_password="hashed",
+            full_name="Admin User",
+            user_type=UserType.ADMIN,
+            is_active=True,
+        )
+        db_session.add(admin)
+        db_session.commit()
+        UserService.update_user(
+            db_session,
+            eo_user.id,
+            UserUpdate(administrative_id=nyali.id),
+            admin,
+        )
+
+        refreshed = PrincipalService.get_principal(
+            db_session, "cached_eo@example.com"
+        )
+        assert refreshed is not first
+        assert refreshed.ward_ids == frozenset({nyali.id})
+
+    def test_reassigned_eo_loses_access_to_old_ward(
+        self, client, db_session, administrative_hierarchy,
+        auth_headers_factory
+    ):
+        """Dashboard access follows the reassignment immediately."""
+        central = administrative_hierarchy["districts"]["central"]
+        westlands = administrative_hierarchy["wards"]["westlands"]
+        nyali = administrative_hierarchy["wards"]["nyali"]
+        auth_headers, eo_user = auth_headers_factory(
+            user_type="eo",
+            email="moving_eo@example.com",
+            administrative_ids=[central.id],
+        )
+
+        customer = Customer(
+            phone_number="+255999000090",
+            language=CustomerLanguage.EN,
+        )
+        db_session.add(customer)
+        db_session.commit()
+        message = Message(
+            customer_id=customer.id,
+            message_sid="MSG090",
+            body="Test message",
+            from_source=MessageFrom.CUSTOMER,
+        )
+        db_session.add(message)
+        db_session.commit()
+        ticket = Ticket(
+            ticket_number="202401010090",
+            customer_id=customer.id,
+            message_id=message.id,
+            administrative_id=westlands.id,
+        )
+        db_session.add(ticket)
+        db_session.commit()
+
+        url = f"/api/tickets/{ticket.id}"
+        assert client.get(url, headers=auth_headers).status_code == 200
+
+        UserService.update_user(
+            db_session,
+            eo_user.id,
+            UserUpdate(administrative_id=nyali.id),
+            db_session.get(User, eo_user.id),
+        )
+
+        assert client.get(url, headers=auth_headers).status_code == 403
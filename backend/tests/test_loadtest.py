@@ -0,0 +1,126 @@
+"""Tests for the load-test harness and the per-request DB query metric."""
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from loadtest.runner import (
+    Recorder,
+    diff_db_queries,
+    format_report,
+    parse_db_queries,
+    percentile,
+)
+from loadtest.scenarios import load_test_phone
+from loadtest.standins import Fault, StandInConfig, create_app
+
+
+@pytest.fixture
+def standins():
+    config = StandInConfig(status_callbacks=False)
+    with TestClient(create_app(config)) as client:
+        yield client, config
+
+
+class TestStandIns:
+    def test_twilio_and_openai_responses(self, standins):
+        client, _ = standins
+        response = client.post(
+            "/2010-04-01/Accounts/AC123/Messages.json",
+            data={"To": "whatsapp:+255700000001", "Body": "Hi"},
+        )
+        assert response.status_code == 201
+        assert response.json()["sid"].startswith("SM")
+        assert response.json()["to"] == "whatsapp:+255700000001"
+
+        response = client.post(
+            "/v1/chat/completions",
+            json={
+                "model": "gpt-4o-mini",
+                "messages": [],
+                "response_format": {"type": "json_object"},
+            },
+        )
+        assert response.json()["choices"][0]["message"]["content"] == "{}"
+
+        embeddings = client.post(
+            "/v1/embeddings", json={"input": ["maize", "maize"]}
+        ).json()["data"]
+        assert embeddings[0]["embedding"] == embeddings[1]["embedding"]
+        assert client.get("/stats").json()["requests"]["openai"] == 2
+
+    def test_error_injection(self, standins):
+        client, config = standins
+        config.faults["twilio"] = Fault(error_rate=1.0)
+        config.faults["expo"] = Fault(error_rate=1.0)
+
+        response = client.post(
+            "/2010-04-01/Accounts/AC123/Messages.json", data={"To": "x"}
+        )
+        assert response.status_code == 429
+        assert response.json()["code"] == 20429
+
+        tickets = client.post(
+            "/expo/push/send", json=[{"to": "a"}, {"to": "b"}]
+        ).json()["data"]
+        assert [t["details"]["error"] for t in tickets] == [
+            "DeviceNotRegistered"
+        ] * 2
+
+
+class TestReporting:
+    def test_percentiles_and_summary(self):
+        assert percentile([], 0.5) is None
+        assert percentile([1, 2, 3, 4], 0.5) == 2.5
+        assert percentile([1, 2, 3, 4], 0.99) == pytest.approx(3.97)
+
+        recorder = Recorder()
+        for seconds in (0.1, 0.2, 0.3):
+            recorder.record("GET /api/tickets/", seconds, ok=True)
+        recorder.record("GET /api/tickets/", 1.0, ok=False)
+        recorder.stop()
+
+        row = recorder.summary()[0]
+        assert row["count"] == 4
+        assert row["errors"] == 1
+        assert row["p50_ms"] == 250.0
+        assert "GET /api/tickets/" in format_report("test", recorder, [])
+
+    def test_db_query_diff(self):
+        def scrape(total, count):
+            return parse_db_queries(
+                "# TYPE agriconnect_db_queries_per_request histogram\n"
+                "agriconnect_db_queries_per_request_sum"
+                f'{{route="/api/tickets/"}} {total}\n'
+                "agriconnect_db_queries_per_request_count"
+                f'{{route="/api/tickets/"}} {count}\n'
+            )
+
+        rows = diff_db_queries(scrape(10, 2), scrape(40, 5))
+        assert rows == [
+            {
+                "route": "/api/tickets/",
+                "requests": 3,
+                "queries": 30,
+                "queries_per_request": 10.0,
+            }
+        ]
+        assert load_test_phone("+25579900", 7) == "+255799000007"
+
+
+class TestDbQueryMetric:
+    def test_queries_are_counted_per_route(
+        self, client, auth_headers_factory
+    ):
+        headers, _ = auth_headers_factory(user_type="admin")
+        labels = {"route": "/api/auth/profile"}
+
+        def observed(suffix):
+            return REGISTRY.get_sample_value(
+                f"agriconnect_db_queries_per_request_{suffix}", labels
+            ) or 0
+
+        count, total = observed("count"), observed("sum")
+        assert client.get("/api/auth/profile", headers=headers).status_code
+        assert observed("count") == count + 1
+        assert observed("sum") > total
@@ -0,0 +1,140 @@
+"""Tests for moving old messages to the partitioned archive."""
+
+from datetime import date, datetime, timezone
+
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import select
+
+from config import settings
+from models.administrative import Administrative, AdministrativeLevel
+from models.customer import Customer
+from models.message import DeliveryStatus, Message, MessageFrom
+from models.message_archive import MessageArchive
+from models.ticket import Ticket
+from services.message_archive_service import (
+    MessageArchiveService,
+    message_history,
+)
+
+TODAY = date(2026, 10, 18)
+OLD = datetime(2026, 1, 15, 9, 0, tzinfo=timezone.utc)
+RECENT = datetime(2026, 9, 1, 9, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def customer(db_session):
+    customer = Customer(phone_number="+255710000901", language="en")
+    db_session.add(customer)
+    db_session.commit()
+    return customer
+
+
+def _message(db_session, customer, sid, created_at, **kwargs):
+    message = Message(
+        message_sid=sid,
+        customer_id=customer.id,
+        body=f"Body {sid}",
+        from_source=kwargs.pop("from_source", MessageFrom.CUSTOMER),
+        created_at=created_at,
+        **kwargs,
+    )
+    db_session.add(message)
+    db_session.commit()
+    return message
+
+
+def _sids(db_session, table):
+    db_session.expire_all()
+    return set(db_session.scalars(select(table.message_sid)))
+
+
+class TestArchiveMessages:
+    def test_moves_old_messages_nothing_depends_on(
+        self, db_session, customer, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "message_archive_batch_size", 2)
+        for i in range(3):
+            _message(db_session, customer, f"SM_ARCH_OLD_{i}", OLD)
+        _message(db_session, customer, "SM_ARCH_RECENT", RECENT)
+        _message(
+            db_session,
+            customer,
+            "SM_ARCH_RETRY",
+            OLD,
+            from_source=MessageFrom.LLM,
+            delivery_status=DeliveryStatus.FAILED,
+        )
+        _message(
+            db_session,
+            customer,
+            "SM_ARCH_UNDELIVERED",
+            OLD,
+            from_source=MessageFrom.USER,
+            delivery_status=DeliveryStatus.UNDELIVERED,
+        )
+        question = _message(db_session, customer, "SM_ARCH_TICKET", OLD)
+        level = AdministrativeLevel(name="archive-ward")
+        db_session.add(level)
+        db_session.flush()
+        ward = Administrative(
+            code="ARCH-W", name="Archive Ward", level_id=level.id, path="W"
+        )
+        db_session.add(ward)
+        db_session.flush()
+        db_session.add(
+            Ticket(
+                ticket_number="ARCH-T1",
+                administrative_id=ward.id,
+                customer_id=customer.id,
+                message_id=question.id,
+            )
+        )
+        db_session.commit()
+
+        service = MessageArchiveService(db_session)
+        assert service.archive_due(TODAY) == {
+            "messages_archive_y2026m01": 3,
+            "messages_archive_y2026m02": 0,
+            "messages_archive_y2026m03": 0,
+        }
+
+        assert _sids(db_session, MessageArchive) == {
+            "SM_ARCH_OLD_0",
+            "SM_ARCH_OLD_1",
+            "SM_ARCH_OLD_2",
+        }
+        assert _sids(db_session, Message) == {
+            "SM_ARCH_RECENT",
+            "SM_ARCH_RETRY",
+            "SM_ARCH_UNDELIVERED",
+            "SM_ARCH_TICKET",
+        }
+        assert service.list_partitions()[:3] == [
+            date(2026, 1, 1),
+            date(2026, 2, 1),
+            date(2026, 3, 1),
+        ]
+
+        history = message_history(
+            "message_sid", since=datetime(2026, 1, 1, tzinfo=timezone.utc)
+        )
+        rows = db_session.scalars(select(history.c.message_sid)).all()
+        assert len(rows) == 7
+
+    def test_exports_expired_partition_to_parquet(
+        self, db_session, customer, tmp_path
+    ):
+        _message(db_session, customer, "SM_ARCH_EXPORT", OLD)
+        service = MessageArchiveService(db_session, str(tmp_path))
+        service.archive_month(OLD.date())
+
+        paths = service.export_due(date(2028, 6, 1))
+
+        path = str(tmp_path / "messages_archive_y2026m01.parquet")
+        assert path in paths
+        table = pq.read_table(path)
+        assert table.column("message_sid").to_pylist() == ["SM_ARCH_EXPORT"]
+        assert table.column("delivery_status").to_pylist() == ["PENDING"]
+        assert date(2026, 1, 1) not in service.list_partitions()
+        assert _sids(db_session, MessageArchive) == set()
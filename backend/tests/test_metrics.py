@@ -0,0 +1,112 @@
+"""Tests for the Prometheus metrics."""
+
+import os
+import subprocess
+import sys
+from unittest.mock import MagicMock
+
+from prometheus_client import REGISTRY
+
+from services.openai_service import OpenAIService
+from services.whatsapp_service import _count_twilio_error
+from utils.metrics import _task_postrun, _task_prerun
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _value(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestMetricsEndpoint:
+    def test_requests_are_labelled_by_route_template(self, client):
+        labels = {
+            "method": "GET",
+            "route": "/api/health-check",
+            "status": "200",
+        }
+        before = _value(
+            "agriconnect_http_request_duration_seconds_count", **labels
+        )
+
+        client.get("/api/health-check")
+
+        assert _value(
+            "agriconnect_http_request_duration_seconds_count", **labels
+        ) == before + 1
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'route="/api/health-check"' in response.text
+
+    def test_token_is_required_when_configured(self, client, monkeypatch):
+        monkeypatch.setattr(
+            "routers.metrics.settings.metrics_token", "secret"
+        )
+        assert client.get("/metrics").status_code == 401
+        response = client.get(
+            "/metrics", headers={"Authorization": "Bearer secret"}
+        )
+        assert response.status_code == 200
+
+
+class TestInstrumentation:
+    def test_celery_task_runtime(self):
+        task = MagicMock()
+        task.name = "tasks.test.sample"
+        labels = {"task": "tasks.test.sample", "state": "SUCCESS"}
+
+        _task_prerun(task_id="t-1", task=task)
+        _task_postrun(task_id="t-1", task=task, state="SUCCESS")
+        # Unknown task id (prerun missed): ignored
+        _task_postrun(task_id="t-2", task=task, state="SUCCESS")
+
+        assert _value(
+            "agriconnect_celery_task_duration_seconds_count", **labels
+        ) == 1
+
+    def test_openai_tokens_and_twilio_errors(self):
+        prompt = _value("agriconnect_openai_tokens_total", kind="prompt")
+        errors = _value(
+            "agriconnect_twilio_errors_total", code="21211", source="send"
+        )
+
+        OpenAIService()._track_usage(prompt_tokens=12, completion_tokens=3)
+        error = Exception("invalid number")
+        error.code = 21211
+        _count_twilio_error(error)
+
+        assert _value(
+            "agriconnect_openai_tokens_total", kind="prompt"
+        ) == prompt + 12
+        assert _value(
+            "agriconnect_twilio_errors_total", code="21211", source="send"
+        ) == errors + 1
+
+
+class TestMultiprocess:
+    def test_samples_of_all_processes_are_aggregated(self, tmp_path):
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+
+        def run(code):
+            return subprocess.run(
+                [sys.executable, "-c", code],
+                cwd=BACKEND_DIR,
+                env=env,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+
+        for tokens in (5, 7):
+            run(
+                "from utils.metrics import OPENAI_TOKENS; "
+                f"OPENAI_TOKENS.labels(kind='prompt').inc({tokens})"
+            )
+        output = run(
+            "from utils.metrics import render_metrics; "
+            "print(render_metrics()[0].decode())"
+        )
+
+        assert 'agriconnect_openai_tokens_total{kind="prompt"} 12.0' in output
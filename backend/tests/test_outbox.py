@@ -0,0 +1,250 @@
+"""Tests for the transactional WhatsApp outbox."""
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+from twilio.base.exceptions import TwilioRestException
+
+from config import settings
+from models.answer_cache import AnswerCacheEntry
+from models.customer import Customer
+from models.message import DeliveryStatus, Message, MessageFrom
+from models.whatsapp_outbox import OutboxMessage, OutboxStatus
+from services.answer_cache_service import AnswerCacheService, CacheHit
+from services.outbox_service import OutboxDispatcher, OutboxService
+
+
+class FakeWhatsApp:
+    """Records create_message calls; raises the configured error"""
+
+    def __init__(self, sent, error=None):
+        self.sent = sent
+        self.error = error
+
+    def create_message(
+        self, to_number, body=None, content_sid=None, content_variables=None
+    ):
+        if self.error is not None:
+            raise self.error
+        self.sent.append((to_number, body or content_sid))
+        return SimpleNamespace(
+            sid=f"SM_OUT_{len(self.sent)}", status="queued"
+        )
+
+
+@pytest.fixture
+def outbox_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "whatsapp_outbox_enabled", True)
+    kick = MagicMock()
+    monkeypatch.setattr("services.outbox_service.kick_outbox_drain", kick)
+    return kick
+
+
+def _dispatcher(db_session: Session, sent, error=None):
+    return OutboxDispatcher(
+        session_factory=sessionmaker(bind=db_session.get_bind()),
+        whatsapp_factory=lambda: FakeWhatsApp(sent, error),
+        rate_per_second=0,
+    )
+
+
+def _outbox_rows(db_session: Session):
+    db_session.expire_all()
+    return db_session.query(OutboxMessage).order_by(OutboxMessage.id).all()
+
+
+class TestOutboxService:
+    def test_queued_with_the_callers_commit(
+        self, db_session: Session, outbox_enabled
+    ):
+        outbox = OutboxService(db_session)
+
+        outbox.send_message("+255710000801", "Rolled back")
+        db_session.rollback()
+        assert _outbox_rows(db_session) == []
+        outbox_enabled.assert_not_called()
+
+        assert outbox.send_message("+255710000801", "Hello") is None
+        db_session.commit()
+        rows = _outbox_rows(db_session)
+        assert [row.body for row in rows] == ["Hello"]
+        assert rows[0].status == OutboxStatus.PENDING
+        outbox_enabled.assert_called_once()
+
+    def test_sends_inline_when_disabled(self, db_session: Session):
+        whatsapp = MagicMock()
+        whatsapp.send_message.return_value = {"sid": "SM_INLINE"}
+
+        response = OutboxService(db_session, whatsapp).send_message(
+            "+255710000802", "Hello"
+        )
+
+        assert response == {"sid": "SM_INLINE"}
+        whatsapp.send_message.assert_called_once_with(
+            "+255710000802", "Hello"
+        )
+        assert _outbox_rows(db_session) == []
+
+    @pytest.mark.asyncio
+    async def test_cached_answer_is_queued_behind_earlier_messages(
+        self, db_session: Session, outbox_enabled
+    ):
+        customer = Customer(phone_number="+255710000807")
+        db_session.add(customer)
+        db_session.flush()
+        question = Message(
+            message_sid="OUTBOX_CACHE_Q",
+            customer_id=customer.id,
+            body="When should I spray avocado for thrips?",
+            from_source=MessageFrom.CUSTOMER,
+        )
+        entry = AnswerCacheEntry(
+            language="en",
+            kb_version="outbox",
+            question="When to spray avocado against thrips",
+            answer="Spray at flowering.",
+            embedding=b"",
+            source="ai",
+            has_citations=True,
+        )
+        db_session.add_all([question, entry])
+        OutboxService(db_session).send_message(
+            customer.phone_number, "Earlier"
+        )
+        db_session.commit()
+
+        service = AnswerCacheService(db_session)
+        hit = CacheHit(entry=entry, similarity=0.99)
+        with patch.object(
+            service, "lookup", AsyncMock(return_value=hit)
+        ), patch("services.answer_cache_service.WhatsAppService") as whatsapp:
+            whatsapp.sanitize_whatsapp_content.side_effect = lambda x: x
+            whatsapp.return_value.get_template_sid.return_value = "HX_CONF"
+            reply = await service.answer_from_cache(customer, question)
+
+        # Nothing is sent from the webhook
+        whatsapp.return_value.send_message_with_tracking.assert_not_called()
+        whatsapp.return_value.send_template_message.assert_not_called()
+        assert reply.message_sid == f"pending_cache_{question.id}"
+        assert reply.delivery_status != DeliveryStatus.SENT
+
+        earlier, answer, template = _outbox_rows(db_session)
+        assert answer.body.startswith("Spray at flowering.")
+        assert answer.message_id == reply.id
+        assert answer.trace_message_id == question.id
+        assert answer.to_number == customer.phone_e164
+        assert template.content_sid == "HX_CONF"
+
+        sent = []
+        await _dispatcher(db_session, sent).drain()
+        assert [body for _, body in sent] == [
+            "Earlier",
+            answer.body,
+            "HX_CONF",
+        ]
+        db_session.refresh(reply)
+        assert reply.message_sid == "SM_OUT_2"
+
+
+class TestOutboxDispatcher:
+    def test_keeps_order_per_number(
+        self, db_session: Session, outbox_enabled
+    ):
+        outbox = OutboxService(db_session)
+        outbox.send_message("+255710000803", "first")
+        outbox.send_message("+255710000804", "other")
+        outbox.send_message("+255710000803", "second")
+        db_session.commit()
+
+        sent = []
+        dispatcher = _dispatcher(db_session, sent)
+        with dispatcher.session_factory() as db:
+            # One message per number per batch
+            claimed = dispatcher.claim_batch(db)
+            assert [job.body for job in claimed] == ["first", "other"]
+            # Nothing more while the heads are being sent
+            assert dispatcher.claim_batch(db) == []
+            db.query(OutboxMessage).update(
+                {OutboxMessage.status: OutboxStatus.PENDING}
+            )
+            db.commit()
+
+        stats = asyncio.run(dispatcher.drain())
+
+        assert stats == {"sent": 3, "retried": 0, "failed": 0}
+        assert [body for number, body in sent if number.endswith("03")] == [
+            "first",
+            "second",
+        ]
+        assert all(
+            row.status == OutboxStatus.SENT for row in _outbox_rows(db_session)
+        )
+
+    def test_tracked_message_gets_sid_or_joins_retry_queue(
+        self, db_session: Session, outbox_enabled
+    ):
+        customer = Customer(phone_number="+255710000805")
+        db_session.add(customer)
+        db_session.flush()
+        messages = [
+            Message(
+                message_sid=f"pending_ai_outbox_{i}",
+                customer_id=customer.id,
+                body="Answer",
+                from_source=MessageFrom.LLM,
+                delivery_status=DeliveryStatus.PENDING,
+            )
+            for i in range(2)
+        ]
+        db_session.add_all(messages)
+        db_session.flush()
+        outbox = OutboxService(db_session)
+        outbox.send_message(
+            customer.phone_number, "Answer", message_id=messages[0].id
+        )
+        db_session.commit()
+
+        asyncio.run(_dispatcher(db_session, []).drain())
+        db_session.refresh(messages[0])
+        assert messages[0].message_sid == "SM_OUT_1"
+        assert messages[0].delivery_status == DeliveryStatus.QUEUED
+
+        outbox.send_message(
+            customer.phone_number, "Answer", message_id=messages[1].id
+        )
+        db_session.commit()
+        invalid = TwilioRestException(
+            status=400, uri="/Messages", msg="Invalid To", code=21211
+        )
+        stats = asyncio.run(_dispatcher(db_session, [], invalid).drain())
+
+        assert stats["failed"] == 1
+        db_session.refresh(messages[1])
+        assert messages[1].delivery_status == DeliveryStatus.FAILED
+        assert messages[1].twilio_error_code == "21211"
+
+    def test_retryable_error_backs_off(
+        self, db_session: Session, outbox_enabled
+    ):
+        OutboxService(db_session).send_template_message(
+            "+255710000806", "HX123", {"1": "2"}
+        )
+        db_session.commit()
+        rate_limited = TwilioRestException(
+            status=429, uri="/Messages", msg="Too many", code=20429
+        )
+
+        stats = asyncio.run(
+            _dispatcher(db_session, [], rate_limited).drain()
+        )
+
+        assert stats == {"sent": 0, "retried": 1, "failed": 0}
+        (row,) = _outbox_rows(db_session)
+        assert row.status == OutboxStatus.PENDING
+        assert row.attempts == 1
+        assert row.error_code == "20429"
+        assert row.next_attempt_at > datetime.now(timezone.utc)
@@ -0,0 +1,239 @@
+"""Tests for farmer response latency tracing."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from models.customer import Customer, OnboardingStatus
+from models.message import DeliveryStatus, Message, MessageFrom
+from models.response_trace import ResponsePath, ResponseTrace
+from services.response_trace_service import ResponseTraceService
+
+
+@pytest.fixture
+def customer(db_session):
+    customer = Customer(
+        phone_number="+255710000501",
+        full_name="Traced Farmer",
+        language="en",
+        onboarding_status=OnboardingStatus.COMPLETED,
+    )
+    db_session.add(customer)
+    db_session.commit()
+    return customer
+
+
+def _message(db_session, customer, sid, from_source=MessageFrom.CUSTOMER):
+    message = Message(
+        message_sid=sid,
+        customer_id=customer.id,
+        body="When should I plant maize?",
+        from_source=from_source,
+    )
+    db_session.add(message)
+    db_session.commit()
+    return message
+
+
+class TestResponseTraceService:
+    def test_mark_keeps_first_time_and_ignores_untraced(
+        self, db_session, customer
+    ):
+        message = _message(db_session, customer, "SM_TRACE_1")
+        start = datetime.now(timezone.utc) - timedelta(seconds=30)
+        service = ResponseTraceService(db_session)
+        service.start(message.id, ResponsePath.REPLY, received_at=start)
+        db_session.commit()
+
+        first = start + timedelta(seconds=2)
+        service.mark(
+            message.id, "ai_job_created", at=first, trace_id="reply_c1_m1"
+        )
+        service.mark(
+            message.id, "ai_job_created", at=first + timedelta(seconds=5)
+        )
+        # No trace for this message: nothing happens
+        service.mark(message.id + 1000, "ai_callback")
+        db_session.commit()
+
+        trace = db_session.query(ResponseTrace).one()
+        assert trace.ai_job_created_at == first
+        assert trace.trace_id == "reply_c1_m1"
+
+    def test_start_twice_does_not_break_the_session(
+        self, db_session, customer
+    ):
+        message = _message(db_session, customer, "SM_TRACE_2")
+        service = ResponseTraceService(db_session)
+        now = datetime.now(timezone.utc)
+        service.start(message.id, ResponsePath.REPLY, received_at=now)
+        service.start(message.id, ResponsePath.REPLY, received_at=now)
+        db_session.commit()
+
+        assert db_session.query(ResponseTrace).count() == 1
+
+    def test_percentiles_per_stage(self, db_session, customer):
+        base = datetime.now(timezone.utc) - timedelta(hours=1)
+        service = ResponseTraceService(db_session)
+        for n in range(1, 5):
+            question = _message(db_session, customer, f"SM_TRACE_Q{n}")
+            reply = _message(
+                db_session, customer, f"SM_TRACE_R{n}", MessageFrom.LLM
+            )
+            reply.delivered_at = base + timedelta(seconds=10 * n + 1)
+            service.start(
+                question.id,
+                ResponsePath.REPLY,
+                received_at=base,
+                onboarded_at=base + timedelta(milliseconds=200),
+            )
+            service.mark(
+                question.id, "ai_job_created", at=base + timedelta(seconds=1)
+            )
+            service.mark(
+                question.id, "ai_callback", at=base + timedelta(seconds=10 * n)
+            )
+            service.mark(
+                question.id,
+                "reply_sent",
+                at=base + timedelta(seconds=10 * n),
+                reply_message_id=reply.id,
+            )
+        db_session.commit()
+
+        report = service.get_latency_percentiles(days=1)
+        stages = {stage["stage"]: stage for stage in report["stages"]}
+
+        assert report["traces"] == 4
+        assert stages["transcription"]["count"] == 0
+        assert stages["transcription"]["p50_ms"] is None
+        assert stages["onboarding"]["p50_ms"] == 200
+        # AI processing took 9, 19, 29 and 39 seconds
+        assert stages["ai_processing"]["count"] == 4
+        assert stages["ai_processing"]["p50_ms"] == 24000
+        assert stages["ai_processing"]["p99_ms"] == pytest.approx(
+            38700, abs=1
+        )
+        assert stages["delivery"]["p95_ms"] == 1000
+        assert stages["total"]["p50_ms"] == 26000
+
+        assert service.get_latency_percentiles(
+            days=1, path=ResponsePath.CACHE
+        )["traces"] == 0
+
+
+class TestTracedFlow:
+    def test_webhook_and_callback_record_stages(
+        self, client, db_session, customer, monkeypatch
+    ):
+        with patch(
+            "routers.whatsapp.get_onboarding_service"
+        ) as onboarding:
+            onboarding.return_value.needs_onboarding.return_value = False
+            response = client.post(
+                "/api/whatsapp/webhook",
+                data={
+                    "From": f"whatsapp:{customer.phone_number}",
+                    "Body": "When should I plant maize?",
+                    "MessageSid": "SM_TRACED_IN",
+                },
+            )
+        assert response.status_code == 200
+
+        question = (
+            db_session.query(Message)
+            .filter(Message.message_sid == "SM_TRACED_IN")
+            .one()
+        )
+        trace = db_session.query(ResponseTrace).one()
+        assert trace.message_id == question.id
+        assert trace.path == ResponsePath.REPLY
+        assert trace.received_at <= trace.onboarded_at
+        assert trace.transcribed_at is None
+
+        whatsapp = MagicMock()
+        whatsapp.return_value.send_message_with_tracking.return_value = {
+            "sid": "SM_TRACED_OUT"
+        }
+        whatsapp.sanitize_whatsapp_content.side_effect = lambda x: x
+        monkeypatch.setattr("routers.callbacks.WhatsAppService", whatsapp)
+        response = client.post(
+            "/api/callback/ai",
+            json={
+                "job_id": "job_traced",
+                "status": "completed",
+                "output": {"answer": "Plant at the onset of rain."},
+                "callback_params": {
+                    "message_id": question.id,
+                    "message_type": 1,
+                    "customer_id": customer.id,
+                },
+                "trace_id": f"reply_c{customer.id}_m{question.id}",
+                "job": "chat",
+            },
+        )
+        assert response.status_code == 200
+
+        db_session.expire_all()
+        trace = db_session.query(ResponseTrace).one()
+        reply = (
+            db_session.query(Message)
+            .filter(Message.message_sid == "SM_TRACED_OUT")
+            .one()
+        )
+        assert trace.reply_message_id == reply.id
+        assert trace.onboarded_at <= trace.ai_callback_at
+        assert trace.ai_callback_at <= trace.reply_sent_at
+
+        reply.delivery_status = DeliveryStatus.DELIVERED
+        reply.delivered_at = datetime.now(timezone.utc)
+        db_session.commit()
+        stages = ResponseTraceService(db_session).get_trace(question.id)[
+            "stages"
+        ]
+        assert stages["delivered"] is not None
+        assert stages["ai_job_created"] is None
+
+    def test_latency_endpoints_are_admin_only(
+        self, client, db_session, customer, auth_headers_factory
+    ):
+        message = _message(db_session, customer, "SM_TRACE_API")
+        ResponseTraceService(db_session).start(
+            message.id,
+            ResponsePath.REPLY,
+            received_at=datetime.now(timezone.utc),
+        )
+        db_session.commit()
+
+        headers, _ = auth_headers_factory(user_type="admin")
+        response = client.get(
+            "/api/admin/analytics/response-latency?days=1&path=reply",
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert response.json()["traces"] == 1
+        assert [s["stage"] for s in response.json()["stages"]][:2] == [
+            "transcription",
+            "onboarding",
+        ]
+
+        response = client.get(
+            f"/api/admin/analytics/response-latency/{message.id}",
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert response.json()["path"] == ResponsePath.REPLY
+        response = client.get(
+            "/api/admin/analytics/response-latency/999999",
+            headers=headers,
+        )
+        assert response.status_code == 404
+
+        eo_headers, _ = auth_headers_factory(
+            user_type="eo", email="trace-eo@test.com"
+        )
+        response = client.get(
+            "/api/admin/analytics/response-latency", headers=eo_headers
+        )
+        assert response.status_code == 403
@@ -401,6 +401,44 @@ class TestRetryExecution:
             assert message.twilio_error_code == "30003"
             assert "Network error" in message.twilio_error_message
 
+    def test_unexpected_error_counts_the_attempt(self, db_session):
+        """Test that a non-Twilio failure still uses up an attempt"""
+        customer = Customer(
+            phone_number="+255712345678",
+            full_name="Test Farmer",
+        )
+        db_session.add(customer)
+        db_session.commit()
+
+        message = Message(
+            message_sid="SM_FAILED_UNEXPECTED",
+            customer_id=customer.id,
+            body="Test message",
+            from_source=MessageFrom.LLM,
+            delivery_status=DeliveryStatus.FAILED,
+            retry_count=settings.retry_max_attempts - 1,
+            created_at=datetime.now(timezone.utc) - timedelta(hours=2),
+        )
+        db_session.add(message)
+        db_session.commit()
+
+        service = RetryService(db_session)
+        with patch.object(
+            service.whatsapp_service, "send_message_with_tracking"
+        ) as mock_send:
+            mock_send.side_effect = ValueError("Invalid phone number")
+
+            assert service.retry_message(message) is False
+
+        db_session.refresh(message)
+        assert message.delivery_status == DeliveryStatus.FAILED
+        assert message.retry_count == settings.retry_max_attempts
+        assert message.last_retry_at is not None
+        assert message.twilio_error_code is None
+        assert "Invalid phone number" in message.twilio_error_message
+        # Out of attempts: never claimed again
+        assert service.claim_messages_for_retry(limit=10) == []
+
 
 class TestRetryBatch:
     """Test batch retry operations"""
@@ -596,3 +634,157 @@ class TestRetryStatus:
         status = service.get_retry_status(99999)
 
         assert status is None
+
+
+class TestRetryQueue:
+    """Test the indexed retry queue (next_retry_at + claim)"""
+
+    def _create_failed_message(self, db_session, customer, sid, **kwargs):
+        message = Message(
+            message_sid=sid,
+            customer_id=customer.id,
+            body="Test message",
+            from_source=MessageFrom.LLM,
+            delivery_status=DeliveryStatus.FAILED,
+            retry_count=0,
+            created_at=datetime.now(timezone.utc) - timedelta(minutes=10),
+            **kwargs,
+        )
+        db_session.add(message)
+        db_session.commit()
+        return message
+
+    def test_next_retry_at_computed_at_failure_time(self, db_session):
+        """Test that recording a failure schedules the next retry"""
+        customer = Customer(
+            phone_number="+255712345678",
+            full_name="Test Farmer",
+        )
+        db_session.add(customer)
+        db_session.commit()
+
+        message = Message(
+            message_sid="SM_QUEUE",
+            customer_id=customer.id,
+            body="Test message",
+            from_source=MessageFrom.LLM,
+            delivery_status=DeliveryStatus.SENT,
+        )
+        db_session.add(message)
+        db_session.commit()
+        assert message.next_retry_at is None
+
+        # Failure reported (e.g., by Twilio status callback)
+        message.delivery_status = DeliveryStatus.UNDELIVERED
+        message.last_retry_at = datetime.now(timezone.utc)
+        db_session.commit()
+        db_session.refresh(message)
+
+        expected = message.last_retry_at + timedelta(
+            minutes=settings.retry_backoff_minutes[0]
+        )
+        assert message.next_retry_at == expected
+
+        # Delivered later: leaves the queue
+        message.delivery_status = DeliveryStatus.DELIVERED
+        db_session.commit()
+        db_session.refresh(message)
+        assert message.next_retry_at is None
+
+    def test_permanent_error_and_inbound_not_queued(self, db_session):
+        """Test that permanent errors and inbound messages never queue"""
+        customer = Customer(
+            phone_number="+255712345678",
+            full_name="Test Farmer",
+        )
+        db_session.add(customer)
+        db_session.commit()
+
+        permanent = self._create_failed_message(
+            db_session, customer, "SM_PERM", twilio_error_code="21211"
+        )
+        inbound = Message(
+            message_sid="SM_INBOUND",
+            customer_id=customer.id,
+            body="Question",
+            from_source=MessageFrom.CUSTOMER,
+            delivery_status=DeliveryStatus.FAILED,
+        )
+        db_session.add(inbound)
+        db_session.commit()
+
+        assert permanent.next_retry_at is None
+        assert inbound.next_retry_at is None
+
+    def test_claim_leases_messages(self, db_session):
+        """Test that claimed messages are hidden from later claims"""
+        customer = Customer(
+            phone_number="+255712345678",
+            full_name="Test Farmer",
+        )
+        db_session.add(customer)
+        db_session.commit()
+
+        for i in range(3):
+            self._create_failed_message(db_session, customer, f"SM_C_{i}")
+
+        service = RetryService(db_session)
+        claimed = service.claim_messages_for_retry(limit=2)
+        assert len(claimed) == 2
+        for message in claimed:
+            assert message.next_retry_at > datetime.now(timezone.utc)
+
+        remaining = service.claim_messages_for_retry(limit=10)
+        assert len(remaining) == 1
+        assert service.claim_messages_for_retry(limit=10) == []
+
+    def test_failed_retry_reschedules_with_next_backoff(self, db_session):
+        """Test that a failed retry re-enters the queue with more backoff"""
+        from twilio.base.exceptions import TwilioRestException
+
+        customer = Customer(
+            phone_number="+255712345678",
+            full_name="Test Farmer",
+        )
+        db_session.add(customer)
+        db_session.commit()
+        message = self._create_failed_message(db_session, customer, "SM_R")
+
+        service = RetryService(db_session)
+        with patch.object(
+            service.whatsapp_service, "send_message_with_tracking"
+        ) as mock_send:
+            mock_send.side_effect = TwilioRestException(
+                status=400, uri="test", msg="Network error", code=30003
+            )
+            stats = service.retry_all_pending()
+
+        assert stats["total_attempted"] == 1
+        db_session.refresh(message)
+        assert message.retry_count == 1
+        assert message.next_retry_at == message.last_retry_at + timedelta(
+            minutes=settings.retry_backoff_minutes[1]
+        )
+
+    def test_retry_task_drains_queue(self, db_session):
+        """Test the Celery beat task retries due messages"""
+        from tasks.retry_tasks import retry_failed_messages
+
+        customer = Customer(
+            phone_number="+255712345678",
+            full_name="Test Farmer",
+        )
+        db_session.add(customer)
+        db_session.commit()
+        message = self._create_failed_message(db_session, customer, "SM_T")
+
+        with patch(
+            "tasks.retry_tasks.SessionLocal", return_value=db_session
+        ), patch.object(db_session, "close"):
+            result = retry_failed_messages()
+
+        assert result["total_attempted"] == 1
+        assert result["successful"] == 1
+        db_session.refresh(message)
+        assert message.delivery_status == DeliveryStatus.SENT
+        assert message.next_retry_at is None
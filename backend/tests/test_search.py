@@ -0,0 +1,136 @@
+"""Tests for the trigram-backed list search and estimated totals."""
+
+from models.customer import Customer
+from services.customer_service import CustomerService
+from services.user_service import UserService
+from models.user import User, UserType
+from utils.search import (
+    count_matches,
+    escape_like,
+    is_estimate,
+    phone_digits,
+)
+
+
+def _customers(db_session, *rows):
+    customers = [
+        Customer(phone_number=phone, full_name=name) for phone, name in rows
+    ]
+    db_session.add_all(customers)
+    db_session.commit()
+    return customers
+
+
+class TestSearchTerms:
+    def test_phone_digits(self):
+        assert phone_digits("0712 345 678") == "712345678"
+        assert phone_digits("+255 712-345") == "255712345"
+        assert phone_digits("(0712) 34") == "71234"
+        # Too short for the trigram index, or not a phone number
+        assert phone_digits("07") is None
+        assert phone_digits("John") is None
+        assert phone_digits("John 0712") is None
+
+    def test_escape_like(self):
+        assert escape_like("100%_a\\b") == "100\\%\\_a\\\\b"
+
+
+class TestCustomerSearch:
+    def test_local_phone_format_matches_e164(self, db_session):
+        _customers(
+            db_session,
+            ("+255712345678", "Amina Juma"),
+            ("+255787123456", "Baraka Mwita"),
+        )
+        customers, total = CustomerService(db_session).get_customers_list(
+            search="0712 345 678"
+        )
+        assert total == 1
+        assert customers[0]["full_name"] == "Amina Juma"
+
+    def test_phone_suffix_ranks_first(self, db_session):
+        _customers(
+            db_session,
+            ("+255456780000", "Contains"),
+            ("+255700045678", "Suffix"),
+        )
+        customers, total = CustomerService(db_session).get_customers_list(
+            search="45678"
+        )
+        assert total == 2
+        assert [c["full_name"] for c in customers] == ["Suffix", "Contains"]
+
+    def test_name_search_is_ranked_and_escaped(self, db_session):
+        _customers(
+            db_session,
+            ("+255700000001", "Johnathan Peter"),
+            ("+255700000002", "John"),
+            ("+255700000003", "Mary 100%"),
+        )
+        service = CustomerService(db_session)
+
+        customers, total = service.get_customers_list(search="john")
+        assert total == 2
+        assert customers[0]["full_name"] == "John"
+
+        customers, total = service.get_customers_list(search="0%")
+        assert [c["full_name"] for c in customers] == ["Mary 100%"]
+
+
+class TestUserSearch:
+    def test_search_by_email_and_phone(self, db_session):
+        db_session.add_all(
+            [
+                User(
+                    email="amina@example.com",
+                    phone_number="+255712000001",
+                    full_name="Amina EO",
+                    user_type=UserType.EXTENSION_OFFICER,
+                ),
+                User(
+                    email="peter@example.com",
+                    phone_number="+255712000002",
+                    full_name="Peter EO",
+                    user_type=UserType.EXTENSION_OFFICER,
+                ),
+            ]
+        )
+        db_session.commit()
+
+        users, total = UserService.get_users_list(db_session, search="amina@")
+        assert total == 1
+        assert users[0]["full_name"] == "Amina EO"
+
+        users, total = UserService.get_users_list(
+            db_session, search="0712000002"
+        )
+        assert [u["full_name"] for u in users] == ["Peter EO"]
+
+
+class TestCountMatches:
+    def test_exact_below_limit_estimated_above(self, db_session):
+        _customers(
+            db_session,
+            *((f"+2557000001{n:02d}", f"Farmer {n}") for n in range(12))
+        )
+        query = db_session.query(Customer)
+
+        assert count_matches(db_session, query, exact_limit=20) == 12
+        assert not is_estimate(12, exact_limit=20)
+
+        total = count_matches(db_session, query, exact_limit=5)
+        assert total > 5
+        assert is_estimate(total, exact_limit=5)
+
+    def test_list_response_flags_estimates(
+        self, client, auth_headers_factory, monkeypatch
+    ):
+        from config import settings
+
+        headers, _ = auth_headers_factory(user_type="admin")
+        response = client.get("/api/customers/list", headers=headers)
+        assert response.json()["total_is_estimate"] is False
+
+        monkeypatch.setattr(settings, "search_exact_count_limit", -1)
+        response = client.get("/api/customers/list", headers=headers)
+        assert response.json()["total_is_estimate"] is True
@@ -0,0 +1,163 @@
+"""Tests for the COPY-based seeders and the synthetic dataset generator."""
+
+from datetime import datetime, timezone
+
+from models.administrative import (
+    Administrative,
+    CustomerAdministrative,
+    UserAdministrative,
+)
+from models.conversation_state import ConversationState
+from models.customer import Customer, OnboardingStatus
+from models.message import Message, MessageFrom
+from models.ticket import Ticket
+from seeder.administrative import seed_administrative_data
+from seeder.bulk import copy_rows, reserve_ids, update_rows
+from seeder.customer import create_fake_customers
+from seeder.synthetic import SyntheticConfig, generate_dataset
+
+ROWS = [
+    {"code": "TZ", "name": "Tanzania", "level": "country", "parent_code": ""},
+    {"code": "AR", "name": "Arusha", "level": "region", "parent_code": "TZ"},
+    {"code": "MR", "name": "Meru", "level": "district", "parent_code": "AR"},
+    {"code": "W1", "name": "Ward 1", "level": "ward", "parent_code": "MR"},
+    {"code": "W2", "name": "Ward 2", "level": "ward", "parent_code": "MR"},
+]
+
+
+class TestBulkHelpers:
+    def test_copy_and_update_rows(self, db_session):
+        ids = reserve_ids(db_session, Customer, 2)
+        assert len(set(ids)) == 2
+
+        written = copy_rows(
+            db_session,
+            Customer,
+            [
+                {
+                    "id": ids[0],
+                    "phone_number": "+255700000101",
+                    "full_name": 'Amina "Mama" Juma',
+                    "onboarding_status": OnboardingStatus.COMPLETED,
+                    "profile_data": {"crop_type": "Maize"},
+                },
+                {
+                    "id": ids[1],
+                    "phone_number": "+255700000102",
+                    "full_name": None,
+                    "onboarding_status": OnboardingStatus.NOT_STARTED,
+                    "profile_data": None,
+                },
+            ],
+        )
+        update_rows(
+            db_session,
+            Customer,
+            [{"id": ids[1], "full_name": "Baraka"}],
+            ["full_name"],
+        )
+        db_session.commit()
+
+        assert written == 2
+        first = db_session.get(Customer, ids[0])
+        second = db_session.get(Customer, ids[1])
+        assert first.full_name == 'Amina "Mama" Juma'
+        assert first.onboarding_status == OnboardingStatus.COMPLETED
+        assert first.profile_data == {"crop_type": "Maize"}
+        # Python-side defaults are applied to columns not given
+        assert first.created_at is not None
+        assert second.full_name == "Baraka"
+
+    def test_empty_rows_are_a_no_op(self, db_session):
+        assert reserve_ids(db_session, Customer, 0) == []
+        assert copy_rows(db_session, Customer, []) == 0
+        assert update_rows(db_session, Customer, [], ["full_name"]) == 0
+
+
+class TestSeeders:
+    def test_seed_administrative_resolves_parents_in_memory(
+        self, db_session
+    ):
+        stats = seed_administrative_data(db_session, ROWS)
+        assert stats["created"] == 5
+        assert stats["errors"] == 0
+
+        ward = db_session.query(Administrative).filter_by(code="W1").one()
+        assert ward.path == "Tanzania - Arusha - Meru - Ward 1"
+        assert ward.parent.code == "MR"
+
+        renamed = [dict(row) for row in ROWS]
+        renamed[2]["name"] = "Meru DC"
+        stats = seed_administrative_data(db_session, renamed)
+        assert (stats["created"], stats["updated"], stats["skipped"]) == (
+            0,
+            1,
+            4,
+        )
+        db_session.expire_all()
+        district = db_session.query(Administrative).filter_by(code="MR").one()
+        assert district.name == "Meru DC"
+
+    def test_seed_administrative_reports_missing_parent(self, db_session):
+        rows = ROWS[:1] + [
+            {
+                "code": "X1",
+                "name": "Orphan",
+                "level": "region",
+                "parent_code": "NOPE",
+            }
+        ]
+        stats = seed_administrative_data(db_session, rows)
+        assert stats["created"] == 1
+        assert stats["errors"] == 1
+        assert "Parent not found" in stats["error_messages"][0]
+
+    def test_create_fake_customers(self, db_session):
+        seed_administrative_data(db_session, ROWS)
+        created = create_fake_customers(db_session, count=25)
+
+        assert created == db_session.query(Customer).count()
+        assert (
+            db_session.query(CustomerAdministrative).count() == created
+        )
+
+
+class TestSyntheticDataset:
+    def test_generate_dataset(self, db_session):
+        seed_administrative_data(db_session, ROWS)
+        config = SyntheticConfig(
+            customers=60,
+            days=30,
+            messages_per_customer=6,
+            escalation_rate=0.3,
+            officers=2,
+            broadcasts=2,
+            chunk_size=25,
+            now=datetime(2026, 1, 31, tzinfo=timezone.utc),
+        )
+        counts = generate_dataset(db_session, config)
+
+        assert counts["customers"] == 60
+        assert db_session.query(Customer).count() == 60
+        assert db_session.query(Message).count() == counts["messages"]
+        assert db_session.query(Ticket).count() == counts["tickets"]
+        assert db_session.query(UserAdministrative).count() == 2
+        assert counts["broadcast_recipients"] == 2 * 18
+        # Conversation state rows are filled although COPY skips events
+        assert db_session.query(ConversationState).count() == 60
+
+        customer = db_session.query(Customer).first()
+        last = (
+            db_session.query(Message)
+            .filter(Message.customer_id == customer.id)
+            .order_by(Message.created_at.desc(), Message.id.desc())
+            .first()
+        )
+        assert customer.last_message_at == last.created_at
+        assert db_session.query(Message).filter(
+            Message.from_source == MessageFrom.CUSTOMER
+        ).count() > 0
+
+        # Same seed again: existing farmers are skipped
+        config.officers = 0
+        assert generate_dataset(db_session, config)["customers"] == 0
@@ -0,0 +1,241 @@
+"""Tests for request coalescing (single-flight)."""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import redis
+
+from services.openai_service import OpenAIService
+from utils.single_flight import RedisSingleFlight, SingleFlight, request_key
+
+
+class FakeRedis:
+    """Just enough of redis.Redis for the lock and result keys"""
+
+    def __init__(self):
+        self.data = {}
+        # Threads the client was called from
+        self.threads = set()
+
+    def set(self, key, value, nx=False, px=None):
+        self.threads.add(threading.get_ident())
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        return True
+
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return self.data.get(key)
+
+    def exists(self, key):
+        self.threads.add(threading.get_ident())
+        return int(key in self.data)
+
+    def delete(self, key):
+        return int(self.data.pop(key, None) is not None)
+
+    def eval(self, script, numkeys, key, token):
+        # The compare-and-delete release script
+        self.threads.add(threading.get_ident())
+        if self.data.get(key) == token.encode():
+            return self.delete(key)
+        return 0
+
+
+class TestRequestKey:
+    def test_key_is_stable_and_argument_sensitive(self):
+        key = request_key("ns", "text", {"b": 1, "a": 2})
+        assert key == request_key("ns", "text", {"a": 2, "b": 1})
+        assert key.startswith("ns:")
+        assert key != request_key("ns", "text", {"a": 2, "b": 2})
+        assert key != request_key("other", "text", {"a": 2, "b": 1})
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_request(self):
+        group = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(
+            *[group.do("k", fetch) for _ in range(5)]
+        )
+
+        assert results == ["result"] * 5
+        assert len(calls) == 1
+        assert group.stats == {"calls": 5, "coalesced": 4}
+        assert group.in_flight() == 0
+
+        # Finished calls are not cached
+        await group.do("k", fetch)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_reaches_every_caller(self):
+        group = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream down")
+
+        results = await asyncio.gather(
+            group.do("k", fail), group.do("k", fail),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert group.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_follower_does_not_cancel_leader(self):
+        group = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "result"
+
+        leader = asyncio.ensure_future(group.do("k", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(group.do("k", fetch))
+        await asyncio.sleep(0)
+        follower.cancel()
+
+        assert await leader == "result"
+
+
+class TestRedisSingleFlight:
+    @pytest.mark.asyncio
+    async def test_follower_process_reuses_leader_result(
+        self, monkeypatch
+    ):
+        monkeypatch.setattr(
+            "utils.single_flight.settings.single_flight_wait_timeout_ms",
+            2000,
+        )
+        client = FakeRedis()
+        # Two groups with separate local state act as two workers
+        worker_a = RedisSingleFlight(client=client)
+        worker_b = RedisSingleFlight(client=client)
+        fetch = AsyncMock(return_value={"text": "Rain tomorrow"})
+
+        async def slow_fetch():
+            await asyncio.sleep(0.15)
+            return await fetch()
+
+        results = await asyncio.gather(
+            worker_a.do("k", slow_fetch), worker_b.do("k", slow_fetch)
+        )
+
+        assert results == [{"text": "Rain tomorrow"}] * 2
+        assert fetch.await_count == 1
+        assert "single_flight:lock:k" not in client.data
+
+    @pytest.mark.asyncio
+    async def test_follower_computes_when_leader_fails(self):
+        client = FakeRedis()
+        client.set("single_flight:lock:k", "1")
+        group = RedisSingleFlight(client=client)
+
+        async def release_lock():
+            await asyncio.sleep(0.05)
+            client.delete("single_flight:lock:k")
+
+        fetch = AsyncMock(return_value="own result")
+        result, _ = await asyncio.gather(
+            group.do("k", fetch), release_lock()
+        )
+
+        assert result == "own result"
+        fetch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_leader_keeps_lock_taken_over_after_ttl(self):
+        client = FakeRedis()
+        group = RedisSingleFlight(client=client)
+
+        async def fetch():
+            # The lock expired and another leader took it meanwhile
+            client.data["single_flight:lock:k"] = b"other leader"
+            return 1
+
+        assert await group.do("k", fetch) == 1
+        assert client.data["single_flight:lock:k"] == b"other leader"
+
+    @pytest.mark.asyncio
+    async def test_redis_is_called_off_the_event_loop(self):
+        client = FakeRedis()
+        group = RedisSingleFlight(client=client)
+
+        assert await group.do("k", AsyncMock(return_value=1)) == 1
+        assert client.threads
+        assert threading.get_ident() not in client.threads
+
+    @pytest.mark.asyncio
+    async def test_redis_error_falls_back_to_direct_call(self):
+        client = MagicMock()
+        client.set.side_effect = redis.ConnectionError("down")
+        group = RedisSingleFlight(client=client)
+
+        assert await group.do("k", AsyncMock(return_value=1)) == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_uses_in_process_group_only(self):
+        group = RedisSingleFlight()
+        with patch.object(group, "_get_client") as get_client:
+            assert await group.do("k", AsyncMock(return_value=1)) == 1
+        get_client.assert_not_called()
+
+
+class TestOpenAIServiceCoalescing:
+    @pytest.mark.asyncio
+    async def test_identical_translations_share_one_completion(self):
+        service = OpenAIService()
+        service.is_configured = MagicMock(return_value=True)
+
+        async def chat_completion(**kwargs):
+            await asyncio.sleep(0.01)
+            response = MagicMock()
+            response.content = "Habari"
+            return response
+
+        service.chat_completion = AsyncMock(side_effect=chat_completion)
+
+        results = await asyncio.gather(
+            *[
+                service.translate_text("Hello", "sw", source_language="en")
+                for _ in range(3)
+            ],
+            service.translate_text("Bye", "sw", source_language="en"),
+        )
+
+        assert results == ["Habari"] * 4
+        assert service.chat_completion.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_classify_language_ignores_case_and_spacing(self):
+        service = OpenAIService()
+        service.is_configured = MagicMock(return_value=True)
+
+        async def chat_completion(**kwargs):
+            await asyncio.sleep(0.01)
+            response = MagicMock()
+            response.content = "sw"
+            return response
+
+        service.chat_completion = AsyncMock(side_effect=chat_completion)
+
+        results = await asyncio.gather(
+            service.classify_language("Habari yako"),
+            service.classify_language("habari  YAKO "),
+        )
+
+        assert results == ["sw", "sw"]
+        service.chat_completion.assert_awaited_once()
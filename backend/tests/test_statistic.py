@@ -10,7 +10,7 @@ from unittest.mock import patch
 import pytest
 
 from models.customer import Customer, CustomerLanguage, OnboardingStatus
-from models.message import Message, MessageFrom
+from models.message import DeliveryStatus, Message, MessageFrom
 from models.ticket import Ticket
 from models.user import User, UserType
 from models.administrative import (
@@ -19,6 +19,7 @@ from models.administrative import (
     UserAdministrative,
 )
 from models.broadcast import BroadcastMessage
+from schemas.callback import MessageType
 from seeder.administrative import seed_administrative_data
 
 
@@ -1380,3 +1381,162 @@ class TestEOAggregate:
             if wangu:
                 assert wangu["eo_count"] >= 1
                 assert wangu["total_replies"] >= 1
+
+
+class TestDeliveryStats:
+    """Test outbound message delivery statistics endpoint."""
+
+    def _create_messages(self, db_session, administrative_data):
+        """Create outbound messages with mixed delivery outcomes."""
+        c1 = Customer(
+            phone_number="+254700000401",
+            onboarding_status=OnboardingStatus.COMPLETED,
+            language=CustomerLanguage.EN,
+        )
+        c2 = Customer(
+            phone_number="+254700000402",
+            onboarding_status=OnboardingStatus.COMPLETED,
+            language=CustomerLanguage.EN,
+        )
+        db_session.add_all([c1, c2])
+        db_session.commit()
+
+        db_session.add_all(
+            [
+                CustomerAdministrative(
+                    customer_id=c1.id,
+                    administrative_id=administrative_data["ward1"].id,
+                ),
+                CustomerAdministrative(
+                    customer_id=c2.id,
+                    administrative_id=administrative_data["ward2"].id,
+                ),
+            ]
+        )
+
+        rows = [
+            (c1, MessageType.REPLY, DeliveryStatus.DELIVERED, None),
+            (c1, MessageType.REPLY, DeliveryStatus.READ, None),
+            (c1, MessageType.BROADCAST, DeliveryStatus.FAILED, "63016"),
+            (c2, MessageType.BROADCAST, DeliveryStatus.UNDELIVERED, "63016"),
+            (c2, MessageType.REPLY, DeliveryStatus.FAILED, "63024"),
+            (c2, MessageType.REPLY, DeliveryStatus.SENT, None),
+        ]
+        for i, (customer, msg_type, status, code) in enumerate(rows):
+            db_session.add(
+                Message(
+                    message_sid=f"DELIVERY_STATS_{i}",
+                    customer_id=customer.id,
+                    body="Outbound",
+                    from_source=MessageFrom.LLM,
+                    message_type=msg_type,
+                    delivery_status=status,
+                    twilio_error_code=code,
+                )
+            )
+        # Inbound farmer messages are not part of delivery stats
+        db_session.add(
+            Message(
+                message_sid="DELIVERY_STATS_INBOUND",
+                customer_id=c1.id,
+                body="Question",
+                from_source=MessageFrom.CUSTOMER,
+            )
+        )
+        db_session.commit()
+
+    def test_delivery_stats_breakdowns(
+        self, client, db_session, administrative_data
+    ):
+        """Test summary, type and error code breakdowns."""
+        self._create_messages(db_session, administrative_data)
+
+        with patch(
+            "config.settings.statistic_api_token", TEST_STATISTIC_TOKEN
+        ):
+            headers = {"Authorization": f"Bearer {TEST_STATISTIC_TOKEN}"}
+            response = client.get(
+                "/api/statistic/messages/delivery?include_wards=true",
+                headers=headers,
+            )
+            assert response.status_code == 200
+
+            data = response.json()
+            summary = data["summary"]
+            assert summary["total"] == 6
+            assert summary["delivered"] == 2
+            assert summary["failed"] == 3
+            assert summary["success_rate"] == 33.33
+            assert summary["by_status"]["FAILED"] == 2
+            assert summary["by_status"]["PENDING"] == 0
+
+            assert len(data["time_series"]) == 1
+            assert data["time_series"][0]["total"] == 6
+
+            by_type = {t["message_type"]: t for t in data["by_message_type"]}
+            assert by_type["REPLY"]["total"] == 4
+            assert by_type["BROADCAST"]["failed"] == 2
+
+            assert data["by_error_code"][0] == {
+                "error_code": "63016",
+                "count": 2,
+            }
+
+            by_ward = {w["ward_name"]: w for w in data["by_ward"]}
+            assert by_ward["Wangu"]["total"] == 3
+            assert by_ward["Mukangu"]["failed"] == 2
+
+    def test_delivery_stats_filters(
+        self, client, db_session, administrative_data
+    ):
+        """Test administrative and message type filters."""
+        self._create_messages(db_session, administrative_data)
+
+        with patch(
+            "config.settings.statistic_api_token", TEST_STATISTIC_TOKEN
+        ):
+            headers = {"Authorization": f"Bearer {TEST_STATISTIC_TOKEN}"}
+            ward_id = administrative_data["ward1"].id
+            response = client.get(
+                "/api/statistic/messages/delivery"
+                f"?administrative_id={ward_id}&message_type=reply",
+                headers=headers,
+            )
+            assert response.status_code == 200
+
+            data = response.json()
+            assert data["summary"]["total"] == 2
+            assert data["summary"]["success_rate"] == 100.0
+            assert data["by_error_code"] == []
+            assert data["by_ward"] == []
+            assert data["filters"]["administrative_id"] == ward_id
+
+
+class TestDBPoolStats:
+    """Tests for /api/statistic/system/db-pool endpoint."""
+
+    def test_db_pool_stats(self, client, db_session):
+        """Test pool metrics are reported for the primary engine."""
+        from database import DB_ENGINE_PROFILE, SessionLocal
+        from sqlalchemy import text
+
+        db = SessionLocal()
+        try:
+            db.execute(text("SELECT 1"))
+        finally:
+            db.close()
+
+        with patch(
+            "config.settings.statistic_api_token", TEST_STATISTIC_TOKEN
+        ):
+            headers = {"Authorization": f"Bearer {TEST_STATISTIC_TOKEN}"}
+            response = client.get(
+                "/api/statistic/system/db-pool", headers=headers
+            )
+            assert response.status_code == 200
+
+            pools = {p["role"]: p for p in response.json()["pools"]}
+            primary = pools[DB_ENGINE_PROFILE]
+            assert primary["checkouts"] >= 1
+            assert primary["timeouts"] == 0
+            assert 0 <= primary["saturation"] <= 1
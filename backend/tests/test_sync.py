@@ -0,0 +1,278 @@
+"""Tests for the mobile delta-sync endpoint (GET /api/sync)."""
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from models.administrative import Administrative
+from models.customer import Customer
+from models.message import DeliveryStatus, Message, MessageFrom
+from models.ticket import Ticket
+from schemas.callback import MessageType
+from seeder.administrative import seed_administrative_data
+from services.sync_service import decode_cursor
+
+
+@pytest.fixture
+def sync_data(db_session):
+    """Two wards, each with a customer, an escalated ticket and messages."""
+    seed_administrative_data(
+        db_session,
+        [
+            {"code": "TZ", "name": "Tanzania", "level": "Country",
+             "parent_code": ""},
+            {"code": "MWZ", "name": "Mwanza", "level": "Region",
+             "parent_code": "TZ"},
+            {"code": "MWZ-KWM", "name": "Kwimba", "level": "District",
+             "parent_code": "MWZ"},
+            {"code": "MWZ-KWM-NGU", "name": "Ngudu", "level": "Ward",
+             "parent_code": "MWZ-KWM"},
+            {"code": "MWZ-KWM-BUK", "name": "Bukandwe", "level": "Ward",
+             "parent_code": "MWZ-KWM"},
+        ],
+    )
+    wards = {
+        code: db_session.query(Administrative).filter_by(code=code).first()
+        for code in ("MWZ-KWM-NGU", "MWZ-KWM-BUK")
+    }
+
+    data = {"wards": wards}
+    for index, code in enumerate(wards):
+        customer = Customer(
+            phone_number=f"+25510000010{index}",
+            full_name=f"Farmer {index}",
+        )
+        db_session.add(customer)
+        db_session.commit()
+        question = Message(
+            message_sid=f"SYNC_Q_{index}",
+            customer_id=customer.id,
+            body="My maize leaves are yellow",
+            from_source=MessageFrom.CUSTOMER,
+        )
+        broadcast = Message(
+            message_sid=f"SYNC_B_{index}",
+            customer_id=customer.id,
+            body="Rain expected tomorrow",
+            from_source=MessageFrom.USER,
+            message_type=MessageType.BROADCAST,
+        )
+        db_session.add_all([question, broadcast])
+        db_session.commit()
+        ticket = Ticket(
+            ticket_number=f"20240101000{index}",
+            customer_id=customer.id,
+            message_id=question.id,
+            administrative_id=wards[code].id,
+        )
+        db_session.add(ticket)
+        db_session.commit()
+        data[code] = {
+            "customer": customer,
+            "question": question,
+            "broadcast": broadcast,
+            "ticket": ticket,
+        }
+    return data
+
+
+class TestSync:
+    def test_full_sync_is_scoped_to_eo_wards(
+        self, client, auth_headers_factory, sync_data
+    ):
+        ngudu = sync_data["MWZ-KWM-NGU"]
+        headers, _ = auth_headers_factory(
+            user_type="eo",
+            administrative_ids=[sync_data["wards"]["MWZ-KWM-NGU"].id],
+        )
+
+        response = client.get("/api/sync", headers=headers)
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["has_more"] is False
+        assert [t["id"] for t in data["tickets"]] == [ngudu["ticket"].id]
+        assert data["tickets"][0]["status"] == "open"
+        # Broadcasts are excluded from ticket conversations
+        assert [m["id"] for m in data["messages"]] == [
+            ngudu["question"].id
+        ]
+        assert [c["id"] for c in data["customers"]] == [
+            ngudu["customer"].id
+        ]
+        # Null fields are omitted
+        assert "resolved_at" not in data["tickets"][0]
+
+    def test_admin_sees_all_wards(
+        self, client, auth_headers_factory, sync_data
+    ):
+        headers, _ = auth_headers_factory(user_type="admin")
+
+        data = client.get("/api/sync", headers=headers).json()
+
+        assert len(data["tickets"]) == 2
+        assert len(data["customers"]) == 2
+
+    def test_incremental_sync_returns_only_changes(
+        self, client, db_session, auth_headers_factory, sync_data
+    ):
+        ngudu = sync_data["MWZ-KWM-NGU"]
+        headers, eo_user = auth_headers_factory(
+            user_type="eo",
+            administrative_ids=[sync_data["wards"]["MWZ-KWM-NGU"].id],
+        )
+        cursor = client.get("/api/sync", headers=headers).json()["cursor"]
+
+        # Nothing changed: empty payload, same cursor
+        data = client.get(
+            "/api/sync", params={"cursor": cursor}, headers=headers
+        ).json()
+        assert data["tickets"] == []
+        assert data["messages"] == []
+        assert data["customers"] == []
+        assert data["cursor"] == cursor
+
+        # EO reply, then a delivery status update on it
+        reply = Message(
+            message_sid="SYNC_REPLY",
+            customer_id=ngudu["customer"].id,
+            user_id=eo_user.id,
+            body="Apply nitrogen fertilizer",
+            from_source=MessageFrom.USER,
+            message_type=MessageType.REPLY,
+        )
+        db_session.add(reply)
+        db_session.commit()
+        data = client.get(
+            "/api/sync", params={"cursor": cursor}, headers=headers
+        ).json()
+        assert [m["id"] for m in data["messages"]] == [reply.id]
+        assert data["users"] == [
+            {
+                "id": eo_user.id,
+                "full_name": eo_user.full_name,
+                "user_type": "eo",
+            }
+        ]
+        cursor = data["cursor"]
+
+        reply.delivery_status = DeliveryStatus.DELIVERED
+        # Reconnection bookkeeping is not a profile change
+        ngudu["customer"].last_message_from = MessageFrom.USER
+        db_session.commit()
+
+        data = client.get(
+            "/api/sync", params={"cursor": cursor}, headers=headers
+        ).json()
+        assert [m["id"] for m in data["messages"]] == [reply.id]
+        assert data["messages"][0]["delivery_status"] == "DELIVERED"
+        assert data["customers"] == []
+        assert data["tickets"] == []
+
+    def test_profile_update_is_synced(
+        self, client, db_session, auth_headers_factory, sync_data
+    ):
+        ngudu = sync_data["MWZ-KWM-NGU"]
+        headers, _ = auth_headers_factory(
+            user_type="eo",
+            administrative_ids=[sync_data["wards"]["MWZ-KWM-NGU"].id],
+        )
+        cursor = client.get("/api/sync", headers=headers).json()["cursor"]
+
+        ngudu["customer"].update_profile_data({"crop_type": "Maize"})
+        db_session.commit()
+
+        data = client.get(
+            "/api/sync", params={"cursor": cursor}, headers=headers
+        ).json()
+        assert [c["id"] for c in data["customers"]] == [
+            ngudu["customer"].id
+        ]
+        assert data["customers"][0]["crop_type"] == "Maize"
+
+    def test_has_more_pages_without_gaps(
+        self, client, auth_headers_factory, sync_data
+    ):
+        headers, _ = auth_headers_factory(user_type="admin")
+
+        seen = {"tickets": set(), "messages": set(), "customers": set()}
+        cursor = None
+        for _ in range(10):
+            params = {"limit": 1}
+            if cursor:
+                params["cursor"] = cursor
+            data = client.get(
+                "/api/sync", params=params, headers=headers
+            ).json()
+            for key in seen:
+                seen[key].update(row["id"] for row in data[key])
+            cursor = data["cursor"]
+            if not data["has_more"]:
+                break
+
+        assert len(seen["tickets"]) == 2
+        assert len(seen["messages"]) == 2
+        assert len(seen["customers"]) == 2
+
+    def test_cursor_waits_for_open_transaction(
+        self, client, db_session, auth_headers_factory, sync_data
+    ):
+        ngudu = sync_data["MWZ-KWM-NGU"]
+        bukandwe = sync_data["MWZ-KWM-BUK"]
+        headers, _ = auth_headers_factory(user_type="admin")
+
+        # Another session takes a lower sync_seq and stays open while a
+        # later change (of another customer, so neither waits on the
+        # other's row locks) commits
+        other = sessionmaker(bind=db_session.get_bind())()
+        try:
+            slow = Message(
+                message_sid="SYNC_SLOW",
+                customer_id=ngudu["customer"].id,
+                body="Leaves are curling",
+                from_source=MessageFrom.CUSTOMER,
+            )
+            other.add(slow)
+            other.flush()
+            slow_id, slow_seq = slow.id, slow.sync_seq
+            recent = Message(
+                message_sid="SYNC_RECENT",
+                customer_id=bukandwe["customer"].id,
+                body="Is it too late to plant?",
+                from_source=MessageFrom.CUSTOMER,
+            )
+            db_session.add(recent)
+            db_session.commit()
+            assert recent.sync_seq > slow_seq
+
+            data = client.get("/api/sync", headers=headers).json()
+            assert recent.id in {m["id"] for m in data["messages"]}
+            assert slow_id not in {m["id"] for m in data["messages"]}
+            assert decode_cursor(data["cursor"]) < slow_seq
+
+            other.commit()
+        finally:
+            other.close()
+
+        again = client.get(
+            "/api/sync", params={"cursor": data["cursor"]}, headers=headers
+        ).json()
+        assert {slow_id, recent.id} <= {m["id"] for m in again["messages"]}
+        assert decode_cursor(again["cursor"]) >= recent.sync_seq
+
+        data = client.get(
+            "/api/sync", params={"cursor": again["cursor"]}, headers=headers
+        ).json()
+        assert data["messages"] == []
+
+    def test_invalid_cursor(self, client, auth_headers_factory):
+        headers, _ = auth_headers_factory(user_type="admin")
+
+        response = client.get(
+            "/api/sync", params={"cursor": "not-a-cursor"}, headers=headers
+        )
+
+        assert response.status_code == 400
+
+    def test_requires_auth(self, client):
+        response = client.get("/api/sync")
+        assert response.status_code in (401, 403)
@@ -0,0 +1,343 @@
+"""Tests for background, batched ticket auto-tagging."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from models.administrative import Administrative
+from models.customer import Customer
+from models.message import Message, MessageFrom
+from models.ticket import Ticket, TicketTag
+from seeder.administrative import seed_administrative_data
+from services.socketio_emitter import get_ticket_recipient_ids
+from services.tagging_service import TaggingResult, classify_tickets
+from services.ticket_tagging_service import TicketTaggingService
+from tasks.tagging_tasks import schedule_ticket_tagging
+
+
+@pytest.fixture
+def wards(db_session):
+    seed_administrative_data(
+        db_session,
+        [
+            {"code": "TZ", "name": "Tanzania", "level": "Country",
+             "parent_code": ""},
+            {"code": "MWZ", "name": "Mwanza", "level": "Region",
+             "parent_code": "TZ"},
+            {"code": "MWZ-KWM", "name": "Kwimba", "level": "District",
+             "parent_code": "MWZ"},
+            {"code": "MWZ-KWM-NGU", "name": "Ngudu", "level": "Ward",
+             "parent_code": "MWZ-KWM"},
+            {"code": "MWZ-KWM-BUK", "name": "Bukandwe", "level": "Ward",
+             "parent_code": "MWZ-KWM"},
+        ],
+    )
+    return {
+        code: db_session.query(Administrative).filter_by(code=code).first()
+        for code in ("MWZ-KWM", "MWZ-KWM-NGU", "MWZ-KWM-BUK")
+    }
+
+
+@pytest.fixture
+def make_ticket(db_session, wards):
+    counter = {"n": 0}
+
+    def _make_ticket(resolved_at=None, tag=None, body="Aphids on maize"):
+        counter["n"] += 1
+        n = counter["n"]
+        customer = Customer(
+            phone_number=f"+2551000002{n:02d}", full_name=f"Farmer {n}"
+        )
+        db_session.add(customer)
+        db_session.commit()
+        message = Message(
+            message_sid=f"TAG_Q_{n}",
+            customer_id=customer.id,
+            body=body,
+            from_source=MessageFrom.CUSTOMER,
+        )
+        db_session.add(message)
+        db_session.commit()
+        ticket = Ticket(
+            ticket_number=f"2026101800{n:04d}",
+            administrative_id=wards["MWZ-KWM-NGU"].id,
+            customer_id=customer.id,
+            message_id=message.id,
+            resolved_at=resolved_at,
+            tag=tag,
+        )
+        db_session.add(ticket)
+        db_session.commit()
+        return ticket
+
+    return _make_ticket
+
+
+def _openai_returning(data):
+    service = MagicMock()
+    service.is_configured.return_value = True
+    response = MagicMock()
+    response.data = data
+    service.structured_output = AsyncMock(return_value=response)
+    return service
+
+
+class TestClassifyTickets:
+    @pytest.mark.asyncio
+    async def test_one_call_for_all_tickets(self):
+        service = _openai_returning(
+            {
+                "results": [
+                    {"ticket_id": 1, "tag": "PEST", "confidence": 0.9},
+                    {"ticket_id": 2, "tag": "NOT_A_TAG", "confidence": 3},
+                    {"ticket_id": 99, "tag": "PEST", "confidence": 0.9},
+                ]
+            }
+        )
+        conversations = {
+            1: [{"body": "Aphids", "from_source": "whatsapp"}],
+            2: [{"body": "Market prices", "from_source": "whatsapp"}],
+            3: [{"body": "Yellow leaves", "from_source": "whatsapp"}],
+        }
+        with patch(
+            "services.tagging_service.get_openai_service",
+            return_value=service,
+        ):
+            results = await classify_tickets(conversations)
+
+        service.structured_output.assert_awaited_once()
+        prompt = service.structured_output.call_args.kwargs["messages"]
+        assert "### Ticket 3" in prompt[1]["content"]
+        assert results[1].tag == TicketTag.PEST
+        assert results[2].tag == TicketTag.OTHER
+        assert results[2].confidence == 1.0
+        # Skipped by the model or not requested
+        assert 3 not in results
+        assert 99 not in results
+
+    @pytest.mark.asyncio
+    async def test_empty_conversations_skip_the_model(self):
+        service = _openai_returning({"results": []})
+        with patch(
+            "services.tagging_service.get_openai_service",
+            return_value=service,
+        ):
+            results = await classify_tickets({5: []})
+
+        service.structured_output.assert_not_called()
+        assert results[5].tag == TicketTag.OTHER
+
+    @pytest.mark.asyncio
+    async def test_unconfigured_openai_returns_nothing(self):
+        service = MagicMock()
+        service.is_configured.return_value = False
+        with patch(
+            "services.tagging_service.get_openai_service",
+            return_value=service,
+        ):
+            results = await classify_tickets(
+                {1: [{"body": "Aphids", "from_source": "whatsapp"}]}
+            )
+        assert results == {}
+
+
+class TestTicketTaggingService:
+    def test_tags_resolved_untagged_tickets_in_one_batch(
+        self, db_session, make_ticket
+    ):
+        now = datetime.now(timezone.utc)
+        first = make_ticket(resolved_at=now)
+        second = make_ticket(resolved_at=now)
+        skipped = make_ticket(resolved_at=now)
+        open_ticket = make_ticket()
+        tagged = make_ticket(resolved_at=now, tag=TicketTag.HARVESTING.value)
+
+        classify = AsyncMock(
+            return_value={
+                first.id: TaggingResult(TicketTag.PEST, 0.9),
+                second.id: TaggingResult(TicketTag.IRRIGATION, 0.7),
+            }
+        )
+        with patch(
+            "services.ticket_tagging_service.classify_tickets", classify
+        ), patch(
+            "services.ticket_tagging_service.emit_ticket_tagged"
+        ) as emit:
+            stats = TicketTaggingService(db_session).tag_pending(
+                batch_size=10
+            )
+
+        assert stats == {"attempted": 3, "tagged": 2, "failed": 1}
+        classify.assert_awaited_once()
+        assert set(classify.call_args.args[0]) == {
+            first.id,
+            second.id,
+            skipped.id,
+        }
+        assert emit.call_count == 2
+        assert emit.call_args_list[0].kwargs["tag"] == "pest"
+
+        for ticket in (first, second, skipped, open_ticket, tagged):
+            db_session.refresh(ticket)
+        assert first.tag == TicketTag.PEST.value
+        assert first.tag_confidence == 0.9
+        assert second.tag == TicketTag.IRRIGATION.value
+        assert skipped.tag is None
+        assert open_ticket.tag is None
+        assert tagged.tag == TicketTag.HARVESTING.value
+
+    def test_stops_when_a_batch_fails(self, db_session, make_ticket):
+        now = datetime.now(timezone.utc)
+        for _ in range(3):
+            make_ticket(resolved_at=now)
+
+        classify = AsyncMock(return_value={})
+        with patch(
+            "services.ticket_tagging_service.classify_tickets", classify
+        ), patch("services.ticket_tagging_service.emit_ticket_tagged"):
+            stats = TicketTaggingService(db_session).tag_pending(
+                batch_size=1
+            )
+
+        assert stats == {"attempted": 1, "tagged": 0, "failed": 1}
+        assert classify.await_count == 1
+
+    def test_resolved_since_and_max_tickets(self, db_session, make_ticket):
+        now = datetime.now(timezone.utc)
+        make_ticket(resolved_at=now - timedelta(days=3))
+        recent = [make_ticket(resolved_at=now) for _ in range(3)]
+
+        service = TicketTaggingService(db_session)
+        since = now - timedelta(hours=24)
+        assert service.count_untagged() == 4
+        assert service.count_untagged(resolved_since=since) == 3
+
+        async def tag_all(conversations):
+            return {
+                ticket_id: TaggingResult(TicketTag.PEST, 0.8)
+                for ticket_id in conversations
+            }
+
+        with patch(
+            "services.ticket_tagging_service.classify_tickets", tag_all
+        ), patch("services.ticket_tagging_service.emit_ticket_tagged"):
+            stats = service.tag_pending(
+                batch_size=1, resolved_since=since, max_tickets=2
+            )
+
+        assert stats["tagged"] == 2
+        assert [t.id for t in recent[:2]] == [
+            t.id for t in db_session.query(Ticket).filter(
+                Ticket.tag.isnot(None)
+            ).order_by(Ticket.id)
+        ]
+
+    def test_conversation_ends_at_resolution(self, db_session, make_ticket):
+        now = datetime.now(timezone.utc)
+        ticket = make_ticket(resolved_at=now)
+        ticket.message.created_at = now - timedelta(minutes=10)
+        db_session.add_all(
+            [
+                Message(
+                    message_sid="TAG_BEFORE",
+                    customer_id=ticket.customer_id,
+                    body="Old question",
+                    from_source=MessageFrom.CUSTOMER,
+                    created_at=now - timedelta(days=1),
+                ),
+                Message(
+                    message_sid="TAG_REPLY",
+                    customer_id=ticket.customer_id,
+                    body="Use neem oil",
+                    from_source=MessageFrom.USER,
+                    created_at=now - timedelta(minutes=5),
+                ),
+                Message(
+                    message_sid="TAG_AFTER",
+                    customer_id=ticket.customer_id,
+                    body="New question",
+                    from_source=MessageFrom.CUSTOMER,
+                    created_at=now + timedelta(minutes=5),
+                ),
+            ]
+        )
+        db_session.commit()
+
+        conversation = TicketTaggingService(db_session).get_conversation(
+            ticket
+        )
+
+        assert conversation == [
+            {"body": "Aphids on maize", "from_source": "whatsapp"},
+            {"body": "Use neem oil", "from_source": "system"},
+        ]
+
+
+class TestTicketTaggedRecipients:
+    def test_admins_and_eos_covering_the_ward(
+        self, db_session, auth_headers_factory, wards
+    ):
+        _, admin = auth_headers_factory(
+            user_type="admin", email="tag-admin@test.com"
+        )
+        _, district_eo = auth_headers_factory(
+            user_type="eo",
+            email="tag-district@test.com",
+            phone_number="+10000000012",
+            administrative_ids=[wards["MWZ-KWM"].id],
+        )
+        _, ward_eo = auth_headers_factory(
+            user_type="eo",
+            email="tag-ward@test.com",
+            phone_number="+10000000013",
+            administrative_ids=[wards["MWZ-KWM-NGU"].id],
+        )
+        _, other_eo = auth_headers_factory(
+            user_type="eo",
+            email="tag-other@test.com",
+            phone_number="+10000000014",
+            administrative_ids=[wards["MWZ-KWM-BUK"].id],
+        )
+
+        recipients = get_ticket_recipient_ids(
+            db_session, wards["MWZ-KWM-NGU"].id
+        )
+
+        assert {admin.id, district_eo.id, ward_eo.id} <= recipients
+        assert other_eo.id not in recipients
+
+
+class TestResolveSchedulesTagging:
+    def test_resolve_does_not_wait_for_tagging(
+        self, client, db_session, auth_headers_factory, make_ticket,
+        monkeypatch,
+    ):
+        headers, _ = auth_headers_factory(user_type="admin")
+        ticket = make_ticket()
+        scheduled = []
+        monkeypatch.setattr(
+            "routers.tickets.schedule_ticket_tagging",
+            lambda: scheduled.append(True),
+        )
+
+        with patch(
+            "services.tagging_service.get_openai_service"
+        ) as get_openai_service:
+            response = client.patch(
+                f"/api/tickets/{ticket.id}",
+                json={"resolved_at": datetime.utcnow().isoformat()},
+                headers=headers,
+            )
+
+        assert response.status_code == 200
+        assert response.json()["ticket"]["tag"] is None
+        assert scheduled == [True]
+        get_openai_service.assert_not_called()
+
+    def test_schedule_never_raises(self):
+        with patch(
+            "tasks.tagging_tasks.tag_resolved_tickets.apply_async",
+            side_effect=Exception("broker down"),
+        ):
+            schedule_ticket_tagging()
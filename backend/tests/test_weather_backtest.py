@@ -0,0 +1,199 @@
+"""Tests for the weather observation store and the rule backtests."""
+
+import random
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from models.administrative import Administrative, AdministrativeLevel
+from models.weather_broadcast import WeatherBroadcast
+from models.weather_observation import OBSERVATION_FIELDS, WeatherObservation
+from services.weather_backtest_service import WeatherBacktestService
+from services.weather_observation_service import (
+    ObservationFrame,
+    WeatherObservationService,
+)
+
+
+def _raw(max_temp=24, min_temp=14, rain=3.0, humidity=88):
+    """Weather API response, as stored on WeatherBroadcast.weather_data"""
+    return {
+        "currentConditionsHistory": {
+            "maxTemperature": {"degrees": max_temp},
+            "minTemperature": {"degrees": min_temp},
+            "qpf": {"quantity": rain},
+        },
+        "wind": {"speed": {"value": 12}, "gust": {"value": 20}},
+        "cloudCover": 90,
+        "relativeHumidity": humidity,
+        "isDaytime": True,
+        "forecastDays": [
+            {
+                "interval": {"startTime": "2026-03-02T00:00:00Z"},
+                "maxTemperature": {"degrees": 25},
+                "minTemperature": {"degrees": 15},
+                "daytimeForecast": {
+                    "precipitation": {
+                        "qpf": {"quantity": 4},
+                        "probability": {"percent": 70},
+                    }
+                },
+                "nighttimeForecast": {},
+            }
+        ],
+    }
+
+
+def _records(count=400, seed=11):
+    """Synthetic observations over a year, with some fields missing"""
+    rng = random.Random(seed)
+    records = []
+    for n in range(count):
+        temperature = rng.choice([None] + list(range(4, 36)))
+        records.append(
+            {
+                "administrative_id": n % 25 + 1,
+                "observed_on": date(2026, 1, 1)
+                + timedelta(days=rng.randrange(365)),
+                "temperature_c": temperature,
+                "temperature_max_c": (
+                    temperature + rng.randrange(0, 8) if temperature else None
+                ),
+                "temperature_min_c": (
+                    temperature - rng.randrange(0, 8) if temperature else None
+                ),
+                "soil_temp_estimate_c": (
+                    temperature - 2 if temperature else None
+                ),
+                "relative_humidity_pct": rng.choice([55, 75, 85, 92, 97]),
+                "thi_value": rng.choice([None, 65.0, 73.5, 79.2]),
+                "wind_speed_kmh": rng.randrange(0, 45),
+                "wind_gust_kmh": rng.randrange(0, 60),
+                "cloud_cover_pct": rng.randrange(0, 101, 10),
+                "qpf_today_mm": rng.choice([0, 0, 0.5, 2, 6, 15, 30]),
+                "rain_probability_today_pct": rng.randrange(0, 101, 10),
+                "rain_probability_next_6h_pct": rng.randrange(0, 101, 10),
+                "cumulative_rain_48h_mm": rng.randrange(0, 60),
+                "cumulative_rain_7d_mm": rng.randrange(0, 150),
+                "consecutive_dry_days": rng.randrange(0, 20),
+                "consecutive_days_above_10c": rng.randrange(0, 8),
+                "is_daytime": rng.random() < 0.5,
+            }
+        )
+    return records
+
+
+@pytest.fixture
+def area(db_session):
+    level = AdministrativeLevel(name="BacktestWard")
+    db_session.add(level)
+    db_session.flush()
+    area = Administrative(
+        code="BKT001", name="Backtest Ward", level_id=level.id, path="BKT001"
+    )
+    db_session.add(area)
+    db_session.commit()
+    return area
+
+
+class TestObservationStore:
+    def test_model_has_a_column_per_field(self):
+        columns = WeatherObservation.__table__.c
+        assert all(name in columns for name in OBSERVATION_FIELDS)
+
+    def test_record_keeps_latest_fetch_of_the_day(self, db_session, area):
+        service = WeatherObservationService(db_session)
+        morning = datetime(2026, 3, 1, 6, 0)
+        evening = datetime(2026, 3, 1, 18, 0)
+
+        assert service.record(area.id, _raw(max_temp=30), evening)
+        # An older fetch (e.g. a backfill) does not overwrite it
+        assert service.record(area.id, _raw(max_temp=20), morning)
+        db_session.commit()
+
+        observation = db_session.query(WeatherObservation).one()
+        assert observation.observed_on == date(2026, 3, 1)
+        assert observation.temperature_c == 22.0
+        assert observation.hour == 18
+        assert observation.month == 3
+        assert observation.is_daytime is True
+        assert observation.cumulative_rain_48h_mm == 7
+
+    def test_backfill_and_load_frame(self, db_session, area):
+        db_session.add_all(
+            [
+                WeatherBroadcast(
+                    administrative_id=area.id,
+                    location_name="Backtest Ward",
+                    weather_data=_raw(rain=rain),
+                    created_at=datetime(2026, 3, day, 6, 0),
+                )
+                for day, rain in ((1, 0.0), (2, 12.0))
+            ]
+            + [
+                WeatherBroadcast(
+                    administrative_id=area.id,
+                    location_name="Backtest Ward",
+                    weather_data=None,
+                    created_at=datetime(2026, 3, 3, 6, 0),
+                )
+            ]
+        )
+        db_session.commit()
+
+        service = WeatherObservationService(db_session)
+        assert service.backfill_from_broadcasts(batch_size=1) == 2
+
+        frame = service.load_frame(date(2026, 3, 1), date(2026, 3, 31))
+        assert len(frame) == 2
+        assert frame.administrative_ids.tolist() == [area.id, area.id]
+        assert frame.months.tolist() == [3, 3]
+        assert frame.columns["qpf_today_mm"].tolist() == [0.0, 12.0]
+        # Fields the response did not have are missing, not zero
+        assert np.isnan(frame.columns["temperature_rising"]).all()
+        assert "temperature_rising" not in frame.row(1)
+        assert frame.row(1)["consecutive_wet_days"] == 2
+
+        empty = service.load_frame(date(2025, 1, 1), date(2025, 1, 31))
+        assert len(empty) == 0
+
+
+class TestBacktest:
+    @pytest.mark.parametrize("crop", ["potato", "avocado", "dairy"])
+    def test_matches_evaluate_rules(self, crop):
+        frame = ObservationFrame.from_records(_records())
+        service = WeatherBacktestService()
+
+        report = service.backtest(frame, crop)
+        expected = service.replay(frame, crop)
+
+        assert report.observations == 400
+        assert report.areas == 25
+        assert {
+            s.rule_id: s.triggers for s in report.rules if s.triggers
+        } == dict(expected)
+        assert any(s.triggers for s in report.rules)
+        for stats in report.rules:
+            assert stats.triggers <= stats.weather_matches
+
+    def test_report_rows(self):
+        frame = ObservationFrame.from_records(_records(count=50))
+        service = WeatherBacktestService()
+        report = service.backtest(frame, "potato")
+
+        rows = report.to_rows()
+        assert len(rows) == len(report.rules)
+        assert rows[0]["triggers"] >= rows[-1]["triggers"]
+        assert 0 <= rows[0]["trigger_rate"] <= 1
+        # Rules that never fire are reported too
+        rule_ids = {
+            rule["id"]
+            for rule in service.advisory_service.load_rules("potato")["rules"]
+        }
+        assert rule_ids <= {row["rule_id"] for row in rows}
+
+    def test_empty_frame(self):
+        frame = ObservationFrame.from_records([])
+        report = WeatherBacktestService().backtest(frame, "potato")
+        assert (report.observations, report.rules) == (0, [])
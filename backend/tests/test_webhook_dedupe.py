@@ -0,0 +1,108 @@
+"""Tests for the early webhook dedupe gate and customer upsert."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from models.customer import Customer
+from services.customer_service import CustomerService
+from utils.webhook_dedupe import WebhookDedupe
+
+
+class FakeRedis:
+    """Just enough of redis.Redis for SET NX/EX and DELETE"""
+
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.fixture
+def dedupe(monkeypatch):
+    dedupe = WebhookDedupe(client=FakeRedis())
+    monkeypatch.setattr(
+        "routers.whatsapp.get_webhook_dedupe", lambda: dedupe
+    )
+    return dedupe
+
+
+def _voice_webhook(client: TestClient, sid: str):
+    return client.post(
+        "/api/whatsapp/webhook",
+        data={
+            "From": "whatsapp:+255710000701",
+            "MessageSid": sid,
+            "NumMedia": "1",
+            "MediaUrl0": "https://api.twilio.com/media/voice",
+            "MediaContentType0": "audio/ogg",
+        },
+    )
+
+
+class TestWebhookDedupe:
+    def test_claimed_sid_skips_media_download(
+        self, client: TestClient, dedupe
+    ):
+        assert dedupe.claim("SM_DEDUPE_1") is True
+
+        with patch("routers.whatsapp.WhatsAppService") as whatsapp_service:
+            response = _voice_webhook(client, "SM_DEDUPE_1")
+
+        assert response.status_code == 200
+        assert response.json()["message"] == "Already processed"
+        whatsapp_service.return_value.download_twilio_media.assert_not_called()
+
+    def test_failure_releases_claim(self, client: TestClient, dedupe):
+        with patch(
+            "routers.whatsapp.CustomerService.get_or_create_customer",
+            side_effect=RuntimeError("db down"),
+        ):
+            response = client.post(
+                "/api/whatsapp/webhook",
+                data={
+                    "From": "whatsapp:+255710000702",
+                    "Body": "Hello",
+                    "MessageSid": "SM_DEDUPE_2",
+                },
+            )
+
+        assert response.status_code == 500
+        # Twilio's retry gets through
+        assert dedupe.claim("SM_DEDUPE_2") is True
+
+    def test_redis_errors_let_requests_through(self):
+        client = MagicMock()
+        client.set.side_effect = redis.ConnectionError("down")
+
+        assert WebhookDedupe(client=client).claim("SM_DEDUPE_3") is True
+
+
+class TestCustomerUpsert:
+    def test_returns_existing_customer(self, db_session: Session):
+        existing = Customer(phone_number="+255710000703", full_name="Asha")
+        db_session.add(existing)
+        db_session.commit()
+
+        service = CustomerService(db_session)
+        first = service.get_or_create_customer("+255710000703")
+        second = service.get_or_create_customer("+255710000703")
+
+        assert first.id == second.id == existing.id
+        assert second.full_name == "Asha"
+        assert (
+            db_session.query(Customer)
+            .filter(Customer.phone_number == "+255710000703")
+            .count()
+            == 1
+        )
@@ -67,6 +67,87 @@ class TestPhoneNumberValidation:
             WhatsAppService.validate_and_format_phone_number("00000000000")
 
 
+class TestStoredE164:
+    """Test Customer.phone_e164, normalized at write time"""
+
+    def test_phone_e164_set_on_insert_and_update(self, db_session: Session):
+        customer = Customer(phone_number="255712345678")
+        db_session.add(customer)
+        db_session.commit()
+        assert customer.phone_e164 == "+255712345678"
+
+        customer.phone_number = "+14155552671"
+        db_session.commit()
+        assert customer.phone_e164 == "+14155552671"
+
+        customer.phone_number = "123"
+        db_session.commit()
+        assert customer.phone_e164 is None
+
+    def test_send_with_e164_skips_parsing(self):
+        service = WhatsAppService()
+        with patch(
+            "services.whatsapp_service.to_e164"
+        ) as mock_to_e164:
+            result = service.send_message_with_tracking(
+                to_number="+255712345678",
+                message_body="Hello",
+                e164="+255712345678",
+            )
+        mock_to_e164.assert_not_called()
+        assert result["status"] == "sent"
+
+
+class TestTemplateRouting:
+    """Test the precomputed (template_type, language) SID table"""
+
+    @pytest.fixture
+    def templates(self, monkeypatch):
+        from config import settings
+
+        monkeypatch.setattr(
+            settings,
+            "languages",
+            [{"code": "en"}, {"code": "sw"}, {"code": "fr"}],
+        )
+        monkeypatch.setattr(
+            settings, "whatsapp_broadcast_template_sid", "HX_EN"
+        )
+        monkeypatch.setattr(
+            settings, "whatsapp_broadcast_template_sid_sw", ""
+        )
+        monkeypatch.setattr(
+            settings,
+            "whatsapp_templates",
+            {"broadcast": {"sid": "HX_EN", "sid_fr": "HX_FR"}},
+        )
+        return settings
+
+    def test_language_specific_and_fallback(self, templates):
+        service = WhatsAppService()
+        assert service.get_template_sid("broadcast", "fr") == "HX_FR"
+        assert service.get_template_sid("broadcast", "en") == "HX_EN"
+        # Swahili not configured, unknown language: English
+        assert service.get_template_sid("broadcast", "sw") == "HX_EN"
+        assert service.get_template_sid("broadcast", "de") == "HX_EN"
+        assert service.get_template_sid("broadcast") == "HX_EN"
+
+    def test_settings_changes_are_picked_up(self, templates, monkeypatch):
+        service = WhatsAppService()
+        assert service.get_template_sid("broadcast", "sw") == "HX_EN"
+
+        monkeypatch.setattr(
+            templates, "whatsapp_broadcast_template_sid_sw", "HX_SW"
+        )
+        monkeypatch.setattr(
+            templates, "languages", [{"code": "en"}, {"code": "sw"}]
+        )
+
+        assert service.get_template_sid("broadcast", "sw") == "HX_SW"
+        # fr is no longer a configured language
+        assert service.get_template_sid("broadcast", "fr") == "HX_EN"
+
+
 class TestTwilioStatusMapping:
     """Test Twilio status to DeliveryStatus mapping"""
 
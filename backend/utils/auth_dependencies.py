@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 
 from database import get_db
 from models.user import User, UserType
-from services.user_service import UserService
+from services.principal_service import Principal, PrincipalService
 from utils.auth import verify_token
 from utils.constants import (
     ADMIN_ACCESS_REQUIRED,
@@ -17,11 +17,17 @@ from utils.constants import (
 security = HTTPBearer()
 
 
-def get_current_user(
+def get_current_principal(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
-) -> User:
-    """Get current authenticated user"""
+) -> Principal:
+    """
+    Get the authenticated user's principal (id, type, ward set).
+
+    Cached per token subject for a short TTL, and resolved once per
+    request by FastAPI's dependency cache, so dashboard endpoints that
+    only need authorization data skip the user and ward lookups.
+    """
     try:
         payload = verify_token(credentials.credentials)
         email = payload.get("sub")
@@ -38,8 +44,33 @@ def get_current_user(
             headers={"WWW-Authenticate": WWW_AUTHENTICATE_HEADER},
         )
 
-    user = UserService.get_user_by_email(db, email)
+    principal = PrincipalService.get_principal(db, email)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=USER_NOT_FOUND,
+            headers={"WWW-Authenticate": WWW_AUTHENTICATE_HEADER},
+        )
+
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=INACTIVE_USER,
+            headers={"WWW-Authenticate": WWW_AUTHENTICATE_HEADER},
+        )
+
+    return principal
+
+
+def get_current_user(
+    principal: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+) -> User:
+    """Get current authenticated user"""
+    user = db.get(User, principal.id)
     if user is None:
+        # Deleted since the principal was cached
+        PrincipalService.invalidate(email=principal.email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=USER_NOT_FOUND,
@@ -47,6 +78,7 @@ def get_current_user(
         )
 
     if not user.is_active:
+        PrincipalService.invalidate(email=principal.email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=INACTIVE_USER,
@@ -0,0 +1,154 @@
+"""
+Compiled configuration snapshot.
+
+Settings and locale files are nested dicts and lists. The webhook path
+used to re-derive the same values from them for every message: admin
+level orders, onboarding field tables (one per OnboardingService), and
+translations by splitting dotted paths and walking nested dicts. The
+snapshot derives them once:
+
+- languages / default_language: supported language codes
+- admin: AdminLevels (level order, leaf level, suffix tokens)
+- onboarding_fields / onboarding_fields_by_name: enabled onboarding
+  fields by priority, and by field name
+- translations: {lang: {"full.dotted.path": value}}, every node of the
+  locale files keyed by its full path
+
+current_snapshot() returns the snapshot in use. A new snapshot is built
+and swapped in as a whole, so a request holding the previous one keeps a
+consistent view:
+
+- by reload_snapshot(), which utils.i18n.reload_translations() calls
+  with the locales it loaded
+- on the next current_snapshot() after languages,
+  administrative_hierarchy or onboarding_fields_config is assigned a new
+  value (settings are compared by identity; replace values instead of
+  editing them in place, or call reload_snapshot())
+"""
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from config import AdminLevels, settings
+from schemas.onboarding_schemas import (
+    OnboardingFieldConfig,
+    build_onboarding_fields,
+)
+
+# Settings the snapshot is compiled from
+SOURCE_SETTINGS = (
+    "languages",
+    "administrative_hierarchy",
+    "onboarding_fields_config",
+)
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Configuration derived once from settings and locale files"""
+
+    languages: Tuple[str, ...]
+    default_language: str
+    admin: AdminLevels
+    onboarding_fields: Tuple[OnboardingFieldConfig, ...]
+    onboarding_fields_by_name: Mapping[str, OnboardingFieldConfig]
+    translations: Mapping[str, Mapping[str, Any]]
+    # Setting values the snapshot was built from, by identity
+    sources: Tuple[Any, ...] = field(repr=False, compare=False)
+
+    def is_current(self) -> bool:
+        """Whether the source settings still hold the same values"""
+        return all(
+            getattr(settings, name) is source
+            for name, source in zip(SOURCE_SETTINGS, self.sources)
+        )
+
+
+def flatten_translations(
+    locales: Dict[str, Dict[str, Any]],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Flat translation maps: {lang: {"a.b.c": value}}.
+
+    Intermediate nodes are kept too ("a.b" maps to its dict), so a
+    lookup returns exactly what walking the nested dict would.
+    """
+    flat: Dict[str, Dict[str, Any]] = {}
+
+    def _walk(node: Dict[str, Any], prefix: str, target: Dict[str, Any]):
+        for key, value in node.items():
+            path = f"{prefix}{key}"
+            target[path] = value
+            if isinstance(value, dict):
+                _walk(value, f"{path}.", target)
+
+    for lang, content in locales.items():
+        table: Dict[str, Any] = {}
+        if isinstance(content, dict):
+            _walk(content, "", table)
+        flat[lang] = table
+    return flat
+
+
+def compile_snapshot(
+    locales: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> ConfigSnapshot:
+    """Build a snapshot from the current settings and the given locales"""
+    sources = tuple(getattr(settings, name) for name in SOURCE_SETTINGS)
+    languages = settings.language_codes
+    fields = tuple(build_onboarding_fields(settings.onboarding_fields_config))
+
+    by_name: Dict[str, OnboardingFieldConfig] = {}
+    for config in fields:
+        by_name.setdefault(config.field_name, config)
+
+    translations = flatten_translations(locales or {})
+    return ConfigSnapshot(
+        languages=languages,
+        default_language=languages[0] if languages else "en",
+        admin=settings.admin_levels,
+        onboarding_fields=fields,
+        onboarding_fields_by_name=MappingProxyType(by_name),
+        translations=MappingProxyType(
+            {
+                lang: MappingProxyType(table)
+                for lang, table in translations.items()
+            }
+        ),
+        sources=sources,
+    )
+
+
+_locales: Dict[str, Dict[str, Any]] = {}
+_snapshot: Optional[ConfigSnapshot] = None
+
+
+def reload_snapshot(
+    locales: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> ConfigSnapshot:
+    """
+    Rebuild the snapshot and swap it in.
+
+    Args:
+        locales: Newly loaded locale files; the previous ones are kept
+            when omitted
+
+    Returns:
+        The new snapshot
+    """
+    global _locales, _snapshot
+    if locales is not None:
+        _locales = locales
+    snapshot = compile_snapshot(_locales)
+    # Single assignment: readers see either the old or the new snapshot
+    _snapshot = snapshot
+    return snapshot
+
+
+def current_snapshot() -> ConfigSnapshot:
+    """The snapshot in use, rebuilt first if a source setting changed"""
+    snapshot = _snapshot
+    if snapshot is None or not snapshot.is_current():
+        snapshot = reload_snapshot()
+    return snapshot
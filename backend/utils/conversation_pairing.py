@@ -0,0 +1,231 @@
+"""
+Conversation Pairing
+
+Pairs farmer messages with the messages around them in a single SQL
+pass, using window functions over each customer's messages ordered by
+(created_at, id). Both hot and archived messages are read (see
+services/message_archive_service.message_history).
+
+- question_response_pairs(): farmer question -> AI / EO reply, as in
+  scripts/export_farmer_conversations.py
+- follow_up_questions(): farmer messages just before and just after an
+  AI FOLLOW_UP question, as in utils/conversation_summary.py
+
+Both return SELECT statements, so callers can join customer data onto
+them; stream() executes one with yield_per.
+"""
+
+from datetime import timedelta
+from typing import Iterator
+
+from sqlalchemy import Select, and_, case, func, or_, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from models.message import MessageFrom
+from schemas.callback import MessageType
+from services.message_archive_service import message_history
+
+HISTORY_COLUMNS = (
+    "id",
+    "customer_id",
+    "body",
+    "from_source",
+    "message_type",
+    "created_at",
+)
+
+
+def _history():
+    return message_history(*HISTORY_COLUMNS)
+
+
+def _window(history, descending: bool = False) -> dict:
+    order_by = (history.c.created_at, history.c.id)
+    if descending:
+        order_by = tuple(column.desc() for column in order_by)
+    return {"partition_by": history.c.customer_id, "order_by": order_by}
+
+
+def question_response_pairs() -> Select:
+    """
+    Farmer questions with the reply that answered them.
+
+    Only farmer messages and replies are kept: AI REPLY messages and EO
+    messages without a type (WHISPER, FOLLOW_UP and BROADCAST messages
+    are skipped). A reply answers the message right before it (LAG)
+    when that is a farmer message, so a newer farmer message supersedes
+    an unanswered older one and a second reply in a row is dropped.
+
+    Returns:
+        SELECT of customer_id, question, question_at, response_id,
+        response, response_at and response_from, ordered by customer
+        and time
+    """
+    history = _history()
+    is_question = history.c.from_source == MessageFrom.CUSTOMER
+    is_response = or_(
+        and_(
+            history.c.from_source == MessageFrom.LLM,
+            history.c.message_type == MessageType.REPLY,
+        ),
+        and_(
+            history.c.from_source == MessageFrom.USER,
+            history.c.message_type.is_(None),
+        ),
+    )
+    window = _window(history)
+    conversation = (
+        select(
+            history.c.customer_id,
+            history.c.id.label("response_id"),
+            history.c.body.label("response"),
+            history.c.from_source.label("response_from"),
+            history.c.created_at.label("response_at"),
+            func.lag(history.c.from_source)
+            .over(**window)
+            .label("previous_from"),
+            func.lag(history.c.body).over(**window).label("question"),
+            func.lag(history.c.created_at)
+            .over(**window)
+            .label("question_at"),
+        )
+        .where(or_(is_question, is_response))
+        .subquery("conversation_stream")
+    )
+    return (
+        select(
+            conversation.c.customer_id,
+            conversation.c.question,
+            conversation.c.question_at,
+            conversation.c.response_id,
+            conversation.c.response,
+            conversation.c.response_at,
+            conversation.c.response_from,
+        )
+        .where(
+            conversation.c.response_from != MessageFrom.CUSTOMER,
+            conversation.c.previous_from == MessageFrom.CUSTOMER,
+        )
+        .order_by(
+            conversation.c.customer_id,
+            conversation.c.response_at,
+            conversation.c.response_id,
+        )
+    )
+
+
+def follow_up_questions(time_threshold_minutes: int = 5) -> Select:
+    """
+    FOLLOW_UP messages with the farmer messages around them.
+
+    Farmer messages are numbered by a running count in both directions;
+    a follow-up shares its number with the closest farmer message before
+    it (counting forwards) and after it (counting backwards), which
+    first_value() then picks up. Farmer messages further than the
+    threshold from the follow-up are dropped, as are follow-ups with
+    neither.
+
+    Args:
+        time_threshold_minutes: Max time gap between a follow-up and
+            the farmer messages merged with it
+
+    Returns:
+        SELECT of follow_up_id, customer_id, follow_up_at, before_body,
+        before_at, after_body and after_at, ordered by follow-up time
+    """
+    history = _history()
+    is_follow_up = history.c.message_type == MessageType.FOLLOW_UP
+    is_farmer = and_(
+        history.c.from_source == MessageFrom.CUSTOMER,
+        or_(
+            history.c.message_type.is_(None),
+            history.c.message_type != MessageType.FOLLOW_UP,
+        ),
+    )
+    numbered = (
+        select(
+            history.c.id,
+            history.c.customer_id,
+            history.c.created_at,
+            is_follow_up.label("is_follow_up"),
+            case((is_farmer, history.c.body)).label("farmer_body"),
+            case((is_farmer, history.c.created_at)).label("farmer_at"),
+            func.count()
+            .filter(is_farmer)
+            .over(**_window(history))
+            .label("before_group"),
+            func.count()
+            .filter(is_farmer)
+            .over(**_window(history, descending=True))
+            .label("after_group"),
+        )
+        .where(or_(is_farmer, is_follow_up))
+        .subquery("numbered")
+    )
+
+    def closest(column, group, descending=False):
+        return func.first_value(column).over(
+            partition_by=(numbered.c.customer_id, group),
+            order_by=_window(numbered, descending)["order_by"],
+        )
+
+    neighbours = select(
+        numbered.c.id,
+        numbered.c.customer_id,
+        numbered.c.created_at,
+        numbered.c.is_follow_up,
+        closest(numbered.c.farmer_body, numbered.c.before_group).label(
+            "before_body"
+        ),
+        closest(numbered.c.farmer_at, numbered.c.before_group).label(
+            "before_at"
+        ),
+        closest(numbered.c.farmer_body, numbered.c.after_group, True).label(
+            "after_body"
+        ),
+        closest(numbered.c.farmer_at, numbered.c.after_group, True).label(
+            "after_at"
+        ),
+    ).subquery("neighbours")
+
+    threshold = timedelta(minutes=time_threshold_minutes)
+    before_ok = and_(
+        neighbours.c.before_at < neighbours.c.created_at,
+        neighbours.c.before_at >= neighbours.c.created_at - threshold,
+    )
+    after_ok = and_(
+        neighbours.c.after_at > neighbours.c.created_at,
+        neighbours.c.after_at <= neighbours.c.created_at + threshold,
+    )
+    return (
+        select(
+            neighbours.c.id.label("follow_up_id"),
+            neighbours.c.customer_id,
+            neighbours.c.created_at.label("follow_up_at"),
+            case((before_ok, neighbours.c.before_body)).label("before_body"),
+            case((before_ok, neighbours.c.before_at)).label("before_at"),
+            case((after_ok, neighbours.c.after_body)).label("after_body"),
+            case((after_ok, neighbours.c.after_at)).label("after_at"),
+        )
+        .where(neighbours.c.is_follow_up, or_(before_ok, after_ok))
+        .order_by(neighbours.c.created_at, neighbours.c.id)
+    )
+
+
+def stream(
+    db: Session, statement: Select, yield_per: int = 1000
+) -> Iterator[Row]:
+    """
+    Execute a pairing statement, fetching rows in chunks.
+
+    Args:
+        db: Database session
+        statement: SELECT from this module (optionally extended)
+        yield_per: Rows fetched per round trip
+
+    Returns:
+        Iterator over result rows
+    """
+    result = db.execute(statement, execution_options={"yield_per": yield_per})
+    return iter(result)
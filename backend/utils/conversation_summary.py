@@ -7,17 +7,16 @@ and export with customer context.
 GitHub Issue: https://github.com/akvo/agriconnect/issues/137
 """
 
-from datetime import timedelta
 from typing import List, Optional
 
 import pandas as pd
-from sqlalchemy import and_, or_
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from models.administrative import Administrative, CustomerAdministrative
 from models.customer import Customer
-from models.message import Message, MessageFrom
-from schemas.callback import MessageType
+from models.message import Message
+from utils.conversation_pairing import follow_up_questions, stream
 
 
 def get_customer_context(db: Session, customer_id: int) -> dict:
@@ -71,6 +70,19 @@ def get_customer_context(db: Session, customer_id: int) -> dict:
     }
 
 
+def merge_texts(*texts: Optional[str]) -> str:
+    """
+    Join message bodies into a single question string.
+
+    Args:
+        texts: Message bodies in conversation order (None is skipped)
+
+    Returns:
+        Stripped bodies joined with ". "
+    """
+    return ". ".join(text.strip() for text in texts if text)
+
+
 def merge_questions(
     before_msg: Optional[Message],
     after_msg: Optional[Message]
@@ -85,15 +97,10 @@ def merge_questions(
     Returns:
         Merged question string
     """
-    parts = []
-
-    if before_msg and before_msg.body:
-        parts.append(before_msg.body.strip())
-
-    if after_msg and after_msg.body:
-        parts.append(after_msg.body.strip())
-
-    return ". ".join(parts) if parts else ""
+    return merge_texts(
+        before_msg.body if before_msg else None,
+        after_msg.body if after_msg else None,
+    )
 
 
 def get_follow_up_conversations(
@@ -104,6 +111,9 @@ def get_follow_up_conversations(
     Get all conversations with FOLLOW_UP messages,
     merging questions before and after the follow-up.
 
+    Pairs and customer context come from one streamed query (see
+    utils/conversation_pairing.follow_up_questions).
+
     Args:
         db: Database session
         time_threshold_minutes: Max time gap for merging messages (default: 5)
@@ -112,90 +122,50 @@ def get_follow_up_conversations(
         DataFrame with columns: farmer_id, ward, crop, gender,
         age_group, query_text, date
     """
-    # Query all FOLLOW_UP messages
-    follow_up_messages = (
-        db.query(Message)
-        .filter(Message.message_type == MessageType.FOLLOW_UP)
-        .order_by(Message.created_at)
-        .all()
-    )
-
-    results: List[dict] = []
-    threshold = timedelta(minutes=time_threshold_minutes)
-
-    for follow_up in follow_up_messages:
-        customer_id = follow_up.customer_id
-        follow_up_time = follow_up.created_at
-
-        # Find customer message BEFORE the follow-up
-        # (from_source=1 means CUSTOMER, within threshold)
-        before_msg = (
-            db.query(Message)
-            .filter(
-                and_(
-                    Message.customer_id == customer_id,
-                    Message.from_source == MessageFrom.CUSTOMER,
-                    Message.created_at < follow_up_time,
-                    Message.created_at >= follow_up_time - threshold,
-                    # Handle NULL message_type (NULL != value is NULL in SQL)
-                    or_(
-                        Message.message_type != MessageType.FOLLOW_UP,
-                        Message.message_type.is_(None),
-                    ),
-                )
-            )
-            .order_by(Message.created_at.desc())
-            .first()
+    pairs = follow_up_questions(time_threshold_minutes).subquery()
+    # First assigned administrative area, like get_customer_context
+    ward = (
+        select(Administrative.name)
+        .join(
+            CustomerAdministrative,
+            CustomerAdministrative.administrative_id == Administrative.id,
         )
-
-        # Find customer message AFTER the follow-up
-        # (from_source=1 means CUSTOMER, within threshold)
-        after_msg = (
-            db.query(Message)
-            .filter(
-                and_(
-                    Message.customer_id == customer_id,
-                    Message.from_source == MessageFrom.CUSTOMER,
-                    Message.created_at > follow_up_time,
-                    Message.created_at <= follow_up_time + threshold,
-                    # Handle NULL message_type (NULL != value is NULL in SQL)
-                    or_(
-                        Message.message_type != MessageType.FOLLOW_UP,
-                        Message.message_type.is_(None),
-                    ),
-                )
-            )
-            .order_by(Message.created_at)
-            .first()
+        .where(CustomerAdministrative.customer_id == pairs.c.customer_id)
+        .order_by(CustomerAdministrative.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    query = (
+        select(
+            pairs.c.customer_id,
+            pairs.c.before_body,
+            pairs.c.before_at,
+            pairs.c.after_body,
+            pairs.c.after_at,
+            ward.label("ward"),
+            Customer.profile_data.op("->>")("crop_type").label("crop"),
+            Customer.profile_data.op("->>")("gender").label("gender"),
+            Customer.age_group_expression().label("age_group"),
         )
+        .outerjoin(Customer, Customer.id == pairs.c.customer_id)
+        .order_by(pairs.c.follow_up_at, pairs.c.follow_up_id)
+    )
 
-        # Skip if no messages found
-        if not before_msg and not after_msg:
-            continue
-
-        # Merge questions
-        merged_question = merge_questions(before_msg, after_msg)
-
+    results: List[dict] = []
+    for row in stream(db, query):
+        merged_question = merge_texts(row.before_body, row.after_body)
         if not merged_question:
             continue
 
-        # Get customer context
-        context = get_customer_context(db, customer_id)
-
-        # Determine date (use earliest message time)
-        if before_msg:
-            date = before_msg.created_at
-        else:
-            date = after_msg.created_at
-
         results.append({
-            "farmer_id": context["farmer_id"],
-            "ward": context["ward"],
-            "crop": context["crop"],
-            "gender": context["gender"],
-            "age_group": context["age_group"],
+            "farmer_id": row.customer_id,
+            "ward": row.ward,
+            "crop": row.crop,
+            "gender": row.gender,
+            "age_group": row.age_group,
             "query_text": merged_question,
-            "date": date,
+            # Earliest message time
+            "date": row.before_at or row.after_at,
         })
 
     # Create DataFrame
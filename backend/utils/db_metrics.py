@@ -0,0 +1,150 @@
+"""
+Connection pool metrics.
+
+Each engine created by database.py uses a QueuePool subclass that times
+how long callers wait for a connection. Together with the pool's own
+counters this shows checkout latency and how close a pool is to
+saturation (every connection, including overflow, checked out).
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Type
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    """Checkout counters for one engine role"""
+
+    def __init__(
+        self,
+        role: str,
+        pool_size: int,
+        max_overflow: int,
+        slow_checkout_ms: float = 500,
+    ):
+        self.role = role
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.slow_checkout_ms = slow_checkout_ms
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.slow_checkouts = 0
+            self.total_wait_ms = 0.0
+            self.max_wait_ms = 0.0
+
+    def observe_checkout(self, wait_ms: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            if wait_ms >= self.slow_checkout_ms:
+                self.slow_checkouts += 1
+        if wait_ms >= self.slow_checkout_ms:
+            logger.warning(
+                f"⚠ Slow DB pool checkout ({self.role}): {wait_ms:.0f}ms"
+            )
+
+    def observe_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+        logger.error(f"✗ DB pool checkout timed out ({self.role})")
+
+    def snapshot(self, pool: QueuePool) -> dict:
+        """
+        Current pool state merged with the checkout counters.
+
+        Args:
+            pool: The engine's live pool
+
+        Returns:
+            Dict of pool gauges and checkout statistics
+        """
+        capacity = self.pool_size + max(self.max_overflow, 0)
+        checked_out = pool.checkedout()
+        with self._lock:
+            avg_wait_ms = (
+                self.total_wait_ms / self.checkouts if self.checkouts else 0.0
+            )
+            return {
+                "role": self.role,
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "checked_out": checked_out,
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "saturation": (
+                    round(checked_out / capacity, 4) if capacity else 0.0
+                ),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "slow_checkouts": self.slow_checkouts,
+                "avg_checkout_ms": round(avg_wait_ms, 2),
+                "max_checkout_ms": round(self.max_wait_ms, 2),
+            }
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that reports checkout latency to its PoolMetrics"""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            if self.metrics:
+                self.metrics.observe_timeout()
+            raise
+        if self.metrics:
+            self.metrics.observe_checkout(
+                (time.perf_counter() - start) * 1000
+            )
+        return connection
+
+
+def metered_pool_class(metrics: PoolMetrics) -> Type[MeteredQueuePool]:
+    """
+    Build a pool class bound to the given metrics.
+
+    The metrics live on the class (not the instance) so they survive
+    Pool.recreate(), which SQLAlchemy calls when the engine is disposed.
+    """
+    return type(
+        f"MeteredQueuePool_{metrics.role}",
+        (MeteredQueuePool,),
+        {"metrics": metrics},
+    )
+
+
+_engines: Dict[str, Engine] = {}
+
+
+def register_engine(role: str, engine: Engine) -> None:
+    """Track an engine so its pool shows up in get_pool_metrics()"""
+    _engines[role] = engine
+
+
+def get_pool_metrics() -> List[dict]:
+    """Snapshot every registered engine pool"""
+    snapshots = []
+    for role, engine in _engines.items():
+        metrics = getattr(engine.pool, "metrics", None)
+        if metrics is None:
+            continue
+        snapshot = metrics.snapshot(engine.pool)
+        snapshot["role"] = role
+        snapshots.append(snapshot)
+    return snapshots
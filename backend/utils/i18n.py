@@ -4,6 +4,8 @@ Dynamic file-based locale system loading JSON translation files from
 backend/locales/ directory.
 
 Structure: trans[category][field][message_type][language]
+t() looks paths up in the flat per-language maps of the compiled config
+snapshot (utils.config_snapshot) instead of walking the nested dicts.
 Usage:
 - t("onboarding.administration.select_region", "sw") or
 - trans["onboarding"]["common"]["age"]["sw"]
@@ -13,7 +15,7 @@ import json
 import logging
 from pathlib import Path
 from typing import Any, Dict
-from config import settings
+from utils.config_snapshot import current_snapshot, reload_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -85,15 +87,19 @@ def _build_trans_dict(locales: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
 # In-memory translation storage
 _locales: Dict[str, Dict[str, Any]] = load_translations()
 trans: Dict[str, Any] = _build_trans_dict(_locales)
+reload_snapshot(_locales)
 
 
 def reload_translations() -> None:
     """
     Reload all translation files from disk.
     Used for testing and runtime locale updates without server restart.
+    t() switches to the new translations in one step, when the compiled
+    config snapshot is swapped.
     """
     global _locales, trans
     _locales = load_translations()
+    reload_snapshot(_locales)
     trans.clear()
     trans.update(_build_trans_dict(_locales))
 
@@ -116,32 +122,27 @@ def t(path: str, lang: str = "en", **kwargs) -> str:
         Translated and formatted string, fallback to default language if
         missing.
     """
+    snapshot = current_snapshot()
+    translations = snapshot.translations
     target_lang = (
         lang
-        if lang in _locales
+        if lang in translations
         else (
-            settings.default_language
-            if settings.default_language in _locales
+            snapshot.default_language
+            if snapshot.default_language in translations
             else "en"
         )
     )
 
-    keys = path.split(".")
-
-    def _lookup(locale_data: Dict[str, Any], key_list: list) -> Any:
-        current = locale_data
-        for k in key_list:
-            if not isinstance(current, dict) or k not in current:
-                return None
-            current = current[k]
-        return current
-
     # 1. Try target language
-    value = _lookup(_locales.get(target_lang, {}), keys)
+    table = translations.get(target_lang)
+    value = table.get(path) if table is not None else None
 
     # 2. Fallback to default language ("en") if missing
     if value is None and target_lang != "en":
-        value = _lookup(_locales.get("en", {}), keys)
+        fallback = translations.get("en")
+        if fallback is not None:
+            value = fallback.get(path)
 
     if value is None:
         return path
@@ -0,0 +1,220 @@
+"""
+Prometheus metrics.
+
+Metrics are defined here and updated where the work happens: HTTP
+request durations (MetricsMiddleware), Celery task runtimes (signal
+handlers, see connect_celery_metrics), database queries per request,
+OpenAI token usage, Twilio errors, WhatsApp outbox sends, Expo push
+failures and Socket.IO connections.
+
+The API runs several uvicorn workers and Celery forks pool processes,
+so each process only sees its own samples. When PROMETHEUS_MULTIPROC_DIR
+is set (run.sh, entrypoint-celery.sh) every process writes its samples
+to that directory and both /metrics (API) and the Celery exporter
+aggregate all processes. The directory must be emptied before the
+processes start. Without it the metrics of the current process are
+served, which is enough for development and tests.
+"""
+
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "agriconnect_http_request_duration_seconds",
+    "HTTP request duration by route template",
+    ["method", "route", "status"],
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "agriconnect_db_queries_per_request",
+    "SQL statements executed per HTTP request",
+    ["route"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+CELERY_TASK_DURATION = Histogram(
+    "agriconnect_celery_task_duration_seconds",
+    "Celery task runtime",
+    ["task", "state"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+OPENAI_REQUESTS = Counter(
+    "agriconnect_openai_requests",
+    "OpenAI API requests that reported token usage",
+)
+OPENAI_TOKENS = Counter(
+    "agriconnect_openai_tokens",
+    "OpenAI tokens used",
+    ["kind"],
+)
+TWILIO_ERRORS = Counter(
+    "agriconnect_twilio_errors",
+    "Twilio errors by error code",
+    ["code", "source"],
+)
+OUTBOX_MESSAGES = Counter(
+    "agriconnect_outbox_messages",
+    "WhatsApp outbox send attempts by result",
+    ["result"],
+)
+EXPO_PUSH_FAILURES = Counter(
+    "agriconnect_expo_push_failures",
+    "Expo push notifications that could not be sent",
+    ["reason"],
+)
+SOCKETIO_CONNECTIONS = Gauge(
+    "agriconnect_socketio_connections",
+    "Authenticated Socket.IO connections",
+    multiprocess_mode="livesum",
+)
+
+
+# Statement counter of the current request; the list is shared with the
+# threadpool workers that run sync endpoints and dependencies
+_request_queries: ContextVar[Optional[List[int]]] = ContextVar(
+    "request_queries", default=None
+)
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _request_queries.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def count_db_queries() -> None:
+    """Count SQL statements of every engine per HTTP request"""
+    if not event.contains(Engine, "before_cursor_execute", _count_query):
+        event.listen(Engine, "before_cursor_execute", _count_query)
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def get_registry() -> CollectorRegistry:
+    """Registry with the samples of all processes when aggregating"""
+    if not multiprocess_enabled():
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Metrics in the Prometheus text format, and its content type"""
+    return generate_latest(get_registry()), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    """Drop the live gauges of an exiting process"""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing HTTP requests.
+
+    Requests are labelled with the route template
+    ("/api/tickets/{ticket_id}") rather than the path, so label
+    cardinality stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = {"code": 500}
+        queries = [0]
+        token = _request_queries.set(queries)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_queries.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_DURATION.labels(
+                method=scope["method"],
+                route=route,
+                status=str(status["code"]),
+            ).observe(time.perf_counter() - start)
+            DB_QUERIES_PER_REQUEST.labels(route=route).observe(queries[0])
+
+
+# Start times of running Celery tasks, by task id
+_task_started: Dict[str, float] = {}
+
+
+def _task_prerun(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+def _task_postrun(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is None or task is None:
+        return
+    CELERY_TASK_DURATION.labels(
+        task=task.name, state=state or "UNKNOWN"
+    ).observe(time.perf_counter() - started)
+
+
+def _worker_ready(**kwargs):
+    from config import settings
+
+    port = settings.celery_metrics_port
+    if not port:
+        return
+    try:
+        start_http_server(port, registry=get_registry())
+        logger.info(f"✓ Celery metrics exporter listening on :{port}")
+    except OSError as e:
+        logger.warning(f"⚠ Celery metrics exporter not started: {e}")
+
+
+def _worker_process_shutdown(pid=None, **kwargs):
+    mark_process_dead(pid)
+
+
+def connect_celery_metrics() -> None:
+    """
+    Record task runtimes and serve metrics from the Celery worker.
+
+    The exporter runs in the main worker process on
+    CELERY_METRICS_PORT and aggregates the pool processes.
+    """
+    from celery import signals
+
+    signals.task_prerun.connect(_task_prerun, weak=False)
+    signals.task_postrun.connect(_task_postrun, weak=False)
+    signals.worker_ready.connect(_worker_ready, weak=False)
+    signals.worker_process_shutdown.connect(
+        _worker_process_shutdown, weak=False
+    )
@@ -0,0 +1,56 @@
+"""
+Phone number normalization.
+
+Numbers are parsed and validated with phonenumbers once, when they are
+written (Customer.phone_e164), instead of on every WhatsApp send.
+"""
+
+from typing import Optional
+
+import phonenumbers
+from phonenumbers import NumberParseException
+
+
+def to_e164(phone: str) -> str:
+    """
+    Validate and format a phone number to E.164.
+
+    Args:
+        phone: Phone number in any format, with or without the
+            "whatsapp:" prefix and the leading +
+
+    Returns:
+        E.164 formatted number (e.g., +255712345678)
+
+    Raises:
+        ValueError: If phone number is invalid
+    """
+    try:
+        # Remove whatsapp: prefix if present
+        phone = phone.replace("whatsapp:", "").strip()
+
+        # If number doesn't start with +, try adding it
+        if not phone.startswith("+"):
+            phone = "+" + phone
+
+        # Parse phone number (None = detect country from number)
+        parsed = phonenumbers.parse(phone, None)
+
+        if not phonenumbers.is_valid_number(parsed):
+            raise ValueError(f"Invalid phone number: {phone}")
+
+        return phonenumbers.format_number(
+            parsed, phonenumbers.PhoneNumberFormat.E164
+        )
+    except NumberParseException as e:
+        raise ValueError(f"Cannot parse phone number '{phone}': {e}")
+
+
+def e164_or_none(phone: Optional[str]) -> Optional[str]:
+    """E.164 form of a phone number, or None if it is not valid"""
+    if not phone:
+        return None
+    try:
+        return to_e164(phone)
+    except ValueError:
+        return None
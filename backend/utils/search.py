@@ -0,0 +1,159 @@
+"""
+Search and list totals for the dashboard lists.
+
+Searches are case-insensitive substring matches on names, emails and
+phone numbers, served by pg_trgm GIN indexes (the ix_*_trgm indexes on
+customers and users) instead of sequential scans. The trigram index
+needs at least three characters to narrow anything down.
+
+- search_condition(): WHERE clause and rank for a search term. A term
+  that looks like a phone number ("0712 345 678", "+255 712") is
+  reduced to its digits, without the national trunk prefix 0, and
+  matched against the stored E.164 number; numbers ending in those
+  digits rank first. Other terms match any of the text columns and
+  rank by trigram word similarity.
+- count_matches(): list total that counts exactly up to
+  settings.search_exact_count_limit rows and otherwise returns the
+  planner's row estimate, so typing into the search box does not count
+  a million farmers on every keystroke.
+"""
+
+import re
+from typing import Optional, Sequence, Tuple
+
+from sqlalchemy import case, func, literal, or_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from config import settings
+
+# Shortest term the trigram indexes can serve
+MIN_TRIGRAM_LENGTH = 3
+
+_PHONE_TERM = re.compile(r"^\+?[\d\s().-]+$")
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards in a user-supplied term (escape char: \\)"""
+    return (
+        term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    )
+
+
+def phone_digits(term: str) -> Optional[str]:
+    """
+    Digits to look for when a search term is a phone number.
+
+    Returns None for terms that are not phone-like or have fewer than
+    MIN_TRIGRAM_LENGTH digits.
+    """
+    term = term.strip()
+    if not _PHONE_TERM.match(term):
+        return None
+    digits = re.sub(r"\D", "", term)
+    if not term.startswith("+"):
+        # Local format: 0712345678 is stored as +255712345678
+        digits = digits.lstrip("0")
+    if len(digits) < MIN_TRIGRAM_LENGTH:
+        return None
+    return digits
+
+
+def search_condition(
+    term: str,
+    text_columns: Sequence,
+    phone_column=None,
+) -> Tuple[ClauseElement, ClauseElement]:
+    """
+    Filter and rank for a search term.
+
+    Args:
+        term: Search term as typed
+        text_columns: Columns matched case-insensitively (names, emails)
+        phone_column: E.164 phone number column, if any
+
+    Returns:
+        (condition, rank): WHERE clause, and a score to order by
+        (descending) so the closest matches come first
+    """
+    term = term.strip()
+    digits = phone_digits(term) if phone_column is not None else None
+    if digits:
+        pattern = f"%{digits}"
+        return (
+            phone_column.like(f"{pattern}%"),
+            case((phone_column.like(pattern), 1.0), else_=0.0),
+        )
+
+    pattern = f"%{escape_like(term)}%"
+    columns = list(text_columns)
+    if phone_column is not None:
+        columns.append(phone_column)
+    condition = or_(
+        *(column.ilike(pattern, escape="\\") for column in columns)
+    )
+    scores = [
+        func.word_similarity(literal(term), func.coalesce(column, ""))
+        for column in text_columns
+    ]
+    rank = func.greatest(*scores) if len(scores) > 1 else scores[0]
+    return condition, rank
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, with its bind parameters"""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(
+        element.statement, **kw
+    )
+
+
+def estimate_rows(db: Session, query: Query) -> int:
+    """Planner's estimate of the rows a query returns"""
+    plan = db.execute(_Explain(query.statement)).scalar()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_matches(
+    db: Session, query: Query, exact_limit: Optional[int] = None
+) -> int:
+    """
+    Total rows of a list query: exact up to a limit, estimated beyond.
+
+    Args:
+        db: Database session
+        query: List query, before ordering and pagination
+        exact_limit: Rows counted exactly
+            (default: settings.search_exact_count_limit)
+
+    Returns:
+        The exact count, or an estimate above exact_limit when there
+        are more rows (see is_estimate())
+    """
+    if exact_limit is None:
+        exact_limit = settings.search_exact_count_limit
+    query = query.enable_eagerloads(False).order_by(None)
+    capped = (
+        db.query(func.count())
+        .select_from(query.limit(exact_limit + 1).subquery())
+        .scalar()
+    )
+    if capped <= exact_limit:
+        return capped
+    return max(estimate_rows(db, query), exact_limit + 1)
+
+
+def is_estimate(total: int, exact_limit: Optional[int] = None) -> bool:
+    """Whether a total from count_matches() is a planner estimate"""
+    if exact_limit is None:
+        exact_limit = settings.search_exact_count_limit
+    return total > exact_limit
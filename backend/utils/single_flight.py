@@ -0,0 +1,266 @@
+"""
+Request coalescing (single-flight) for identical upstream calls.
+
+After a broadcast many farmers in the same ward reply within seconds,
+and the same translation, language classification or weather message
+is requested several times at once. A single-flight group lets the
+first caller of a key (the leader) make the upstream request while
+concurrent callers of the same key wait for and share its result.
+This is not a cache: later callers make a new request.
+
+SingleFlight coalesces callers on one event loop (the API process).
+RedisSingleFlight coalesces across processes (Celery workers) with a
+SET NX lock: followers poll for the leader's result, which is kept for
+a few seconds only, and compute it themselves if it does not appear in
+time. Redis errors never fail the call, it is then made directly.
+The synchronous Redis client is called in a worker thread
+(asyncio.to_thread), so the event loop never waits on Redis; an
+asyncio client would be bound to one loop, and Celery tasks each run
+their own.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import secrets
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import redis
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Deletes the lock only if it still holds the caller's token
+_RELEASE_LOCK = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def request_key(namespace: str, *parts: Any) -> str:
+    """
+    Build a coalescing key from the request arguments.
+
+    Args:
+        namespace: Kind of request, e.g. "openai:translate"
+        *parts: JSON-serializable arguments that determine the result
+
+    Returns:
+        "<namespace>:<sha256 of the canonical JSON of parts>"
+    """
+    payload = json.dumps(
+        parts, sort_keys=True, separators=(",", ":"), default=str
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+class SingleFlight:
+    """In-process single-flight group based on asyncio futures"""
+
+    def __init__(self):
+        self._calls: Dict[Tuple[int, str], asyncio.Future] = {}
+        self.stats = {"calls": 0, "coalesced": 0}
+
+    async def do(
+        self, key: str, fn: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Run fn once for all concurrent callers of key.
+
+        Args:
+            key: Coalescing key (see request_key)
+            fn: Coroutine factory making the upstream call
+
+        Returns:
+            The leader's result; its exception is raised to every caller
+        """
+        loop = asyncio.get_running_loop()
+        # Futures belong to one loop (Celery tasks create their own)
+        call_key = (id(loop), key)
+        self.stats["calls"] += 1
+
+        future = self._calls.get(call_key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(future)
+
+        future = loop.create_future()
+        # Followers may all be gone; never log "exception never retrieved"
+        future.add_done_callback(
+            lambda f: f.cancelled() or f.exception()
+        )
+        self._calls[call_key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._calls.pop(call_key, None)
+
+    def in_flight(self) -> int:
+        """Number of keys currently being computed"""
+        return len(self._calls)
+
+
+class RedisSingleFlight:
+    """
+    Single-flight across processes, on top of the in-process group.
+
+    The result must be JSON-serializable.
+    """
+
+    def __init__(
+        self,
+        local: Optional[SingleFlight] = None,
+        client: Optional[redis.Redis] = None,
+        prefix: str = "single_flight",
+    ):
+        self.local = local or SingleFlight()
+        self._client = client
+        self.prefix = prefix
+
+    @property
+    def enabled(self) -> bool:
+        return (
+            self._client is not None
+            or settings.single_flight_redis_enabled
+        )
+
+    def _get_client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(
+                settings.celery_broker_url,
+                socket_timeout=2,
+                socket_connect_timeout=2,
+            )
+        return self._client
+
+    async def do(
+        self, key: str, fn: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Run fn once for all concurrent callers of key in any process.
+
+        Args:
+            key: Coalescing key (see request_key)
+            fn: Coroutine factory making the upstream call
+
+        Returns:
+            The result computed by this process or by the lock holder
+        """
+        if not self.enabled:
+            return await self.local.do(key, fn)
+        return await self.local.do(key, lambda: self._do_shared(key, fn))
+
+    async def _do_shared(
+        self, key: str, fn: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        lock_key = f"{self.prefix}:lock:{key}"
+        result_key = f"{self.prefix}:result:{key}"
+        # Only the holder of this token may release the lock: after the
+        # TTL another leader may hold it
+        token = secrets.token_hex(16)
+        try:
+            client = self._get_client()
+            acquired = await asyncio.to_thread(
+                client.set,
+                lock_key,
+                token,
+                nx=True,
+                px=settings.single_flight_lock_ttl_ms,
+            )
+        except redis.RedisError as e:
+            logger.warning(f"⚠ Single-flight lock unavailable: {e}")
+            return await fn()
+
+        if acquired:
+            try:
+                result = await fn()
+                try:
+                    await asyncio.to_thread(
+                        client.set,
+                        result_key,
+                        json.dumps({"value": result}),
+                        px=settings.single_flight_result_ttl_ms,
+                    )
+                except (redis.RedisError, TypeError, ValueError) as e:
+                    logger.warning(
+                        f"⚠ Single-flight result not shared: {e}"
+                    )
+                return result
+            finally:
+                try:
+                    await asyncio.to_thread(
+                        client.eval, _RELEASE_LOCK, 1, lock_key, token
+                    )
+                except redis.RedisError:
+                    pass
+
+        value = await self._wait_for_result(client, lock_key, result_key)
+        if value is _MISSING:
+            return await fn()
+        self.local.stats["coalesced"] += 1
+        return value
+
+    async def _wait_for_result(
+        self, client: redis.Redis, lock_key: str, result_key: str
+    ) -> Any:
+        """Poll for the leader's result; _MISSING if it never arrives"""
+        loop = asyncio.get_running_loop()
+        timeout = settings.single_flight_wait_timeout_ms / 1000
+        deadline = loop.time() + timeout
+        while True:
+            try:
+                raw, locked = await asyncio.to_thread(
+                    self._poll, client, lock_key, result_key
+                )
+                if raw is not None:
+                    return json.loads(raw)["value"]
+                # Leader finished without a result (it failed)
+                if not locked:
+                    return _MISSING
+            except (redis.RedisError, ValueError, KeyError) as e:
+                logger.warning(f"⚠ Single-flight wait failed: {e}")
+                return _MISSING
+            if loop.time() >= deadline:
+                return _MISSING
+            await asyncio.sleep(0.1)
+
+    @staticmethod
+    def _poll(
+        client: redis.Redis, lock_key: str, result_key: str
+    ) -> Tuple[Optional[bytes], bool]:
+        """(leader's result or None, lock still held), off the loop"""
+        raw = client.get(result_key)
+        if raw is not None:
+            return raw, True
+        return None, bool(client.exists(lock_key))
+
+
+# Shared groups; see get_single_flight / get_distributed_single_flight
+_single_flight = SingleFlight()
+_distributed_single_flight = RedisSingleFlight(local=_single_flight)
+
+
+def get_single_flight() -> SingleFlight:
+    """In-process single-flight group"""
+    return _single_flight
+
+
+def get_distributed_single_flight() -> RedisSingleFlight:
+    """Single-flight group shared by all processes through Redis"""
+    return _distributed_single_flight
@@ -0,0 +1,93 @@
+"""
+Early duplicate gate for inbound Twilio webhooks.
+
+Twilio retries a webhook that did not answer in time. Without a gate the
+retry downloads and transcribes the same voice note again before the
+MessageSid lookup finds the first copy. claim() is an atomic Redis
+SET NX on the MessageSid, taken before any expensive work; the unique
+index on messages.message_sid stays the source of truth for retries
+that arrive after the claim expired or while Redis is down.
+
+A claim is released when processing fails, so Twilio's retry is
+processed instead of being dropped.
+"""
+
+import logging
+from typing import Optional
+
+import redis
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookDedupe:
+    """Redis claims on webhook message SIDs"""
+
+    def __init__(
+        self,
+        client: Optional[redis.Redis] = None,
+        prefix: str = "webhook_sid",
+    ):
+        self._client = client
+        self.prefix = prefix
+
+    @property
+    def enabled(self) -> bool:
+        return self._client is not None or settings.webhook_dedupe_enabled
+
+    def _get_client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(
+                settings.celery_broker_url,
+                socket_timeout=1,
+                socket_connect_timeout=1,
+            )
+        return self._client
+
+    def _key(self, message_sid: str) -> str:
+        return f"{self.prefix}:{message_sid}"
+
+    def claim(self, message_sid: str) -> bool:
+        """
+        Claim a message SID for processing.
+
+        Args:
+            message_sid: Twilio MessageSid of the inbound message
+
+        Returns:
+            False if another request already claimed it; True otherwise,
+            including when the gate is disabled or Redis is unavailable
+        """
+        if not self.enabled:
+            return True
+        try:
+            return bool(
+                self._get_client().set(
+                    self._key(message_sid),
+                    "1",
+                    nx=True,
+                    ex=settings.webhook_dedupe_ttl_seconds,
+                )
+            )
+        except redis.RedisError as e:
+            logger.warning(f"⚠ Webhook dedupe unavailable: {e}")
+            return True
+
+    def release(self, message_sid: str) -> None:
+        """Drop a claim so a retry of the message is processed"""
+        if not self.enabled:
+            return
+        try:
+            self._get_client().delete(self._key(message_sid))
+        except redis.RedisError as e:
+            logger.warning(f"⚠ Webhook dedupe release failed: {e}")
+
+
+_webhook_dedupe = WebhookDedupe()
+
+
+def get_webhook_dedupe() -> WebhookDedupe:
+    """Shared webhook dedupe gate"""
+    return _webhook_dedupe